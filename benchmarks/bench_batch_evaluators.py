@@ -0,0 +1,69 @@
+"""Time the per-batch overhead of the batch evaluators.
+
+Optimizers like pounders or neldermead_parallel and numerical derivatives call the
+batch evaluator once per iteration with a small batch. This script evaluates a cheap
+function in many small batches. The function carries data, like the criterion
+function of an optimization problem, such that the cost of sending it to the workers
+is part of the measurement.
+
+Usage:
+
+    python benchmarks/bench_batch_evaluators.py
+
+"""
+
+import functools
+import time
+
+import numpy as np
+
+from optimagic.batch_evaluators import (
+    PoolBatchEvaluator,
+    pathos_is_available,
+    process_batch_evaluator,
+)
+
+N_CORES = 2
+N_BATCHES = 100
+DATA_SIZES = [0, 1_000_000]
+
+
+def weighted_sum(x, data):
+    return float(x @ data[: len(x)])
+
+
+def time_batches(batch_evaluator, func):
+    arguments = [np.ones(10) * i for i in range(N_CORES)]
+    # the first batch starts the workers
+    batch_evaluator(func=func, arguments=arguments, n_cores=N_CORES)
+    start = time.perf_counter()
+    for _ in range(N_BATCHES):
+        batch_evaluator(func=func, arguments=arguments, n_cores=N_CORES)
+    return (time.perf_counter() - start) / N_BATCHES
+
+
+def get_batch_evaluators():
+    batch_evaluators = {
+        "joblib": process_batch_evaluator("joblib"),
+        "threading": process_batch_evaluator("threading"),
+        "pool": PoolBatchEvaluator(),
+    }
+    if pathos_is_available:
+        batch_evaluators["pathos"] = process_batch_evaluator("pathos")
+    return batch_evaluators
+
+
+def main():
+    print(f"{'batch evaluator':<20}{'data size':>12}{'time per batch':>18}")
+    for name, batch_evaluator in get_batch_evaluators().items():
+        for size in DATA_SIZES:
+            data = np.ones(max(size, 10))
+            func = functools.partial(weighted_sum, data=data)
+            seconds = time_batches(batch_evaluator, func)
+            print(f"{name:<20}{size:>12}{seconds * 1e3:>16.2f}ms")
+        if isinstance(batch_evaluator, PoolBatchEvaluator):
+            batch_evaluator.shutdown()
+
+
+if __name__ == "__main__":
+    main()
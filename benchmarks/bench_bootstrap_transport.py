@@ -0,0 +1,107 @@
+"""Compare how bootstrap draws and data are sent to the workers.
+
+Previously, the batch evaluator was called with one task per bootstrap draw and every
+task contained the full dataset. Now, the draws are split into one chunk per core and
+the dataset is sent once per chunk. This script measures the volume of pickled task
+arguments, the peak memory of the parent process and the number of draws per second
+of both approaches.
+
+Usage:
+
+    python benchmarks/bench_bootstrap_transport.py
+
+"""
+
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from estimagic.bootstrap_outcomes import get_bootstrap_outcomes
+from estimagic.bootstrap_samples import get_bootstrap_indices
+from optimagic.batch_evaluators import joblib_batch_evaluator
+
+N_CORES = 2
+N_DRAWS = 100
+N_COLUMNS = 20
+N_OBS = [1_000, 100_000]
+
+
+def mean(data):
+    return data.mean()
+
+
+def take_indices_and_calculate_outcome(indices, data, outcome):
+    return outcome(data.iloc[indices])
+
+
+class CountingBatchEvaluator:
+    """Joblib batch evaluator that counts the bytes of the pickled arguments."""
+
+    def __init__(self):
+        self.n_bytes = 0
+
+    def __call__(self, func, arguments, **kwargs):
+        self.n_bytes += sum(len(pickle.dumps(argument)) for argument in arguments)
+        return joblib_batch_evaluator(func, arguments, **kwargs)
+
+
+def per_draw(data, batch_evaluator):
+    indices = get_bootstrap_indices(data, rng=np.random.default_rng(0), n_draws=N_DRAWS)
+    arguments = [{"data": data, "indices": ind, "outcome": mean} for ind in indices]
+    return batch_evaluator(
+        take_indices_and_calculate_outcome,
+        arguments,
+        n_cores=N_CORES,
+        unpack_symbol="**",
+    )
+
+
+def per_chunk(data, batch_evaluator):
+    return get_bootstrap_outcomes(
+        data,
+        outcome=mean,
+        rng=np.random.default_rng(0),
+        n_draws=N_DRAWS,
+        n_cores=N_CORES,
+        batch_evaluator=batch_evaluator,
+    )
+
+
+def measure(transport, data):
+    batch_evaluator = CountingBatchEvaluator()
+    transport(data, batch_evaluator)
+
+    # the counting evaluator pickles the arguments itself, so memory and time are
+    # measured in a separate run
+    tracemalloc.start()
+    start = time.perf_counter()
+    transport(data, joblib_batch_evaluator)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return batch_evaluator.n_bytes, peak, N_DRAWS / seconds
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(
+        f"{'transport':<12}{'n_obs':>10}{'pickled':>14}{'peak memory':>14}"
+        f"{'draws per second':>20}"
+    )
+    for n_obs in N_OBS:
+        data = pd.DataFrame(rng.normal(size=(n_obs, N_COLUMNS)))
+        # the first call starts the workers
+        per_chunk(data.head(), joblib_batch_evaluator)
+        for name, transport in {"per draw": per_draw, "per chunk": per_chunk}.items():
+            n_bytes, peak, rate = measure(transport, data)
+            print(
+                f"{name:<12}{n_obs:>10}{n_bytes / 1e6:>12.1f}MB{peak / 1e6:>12.1f}MB"
+                f"{rate:>20.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare the evaluations per second with per-row and buffered SQLite logging.
+
+A cheap criterion function is minimized without logging, with the default logging
+that writes one row per evaluation and with buffered logging that writes many rows
+in one transaction.
+
+Usage:
+
+    python benchmarks/bench_buffered_logging.py
+
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import optimagic as om
+
+N_EVALUATIONS = 2_000
+N_PARAMS = 10
+
+LOGGING_OPTIONS = {
+    "no logging": None,
+    "per row": {},
+    "buffer_size=100": {"buffer_size": 100},
+    "buffer_size=1000": {"buffer_size": 1000},
+    "flush_interval=1": {"flush_interval": 1.0},
+}
+
+
+def sphere(x):
+    return x @ x
+
+
+def evaluations_per_second(logging_kwargs, path):
+    logging = (
+        None if logging_kwargs is None else om.SQLiteLogOptions(path, **logging_kwargs)
+    )
+    start = time.perf_counter()
+    res = om.minimize(
+        fun=sphere,
+        params=np.arange(N_PARAMS, dtype=float),
+        algorithm=om.algos.scipy_neldermead(
+            stopping_maxfun=N_EVALUATIONS,
+            convergence_ftol_abs=0,
+            convergence_xtol_abs=0,
+        ),
+        logging=logging,
+    )
+    return res.n_fun_evals / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'logging':<20}{'evaluations per second':>25}")
+    with tempfile.TemporaryDirectory() as directory:
+        for i, (name, logging_kwargs) in enumerate(LOGGING_OPTIONS.items()):
+            path = Path(directory) / f"log_{i}.db"
+            rate = evaluations_per_second(logging_kwargs, path)
+            print(f"{name:<20}{rate:>25.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare two ways of logging parallel evaluations to a SQLite database.
+
+- "workers write": Each worker unpickles the logger and inserts its own rows. The
+  workers set up their own database connections and compete for the database lock.
+- "parent writes": The workers return their log entries and the parent process
+  inserts all of them in one transaction. This is how optimagic logs batch
+  evaluations and parallel multistart optimizations.
+
+The evaluations are timed for 1 to 32 cores. Core counts above the number of CPUs
+of the machine are skipped.
+
+Usage:
+
+    python benchmarks/bench_parallel_logging.py
+
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from optimagic.batch_evaluators import joblib_batch_evaluator
+from optimagic.logging.logger import LogStore, SQLiteLogOptions
+from optimagic.logging.types import IterationState
+
+N_CORES = [1, 2, 4, 8, 16, 32]
+N_EVALUATIONS_PER_CORE = 200
+N_PARAMS = 10
+
+
+def evaluate(x):
+    return IterationState(
+        params=x,
+        timestamp=time.perf_counter(),
+        scalar_fun=float(x @ x),
+        valid=True,
+        raw_fun=None,
+        step=None,
+        exceptions=None,
+    )
+
+
+def evaluate_and_write(x, logger):
+    logger.iteration_store.insert(evaluate(x))
+
+
+def evaluate_many(x_list):
+    return [evaluate(x) for x in x_list]
+
+
+def evaluate_and_write_many(x_list, logger):
+    for x in x_list:
+        evaluate_and_write(x, logger)
+
+
+def workers_write(logger, chunks, n_cores):
+    joblib_batch_evaluator(
+        func=evaluate_and_write_many,
+        arguments=[{"x_list": chunk, "logger": logger} for chunk in chunks],
+        n_cores=n_cores,
+        unpack_symbol="**",
+        error_handling="raise",
+    )
+
+
+def parent_writes(logger, chunks, n_cores):
+    results = joblib_batch_evaluator(
+        func=evaluate_many,
+        arguments=chunks,
+        n_cores=n_cores,
+        error_handling="raise",
+    )
+    logger.iteration_store.insert_many([entry for chunk in results for entry in chunk])
+
+
+def time_mode(mode, n_cores, directory):
+    path = Path(directory) / f"{mode.__name__}_{n_cores}.db"
+    logger = LogStore.from_options(SQLiteLogOptions(path))
+    rng = np.random.default_rng(0)
+    chunks = [
+        list(rng.normal(size=(N_EVALUATIONS_PER_CORE, N_PARAMS)))
+        for _ in range(n_cores)
+    ]
+    # start the workers before timing
+    joblib_batch_evaluator(
+        func=evaluate_many, arguments=[[]] * n_cores, n_cores=n_cores
+    )
+    start = time.perf_counter()
+    mode(logger, chunks, n_cores)
+    seconds = time.perf_counter() - start
+    assert len(logger.iteration_store.select()) == n_cores * N_EVALUATIONS_PER_CORE
+    return seconds
+
+
+def main():
+    n_cores_list = [n for n in N_CORES if n <= (os.cpu_count() or 1)]
+    print(f"{'n_cores':>8}{'workers write':>18}{'parent writes':>18}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_cores in n_cores_list:
+            timings = [
+                time_mode(mode, n_cores, directory)
+                for mode in (workers_write, parent_writes)
+            ]
+            print(f"{n_cores:>8}" + "".join(f"{t:>17.3f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
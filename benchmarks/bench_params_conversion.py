@@ -0,0 +1,92 @@
+"""Time the conversion between internal and external parameters.
+
+The conversion from internal to external parameters is done in every evaluation of
+the criterion function. This script times it for params shapes that are common in
+optimagic.
+
+Usage:
+
+    python benchmarks/bench_params_conversion.py
+
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import optimagic as om
+from optimagic.parameters.conversion import get_converter
+from optimagic.typing import AggregationLevel
+
+N_REPETITIONS = 2_000
+
+
+def get_cases():
+    index = [f"p{i}" for i in range(20)]
+    values = np.r_[0.2, 0.3, 0.5, 0.4, 0.5, 0.6, 0.7, 0.7, np.arange(9, 21) / 10]
+    df = pd.DataFrame({"value": values, "lower_bound": 0.0}, index=index)
+
+    return {
+        "DataFrame": (df, []),
+        "DataFrame with constraints": (
+            df.drop(columns="lower_bound"),
+            [
+                om.ProbabilityConstraint(selector=lambda p: p.loc[["p0", "p1", "p2"]]),
+                om.FixedConstraint(selector=lambda p: p.loc[["p5"]]),
+                om.EqualityConstraint(selector=lambda p: p.loc[["p6", "p7"]]),
+            ],
+        ),
+        "DataFrame with string column": (df.assign(name="x"), []),
+        "dict of arrays": ({"a": np.ones(5), "b": np.ones(5), "c": 1.0}, []),
+        "Series": (pd.Series(np.arange(20.0), index=index), []),
+        "nested dict": ({"a": df, "b": {"c": np.ones(3), "d": 2.0}}, []),
+        "array with fixed params": (
+            np.arange(10.0),
+            [om.FixedConstraint(selector=lambda p: p[:2])],
+        ),
+        "array with probabilities": (
+            np.full(20, 0.25),
+            [
+                om.ProbabilityConstraint(selector=lambda p, i=i: p[4 * i : 4 * i + 4])
+                for i in range(5)
+            ],
+        ),
+        "array with covariances": (
+            np.tile([1, 0.1, 1, 0.1, 0.1, 1], 3).astype(float),
+            [
+                om.FlatCovConstraint(selector=lambda p, i=i: p[6 * i : 6 * i + 6])
+                for i in range(3)
+            ],
+        ),
+    }
+
+
+def time_conversion(params, constraints):
+    converter, internal_params = get_converter(
+        params=params,
+        constraints=[c._to_dict() for c in constraints],
+        bounds=None,
+        func_eval=1.0,
+        solver_type=AggregationLevel.SCALAR,
+    )
+    x = internal_params.values
+
+    from_internal = timeit.timeit(
+        lambda: converter.params_from_internal(x), number=N_REPETITIONS
+    )
+    to_internal = timeit.timeit(
+        lambda: converter.params_to_internal(params), number=N_REPETITIONS
+    )
+    return from_internal / N_REPETITIONS, to_internal / N_REPETITIONS
+
+
+def main():
+    print(f"{'params':<30}{'from internal':>16}{'to internal':>16}")
+    for name, (params, constraints) in get_cases().items():
+        from_internal, to_internal = time_conversion(params, constraints)
+        print(f"{name:<30}{from_internal * 1e6:>14.1f}us{to_internal * 1e6:>14.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Time the selection of model points in pounders over increasing dimension.
+
+In every iteration, pounders selects the points of its residual model in
+get_feature_matrices_residual_model. The cost of the selection grows quickly with the
+number of parameters. This script runs pounders on More-Wild and Cartis-Roberts
+problems of increasing dimension and times all calls of the selection.
+
+Usage:
+
+    python benchmarks/bench_pounders_model_points.py
+
+"""
+
+import functools
+import time
+
+import optimagic as om
+from optimagic.optimizers import pounders
+
+N_ITERATIONS = 30
+
+PROBLEMS = {
+    "more_wild": [
+        "chebyquad_6",
+        "mancino_8",
+        "bdqrtic_12",
+        "brown_almost_linear_medium",
+    ],
+    "cartis_roberts": ["hatfldg", "bratu_3d", "cbratu_2d", "bratu_2d", "penalty_1"],
+}
+
+
+def timed(func, timings):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        out = func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+        return out
+
+    return wrapper
+
+
+def time_model_point_selection(problem):
+    timings = []
+    original = pounders.get_feature_matrices_residual_model
+    pounders.get_feature_matrices_residual_model = timed(original, timings)
+    # the criterion functions of some problems are not marked as least squares
+    fun = om.mark.least_squares(functools.partial(problem["inputs"]["fun"]))
+    try:
+        om.minimize(
+            fun=fun,
+            params=problem["inputs"]["params"],
+            algorithm=om.algos.pounders(stopping_maxiter=N_ITERATIONS),
+        )
+    finally:
+        pounders.get_feature_matrices_residual_model = original
+    return timings
+
+
+def main():
+    print(
+        f"{'collection':<16}{'problem':<30}{'n_params':>10}{'calls':>8}"
+        f"{'total':>12}{'per call':>12}"
+    )
+    for collection, names in PROBLEMS.items():
+        problems = om.get_benchmark_problems(collection)
+        for name in names:
+            problem = problems[name]
+            timings = time_model_point_selection(problem)
+            n_params = len(problem["inputs"]["params"])
+            total = sum(timings)
+            print(
+                f"{collection:<16}{name:<30}{n_params:>10}{len(timings):>8}"
+                f"{total * 1e3:>10.1f}ms{total / len(timings) * 1e3:>10.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare thread and process based batch evaluators.
+
+Numerical derivatives and neldermead_parallel evaluate the criterion function in small
+batches. Threads avoid starting workers and pickling the function, but only run in
+parallel if the function releases the GIL. This script times both batch evaluators
+for a function that spends its time in numpy and a function that spends its time in
+pure Python.
+
+Usage:
+
+    python benchmarks/bench_threads_vs_processes.py
+
+"""
+
+import time
+
+import numpy as np
+
+import optimagic as om
+
+N_CORES = 2
+N_PARAMS = 8
+BATCH_EVALUATORS = ["joblib", "threading"]
+
+_MATRIX = np.random.default_rng(0).normal(size=(300, 300))
+
+
+def numpy_sphere(x):
+    # np.linalg.solve releases the GIL
+    np.linalg.solve(_MATRIX, np.ones(len(_MATRIX)))
+    return x @ x
+
+
+def python_sphere(x):
+    # a loop in pure Python holds the GIL
+    for _ in range(1_000):
+        out = sum(value * value for value in x.tolist())
+    return out
+
+
+def time_derivative(func, batch_evaluator):
+    start = time.perf_counter()
+    om.first_derivative(
+        func,
+        params=np.arange(N_PARAMS, dtype=float),
+        n_cores=N_CORES,
+        batch_evaluator=batch_evaluator,
+    )
+    return time.perf_counter() - start
+
+
+def time_neldermead(func, batch_evaluator):
+    start = time.perf_counter()
+    om.minimize(
+        fun=func,
+        params=np.arange(N_PARAMS, dtype=float),
+        algorithm=om.algos.neldermead_parallel(
+            n_cores=N_CORES, batch_evaluator=batch_evaluator, stopping_maxiter=20
+        ),
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'task':<22}{'function':<10}{'batch evaluator':>18}{'time':>12}")
+    for task, timer in {
+        "first_derivative": time_derivative,
+        "neldermead_parallel": time_neldermead,
+    }.items():
+        for name, func in {"numpy": numpy_sphere, "python": python_sphere}.items():
+            for batch_evaluator in BATCH_EVALUATORS:
+                # the first run starts the workers
+                timer(func, batch_evaluator)
+                seconds = timer(func, batch_evaluator)
+                print(
+                    f"{task:<22}{name:<10}{batch_evaluator:>18}{seconds * 1e3:>10.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import functools
+import itertools
+import warnings
 from dataclasses import dataclass
 from functools import cached_property
 from typing import Any
@@ -7,9 +9,14 @@ import numpy as np
 import pandas as pd
 from pybaum import leaf_names, tree_flatten, tree_just_flatten, tree_unflatten
 
-from estimagic.bootstrap_ci import calculate_ci
+from estimagic.bootstrap_checkpoint import BootstrapCheckpoint, get_draw_rngs
+from estimagic.bootstrap_ci import calculate_ci, calculate_ci_from_summaries
 from estimagic.bootstrap_helpers import check_inputs
-from estimagic.bootstrap_outcomes import get_bootstrap_outcomes
+from estimagic.bootstrap_outcomes import (
+    get_bootstrap_outcomes,
+    get_bootstrap_outcomes_by_draw,
+)
+from estimagic.bootstrap_streaming import OnlineMoments, QuantileSketch
 from estimagic.shared_covs import calculate_estimation_summary
 from optimagic.batch_evaluators import joblib_batch_evaluator
 from optimagic.parameters.block_trees import matrix_to_block_tree
@@ -30,6 +37,10 @@ def bootstrap(
     n_cores=1,
     error_handling="continue",
     batch_evaluator=joblib_batch_evaluator,
+    sampling="rows",
+    chunk_size=None,
+    outcomes_path=None,
+    checkpoint_path=None,
 ):
     """Use the bootstrap to calculate inference quantities.
 
@@ -54,6 +65,33 @@ def bootstrap(
         batch_evaluator (str or Callable): Name of a pre-implemented batch evaluator
             (currently 'joblib' and 'pathos_mp') or Callable with the same interface
             as the estimagic batch_evaluators. See :ref:`batch_evaluators`.
+        sampling (str): One of "rows" (default), "weights" and "batched_weights".
+            If "rows", outcome is evaluated on resampled DataFrames. If "weights",
+            outcome is called as ``outcome(data, weights)`` where weights is a 1d
+            integer array that contains how often each observation was drawn. This
+            avoids copying the data for each draw and is much faster for statistics
+            that can be expressed with frequency weights, e.g. weighted means or
+            regressions. If "batched_weights", weights is a 2d array with one row
+            per draw and outcome has to return a sequence with one outcome per row,
+            such that a whole block of draws can be calculated at once.
+        chunk_size (int): If None (default), all bootstrap outcomes are kept in
+            memory. Otherwise, the draws are processed in chunks of chunk_size
+            draws and only a running covariance matrix and approximate quantiles
+            are kept. Confidence intervals are then calculated from the
+            approximate quantiles unless outcomes_path is given.
+        outcomes_path (str or pathlib.Path): Only used if chunk_size is not None.
+            Path of a .npy file to which the flat bootstrap outcomes are written
+            chunk by chunk. The result then accesses the outcomes via a memory map,
+            which allows for exact confidence intervals.
+        checkpoint_path (str or pathlib.Path): Path of an SQLite database in which
+            the bootstrap outcomes are stored, keyed by draw. If the database already
+            contains outcomes, only the missing draws are calculated, such that an
+            interrupted run can be resumed by calling bootstrap again with the same
+            arguments. Each draw uses its own random number generator that is derived
+            from seed and the draw index, such that the result does not depend on
+            interruptions or n_cores. Outcomes are saved after every chunk of
+            chunk_size draws or every 100 draws if chunk_size is None. Cannot be
+            combined with existing_result.
 
     Returns:
         BootstrapResult: A BootstrapResult object storing information on summary
@@ -61,7 +99,9 @@ def bootstrap(
 
     """
     if callable(outcome):
-        check_inputs(data=data, weight_by=weight_by, cluster_by=cluster_by)
+        check_inputs(
+            data=data, weight_by=weight_by, cluster_by=cluster_by, sampling=sampling
+        )
 
         if outcome_kwargs is not None:
             outcome = functools.partial(outcome, **outcome_kwargs)
@@ -69,7 +109,7 @@ def bootstrap(
         raise TypeError("outcome must be a callable.")
 
     if existing_result is None:
-        base_outcome = outcome(data)
+        base_outcome = _calculate_base_outcome(outcome, data, sampling)
         existing_outcomes = []
     elif isinstance(existing_result, BootstrapResult):
         base_outcome = existing_result.base_outcome
@@ -77,22 +117,64 @@ def bootstrap(
     else:
         raise ValueError("existing_result must be None or a BootstrapResult.")
 
+    if checkpoint_path is not None:
+        if existing_result is not None:
+            raise ValueError("existing_result cannot be combined with checkpoint_path.")
+        return _bootstrap_with_checkpoint(
+            base_outcome=base_outcome,
+            draw_outcomes=functools.partial(
+                get_bootstrap_outcomes_by_draw,
+                data=data,
+                outcome=outcome,
+                weight_by=weight_by,
+                cluster_by=cluster_by,
+                n_cores=n_cores,
+                error_handling=error_handling,
+                batch_evaluator=batch_evaluator,
+                sampling=sampling,
+            ),
+            settings={
+                "outcome": _get_outcome_name(outcome),
+                "sampling": sampling,
+                "weight_by": weight_by,
+                "cluster_by": cluster_by,
+            },
+            seed=seed,
+            n_draws=n_draws,
+            chunk_size=chunk_size,
+            outcomes_path=outcomes_path,
+            checkpoint_path=checkpoint_path,
+        )
+
     rng = get_rng(seed)
     n_existing = len(existing_outcomes)
 
-    if n_draws > n_existing:
-        new_outcomes = get_bootstrap_outcomes(
-            data=data,
-            outcome=outcome,
-            weight_by=weight_by,
-            cluster_by=cluster_by,
+    draw_outcomes = functools.partial(
+        get_bootstrap_outcomes,
+        data=data,
+        outcome=outcome,
+        weight_by=weight_by,
+        cluster_by=cluster_by,
+        rng=rng,
+        n_cores=n_cores,
+        error_handling=error_handling,
+        batch_evaluator=batch_evaluator,
+        sampling=sampling,
+    )
+
+    if chunk_size is not None:
+        return _bootstrap_in_chunks(
+            base_outcome=base_outcome,
+            existing_outcomes=existing_outcomes,
+            draw_outcomes=draw_outcomes,
             rng=rng,
-            n_draws=n_draws - n_existing,
-            n_cores=n_cores,
-            error_handling=error_handling,
-            batch_evaluator=batch_evaluator,
+            n_draws=n_draws,
+            chunk_size=_process_chunk_size(chunk_size),
+            outcomes_path=outcomes_path,
         )
 
+    if n_draws > n_existing:
+        new_outcomes = draw_outcomes(n_draws=n_draws - n_existing)
         all_outcomes = existing_outcomes + new_outcomes
     else:
         random_indices = rng.choice(n_existing, n_draws, replace=False)
@@ -102,11 +184,7 @@ def bootstrap(
     # Process results
     # ==================================================================================
 
-    registry = get_registry(extended=True)
-    flat_outcomes = [
-        tree_just_flatten(_outcome, registry=registry) for _outcome in all_outcomes
-    ]
-    internal_outcomes = np.array(flat_outcomes)
+    internal_outcomes = _flatten_outcomes(all_outcomes)
 
     result = BootstrapResult(
         _base_outcome=base_outcome,
@@ -117,11 +195,189 @@ def bootstrap(
     return result
 
 
+def _bootstrap_in_chunks(
+    base_outcome,
+    existing_outcomes,
+    draw_outcomes,
+    rng,
+    n_draws,
+    chunk_size,
+    outcomes_path,
+):
+    """Run the bootstrap in chunks and summarize the outcomes chunk by chunk."""
+    n_existing = len(existing_outcomes)
+    if n_draws > n_existing:
+        n_new = n_draws - n_existing
+        new_chunks = (
+            draw_outcomes(n_draws=min(chunk_size, n_new - start))
+            for start in range(0, n_new, chunk_size)
+        )
+        existing_chunks = (
+            existing_outcomes[start : start + chunk_size]
+            for start in range(0, n_existing, chunk_size)
+        )
+        chunks = itertools.chain(existing_chunks, new_chunks)
+    else:
+        random_indices = rng.choice(n_existing, n_draws, replace=False)
+        chunks = (
+            [existing_outcomes[k] for k in random_indices[start : start + chunk_size]]
+            for start in range(0, n_draws, chunk_size)
+        )
+
+    return _summarize_outcome_chunks(base_outcome, chunks, n_draws, outcomes_path)
+
+
+def _summarize_outcome_chunks(base_outcome, chunks, n_draws, outcomes_path):
+    """Summarize bootstrap outcomes chunk by chunk.
+
+    Only the outcomes of one chunk are held in memory at a time. Their mean and
+    covariance are accumulated in OnlineMoments. Quantiles are either approximated by
+    a QuantileSketch or, if outcomes_path is given, calculated exactly from the
+    outcomes that are spilled to a memory mapped .npy file.
+
+    """
+    moments = None
+    quantile_sketch = None
+    spilled_outcomes = None
+    n_stored = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        flat_chunk = _flatten_outcomes(chunk)
+
+        if outcomes_path is not None:
+            if spilled_outcomes is None:
+                spilled_outcomes = np.lib.format.open_memmap(
+                    outcomes_path,
+                    mode="w+",
+                    dtype=np.float64,
+                    shape=(n_draws, flat_chunk.shape[1]),
+                )
+            spilled_outcomes[n_stored : n_stored + len(flat_chunk)] = flat_chunk
+        elif quantile_sketch is None:
+            quantile_sketch = QuantileSketch.from_outcomes(flat_chunk)
+        else:
+            quantile_sketch = quantile_sketch.update(flat_chunk)
+
+        if moments is None:
+            moments = OnlineMoments.from_outcomes(flat_chunk)
+        else:
+            moments = moments.update(flat_chunk)
+        n_stored += len(flat_chunk)
+
+    if moments is None:
+        raise RuntimeError("Calculating of all bootstrap outcomes failed.")
+
+    if spilled_outcomes is not None:
+        spilled_outcomes.flush()
+        # some draws are missing if the calculation of their outcomes failed
+        internal_outcomes = spilled_outcomes[:n_stored]
+    else:
+        internal_outcomes = None
+
+    result = BootstrapResult(
+        _base_outcome=base_outcome,
+        _internal_outcomes=internal_outcomes,
+        _internal_cov=moments.cov,
+        _quantile_sketch=quantile_sketch,
+        _moments=moments,
+    )
+
+    return result
+
+
+def _bootstrap_with_checkpoint(
+    base_outcome,
+    draw_outcomes,
+    settings,
+    seed,
+    n_draws,
+    chunk_size,
+    outcomes_path,
+    checkpoint_path,
+):
+    """Calculate the missing draws of a checkpoint and summarize all its draws."""
+    if chunk_size is not None:
+        chunk_size = _process_chunk_size(chunk_size)
+    checkpoint_chunk_size = 100 if chunk_size is None else chunk_size
+
+    checkpoint = BootstrapCheckpoint(checkpoint_path)
+    checkpoint.check_settings(settings)
+    entropy = checkpoint.get_entropy(seed)
+    completed = checkpoint.get_completed_draws()
+    missing = [draw for draw in range(n_draws) if draw not in completed]
+
+    for start in range(0, len(missing), checkpoint_chunk_size):
+        draws = missing[start : start + checkpoint_chunk_size]
+        outcomes = draw_outcomes(rngs=get_draw_rngs(entropy, draws))
+        checkpoint.insert(draws, outcomes)
+
+    n_failed = checkpoint.count_failed_draws(n_draws)
+    if 0 < n_failed < n_draws:
+        warnings.warn(
+            f"Calculating bootstrap outcomes failed for {n_failed} of {n_draws} "
+            "samples. Those samples are excluded from the calculation of bootstrap "
+            "standard errors and confidence intervals, rendering them invalid. Do not "
+            "use them for anything but diagnostic purposes."
+        )
+
+    chunks = checkpoint.iterate_outcomes(n_draws, checkpoint_chunk_size)
+    if chunk_size is None:
+        all_outcomes = list(itertools.chain.from_iterable(chunks))
+        if not all_outcomes:
+            raise RuntimeError("Calculating of all bootstrap outcomes failed.")
+        internal_outcomes = _flatten_outcomes(all_outcomes)
+        result = BootstrapResult(
+            _base_outcome=base_outcome,
+            _internal_outcomes=internal_outcomes,
+            _internal_cov=np.cov(internal_outcomes, rowvar=False),
+        )
+    else:
+        result = _summarize_outcome_chunks(base_outcome, chunks, n_draws, outcomes_path)
+
+    return result
+
+
+def _process_chunk_size(chunk_size):
+    if int(chunk_size) < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    return int(chunk_size)
+
+
+def _get_outcome_name(outcome):
+    """Get a name that identifies the outcome function across Python sessions."""
+    while isinstance(outcome, functools.partial):
+        outcome = outcome.func
+    module = getattr(outcome, "__module__", None)
+    name = getattr(outcome, "__qualname__", type(outcome).__qualname__)
+    return f"{module}.{name}"
+
+
+def _flatten_outcomes(outcomes):
+    registry = get_registry(extended=True)
+    flat_outcomes = [
+        tree_just_flatten(_outcome, registry=registry) for _outcome in outcomes
+    ]
+    return np.array(flat_outcomes)
+
+
+def _calculate_base_outcome(outcome, data, sampling):
+    if sampling == "rows":
+        base_outcome = outcome(data)
+    elif sampling == "weights":
+        base_outcome = outcome(data, np.ones(len(data), dtype=int))
+    else:
+        base_outcome = outcome(data, np.ones((1, len(data)), dtype=int))[0]
+    return base_outcome
+
+
 @dataclass
 class BootstrapResult:
     _base_outcome: Any
-    _internal_outcomes: np.ndarray
+    _internal_outcomes: np.ndarray | None
     _internal_cov: np.ndarray
+    _quantile_sketch: QuantileSketch | None = None
+    _moments: OnlineMoments | None = None
 
     @cached_property
     def _se(self):
@@ -162,6 +418,11 @@ class BootstrapResult:
             List[Any]: The boostrap outcomes as a list of pytrees.
 
         """
+        if self._internal_outcomes is None:
+            raise ValueError(
+                "The bootstrap outcomes were not stored because the bootstrap was run "
+                "with chunk_size. Pass outcomes_path to store them on disk."
+            )
         registry = get_registry(extended=True)
         _, treedef = tree_flatten(self._base_outcome, registry=registry)
 
@@ -237,9 +498,18 @@ class BootstrapResult:
         registry = get_registry(extended=True)
         base_outcome_flat, treedef = tree_flatten(self._base_outcome, registry=registry)
 
-        lower_flat, upper_flat = calculate_ci(
-            base_outcome_flat, self._internal_outcomes, ci_method, ci_level
-        )
+        if self._internal_outcomes is None:
+            lower_flat, upper_flat = calculate_ci_from_summaries(
+                base_outcome_flat,
+                self._quantile_sketch,
+                self._moments,
+                ci_method,
+                ci_level,
+            )
+        else:
+            lower_flat, upper_flat = calculate_ci(
+                base_outcome_flat, self._internal_outcomes, ci_method, ci_level
+            )
 
         lower = tree_unflatten(treedef, lower_flat, registry=registry)
         upper = tree_unflatten(treedef, upper_flat, registry=registry)
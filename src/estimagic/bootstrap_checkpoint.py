@@ -0,0 +1,230 @@
+"""Checkpoints that make long bootstrap runs resumable.
+
+Each bootstrap draw gets its own random number generator that is derived from the
+entropy of the run and the draw index. The outcomes are stored in an SQLite database,
+keyed by the draw index. This allows to resume an interrupted run with any number of
+cores and obtain the same result as an uninterrupted run.
+
+"""
+
+import numpy as np
+import sqlalchemy as sql
+from sqlalchemy import Column, Integer, PickleType, String
+
+
+class BootstrapCheckpoint:
+    """Append-only store of bootstrap outcomes, keyed by draw index.
+
+    Args:
+        path (str or pathlib.Path): Path to the SQLite database. It is created if it
+            does not exist.
+
+    """
+
+    def __init__(self, path):
+        self._engine = sql.create_engine(f"sqlite:///{path}")
+        metadata = sql.MetaData()
+        self._outcomes = sql.Table(
+            "bootstrap_outcomes",
+            metadata,
+            Column("draw", Integer, primary_key=True),
+            # None marks draws whose outcome could not be calculated
+            Column("outcome", PickleType, nullable=True),
+        )
+        self._metadata_table = sql.Table(
+            "bootstrap_metadata",
+            metadata,
+            Column("key", String, primary_key=True),
+            Column("value", String),
+        )
+        metadata.create_all(self._engine)
+
+    def get_entropy(self, seed):
+        """Get the entropy from which the seeds of all draws are derived.
+
+        The entropy of the first run is stored in the checkpoint. Later runs reuse
+        it, such that they continue with the same random draws.
+
+        Args:
+            seed (None, int or numpy.random.Generator): The seed passed to bootstrap.
+                Can be None when an existing checkpoint is resumed. The entropy of a
+                Generator is derived from the SeedSequence with which it was created
+                and not from its current state, such that the same Generator can be
+                used to resume a checkpoint.
+
+        Returns:
+            int: The entropy.
+
+        """
+        stmt = self._metadata_table.select().where(
+            self._metadata_table.c.key == "entropy"
+        )
+        with self._engine.connect() as connection:
+            row = connection.execute(stmt).fetchone()
+
+        if row is not None:
+            entropy = int(row.value)
+            if seed is not None and _seed_to_entropy(seed) != entropy:
+                raise ValueError(
+                    "The checkpoint was created with a different seed. Use the "
+                    "original seed or seed=None to resume it."
+                )
+        else:
+            entropy = _seed_to_entropy(seed)
+            stmt = self._metadata_table.insert().values(
+                key="entropy", value=str(entropy)
+            )
+            with self._engine.begin() as connection:
+                connection.execute(stmt)
+
+        return entropy
+
+    def check_settings(self, settings):
+        """Check that the settings of a run match the settings of the checkpoint.
+
+        The settings of the first run are stored in the checkpoint. Resuming it with
+        different settings would mix draws of different bootstrap distributions.
+
+        Args:
+            settings (dict): Mapping from setting names to values. The values are
+                compared by their string representation.
+
+        Raises:
+            ValueError: If a setting differs from the stored one.
+
+        """
+        settings = {key: str(value) for key, value in settings.items()}
+        table = self._metadata_table
+        stmt = table.select().where(table.c.key.in_(list(settings)))
+        with self._engine.connect() as connection:
+            stored = {row.key: row.value for row in connection.execute(stmt)}
+
+        mismatches = [
+            key for key in settings if key in stored and stored[key] != settings[key]
+        ]
+        if mismatches:
+            details = ", ".join(
+                f"{key}: {stored[key]} != {settings[key]}" for key in mismatches
+            )
+            raise ValueError(
+                "The checkpoint was created with different bootstrap settings "
+                f"({details}). Use the original settings to resume it."
+            )
+
+        new_rows = [
+            {"key": key, "value": value}
+            for key, value in settings.items()
+            if key not in stored
+        ]
+        if new_rows:
+            with self._engine.begin() as connection:
+                connection.execute(table.insert(), new_rows)
+
+    def get_completed_draws(self):
+        """Get the indices of all draws whose outcomes are stored.
+
+        Returns:
+            set: Indices of completed draws, including failed draws.
+
+        """
+        stmt = sql.select(self._outcomes.c.draw)
+        with self._engine.connect() as connection:
+            return {row.draw for row in connection.execute(stmt)}
+
+    def count_failed_draws(self, n_draws):
+        """Count the failed draws among the first n_draws draws.
+
+        Args:
+            n_draws (int): Number of draws.
+
+        Returns:
+            int: The number of draws whose outcome could not be calculated.
+
+        """
+        draw = self._outcomes.c.draw
+        stmt = (
+            sql.select(sql.func.count())
+            .select_from(self._outcomes)
+            .where(draw < n_draws, self._outcomes.c.outcome.is_(None))
+        )
+        with self._engine.connect() as connection:
+            return connection.execute(stmt).scalar_one()
+
+    def insert(self, draws, outcomes):
+        """Store the outcomes of several draws in one transaction.
+
+        Args:
+            draws (list): Indices of the draws.
+            outcomes (list): Outcomes of the draws. None marks failed draws.
+
+        """
+        if draws:
+            rows = [
+                {"draw": int(draw), "outcome": outcome}
+                for draw, outcome in zip(draws, outcomes, strict=True)
+            ]
+            with self._engine.begin() as connection:
+                connection.execute(self._outcomes.insert(), rows)
+
+    def iterate_outcomes(self, n_draws, chunk_size):
+        """Iterate over the stored outcomes of the first n_draws draws.
+
+        Failed draws are skipped.
+
+        Args:
+            n_draws (int): Number of draws.
+            chunk_size (int): Number of draws that are read at once.
+
+        Yields:
+            list: Outcomes of the successful draws in one chunk, ordered by draw.
+
+        """
+        draw = self._outcomes.c.draw
+        for start in range(0, n_draws, chunk_size):
+            stop = min(start + chunk_size, n_draws)
+            stmt = (
+                self._outcomes.select()
+                .where(draw >= start, draw < stop, self._outcomes.c.outcome.isnot(None))
+                .order_by(draw)
+            )
+            with self._engine.connect() as connection:
+                rows = connection.execute(stmt).fetchall()
+            yield [row.outcome for row in rows]
+
+
+def get_draw_rngs(entropy, draws):
+    """Create one random number generator per draw.
+
+    The generator of draw i is the i'th child of ``SeedSequence(entropy)``, i.e. it
+    only depends on the entropy and the draw index.
+
+    Args:
+        entropy (int): The entropy of the bootstrap run.
+        draws (list): Indices of the draws.
+
+    Returns:
+        list: List of numpy.random.Generator.
+
+    """
+    return [
+        np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(int(draw),)))
+        for draw in draws
+    ]
+
+
+def _seed_to_entropy(seed):
+    if seed is None:
+        entropy = np.random.SeedSequence().entropy
+    elif isinstance(seed, np.random.Generator):
+        # drawing from the generator would change its state and thus the entropy
+        seed_seq = seed.bit_generator.seed_seq
+        if not isinstance(seed_seq, np.random.SeedSequence):
+            raise ValueError(
+                "The seed of a checkpointed bootstrap must be an integer or a "
+                "numpy.random.Generator that was created from a SeedSequence."
+            )
+        state = seed_seq.generate_state(4, dtype=np.uint64)
+        entropy = int.from_bytes(state.tobytes(), "little")
+    else:
+        entropy = int(seed)
+    return entropy
@@ -52,6 +52,65 @@ def calculate_ci(
     return cis[:, 0], cis[:, 1]
 
 
+def calculate_ci_from_summaries(
+    base_outcome,
+    quantile_sketch,
+    moments,
+    ci_method="percentile",
+    ci_level=0.95,
+):
+    """Compute confidence intervals from summaries of the bootstrap estimates.
+
+    This is the counterpart of calculate_ci for bootstrap runs that did not keep the
+    estimates in memory. The quantiles of the estimates are approximated by a
+    QuantileSketch and their standard deviations are taken from OnlineMoments.
+
+    Args:
+        base_outcome (list): List of flat base outcomes, i.e. the outcome
+            statistic(s) evaluated on the original data set.
+        quantile_sketch (QuantileSketch): Quantile sketch of the estimates.
+        moments (OnlineMoments): Mean and covariance of the estimates.
+        ci_method (str): Method of choice for computing confidence intervals.
+            The default is "percentile".
+        ci_level (float): Confidence level for the calculation of confidence
+            intervals. The default is 0.95.
+
+    Returns:
+        np.ndarray: 1d array of the lower confidence interval, where the k'th entry
+            contains the lower confidence interval for the k'th parameter.
+        np.ndarray: 1d array of the upper confidence interval, where the k'th entry
+            contains the upper confidence interval for the k'th parameter.
+
+    """
+    check_inputs(ci_method=ci_method, ci_level=ci_level, skipdata=True)
+
+    alpha = 1 - ci_level
+    base_outcome = np.asarray(base_outcome, dtype=float)
+    q = quantile_sketch.quantile
+
+    if ci_method == "percentile":
+        lower, upper = q(alpha / 2), q(1 - alpha / 2)
+    elif ci_method == "bc":
+        z_naught = norm.ppf(quantile_sketch.cdf(base_outcome))
+        p1 = norm.cdf(z_naught + (z_naught + norm.ppf(alpha)))
+        p2 = norm.cdf(z_naught + (z_naught + norm.ppf(1 - alpha)))
+        lower, upper = q(p1), q(p2)
+    elif ci_method == "t":
+        theta_std = moments.std
+        t1 = (q(1 - alpha / 2) - base_outcome) / theta_std
+        t2 = (q(alpha / 2) - base_outcome) / theta_std
+        lower, upper = base_outcome - theta_std * t1, base_outcome - theta_std * t2
+    elif ci_method == "basic":
+        lower = 2 * base_outcome - q(1 - alpha / 2)
+        upper = 2 * base_outcome - q(alpha / 2)
+    elif ci_method == "normal":
+        t = norm.ppf(alpha / 2)
+        lower = base_outcome + moments.std * t
+        upper = base_outcome - moments.std * t
+
+    return lower, upper
+
+
 def _ci_percentile(estimates, alpha):
     """Compute percentile type confidence interval of bootstrap estimates.
 
@@ -8,6 +8,7 @@ def check_inputs(
     ci_method="percentile",
     ci_level=0.95,
     skipdata=False,
+    sampling="rows",
 ):
     """Check validity of inputs.
 
@@ -20,6 +21,7 @@ def check_inputs(
         ci_level (float): Confidence level for the calculation of confidence
             intervals. The default is 0.95.
         skipdata (bool): Whether to skip all checks on the data argument.
+        sampling (str): How bootstrap samples are passed to the outcome function.
 
     """
     ci_method_list = ["percentile", "bc", "t", "normal", "basic"]
@@ -44,3 +46,9 @@ def check_inputs(
         raise ValueError(msg)
     if ci_level > 1 or ci_level < 0:
         raise ValueError("Input 'ci_level' must be in [0,1].")
+    if sampling not in ["rows", "weights", "batched_weights"]:
+        msg = (
+            "sampling must be 'rows', 'weights' or 'batched_weights', "
+            f"'{sampling}' was supplied"
+        )
+        raise ValueError(msg)
@@ -1,6 +1,17 @@
+import numpy as np
+
 from estimagic.bootstrap_helpers import check_inputs
-from estimagic.bootstrap_samples import get_bootstrap_indices
+from estimagic.bootstrap_samples import (
+    generate_bootstrap_weights,
+    get_bootstrap_indices,
+    get_bootstrap_weights,
+)
 from optimagic.batch_evaluators import process_batch_evaluator
+from optimagic.decorators import catch
+from optimagic.typing import ErrorHandling
+
+# Number of draws whose weights are held in memory at the same time
+_WEIGHTS_CHUNK_SIZE = 100
 
 
 def get_bootstrap_outcomes(
@@ -13,6 +24,7 @@ def get_bootstrap_outcomes(
     n_cores=1,
     error_handling="continue",
     batch_evaluator="joblib",
+    sampling="rows",
 ):
     """Draw bootstrap samples and calculate outcomes.
 
@@ -20,6 +32,7 @@ def get_bootstrap_outcomes(
         data (pandas.DataFrame): original dataset.
         outcome (callable): function of the dataset calculating statistic of interest.
             Returns a general pytree (e.g. pandas Series, dict, numpy array, etc.).
+            See ``sampling`` for the signature.
         weight_by (str): column name of the variable with weights.
         cluster_by (str): column name of the variable to cluster by.
         rng (numpy.random.Generator): A random number generator.
@@ -31,24 +44,127 @@ def get_bootstrap_outcomes(
         batch_evaluator (str or Callable): Name of a pre-implemented batch evaluator
             (currently 'joblib' and 'pathos_mp') or Callable with the same interface
             as the estimagic batch_evaluators. See :ref:`batch_evaluators`.
+        sampling (str): One of "rows", "weights" and "batched_weights". If "rows",
+            outcome is called with a resampled DataFrame. If "weights", outcome is
+            called as ``outcome(data, weights)`` where weights is a 1d integer array
+            with the number of times each observation was drawn. If
+            "batched_weights", outcome is called as ``outcome(data, weights)`` where
+            weights is a 2d integer array with one row per draw and has to return
+            a sequence with one outcome per row.
 
     Returns:
         estimates (list):  List of pytrees of estimated bootstrap outcomes.
 
     """
-    check_inputs(data=data, weight_by=weight_by, cluster_by=cluster_by)
+    check_inputs(
+        data=data, weight_by=weight_by, cluster_by=cluster_by, sampling=sampling
+    )
     batch_evaluator = process_batch_evaluator(batch_evaluator)
 
-    indices = get_bootstrap_indices(
-        data=data,
-        rng=rng,
-        weight_by=weight_by,
-        cluster_by=cluster_by,
-        n_draws=n_draws,
+    if sampling == "rows":
+        indices = get_bootstrap_indices(
+            data=data,
+            rng=rng,
+            weight_by=weight_by,
+            cluster_by=cluster_by,
+            n_draws=n_draws,
+        )
+
+        estimates = _get_bootstrap_outcomes_from_indices(
+            indices=indices,
+            data=data,
+            outcome=outcome,
+            n_cores=n_cores,
+            error_handling=error_handling,
+            batch_evaluator=batch_evaluator,
+        )
+    else:
+        # dense weights have one row of length n_obs per draw, so they are drawn in
+        # chunks
+        weight_chunks = generate_bootstrap_weights(
+            data=data,
+            rng=rng,
+            weight_by=weight_by,
+            cluster_by=cluster_by,
+            n_draws=n_draws,
+            chunk_size=max(_WEIGHTS_CHUNK_SIZE, int(n_cores)),
+        )
+
+        estimates = _get_bootstrap_outcomes_from_weights(
+            weight_chunks=weight_chunks,
+            data=data,
+            outcome=outcome,
+            n_cores=n_cores,
+            error_handling=error_handling,
+            batch_evaluator=batch_evaluator,
+            batched=sampling == "batched_weights",
+        )
+
+    return estimates
+
+
+def get_bootstrap_outcomes_by_draw(
+    data,
+    outcome,
+    rngs,
+    weight_by=None,
+    cluster_by=None,
+    n_cores=1,
+    error_handling="continue",
+    batch_evaluator="joblib",
+    sampling="rows",
+):
+    """Calculate bootstrap outcomes where each draw has its own random generator.
+
+    In contrast to get_bootstrap_outcomes, the sample of each draw only depends on its
+    own random number generator and failed draws are not dropped. This is needed to
+    resume interrupted bootstrap runs.
+
+    Args:
+        data (pandas.DataFrame): original dataset.
+        outcome (callable): function of the dataset calculating statistic of interest.
+        rngs (list): One numpy.random.Generator per draw.
+        weight_by (str): column name of the variable with weights.
+        cluster_by (str): column name of the variable to cluster by.
+        n_cores (int): number of jobs for parallelization.
+        error_handling (str): One of "continue", "raise".
+        batch_evaluator (str or Callable): Name of a pre-implemented batch evaluator
+            (currently 'joblib' and 'pathos_mp') or Callable with the same interface
+            as the estimagic batch_evaluators. See :ref:`batch_evaluators`.
+        sampling (str): One of "rows", "weights" and "batched_weights". See
+            get_bootstrap_outcomes.
+
+    Returns:
+        list: One entry per draw. The entry is the outcome or None if the calculation
+            of the outcome failed.
+
+    """
+    check_inputs(
+        data=data, weight_by=weight_by, cluster_by=cluster_by, sampling=sampling
     )
+    batch_evaluator = process_batch_evaluator(batch_evaluator)
 
-    estimates = _get_bootstrap_outcomes_from_indices(
-        indices=indices,
+    sampling_kwargs = {
+        "data": data,
+        "weight_by": weight_by,
+        "cluster_by": cluster_by,
+        "n_draws": 1,
+    }
+    if sampling == "rows":
+        func = _take_indices_and_calculate_outcomes
+        draws = [get_bootstrap_indices(rng=rng, **sampling_kwargs)[0] for rng in rngs]
+    else:
+        if sampling == "weights":
+            func = _calculate_weighted_outcomes
+        else:
+            func = _calculate_batched_weighted_outcomes
+        draws = np.vstack(
+            [get_bootstrap_weights(rng=rng, **sampling_kwargs) for rng in rngs]
+        )
+
+    raw_estimates = _evaluate_in_chunks(
+        func=func,
+        draws=draws,
         data=data,
         outcome=outcome,
         n_cores=n_cores,
@@ -56,7 +172,7 @@ def get_bootstrap_outcomes(
         batch_evaluator=batch_evaluator,
     )
 
-    return estimates
+    return [None if isinstance(est, str) else est for est in raw_estimates]
 
 
 def _get_bootstrap_outcomes_from_indices(
@@ -67,16 +183,93 @@ def _get_bootstrap_outcomes_from_indices(
     error_handling,
     batch_evaluator,
 ):
-    arguments = [{"data": data, "indices": ind, "outcome": outcome} for ind in indices]
+    raw_estimates = _evaluate_in_chunks(
+        func=_take_indices_and_calculate_outcomes,
+        draws=indices,
+        data=data,
+        outcome=outcome,
+        n_cores=n_cores,
+        error_handling=error_handling,
+        batch_evaluator=batch_evaluator,
+    )
+    return _process_raw_estimates(raw_estimates)
+
+
+def _get_bootstrap_outcomes_from_weights(
+    weight_chunks,
+    data,
+    outcome,
+    n_cores,
+    error_handling,
+    batch_evaluator,
+    batched=False,
+):
+    func = (
+        _calculate_batched_weighted_outcomes
+        if batched
+        else _calculate_weighted_outcomes
+    )
+    raw_estimates = []
+    for weights in weight_chunks:
+        raw_estimates += _evaluate_in_chunks(
+            func=func,
+            draws=weights,
+            data=data,
+            outcome=outcome,
+            n_cores=n_cores,
+            error_handling=error_handling,
+            batch_evaluator=batch_evaluator,
+        )
+    return _process_raw_estimates(raw_estimates)
+
+
+def _evaluate_in_chunks(
+    func, draws, data, outcome, n_cores, error_handling, batch_evaluator
+):
+    """Evaluate func on one chunk of draws per core and return one result per draw.
+
+    The data is shipped once per chunk instead of once per draw. Since there are only
+    n_cores chunks, each worker receives the dataset only once and the remaining
+    communication consists of the draws.
+
+    """
+    n_chunks = max(min(int(n_cores), len(draws)), 1)
+    chunks = [
+        draws[positions]
+        if isinstance(draws, np.ndarray)
+        else [draws[i] for i in positions]
+        for positions in np.array_split(np.arange(len(draws)), n_chunks)
+    ]
+    arguments = [
+        {
+            "chunk": chunk,
+            "data": data,
+            "outcome": outcome,
+            "error_handling": error_handling,
+        }
+        for chunk in chunks
+    ]
 
-    raw_estimates = batch_evaluator(
-        _take_indices_and_calculate_outcome,
+    raw_chunk_estimates = batch_evaluator(
+        func,
         arguments,
         n_cores=n_cores,
         unpack_symbol="**",
         error_handling=error_handling,
     )
 
+    raw_estimates = []
+    for chunk, chunk_estimates in zip(chunks, raw_chunk_estimates, strict=True):
+        # a string means that the evaluation of the whole chunk failed
+        if isinstance(chunk_estimates, str):
+            raw_estimates += [chunk_estimates] * len(chunk)
+        else:
+            raw_estimates += list(chunk_estimates)
+
+    return raw_estimates
+
+
+def _process_raw_estimates(raw_estimates):
     estimates = [est for est in raw_estimates if not isinstance(est, str)]
     tracebacks = [est for est in raw_estimates if isinstance(est, str)]
 
@@ -98,5 +291,36 @@ def _get_bootstrap_outcomes_from_indices(
     return estimates
 
 
+def _take_indices_and_calculate_outcomes(chunk, data, outcome, error_handling):
+    calculate_outcome = _catch_per_draw(
+        _take_indices_and_calculate_outcome, error_handling
+    )
+    return [calculate_outcome(indices, data, outcome) for indices in chunk]
+
+
 def _take_indices_and_calculate_outcome(indices, data, outcome):
     return outcome(data.iloc[indices])
+
+
+def _calculate_weighted_outcomes(chunk, data, outcome, error_handling):
+    calculate_outcome = _catch_per_draw(outcome, error_handling)
+    return [calculate_outcome(data, weights) for weights in chunk]
+
+
+def _calculate_batched_weighted_outcomes(chunk, data, outcome, error_handling):  # noqa: ARG001
+    outcomes = outcome(data, chunk)
+    if len(outcomes) != len(chunk):
+        raise ValueError(
+            "With sampling='batched_weights', outcome must return one outcome per "
+            f"row of weights. Expected {len(chunk)} outcomes, got {len(outcomes)}."
+        )
+    return list(outcomes)
+
+
+def _catch_per_draw(func, error_handling):
+    reraise = error_handling in [
+        "raise",
+        ErrorHandling.RAISE,
+        ErrorHandling.RAISE_STRICT,
+    ]
+    return catch(func, default="__traceback__", reraise=reraise)
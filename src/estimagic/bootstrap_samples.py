@@ -24,25 +24,63 @@ def get_bootstrap_indices(
     Returns:
         list: list of numpy arrays with positional indices
 
+    """
+    chunks = generate_bootstrap_indices(
+        data=data,
+        rng=rng,
+        weight_by=weight_by,
+        cluster_by=cluster_by,
+        n_draws=n_draws,
+        chunk_size=max(n_draws, 1),
+    )
+    bootstrap_indices = [indices for chunk in chunks for indices in chunk]
+    return bootstrap_indices
+
+
+def generate_bootstrap_indices(
+    data,
+    rng,
+    weight_by=None,
+    cluster_by=None,
+    n_draws=1000,
+    chunk_size=100,
+):
+    """Lazily draw positional indices for the construction of bootstrap samples.
+
+    In contrast to get_bootstrap_indices, at most chunk_size index arrays are held in
+    memory at the same time.
+
+    Args:
+        data (pandas.DataFrame): original dataset.
+        rng (numpy.random.Generator): A random number generator.
+        weight_by (str): column name of the variable with weights.
+        cluster_by (str): column name of the variable to cluster by.
+        n_draws (int): number of draws.
+        chunk_size (int): number of draws per yielded chunk.
+
+    Yields:
+        list: list of at most chunk_size numpy arrays with positional indices.
+
     """
     n_obs = len(data)
     probs = _calculate_bootstrap_indices_weights(data, weight_by, cluster_by)
 
-    if cluster_by is None:
-        bootstrap_indices = list(
-            rng.choice(n_obs, size=(n_draws, n_obs), replace=True, p=probs)
-        )
-    else:
-        clusters = data[cluster_by].unique()
-        drawn_clusters = rng.choice(
-            clusters, size=(n_draws, len(clusters)), replace=True, p=probs
-        )
-
-        bootstrap_indices = _convert_cluster_ids_to_indices(
-            data[cluster_by], drawn_clusters
-        )
+    if cluster_by is not None:
+        codes, clusters = pd.factorize(data[cluster_by], use_na_sentinel=False)
+        positions, offsets = _get_cluster_index(codes, len(clusters))
 
-    return bootstrap_indices
+    for start in range(0, n_draws, chunk_size):
+        size = min(chunk_size, n_draws - start)
+        if cluster_by is None:
+            chunk = list(rng.choice(n_obs, size=(size, n_obs), replace=True, p=probs))
+        else:
+            drawn_codes = rng.choice(
+                len(clusters), size=(size, len(clusters)), replace=True, p=probs
+            )
+            chunk = [
+                _expand_cluster_codes(draw, positions, offsets) for draw in drawn_codes
+            ]
+        yield chunk
 
 
 def _calculate_bootstrap_indices_weights(data, weight_by, cluster_by):
@@ -76,14 +114,139 @@ def _convert_cluster_ids_to_indices(cluster_col, drawn_clusters):
     """Convert the drawn clusters to positional indices of individual observations.
 
     Args:
-        cluster_col (pandas.Series):
+        cluster_col (pandas.Series): The cluster id of each observation.
+        drawn_clusters (np.ndarray): 2d array with drawn cluster ids. Each row is one
+            bootstrap draw.
+
+    Returns:
+        list: list of numpy arrays with positional indices.
 
     """
-    bootstrap_indices = []
-    cluster_to_locs = pd.Series(np.arange(len(cluster_col)), index=cluster_col)
-    for draw in drawn_clusters:
-        bootstrap_indices.append(cluster_to_locs[draw].to_numpy())
-    return bootstrap_indices
+    codes, clusters = pd.factorize(cluster_col, use_na_sentinel=False)
+    positions, offsets = _get_cluster_index(codes, len(clusters))
+    drawn_codes = pd.Index(clusters).get_indexer(np.ravel(drawn_clusters))
+    drawn_codes = drawn_codes.reshape(np.shape(drawn_clusters))
+    return [_expand_cluster_codes(draw, positions, offsets) for draw in drawn_codes]
+
+
+def _get_cluster_index(codes, n_clusters):
+    """Build a CSR style index from clusters to positions of their observations.
+
+    The positions of the observations in cluster k are
+    ``positions[offsets[k]:offsets[k + 1]]``, in the order in which they appear in
+    the data.
+
+    Args:
+        codes (np.ndarray): 1d array with the integer code of each observation's
+            cluster.
+        n_clusters (int): Number of clusters.
+
+    Returns:
+        np.ndarray: Positions of the observations, sorted by cluster.
+        np.ndarray: Array of length n_clusters + 1 with the start of each cluster in
+            positions.
+
+    """
+    positions = np.argsort(codes, kind="stable")
+    offsets = np.zeros(n_clusters + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n_clusters), out=offsets[1:])
+    return positions, offsets
+
+
+def _expand_cluster_codes(drawn_codes, positions, offsets):
+    """Convert one draw of cluster codes to positional indices of observations."""
+    starts = offsets[drawn_codes]
+    lengths = offsets[drawn_codes + 1] - starts
+    # position of each output element within its cluster
+    within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return positions[np.repeat(starts, lengths) + within]
+
+
+def get_bootstrap_weights(
+    data,
+    rng,
+    weight_by=None,
+    cluster_by=None,
+    n_draws=1000,
+):
+    """Draw frequency weights for the construction of bootstrap samples.
+
+    Entry ``[b, i]`` of the result is the number of times observation i is contained
+    in the b-th bootstrap sample. Weighting the original data by one row of the result
+    is equivalent to evaluating a statistic on a resampled dataset, without
+    materializing the resampled dataset. With clustering, all observations of a
+    cluster get the multiplicity of their cluster.
+
+    Args:
+        data (pandas.DataFrame): original dataset.
+        rng (numpy.random.Generator): A random number generator.
+        weight_by (str): column name of the variable with weights.
+        cluster_by (str): column name of the variable to cluster by.
+        n_draws (int): number of draws.
+
+    Returns:
+        np.ndarray: 2d integer array of shape (n_draws, n_obs).
+
+    """
+    chunks = generate_bootstrap_weights(
+        data=data,
+        rng=rng,
+        weight_by=weight_by,
+        cluster_by=cluster_by,
+        n_draws=n_draws,
+        chunk_size=max(n_draws, 1),
+    )
+    weights = np.vstack([*chunks, np.empty((0, len(data)), dtype=np.int64)])
+    return weights
+
+
+def generate_bootstrap_weights(
+    data,
+    rng,
+    weight_by=None,
+    cluster_by=None,
+    n_draws=1000,
+    chunk_size=100,
+):
+    """Lazily draw frequency weights for the construction of bootstrap samples.
+
+    In contrast to get_bootstrap_weights, at most chunk_size rows of weights are held
+    in memory at the same time.
+
+    Args:
+        data (pandas.DataFrame): original dataset.
+        rng (numpy.random.Generator): A random number generator.
+        weight_by (str): column name of the variable with weights.
+        cluster_by (str): column name of the variable to cluster by.
+        n_draws (int): number of draws.
+        chunk_size (int): number of draws per yielded chunk.
+
+    Yields:
+        np.ndarray: 2d integer array of shape (size, n_obs) with size <= chunk_size.
+
+    """
+    probs = _calculate_bootstrap_indices_weights(data, weight_by, cluster_by)
+
+    if cluster_by is None:
+        n_units = len(data)
+    else:
+        codes, clusters = pd.factorize(data[cluster_by], use_na_sentinel=False)
+        n_units = len(clusters)
+
+    for start in range(0, n_draws, chunk_size):
+        size = min(chunk_size, n_draws - start)
+        # Counting drawn positions has the same distribution as rng.multinomial but
+        # is much faster when there are many observations or clusters.
+        drawn = rng.choice(n_units, size=(size, n_units), replace=True, p=probs)
+        offsets = n_units * np.arange(size).reshape(-1, 1)
+        unit_weights = np.bincount(
+            (drawn + offsets).ravel(), minlength=size * n_units
+        ).reshape(size, n_units)
+
+        if cluster_by is None:
+            yield unit_weights
+        else:
+            yield unit_weights[:, codes]
 
 
 def get_bootstrap_samples(
@@ -0,0 +1,203 @@
+"""Accumulators that summarize bootstrap outcomes without storing all of them.
+
+Both accumulators can be updated with chunks of outcomes and merged with each other,
+such that the bootstrap can be run in chunks whose outcomes are discarded after they
+have been processed.
+
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class OnlineMoments:
+    """Running mean and covariance of bootstrap outcomes.
+
+    Chunks are combined with the pairwise update formulas of Chan, Golub and LeVeque,
+    which are numerically stable for large numbers of draws.
+
+    Attributes:
+        n (int): Number of processed outcomes.
+        mean (np.ndarray): 1d array with the mean of the processed outcomes.
+        comoment (np.ndarray): 2d array with the sum of outer products of deviations
+            from the mean.
+
+    """
+
+    n: int
+    mean: np.ndarray
+    comoment: np.ndarray
+
+    @classmethod
+    def from_outcomes(cls, outcomes):
+        outcomes = np.asarray(outcomes, dtype=float)
+        mean = outcomes.mean(axis=0)
+        deviations = outcomes - mean
+        return cls(n=len(outcomes), mean=mean, comoment=deviations.T @ deviations)
+
+    def merge(self, other):
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.n / n
+        comoment = (
+            self.comoment
+            + other.comoment
+            + np.outer(delta, delta) * self.n * other.n / n
+        )
+        return OnlineMoments(n=n, mean=mean, comoment=comoment)
+
+    def update(self, outcomes):
+        return self.merge(OnlineMoments.from_outcomes(outcomes))
+
+    @property
+    def cov(self):
+        """Covariance matrix with the same normalization as np.cov."""
+        return self.comoment / (self.n - 1)
+
+    @property
+    def std(self):
+        """Standard deviations with the same normalization as np.std."""
+        return np.sqrt(np.diagonal(self.comoment) / self.n)
+
+
+@dataclass
+class QuantileSketch:
+    """Approximate quantile functions of bootstrap outcomes.
+
+    This is a simplified KLL sketch. Outcomes are stored in levels, where each stored
+    value at level ``l`` represents ``2 ** l`` outcomes. Whenever a level holds more
+    than ``capacity`` values, each column is sorted and every other value is promoted
+    to the next level. The sketch is exact as long as no compaction happened and its
+    rank error is of the order of ``1 / capacity`` otherwise.
+
+    Since all columns contain the same number of outcomes, they share the level
+    structure, such that all operations are vectorized over the columns.
+
+    Attributes:
+        n (int): Number of processed outcomes.
+        capacity (int): Maximum number of values per level.
+        levels (list): List of 2d arrays with one column per outcome.
+        n_compactions (list): Number of compactions per level. It determines whether
+            the values at even or odd positions are promoted.
+
+    """
+
+    n: int
+    capacity: int
+    levels: list
+    n_compactions: list
+
+    @classmethod
+    def from_outcomes(cls, outcomes, capacity=2_000):
+        outcomes = np.asarray(outcomes, dtype=float)
+        sketch = cls(
+            n=len(outcomes), capacity=capacity, levels=[outcomes], n_compactions=[0]
+        )
+        return sketch._compact()
+
+    def merge(self, other):
+        n_levels = max(len(self.levels), len(other.levels))
+        levels = []
+        n_compactions = []
+        for level in range(n_levels):
+            arrays = [
+                sketch.levels[level]
+                for sketch in (self, other)
+                if level < len(sketch.levels)
+            ]
+            levels.append(np.vstack(arrays))
+            n_compactions.append(
+                sum(
+                    sketch.n_compactions[level]
+                    for sketch in (self, other)
+                    if level < len(sketch.n_compactions)
+                )
+            )
+        merged = QuantileSketch(
+            n=self.n + other.n,
+            capacity=self.capacity,
+            levels=levels,
+            n_compactions=n_compactions,
+        )
+        return merged._compact()
+
+    def update(self, outcomes):
+        return self.merge(QuantileSketch.from_outcomes(outcomes, self.capacity))
+
+    def quantile(self, q):
+        """Evaluate the quantile function of each outcome.
+
+        The quantiles are linearly interpolated like in np.quantile.
+
+        Args:
+            q (float or np.ndarray): Probability or 1d array with one probability per
+                outcome.
+
+        Returns:
+            np.ndarray: 1d array with one quantile per outcome.
+
+        """
+        values, weights = self._sorted_values_and_weights()
+        # a value of weight w covers the ranks cum_weights - w, ..., cum_weights - 1
+        cum_weights = np.cumsum(weights, axis=0)
+        ranks = cum_weights - (weights + 1) / 2
+        target_ranks = np.broadcast_to(q, values.shape[1]) * (self.n - 1)
+        return np.array(
+            [
+                np.interp(target_ranks[k], ranks[:, k], values[:, k])
+                for k in range(values.shape[1])
+            ]
+        )
+
+    def cdf(self, x):
+        """Evaluate the empirical cumulative distribution function of each outcome.
+
+        Args:
+            x (np.ndarray): 1d array with one evaluation point per outcome.
+
+        Returns:
+            np.ndarray: 1d array with the share of outcomes that are smaller or equal
+                to x.
+
+        """
+        counts = np.zeros(self.levels[0].shape[1])
+        for level, values in enumerate(self.levels):
+            counts += 2**level * (values <= x).sum(axis=0)
+        return counts / self.n
+
+    def _sorted_values_and_weights(self):
+        values = np.vstack(self.levels)
+        weights = np.concatenate(
+            [np.full(len(values), 2**level) for level, values in enumerate(self.levels)]
+        )
+        order = np.argsort(values, axis=0, kind="stable")
+        return np.take_along_axis(values, order, axis=0), weights[order]
+
+    def _compact(self):
+        levels = list(self.levels)
+        n_compactions = list(self.n_compactions)
+        level = 0
+        while level < len(levels):
+            if len(levels[level]) > self.capacity:
+                if level + 1 == len(levels):
+                    levels.append(levels[level][:0])
+                    n_compactions.append(0)
+                values = np.sort(levels[level], axis=0)
+                # alternate between promoting values at even and odd positions such
+                # that the compactions do not systematically shift the distribution.
+                offset = n_compactions[level] % 2
+                n_pairs = len(values) // 2
+                kept = values[2 * n_pairs :]
+                promoted = values[offset : 2 * n_pairs : 2]
+                levels[level] = kept
+                levels[level + 1] = np.vstack([levels[level + 1], promoted])
+                n_compactions[level] += 1
+            level += 1
+        return QuantileSketch(
+            n=self.n,
+            capacity=self.capacity,
+            levels=levels,
+            n_compactions=n_compactions,
+        )
@@ -1,5 +1,5 @@
 import warnings
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any, Dict
 
@@ -33,6 +33,7 @@ from optimagic.differentiation.derivatives import first_derivative, second_deriv
 from optimagic.differentiation.numdiff_options import (
     NumdiffPurpose,
     get_default_numdiff_options,
+    get_derivative_kwargs,
     pre_process_numdiff_options,
 )
 from optimagic.exceptions import InvalidFunctionError, NotAvailableError
@@ -299,6 +300,47 @@ def estimate_ml(
         derivative_eval=jacobian_eval,
     )
 
+    # ==================================================================================
+    # Calculate numerical derivatives
+    # ==================================================================================
+
+    def func(x):
+        p = converter.params_from_internal(x)
+        loglike_eval = loglike(p, **loglike_kwargs)
+        if deprecations.is_dict_output(loglike_eval):
+            deprecations.throw_dict_output_warning()
+            loglike_eval = deprecations.convert_dict_to_function_value(loglike_eval)
+        return loglike_eval
+
+    numdiff_kwargs = {
+        "func": func,
+        "params": internal_estimates.values,
+        "bounds": Bounds(
+            lower=internal_estimates.lower_bounds,
+            upper=internal_estimates.upper_bounds,
+        ),
+        "f0": loglike_eval,
+        "error_handling": "continue",
+    }
+
+    # The Jacobian and the Hessian use different step rules by default, so only the
+    # evaluation at the estimates is shared between them.
+    num_jac = None
+    if jac_case == "numerical":
+        num_jac = first_derivative(
+            **numdiff_kwargs,
+            unpacker=_get_likelihood_contributions,
+            **get_derivative_kwargs(jacobian_numdiff_options),
+        ).derivative
+
+    num_hess = None
+    if hess_case == "numerical":
+        num_hess = second_derivative(
+            **numdiff_kwargs,
+            unpacker=_get_likelihood_value,
+            **get_derivative_kwargs(hessian_numdiff_options),
+        ).derivative
+
     # ==================================================================================
     # Calculate internal jacobian
     # ==================================================================================
@@ -308,29 +350,7 @@ def estimate_ml(
             jacobian_eval, internal_estimates.values
         )
     elif jac_case == "numerical":
-
-        def func(x):
-            p = converter.params_from_internal(x)
-            loglike_eval = loglike(p, **loglike_kwargs)
-            if deprecations.is_dict_output(loglike_eval):
-                deprecations.throw_dict_output_warning()
-                loglike_eval = deprecations.convert_dict_to_function_value(loglike_eval)
-
-            out = loglike_eval.internal_value(AggregationLevel.LIKELIHOOD)
-            return out
-
-        jac_res = first_derivative(
-            func=func,
-            params=internal_estimates.values,
-            bounds=Bounds(
-                lower=internal_estimates.lower_bounds,
-                upper=internal_estimates.upper_bounds,
-            ),
-            error_handling="continue",
-            **asdict(jacobian_numdiff_options),
-        )
-
-        int_jac = jac_res.derivative
+        int_jac = num_jac
     else:
         int_jac = None
 
@@ -356,28 +376,7 @@ def estimate_ml(
     if hess_case == "skip":
         int_hess = None
     elif hess_case == "numerical":
-
-        def func(x):
-            p = converter.params_from_internal(x)
-            loglike_eval = loglike(p, **loglike_kwargs)
-            if deprecations.is_dict_output(loglike_eval):
-                deprecations.throw_dict_output_warning()
-                loglike_eval = deprecations.convert_dict_to_function_value(loglike_eval)
-
-            out = loglike_eval.internal_value(AggregationLevel.SCALAR)
-            return out
-
-        hess_res = second_derivative(
-            func=func,
-            params=internal_estimates.values,
-            bounds=Bounds(
-                lower=internal_estimates.lower_bounds,
-                upper=internal_estimates.upper_bounds,
-            ),
-            error_handling="continue",
-            **asdict(hessian_numdiff_options),
-        )
-        int_hess = hess_res.derivative
+        int_hess = num_hess
     elif hess_case == "closed-form" and dict_constraints:
         raise NotImplementedError(
             "Closed-form Hessians are not yet compatible with constraints."
@@ -871,3 +870,11 @@ def _calculate_free_cov_ml(
         bounds_handling=bounds_handling,
     )
     return free_cov
+
+
+def _get_likelihood_contributions(loglike_eval):
+    return loglike_eval.internal_value(AggregationLevel.LIKELIHOOD)
+
+
+def _get_likelihood_value(loglike_eval):
+    return loglike_eval.internal_value(AggregationLevel.SCALAR)
@@ -3,7 +3,7 @@
 import functools
 import warnings
 from collections.abc import Callable
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any, Dict, Union
 
@@ -41,6 +41,7 @@ from optimagic.differentiation.derivatives import first_derivative
 from optimagic.differentiation.numdiff_options import (
     NumdiffPurpose,
     get_default_numdiff_options,
+    get_derivative_kwargs,
     pre_process_numdiff_options,
 )
 from optimagic.exceptions import InvalidFunctionError
@@ -322,15 +323,23 @@ def estimate_msm(
             out = np.array(tree_just_flatten(sim_mom, registry=registry))
             return out
 
+        # reuse the simulated moments at the estimates
+        f0 = np.array(
+            tree_just_flatten(
+                func_eval["contributions"], registry=get_registry(extended=True)
+            )
+        )
+
         int_jac = first_derivative(
             func=func,
             params=internal_estimates.values,
+            f0=f0,
             bounds=Bounds(
                 lower=internal_estimates.lower_bounds,
                 upper=internal_estimates.upper_bounds,
             ),
             error_handling="continue",
-            **asdict(jacobian_numdiff_options),
+            **get_derivative_kwargs(jacobian_numdiff_options),
         ).derivative
 
     # ==================================================================================
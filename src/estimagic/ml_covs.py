@@ -2,6 +2,7 @@
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
 from estimagic.shared_covs import process_pandas_arguments
 from optimagic.exceptions import INVALID_INFERENCE_MSG
@@ -206,8 +207,9 @@ def _clustering(jac, design_info):
     The result is the meat of the sandwich estimator.
 
     Args:
-        jac (np.array): "jacobian" - an n x k + 1-dimensional array of first
-            derivatives of the pseudo-log-likelihood function w.r.t. the parameters
+        jac (np.array or iterable): "jacobian" - an n x k + 1-dimensional array of
+            first derivatives of the pseudo-log-likelihood function w.r.t. the
+            parameters or an iterable of consecutive blocks of its rows.
         design_info (pd.DataFrame): dataframe containing psu, stratum,
             population/design weight and/or a finite population corrector (fpc)
 
@@ -216,13 +218,11 @@ def _clustering(jac, design_info):
             the likelihood equation (Pg.557, 14-10, Greene 7th edition)
 
     """
-    list_of_clusters = design_info["psu"].unique()
-    meat = np.zeros([len(jac[0, :]), len(jac[0, :])])
-    for psu in list_of_clusters:
-        psu_scores = jac[design_info["psu"] == psu]
-        psu_scores_sum = psu_scores.sum(axis=0)
-        meat += np.dot(psu_scores_sum[:, None], psu_scores_sum[:, None].T)
-    cluster_meat = len(list_of_clusters) / (len(list_of_clusters) - 1) * meat
+    psu_codes, list_of_clusters = pd.factorize(design_info["psu"])
+    n_clusters = len(list_of_clusters)
+    psu_scores_sum = _sum_by_group(jac, psu_codes, n_clusters)
+    meat = psu_scores_sum.T @ psu_scores_sum
+    cluster_meat = n_clusters / (n_clusters - 1) * meat
     return cluster_meat
 
 
@@ -235,44 +235,88 @@ def _stratification(jac, design_info):
     Args:
         design_options (pd.DataFrame): dataframe containing psu, stratum,
             population/design weight and/or a finite population corrector (fpc)
-        jac (np.array): "jacobian" - an n x k + 1-dimensional array of first
-            derivatives of the pseudo-log-likelihood function w.r.t. the parameters
+        jac (np.array or iterable): "jacobian" - an n x k + 1-dimensional array of
+            first derivatives of the pseudo-log-likelihood function w.r.t. the
+            parameters or an iterable of consecutive blocks of its rows.
 
     Returns:
         strata_meat (np.array): 2d square array of length k + 1. Variance of
         the likelihood equation
 
     """
-    n_params = len(jac[0, :])
-    stratum_col = design_info["strata"]
+    stratum_codes, strata = pd.factorize(design_info["strata"])
+    n_strata = len(strata)
     # Stratification does not require clusters
-    if "psu" not in design_info:
-        design_info["psu"] = design_info.index
+    psu_col = design_info["psu"] if "psu" in design_info else design_info.index
+    psu_codes, psus = pd.factorize(psu_col)
+
+    # psu_jac contains the sum of the observations for each cluster in each stratum.
+    psu_sums = _sum_by_group(jac, psu_codes, len(psus))
+    psu_in_strata = pd.DataFrame(
+        {"stratum": stratum_codes, "psu": psu_codes}
+    ).drop_duplicates()
+    psu_stratum = psu_in_strata["stratum"].to_numpy()
+    psu_jac = psu_sums[psu_in_strata["psu"].to_numpy()]
+
+    n_psu = np.bincount(psu_stratum, minlength=n_strata)
+    psu_jac_mean = _sum_by_group(psu_jac, psu_stratum, n_strata) / n_psu[:, None]
+
+    if "fpc" in design_info:
+        fpc = design_info["fpc"].groupby(stratum_codes).first().to_numpy()
     else:
-        pass
-    psu_col = design_info["psu"]
-    strata_meat = np.zeros([n_params, n_params])
-    # Variance estimation per stratum
-    for stratum in stratum_col.unique():
-        psu_in_strata = psu_col[stratum_col == stratum].unique()
-        psu_jac = np.zeros([n_params])
-        if "fpc" in design_info:
-            fpc = design_info["fpc"][stratum_col == stratum].unique()
-        else:
-            fpc = 1
-        # psu_jac stacks the sum of the observations for each cluster.
-        for psu in psu_in_strata:
-            psu_jac = np.vstack([psu_jac, np.sum(jac[psu_col == psu], axis=0)])
-        psu_jac_mean = np.sum(psu_jac, axis=0) / len(psu_in_strata)
-        if len(psu_in_strata) > 1:
-            mid_step = np.dot(
-                (psu_jac[1:] - psu_jac_mean).T, (psu_jac[1:] - psu_jac_mean)
-            )
-            strata_meat += (
-                fpc * (len(psu_in_strata) / (len(psu_in_strata) - 1)) * mid_step
-            )
-        # Apply "grand-mean" method for single unit stratum
-        elif len(psu_in_strata) == 1:
-            strata_meat += fpc * np.dot(psu_jac[1:].T, psu_jac[1:])
+        fpc = np.ones(n_strata)
+
+    # Apply "grand-mean" method for single unit stratum
+    has_several_psu = n_psu > 1
+    deviations = np.where(
+        has_several_psu[psu_stratum, None],
+        psu_jac - psu_jac_mean[psu_stratum],
+        psu_jac,
+    )
+    weights = fpc * np.where(has_several_psu, n_psu / np.maximum(n_psu - 1, 1), 1)
+    strata_meat = (deviations * weights[psu_stratum, None]).T @ deviations
 
     return strata_meat
+
+
+def _sum_by_group(jac, codes, n_groups):
+    """Sum the rows of jac that belong to the same group.
+
+    Args:
+        jac (np.array or iterable): 2d array of shape (n_obs, n_params) or an
+            iterable of 2d arrays with consecutive blocks of its rows. The latter
+            allows to sum a jacobian that is calculated in chunks without
+            stacking it.
+        codes (np.array): 1d integer array with the group of each row. Rows with
+            negative codes are ignored.
+        n_groups (int): Number of groups.
+
+    Returns:
+        np.array: 2d array of shape (n_groups, n_params).
+
+    """
+    blocks = [jac] if isinstance(jac, np.ndarray) else jac
+
+    group_sums = 0
+    start = 0
+    for raw_block in blocks:
+        block = np.asarray(raw_block)
+        stop = start + len(block)
+        block_codes = codes[start:stop]
+        is_valid = block_codes >= 0
+        indicator = sp.csr_array(
+            (
+                np.ones(is_valid.sum()),
+                (block_codes[is_valid], np.flatnonzero(is_valid)),
+            ),
+            shape=(n_groups, len(block)),
+        )
+        group_sums = group_sums + indicator @ block
+        start = stop
+
+    if start != len(codes):
+        raise ValueError(
+            f"The jacobian has {start} rows but there are {len(codes)} observations "
+            "in design_info."
+        )
+    return group_sums
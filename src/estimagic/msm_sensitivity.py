@@ -11,9 +11,8 @@ epsilon 2-6: Honore, Jorgensen & de Paula
 import numpy as np
 import pandas as pd
 
-from estimagic.msm_covs import cov_robust
 from estimagic.shared_covs import process_pandas_arguments
-from optimagic.exceptions import INVALID_SENSITIVITY_MSG
+from optimagic.exceptions import INVALID_INFERENCE_MSG, INVALID_SENSITIVITY_MSG
 from optimagic.utilities import robust_inverse
 
 
@@ -76,20 +75,10 @@ def calculate_fundamental_sensitivity_to_noise(
         jac=jac, weights=weights, moments_cov=moments_cov, params_cov_opt=params_cov_opt
     )
 
-    m2 = []
-
-    for k in range(len(_weights)):
-        mask_matrix_o = np.zeros(shape=_weights.shape)
-        mask_matrix_o[k, k] = 1
-
-        meat = _sandwich_plus(_jac, _weights, mask_matrix_o)
-
-        m2k = _params_cov_opt @ meat @ _params_cov_opt
-        m2k = np.diagonal(m2k)
-
-        m2.append(m2k)
-
-    m2 = np.array(m2).T
+    # The meat for moment k is the outer product of the kth row of weights @ jac with
+    # itself. Thus, the kth column of m2 is the diagonal of a rank one matrix.
+    weighted_jac = _weights @ _jac
+    m2 = (_params_cov_opt @ weighted_jac.T) * (_params_cov_opt.T @ weighted_jac.T)
 
     moments_variances = np.diagonal(_moments_cov)
     params_variances = np.diagonal(_params_cov_opt)
@@ -135,18 +124,9 @@ def calculate_actual_sensitivity_to_noise(
         weights=weights, moments_cov=moments_cov, params_cov=params_cov
     )
 
-    m3 = []
-
-    for k in range(len(_weights)):
-        mask_matrix_o = np.zeros(shape=_weights.shape)
-        mask_matrix_o[k, k] = 1
-
-        m3k = _sandwich(sensitivity_to_bias.T, mask_matrix_o)
-        m3k = np.diagonal(m3k)
-
-        m3.append(m3k)
-
-    m3 = np.array(m3).T
+    # the kth column of m3 is the diagonal of the outer product of the kth column of
+    # sensitivity_to_bias with itself
+    m3 = sensitivity_to_bias**2
 
     moments_variances = np.diagonal(_moments_cov)
     params_variances = np.diagonal(_params_cov)
@@ -183,25 +163,53 @@ def calculate_actual_sensitivity_to_removal(jac, weights, moments_cov, params_co
         np.ndarray or pd.DataFrame: Sensitivity measure with shape (n_params, n_moments)
 
     """
-    m4 = []
-
     _jac, _weights, _moments_cov, _params_cov, names = process_pandas_arguments(
         jac=jac, weights=weights, moments_cov=moments_cov, params_cov=params_cov
     )
 
-    for k in range(len(_weights)):
-        weight_tilde_k = np.copy(_weights)
-        weight_tilde_k[k, :] = 0
-        weight_tilde_k[:, k] = 0
+    # Removing moment k sets the kth row and column of the weights to zero. This is a
+    # rank two update of weights. We calculate the bread and butter of the robust
+    # covariance (see estimagic.msm_covs.cov_robust) for all k at once by updating
+    # their values with the full weighting matrix. Only the bread has to be inverted
+    # for each k, which is cheap because it has shape (n_params, n_params).
+    weights_diagonal = np.diagonal(_weights)
 
-        sigma_tilde_k = cov_robust(_jac, weight_tilde_k, _moments_cov)
+    jac_w = _weights.T @ _jac  # w_jac[k] = jac.T @ weights[:, k]
+    w_jac = _weights @ _jac
+    cov_jac_w = _moments_cov.T @ jac_w
+    cov_w_jac = _moments_cov @ w_jac
+    cov_weights = _moments_cov @ _weights
+
+    # rows of weights_tilde_k.T @ jac and weights_tilde_k @ jac that change besides
+    # the rank one terms of the kth column of the weights
+    a = jac_w - weights_diagonal[:, None] * _jac
+    b = w_jac - weights_diagonal[:, None] * _jac
+
+    bread = (
+        _jac.T @ _weights @ _jac
+        - np.einsum("ki,kj->kij", _jac, w_jac)
+        - np.einsum("ki,kj->kij", jac_w, _jac)
+        + weights_diagonal[:, None, None] * np.einsum("ki,kj->kij", _jac, _jac)
+    )
 
-        m4k = sigma_tilde_k - _params_cov
-        m4k = m4k.diagonal()
+    butter = (
+        jac_w.T @ _moments_cov @ w_jac
+        - np.einsum("ki,kj->kij", cov_jac_w, b)
+        - np.einsum("ki,kj->kij", _weights.T @ cov_jac_w, _jac)
+        - np.einsum("ki,kj->kij", a, cov_w_jac)
+        + np.diagonal(_moments_cov)[:, None, None] * np.einsum("ki,kj->kij", a, b)
+        + np.diagonal(cov_weights)[:, None, None] * np.einsum("ki,kj->kij", a, _jac)
+        - np.einsum("ki,kj->kij", _jac, _weights @ cov_w_jac)
+        + np.einsum("kj,jk->k", _weights, _moments_cov)[:, None, None]
+        * np.einsum("ki,kj->kij", _jac, b)
+        + np.einsum("kj,jk->k", _weights, cov_weights)[:, None, None]
+        * np.einsum("ki,kj->kij", _jac, _jac)
+    )
 
-        m4.append(m4k)
+    bread_inverse = _robust_inverse_of_stack(bread, INVALID_INFERENCE_MSG)
+    sigma_tilde = bread_inverse @ butter @ bread_inverse
 
-    m4 = np.array(m4).T
+    m4 = (np.diagonal(sigma_tilde, axis1=1, axis2=2) - np.diagonal(_params_cov)).T
 
     params_variances = np.diagonal(_params_cov)
     e4 = m4 / params_variances.reshape(-1, 1)
@@ -241,25 +249,20 @@ def calculate_fundamental_sensitivity_to_removal(jac, moments_cov, params_cov_op
         moments_cov=moments_cov,
         params_cov_opt=params_cov_opt,
     )
-    m5 = []
-
-    for k in range(len(_moments_cov)):
-        g_k = np.copy(_jac)
-        g_k = np.delete(g_k, k, axis=0)
-
-        s_k = np.copy(_moments_cov)
-        s_k = np.delete(s_k, k, axis=0)
-        s_k = np.delete(s_k, k, axis=1)
-
-        sigma_k = _sandwich(g_k, robust_inverse(s_k, INVALID_SENSITIVITY_MSG))
-        sigma_k = robust_inverse(sigma_k, INVALID_SENSITIVITY_MSG)
-
-        m5k = sigma_k - _params_cov_opt
-        m5k = m5k.diagonal()
-
-        m5.append(m5k)
+    # The inverse of moments_cov without the kth row and column equals
+    # inv_cov - inv_cov[:, k] @ inv_cov[k, :] / inv_cov[k, k] without the kth row and
+    # column, where inv_cov is the inverse of the full moments_cov. Thus, the
+    # information matrix for moment k is a rank one downdate of the full one.
+    inv_cov = robust_inverse(_moments_cov, INVALID_SENSITIVITY_MSG)
+    left = inv_cov.T @ _jac
+    right = inv_cov @ _jac
+    information = (
+        _sandwich(_jac, inv_cov)
+        - np.einsum("ki,kj->kij", left, right) / np.diagonal(inv_cov)[:, None, None]
+    )
+    sigma = _robust_inverse_of_stack(information, INVALID_SENSITIVITY_MSG)
 
-    m5 = np.array(m5).T
+    m5 = (np.diagonal(sigma, axis1=1, axis2=2) - np.diagonal(_params_cov_opt)).T
 
     params_variances = np.diagonal(_params_cov_opt)
     e5 = m5 / params_variances.reshape(-1, 1)
@@ -298,39 +301,18 @@ def calculate_sensitivity_to_weighting(jac, weights, moments_cov, params_cov):
     gwg_inverse = _sandwich(_jac, _weights)
     gwg_inverse = robust_inverse(gwg_inverse, INVALID_SENSITIVITY_MSG)
 
-    m6 = []
-
-    for k in range(len(_weights)):
-        mask_matrix_o = np.zeros(shape=_weights.shape)
-        mask_matrix_o[k, k] = 1
-
-        m6k_1 = gwg_inverse @ _sandwich(_jac, mask_matrix_o) @ _params_cov
-        m6k_2 = (
-            gwg_inverse
-            @ _jac.T
-            @ mask_matrix_o
-            @ _moments_cov
-            @ _weights
-            @ _jac
-            @ gwg_inverse
-        )
-        m6k_3 = (
-            gwg_inverse
-            @ _jac.T
-            @ _weights
-            @ _moments_cov
-            @ mask_matrix_o
-            @ _jac
-            @ gwg_inverse
-        )
-        m6k_4 = _params_cov @ _sandwich(_jac, mask_matrix_o) @ gwg_inverse
-
-        m6k = -m6k_1 + m6k_2 + m6k_3 - m6k_4
-        m6k = m6k.diagonal()
-
-        m6.append(m6k)
-
-    m6 = np.array(m6).T
+    # With the mask matrix o_k that only has a one at position (k, k), each term is
+    # the product of a column and a row vector. The kth column of m6 is the sum of
+    # the diagonals of these rank one matrices.
+    gwg_inverse_jac = gwg_inverse @ _jac.T
+    gwg_inverse_t_jac = gwg_inverse.T @ _jac.T
+
+    m6_1 = gwg_inverse_jac * (_params_cov.T @ _jac.T)
+    m6_2 = gwg_inverse_jac * (_moments_cov @ _weights @ _jac @ gwg_inverse).T
+    m6_3 = (gwg_inverse @ _jac.T @ _weights @ _moments_cov) * gwg_inverse_t_jac
+    m6_4 = (_params_cov @ _jac.T) * gwg_inverse_t_jac
+
+    m6 = -m6_1 + m6_2 + m6_3 - m6_4
 
     weights_diagonal = np.diagonal(_weights)
     params_variances = np.diagonal(_params_cov)
@@ -350,7 +332,10 @@ def _sandwich(a, b):
     return sandwich
 
 
-def _sandwich_plus(a, b, c):
-    """Calculate the sandwich product of three matrices: a.T * b.T * c * b * a."""
-    sandwich = a.T @ b.T @ c @ b @ a
-    return sandwich
+def _robust_inverse_of_stack(matrices, msg):
+    """Invert a stack of square matrices with robust_inverse as fallback."""
+    try:
+        out = np.linalg.inv(matrices)
+    except np.linalg.LinAlgError:
+        out = np.array([robust_inverse(matrix, msg) for matrix in matrices])
+    return out
@@ -44,6 +44,9 @@ def get_moments_cov(
         "error_handling",
         "existing_result",
         "outcome_kwargs",
+        "chunk_size",
+        "outcomes_path",
+        "checkpoint_path",
     }
     problematic = set(bootstrap_kwargs).difference(valid_bs_kwargs)
     if problematic:
@@ -21,7 +21,11 @@ from optimagic.constraints import (
     PairwiseEqualityConstraint,
     ProbabilityConstraint,
 )
-from optimagic.differentiation.derivatives import first_derivative, second_derivative
+from optimagic.differentiation.derivatives import (
+    first_and_second_derivative,
+    first_derivative,
+    second_derivative,
+)
 from optimagic.differentiation.numdiff_options import NumdiffOptions
 from optimagic.logging import (
     ExistenceStrategy as ExistenceStrategy,
@@ -33,6 +37,7 @@ from optimagic.logging import (
     SQLiteLogReader as SQLiteLogReader,
 )
 from optimagic.logging.read_log import OptimizeLogReader
+from optimagic.optimization.evaluation_cache import EvaluationCacheOptions
 from optimagic.optimization.fun_value import (
     FunctionValue,
     LeastSquaresFunctionValue,
@@ -65,6 +70,7 @@ __all__ = [
     "utilities",
     "first_derivative",
     "second_derivative",
+    "first_and_second_derivative",
     "run_benchmark",
     "get_benchmark_problems",
     "profile_plot",
@@ -83,6 +89,7 @@ __all__ = [
     "mark",
     "ScalingOptions",
     "MultistartOptions",
+    "EvaluationCacheOptions",
     "NumdiffOptions",
     "FunctionValue",
     "LeastSquaresFunctionValue",
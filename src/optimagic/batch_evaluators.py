@@ -5,6 +5,15 @@ can be used used as batch evaluator in optimagic.
 
 """
 
+import concurrent.futures
+import functools
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import cloudpickle
+import numpy as np
 from joblib import Parallel, delayed
 
 try:
@@ -14,7 +23,17 @@ try:
 except ImportError:
     pathos_is_available = False
 
-from typing import Any, Callable, Literal, TypeVar, cast
+try:
+    # loky is vendored by joblib but not part of its public API
+    from joblib.externals.loky import ProcessPoolExecutor as LokyProcessPoolExecutor
+
+    loky_is_available = True
+except ImportError:
+    loky_is_available = False
+
+from typing import Any, Callable, Iterator, Literal, TypeVar, cast
+
+from typing_extensions import Self
 
 from optimagic.config import DEFAULT_N_CORES as N_CORES
 from optimagic.decorators import catch, unpack
@@ -147,6 +166,547 @@ def joblib_batch_evaluator(
     return res
 
 
+def threading_batch_evaluator(
+    func: Callable[..., T],
+    arguments: list[Any],
+    *,
+    n_cores: int = N_CORES,
+    error_handling: ErrorHandling
+    | Literal["raise", "continue"] = ErrorHandling.CONTINUE,
+    unpack_symbol: Literal["*", "**"] | None = None,
+) -> list[T]:
+    """Batch evaluator based on a pool of threads.
+
+    Threads share the memory of the main process, i.e. func and arguments are never
+    pickled and starting the pool is cheap. The evaluations only run in parallel if
+    func releases the global interpreter lock, e.g. because most of its time is spent
+    in numpy, scipy or compiled code. For pure Python functions, use one of the
+    process based batch evaluators instead.
+
+    Args:
+        func (Callable): The function that is evaluated. It must be thread-safe.
+        arguments (Iterable): Arguments for the functions. Their interperation
+            depends on the unpack argument.
+        n_cores (int): Number of threads used to evaluate the function in parallel.
+            Value below one are interpreted as one. If only one thread is used, func
+            is executed in the main thread.
+        error_handling (str): Can take the values "raise" (raise the error and stop all
+            tasks as soon as one task fails) and "continue" (catch exceptions and set
+            the output of failed tasks to the traceback of the raised exception.
+            KeyboardInterrupt and SystemExit are always raised.
+        unpack_symbol (str or None). Can be "**", "*" or None. If None, func just takes
+            one argument. If "*", the elements of arguments are positional arguments for
+            func. If "**", the elements of arguments are keyword arguments for func.
+
+    Returns:
+        list: The function evaluations.
+
+    """
+    _check_inputs(func, arguments, n_cores, error_handling, unpack_symbol)
+    n_cores = int(n_cores) if int(n_cores) >= 2 else 1
+
+    reraise = error_handling in [
+        "raise",
+        ErrorHandling.RAISE,
+        ErrorHandling.RAISE_STRICT,
+    ]
+
+    @unpack(symbol=unpack_symbol)
+    @catch(default="__traceback__", reraise=reraise)
+    def internal_func(*args: Any, **kwargs: Any) -> T:
+        return func(*args, **kwargs)
+
+    if n_cores == 1:
+        res = [internal_func(arg) for arg in arguments]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_cores) as executor:
+            futures = [executor.submit(internal_func, arg) for arg in arguments]
+            try:
+                res = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    return res
+
+
+class PoolBatchEvaluator:
+    """Batch evaluator that keeps its worker processes alive between calls.
+
+    The batch evaluators above start or reconnect to a pool of workers and send func
+    with every task. This is costly if the same function is evaluated in many small
+    batches, e.g. once per iteration of an optimizer. PoolBatchEvaluator keeps one
+    pool of worker processes until ``shutdown`` is called. Each distinct func is
+    serialized in the main process and sent to each worker only once. All later
+    tasks only contain the arguments. The pickled func is cached in the main process
+    as long as the same function object is passed, i.e. changes to the state of func
+    after its first evaluation are not seen by the workers.
+
+    Instances have the same interface as the other batch evaluators. They can be
+    used as context managers, which shut down the workers on exit.
+
+    Args:
+        timeout (int): Idle workers exit after timeout seconds. They are restarted
+            and receive func again if new tasks are submitted. Ignored if loky, which
+            is shipped with joblib, is not available.
+
+    """
+
+    def __init__(self, timeout: int = 300) -> None:
+        self._timeout = timeout
+        self._executor: concurrent.futures.Executor | None = None
+        self._n_workers = 0
+        self._shipped_keys: set[str] = set()
+        self._payloads: OrderedDict[tuple[int, bool, str | None], _Payload] = (
+            OrderedDict()
+        )
+
+    def __call__(
+        self,
+        func: Callable[..., T],
+        arguments: list[Any],
+        n_cores: int = N_CORES,
+        error_handling: ErrorHandling
+        | Literal["raise", "continue"] = ErrorHandling.CONTINUE,
+        unpack_symbol: Literal["*", "**"] | None = None,
+    ) -> list[T]:
+        """Evaluate func at all arguments.
+
+        See joblib_batch_evaluator for the meaning of the arguments.
+
+        """
+        futures = self.submit(
+            func,
+            arguments,
+            n_cores=n_cores,
+            error_handling=error_handling,
+            unpack_symbol=unpack_symbol,
+        )
+        try:
+            res = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return res
+
+    def submit(
+        self,
+        func: Callable[..., T],
+        arguments: list[Any],
+        n_cores: int = N_CORES,
+        error_handling: ErrorHandling
+        | Literal["raise", "continue"] = ErrorHandling.CONTINUE,
+        unpack_symbol: Literal["*", "**"] | None = None,
+    ) -> list[Future[T]]:
+        """Schedule the evaluation of func at all arguments without waiting for it.
+
+        The arguments are the same as in ``__call__``. If only one core is used, the
+        evaluations are done in the main process when their result is requested or
+        when they are yielded by ``as_completed``.
+
+        Returns:
+            list: One concurrent.futures.Future per argument. Evaluations that did
+                not start yet can be cancelled.
+
+        """
+        _check_inputs(func, arguments, n_cores, error_handling, unpack_symbol)
+        n_cores = int(n_cores) if int(n_cores) >= 2 else 1
+
+        reraise = error_handling in [
+            "raise",
+            ErrorHandling.RAISE,
+            ErrorHandling.RAISE_STRICT,
+        ]
+
+        if n_cores == 1:
+            internal_func = _wrap_func(func, reraise, unpack_symbol)
+            return [_DeferredFuture(internal_func, arg) for arg in arguments]
+
+        executor = self._get_executor(n_cores)
+        key, payload = self._get_payload(func, reraise, unpack_symbol)
+
+        # func is only attached to the tasks of the first batch. Workers that did not
+        # receive it (e.g. because they were restarted) ask for it again.
+        shipped = key in self._shipped_keys
+        self._shipped_keys.add(key)
+        return [
+            _RegisteredFunctionFuture(executor, key, payload, arg, shipped)
+            for arg in arguments
+        ]
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        self._n_workers = 0
+        self._shipped_keys = set()
+
+    def _get_executor(self, n_cores: int) -> concurrent.futures.Executor:
+        if self._executor is None or self._n_workers != n_cores:
+            self.shutdown()
+            self._executor = _get_process_pool_executor(n_cores, self._timeout)
+            self._n_workers = n_cores
+        return self._executor
+
+    def _get_payload(
+        self,
+        func: Callable[..., Any],
+        reraise: bool,
+        unpack_symbol: Literal["*", "**"] | None,
+    ) -> tuple[str, bytes]:
+        """Get the key and the pickled wrapper of func, pickling it only once."""
+        cache_key = (id(func), reraise, unpack_symbol)
+        cached = self._payloads.get(cache_key)
+        # a reference to func is kept, such that its id cannot be reused
+        if cached is None or cached.func is not func:
+            internal_func = _wrap_func(func, reraise, unpack_symbol)
+            payload = cloudpickle.dumps(internal_func)
+            key = hashlib.sha256(payload).hexdigest()
+            cached = _Payload(func=func, key=key, payload=payload)
+            self._payloads[cache_key] = cached
+            while len(self._payloads) > _MAX_WORKER_FUNCTIONS:
+                self._payloads.popitem(last=False)
+        else:
+            self._payloads.move_to_end(cache_key)
+        return cached.key, cached.payload
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The workers belong to the process that started them. Copies in other
+        # processes start their own workers if they are needed.
+        return {"_timeout": self._timeout}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._timeout = state["_timeout"]
+        self._executor = None
+        self._n_workers = 0
+        self._shipped_keys = set()
+        self._payloads = OrderedDict()
+
+
+def _get_process_pool_executor(
+    n_workers: int, timeout: int
+) -> concurrent.futures.Executor:
+    """Create a pool of worker processes.
+
+    The loky executor is preferred because it lets idle workers exit after timeout
+    seconds and restarts them if needed.
+
+    """
+    if loky_is_available:
+        return LokyProcessPoolExecutor(max_workers=n_workers, timeout=timeout)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=n_workers)
+
+
+def _wrap_func(
+    func: Callable[..., T],
+    reraise: bool,
+    unpack_symbol: Literal["*", "**"] | None,
+) -> Callable[..., T]:
+    @unpack(symbol=unpack_symbol)
+    @catch(default="__traceback__", reraise=reraise)
+    def internal_func(*args: Any, **kwargs: Any) -> T:
+        return func(*args, **kwargs)
+
+    return internal_func
+
+
+@dataclass(frozen=True)
+class _Payload:
+    func: Callable[..., Any]
+    key: str
+    payload: bytes
+
+
+class _FunctionNotRegistered:
+    pass
+
+
+class _DeferredFuture(Future[Any]):
+    """Future that is evaluated in the main process when its result is needed."""
+
+    def __init__(self, func: Callable[..., Any], argument: Any) -> None:
+        super().__init__()
+        self._func = func
+        self._argument = argument
+
+    def run(self) -> None:
+        if self.done() or not self.set_running_or_notify_cancel():
+            return
+        try:
+            result = self._func(self._argument)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except BaseException as e:
+            self.set_exception(e)
+        else:
+            self.set_result(result)
+
+    def result(self, timeout: float | None = None) -> Any:
+        self.run()
+        return super().result(timeout)
+
+    def exception(self, timeout: float | None = None) -> BaseException | None:
+        self.run()
+        return super().exception(timeout)
+
+
+class _RegisteredFunctionFuture(Future[Any]):
+    """Future of an evaluation by a PoolBatchEvaluator.
+
+    It wraps the future of the executor and transparently resubmits the task with the
+    pickled function if the worker did not have it yet.
+
+    """
+
+    def __init__(
+        self,
+        executor: concurrent.futures.Executor,
+        key: str,
+        payload: bytes,
+        argument: Any,
+        shipped: bool,
+    ) -> None:
+        super().__init__()
+        self._executor = executor
+        self._key = key
+        self._payload = payload
+        self._argument = argument
+        self._inner = self._submit(None if shipped else payload)
+
+    def _submit(self, payload: bytes | None) -> Future[Any]:
+        inner = self._executor.submit(
+            _evaluate_registered_function, self._key, payload, self._argument
+        )
+        inner.add_done_callback(self._on_inner_done)
+        return inner
+
+    def _on_inner_done(self, inner: Future[Any]) -> None:
+        if inner.cancelled():
+            # notifying is needed such that as_completed does not wait for the future
+            if super().cancel():
+                self.set_running_or_notify_cancel()
+        elif inner.exception() is not None:
+            self.set_exception(inner.exception())
+        elif isinstance(inner.result(), _FunctionNotRegistered):
+            self._inner = self._submit(self._payload)
+        else:
+            self.set_result(inner.result())
+
+    def cancel(self) -> bool:
+        self._inner.cancel()
+        return self.cancelled()
+
+
+def submit_batch(
+    batch_evaluator: BatchEvaluator,
+    func: Callable[..., T],
+    arguments: list[Any],
+    *,
+    n_cores: int = N_CORES,
+    error_handling: ErrorHandling
+    | Literal["raise", "continue"] = ErrorHandling.CONTINUE,
+    unpack_symbol: Literal["*", "**"] | None = None,
+) -> list[Future[T]]:
+    """Schedule a batch evaluation and return one future per argument.
+
+    Batch evaluators with a ``submit`` method, like PoolBatchEvaluator, return before
+    the evaluations are done. For all other batch evaluators, the whole batch is
+    evaluated and the returned futures are already done.
+
+    Args:
+        batch_evaluator: A processed batch evaluator.
+        func, arguments, n_cores, error_handling, unpack_symbol: See
+            joblib_batch_evaluator.
+
+    Returns:
+        list: One concurrent.futures.Future per argument.
+
+    """
+    submit = getattr(batch_evaluator, "submit", None)
+    if submit is not None:
+        return submit(
+            func,
+            arguments,
+            n_cores=n_cores,
+            error_handling=error_handling,
+            unpack_symbol=unpack_symbol,
+        )
+
+    results = batch_evaluator(
+        func=func,
+        arguments=arguments,
+        n_cores=n_cores,
+        error_handling=error_handling,
+        unpack_symbol=unpack_symbol,
+    )
+    futures = []
+    for result in results:
+        future: Future[T] = Future()
+        future.set_result(result)
+        futures.append(future)
+    return futures
+
+
+def as_completed(futures: list[Future[T]]) -> Iterator[Future[T]]:
+    """Iterate over futures in the order in which they are done.
+
+    Futures that are already done when the iteration starts are yielded first, in the
+    order of the input list. The remaining futures are yielded in the order in which
+    they finish. In contrast to concurrent.futures.as_completed, this makes the order
+    deterministic if all futures are done, e.g. because they were returned by a
+    blocking batch evaluator.
+
+    Moreover, the deferred evaluations of PoolBatchEvaluators that use only one core
+    are run. These are run one by one in their original order, such that evaluations
+    that are cancelled while iterating are never run. Cancelled futures are skipped.
+
+    Args:
+        futures: List of futures returned by submit_batch.
+
+    Yields:
+        concurrent.futures.Future: Futures that are done.
+
+    """
+    is_done = [f.done() for f in futures]
+    done = [f for f, d in zip(futures, is_done, strict=True) if d]
+    not_done = [f for f, d in zip(futures, is_done, strict=True) if not d]
+    deferred = [f for f in not_done if isinstance(f, _DeferredFuture)]
+    pending = [f for f in not_done if not isinstance(f, _DeferredFuture)]
+    for future in done:
+        if not future.cancelled():
+            yield future
+    for future in concurrent.futures.as_completed(pending):
+        if not future.cancelled():
+            yield future
+    for future in deferred:
+        future.run()
+        if not future.cancelled():
+            yield future
+
+
+def vectorized_batch_evaluate(
+    func: Callable[[Any], Any],
+    arguments: list[Any],
+    *,
+    batch_evaluator: BatchEvaluator,
+    n_cores: int = N_CORES,
+    error_handling: ErrorHandling
+    | Literal["raise", "continue"] = ErrorHandling.CONTINUE,
+) -> list[Any]:
+    """Evaluate a vectorized function at each entry in arguments.
+
+    The arguments are split into at most n_cores chunks. Each chunk is stacked along a
+    new first axis and evaluated in one call of func. The chunks are distributed with
+    the batch evaluator. If the evaluation of a chunk fails or does not return one
+    value per entry and error_handling is "continue", the entries of the chunk are
+    evaluated one by one, such that only the entries that caused the error are replaced
+    by a traceback.
+
+    Args:
+        func: A function that was marked with `optimagic.mark.vectorized`.
+        arguments: Numpy arrays of the same shape at which func is evaluated.
+        batch_evaluator: A processed batch evaluator.
+        n_cores: Number of cores used to evaluate the chunks in parallel.
+        error_handling: See joblib_batch_evaluator.
+
+    Returns:
+        list: The function evaluations, same length as arguments.
+
+    """
+    if not arguments:
+        return []
+
+    reraise = error_handling in [
+        "raise",
+        ErrorHandling.RAISE,
+        ErrorHandling.RAISE_STRICT,
+    ]
+    n_chunks = max(min(int(n_cores), len(arguments)), 1)
+    chunks = [
+        np.stack([arguments[i] for i in positions])
+        for positions in np.array_split(np.arange(len(arguments)), n_chunks)
+    ]
+    chunk_results = batch_evaluator(
+        func=functools.partial(_evaluate_vectorized_chunk, func, reraise=reraise),
+        arguments=chunks,
+        n_cores=n_cores,
+        error_handling=error_handling,
+    )
+
+    results = []
+    for chunk, chunk_result in zip(chunks, chunk_results, strict=True):
+        # None or a traceback means that the evaluation of the whole chunk failed
+        if chunk_result is None or isinstance(chunk_result, str):
+            results += joblib_batch_evaluator(
+                func=functools.partial(_evaluate_vectorized_point, func),
+                arguments=list(chunk),
+                n_cores=1,
+                error_handling=error_handling,
+            )
+        else:
+            results += chunk_result
+    return results
+
+
+def _evaluate_vectorized_chunk(
+    func: Callable[[Any], Any], chunk: Any, reraise: bool = True
+) -> list[Any] | None:
+    try:
+        out = _call_vectorized(func, chunk)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except Exception:
+        if reraise:
+            raise
+        return None
+    return out
+
+
+def _evaluate_vectorized_point(func: Callable[[Any], Any], argument: Any) -> Any:
+    return _call_vectorized(func, argument[np.newaxis])[0]
+
+
+def _call_vectorized(func: Callable[[Any], Any], chunk: Any) -> list[Any]:
+    out = list(func(chunk))
+    if len(out) != len(chunk):
+        raise ValueError(
+            "A vectorized function must return one function value per parameter "
+            f"vector. Expected {len(chunk)} function values, got {len(out)}."
+        )
+    return out
+
+
+# Functions that were sent to this worker process, keyed by the hash of their pickle.
+_WORKER_FUNCTIONS: OrderedDict[str, Callable[..., Any]] = OrderedDict()
+_MAX_WORKER_FUNCTIONS = 10
+
+
+def _evaluate_registered_function(
+    key: str, payload: bytes | None, argument: Any
+) -> Any:
+    """Evaluate a function that is only unpickled once per worker process."""
+    func = _WORKER_FUNCTIONS.get(key)
+    if func is None:
+        if payload is None:
+            return _FunctionNotRegistered()
+        func = cloudpickle.loads(payload)
+        _WORKER_FUNCTIONS[key] = func
+        while len(_WORKER_FUNCTIONS) > _MAX_WORKER_FUNCTIONS:
+            _WORKER_FUNCTIONS.popitem(last=False)
+    else:
+        _WORKER_FUNCTIONS.move_to_end(key)
+    return func(argument)
+
+
 def _check_inputs(
     func: Callable[..., T],
     arguments: list[Any],
@@ -186,7 +746,8 @@ def _check_inputs(
 
 
 def process_batch_evaluator(
-    batch_evaluator: Literal["joblib", "pathos"] | BatchEvaluator = "joblib",
+    batch_evaluator: Literal["joblib", "pathos", "threading"]
+    | BatchEvaluator = "joblib",
 ) -> BatchEvaluator:
     batch_evaluator = "joblib" if batch_evaluator is None else batch_evaluator
     if callable(batch_evaluator):
@@ -196,10 +757,12 @@ def process_batch_evaluator(
             out = cast(BatchEvaluator, joblib_batch_evaluator)
         elif batch_evaluator == "pathos":
             out = cast(BatchEvaluator, pathos_mp_batch_evaluator)
+        elif batch_evaluator == "threading":
+            out = cast(BatchEvaluator, threading_batch_evaluator)
         else:
             raise ValueError(
-                "Invalid batch evaluator requested. Currently only 'pathos' and "
-                "'joblib' are supported."
+                "Invalid batch evaluator requested. Currently only 'pathos', "
+                "'joblib' and 'threading' are supported."
             )
     else:
         raise TypeError("batch_evaluator must be a callable or string.")
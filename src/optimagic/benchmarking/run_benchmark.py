@@ -197,12 +197,9 @@ def _process_one_result(optimize_result, problem):
         batches_history = [0]
     else:
         history = optimize_result.history
-        params_history = history.params
-        params_history_flat = [
-            tree_just_flatten(p, registry=_registry) for p in params_history
-        ]
+        params_history_flat = history.flat_params.tolist()
         if _is_noisy:
-            criterion_history = np.array([_criterion(p) for p in params_history])
+            criterion_history = np.array([_criterion(p) for p in history.params])
             if criterion_history.ndim == 2:
                 criterion_history = (criterion_history**2).sum(axis=1)
         else:
@@ -0,0 +1,84 @@
+"""Column coloring for the estimation of sparse Jacobians.
+
+Two columns of a Jacobian are structurally orthogonal if there is no row in which both
+have a nonzero entry. The parameters that correspond to structurally orthogonal
+columns can be perturbed together, because each output is only affected by at most one
+of them. This is the method of Curtis, Powell and Reid (1974). Finding a partition of
+the columns into few groups of structurally orthogonal columns is a graph coloring
+problem, which we solve with a greedy heuristic.
+
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from numpy.typing import NDArray
+
+
+def process_sparsity(
+    sparsity: NDArray[np.bool_] | sp.sparray | sp.spmatrix, dim_x: int
+) -> sp.csc_array:
+    """Convert a sparsity pattern to a sparse boolean matrix in CSC format.
+
+    Args:
+        sparsity (np.ndarray or scipy.sparse matrix): Array-like of shape (dim_f,
+            dim_x). Nonzero entries mark the entries of the Jacobian that can be
+            nonzero.
+        dim_x (int): Length of the parameter vector.
+
+    Returns:
+        scipy.sparse.csc_array: The sparsity pattern.
+
+    Raises:
+        ValueError: If the sparsity pattern is not 2d or does not have dim_x columns.
+
+    """
+    pattern = sp.csc_array(sparsity, dtype=bool)
+    if pattern.ndim != 2 or pattern.shape[1] != dim_x:
+        raise ValueError(
+            f"The sparsity pattern has shape {pattern.shape} but must have shape "
+            f"(dim_f, {dim_x})."
+        )
+    pattern.eliminate_zeros()
+    return pattern
+
+
+def get_column_coloring(
+    sparsity: NDArray[np.bool_] | sp.sparray | sp.spmatrix,
+) -> NDArray[np.int_]:
+    """Partition the columns of a Jacobian into groups of orthogonal columns.
+
+    Columns are colored greedily in the order of decreasing number of nonzero entries.
+    Each column gets the smallest color that is not used by any column it shares a
+    row with.
+
+    Args:
+        sparsity (np.ndarray or scipy.sparse matrix): Array-like of shape (dim_f,
+            dim_x). Nonzero entries mark the entries of the Jacobian that can be
+            nonzero.
+
+    Returns:
+        np.ndarray: 1d integer array of length dim_x with the color of each column.
+            The colors are 0, ..., n_colors - 1.
+
+    """
+    pattern = sp.csc_array(sparsity, dtype=np.int32)
+    pattern.eliminate_zeros()
+    dim_x = pattern.shape[1]
+
+    # two columns conflict if they share a nonzero row
+    conflicts = sp.csr_array(pattern.T @ pattern)
+    n_nonzero = np.diff(pattern.indptr)
+    order = np.argsort(-n_nonzero, kind="stable")
+
+    colors = np.full(dim_x, -1)
+    for j in order:
+        neighbors = conflicts.indices[conflicts.indptr[j] : conflicts.indptr[j + 1]]
+        used = np.zeros(len(neighbors) + 1, dtype=bool)
+        neighbor_colors = colors[neighbors]
+        neighbor_colors = neighbor_colors[
+            (neighbor_colors >= 0) & (neighbor_colors < len(used))
+        ]
+        used[neighbor_colors] = True
+        colors[j] = np.argmin(used)
+
+    return colors
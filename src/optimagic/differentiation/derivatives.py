@@ -2,11 +2,11 @@ import functools
 import itertools
 import re
 from dataclasses import dataclass
-from itertools import product
 from typing import Any, Callable, Literal, NamedTuple, cast
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from numpy.typing import NDArray
 from pybaum import tree_flatten, tree_just_flatten, tree_unflatten
 from pybaum import tree_just_flatten as tree_leaves
@@ -18,12 +18,18 @@ from optimagic.deprecations import (
     replace_and_warn_about_deprecated_bounds,
 )
 from optimagic.differentiation import finite_differences
+from optimagic.differentiation.coloring import get_column_coloring, process_sparsity
 from optimagic.differentiation.generate_steps import generate_steps
 from optimagic.differentiation.richardson_extrapolation import richardson_extrapolation
+from optimagic.optimization.evaluation_cache import (
+    EvaluationCache,
+    EvaluationCacheOptions,
+)
 from optimagic.parameters.block_trees import hessian_to_block_tree, matrix_to_block_tree
 from optimagic.parameters.bounds import Bounds, get_internal_bounds, pre_process_bounds
 from optimagic.parameters.tree_registry import get_registry
-from optimagic.typing import PyTree
+from optimagic.shared.process_user_function import is_vectorized
+from optimagic.typing import EvalTask, PyTree
 
 
 @dataclass(frozen=True)
@@ -88,15 +94,17 @@ def first_derivative(
     *,
     bounds: Bounds | None = None,
     func_kwargs: dict[str, Any] | None = None,
-    method: Literal["central", "forward", "backward"] = "central",
+    method: Literal["central", "forward", "backward", "complex_step"] = "central",
     step_size: float | PyTree | None = None,
     scaling_factor: float | PyTree = 1,
     min_steps: float | PyTree | None = None,
     f0: PyTree | None = None,
     n_cores: int = DEFAULT_N_CORES,
     error_handling: Literal["continue", "raise", "raise_strict"] = "continue",
-    batch_evaluator: Literal["joblib", "pathos"] | Callable = "joblib",
+    batch_evaluator: Literal["joblib", "pathos", "threading"] | Callable = "joblib",
     unpacker: Callable[[Any], PyTree] | None = None,
+    sparsity: NDArray[np.bool_] | sp.sparray | sp.spmatrix | None = None,
+    evaluation_cache: EvaluationCache | None = None,
     # deprecated
     lower_bounds: PyTree | None = None,
     upper_bounds: PyTree | None = None,
@@ -121,7 +129,9 @@ def first_derivative(
     :func:`~optimagic.differentiation.generate_steps.generate_steps`.
 
     Args:
-        func: Function of which the derivative is calculated.
+        func: Function of which the derivative is calculated. If func is marked with
+            `optimagic.mark.vectorized`, the evaluation points are stacked and
+            evaluated in one call per core.
         params: A pytree. See :ref:`params`.
         bounds: Lower and upper bounds on the parameters. The most general and preferred
             way to specify bounds is an `optimagic.Bounds` object that collects lower,
@@ -131,7 +141,13 @@ def first_derivative(
             array, you can also provide bounds via any format that is supported by
             scipy.optimize.minimize.
         func_kwargs: Additional keyword arguments for func, optional.
-        method: One of ["central", "forward", "backward"], default "central".
+        method: One of ["central", "forward", "backward", "complex_step"], default
+            "central". "complex_step" evaluates func at x + i * h * e_j and takes the
+            imaginary part of the output divided by h. This is accurate up to machine
+            precision, needs only one evaluation per parameter and is not affected by
+            bounds, because the real part of the parameters is not changed. It requires
+            that func is complex-safe, i.e. implemented with operations that are
+            analytic in the parameters (e.g. no ``abs`` and no casts to float).
         step_size: 1d array of the same length as params.
             step_size * scaling_factor is the absolute value of the first (and possibly
             only) step used in the finite differences approximation of the derivative.
@@ -157,11 +173,21 @@ def first_derivative(
             evaluations for one parameter failed) and "raise_strict" (raise an error
             as soon as a function evaluation fails).
         batch_evaluator (str or callable): Name of a pre-implemented batch evaluator
-            (currently 'joblib' and 'pathos_mp') or Callable with the same interface
-            as the optimagic batch_evaluators.
+            (currently 'joblib', 'pathos_mp' and 'threading') or Callable with the
+            same interface as the optimagic batch_evaluators.
         unpacker: A callable that takes the output of func and returns the part of the
             output that is needed for the derivative calculation. If None, the output of
             func is used as is. Default None.
+        sparsity: Sparsity pattern of the Jacobian as boolean array or scipy sparse
+            matrix of shape (len(func(params)), len(params)). Nonzero entries mark the
+            entries of the Jacobian that can be nonzero. If provided, parameters whose
+            columns of the Jacobian do not share a nonzero row are perturbed together
+            and the derivative is returned as scipy.sparse.csr_array. Only supported
+            if params is a 1d numpy array and func returns a 1d numpy array.
+        evaluation_cache: Cache of evaluations of func, keyed by the flattened
+            parameter vector. Points that are in the cache are not evaluated again
+            and new evaluations are stored in it. This allows to share evaluations
+            between several derivative calculations of the same func. Default None.
 
     Returns:
         NumdiffResult: A numerical differentiation result.
@@ -252,10 +278,22 @@ def first_derivative(
     func_kwargs = {} if func_kwargs is None else func_kwargs
     partialed_func = functools.partial(func, **func_kwargs)
 
-    implemented_methods = {"forward", "backward", "central"}
+    vectorized = is_vectorized(func)
+    if vectorized and not isinstance(params, np.ndarray):
+        raise ValueError(
+            "Vectorized functions are only supported if params is a numpy array."
+        )
+
+    implemented_methods = {"forward", "backward", "central", "complex_step"}
     if method not in implemented_methods:
         raise ValueError(f"Method has to be in {implemented_methods}.")
 
+    is_complex_step = method == "complex_step"
+    if is_complex_step and n_steps > 1:
+        raise ValueError(
+            "Richardson extrapolation is not supported for method 'complex_step'."
+        )
+
     # generate the step array
     step_size = generate_steps(
         x=x,
@@ -270,49 +308,58 @@ def first_derivative(
     )
     step_size = cast(NDArray[np.float64], step_size)
 
-    # generate parameter vectors at which func has to be evaluated as numpy arrays
-    evaluation_points = []
-    for step_arr in step_size:
-        for i, j in product(range(n_steps), range(len(x))):
-            if np.isnan(step_arr[i, j]):
-                evaluation_points.append(np.nan)
-            else:
-                point = x.copy()
-                point[j] += step_arr[i, j]
-                evaluation_points.append(point)
+    # describe the parameter vectors at which func has to be evaluated. They are only
+    # created chunk by chunk during the evaluation.
+    if sparsity is None:
+        evaluation_points = _get_one_step_points(
+            x, step_size, imaginary=is_complex_step
+        )
+    else:
+        if not is_fast_path:
+            raise ValueError(
+                "A sparsity pattern is only supported if params is a numpy array."
+            )
+        pattern = process_sparsity(sparsity, dim_x=len(x))
+        colors = get_column_coloring(pattern)
+        evaluation_points = _get_colored_points(
+            x, step_size, colors, imaginary=is_complex_step
+        )
 
     # convert the numpy arrays to whatever is needed by func
-    if not is_fast_path:
-        evaluation_points = [
-            # entries are either a numpy.ndarray or np.nan
-            _unflatten_if_not_nan(p, params_treedef, registry)
-            for p in evaluation_points
-        ]
+    to_params = (
+        None
+        if is_fast_path
+        else functools.partial(tree_unflatten, params_treedef, registry=registry)
+    )
 
     # we always evaluate f0, so we can fall back to one-sided derivatives if
     # two-sided derivatives fail. The extra cost is negligible in most cases.
-    if f0 is None:
-        evaluation_points.append(params)
+    f0_params = params if f0 is None else None
 
     # do the function evaluations, including error handling
     batch_error_handling = "raise" if error_handling == "raise_strict" else "continue"
-    raw_evals = _nan_skipping_batch_evaluator(
+    [raw_evals], f0_eval = _evaluate_points_in_chunks(
         func=partialed_func,
-        arguments=evaluation_points,
+        points=[evaluation_points],
+        f0_params=f0_params,
+        to_params=to_params,
         n_cores=n_cores,
         error_handling=batch_error_handling,
         batch_evaluator=batch_evaluator,
+        vectorized=vectorized,
+        evaluation_cache=evaluation_cache,
     )
 
     # extract information on exceptions that occurred during function evaluations
-    exc_info = "\n\n".join([val for val in raw_evals if isinstance(val, str)])
+    exc_info = "\n\n".join(
+        [val for val in [*raw_evals, f0_eval] if isinstance(val, str)]
+    )
     raw_evals = [val if not isinstance(val, str) else np.nan for val in raw_evals]
 
     # store full function value at params as func_value and a processed version of it
     # that we need to calculate derivatives as f0
     if f0 is None:
-        f0 = raw_evals[-1]
-        raw_evals = raw_evals[:-1]
+        f0 = f0_eval if not isinstance(f0_eval, str) else np.nan
     func_value = f0
 
     f0_tree = unpacker(f0)
@@ -327,22 +374,46 @@ def first_derivative(
         f0 = tree_leaves(f0_tree, registry=registry)
         f0 = np.array(f0, dtype=np.float64)
 
-    # convert the raw evaluations to numpy arrays
-    raw_evals_arr = _convert_evals_to_numpy(
+    # convert the raw evaluations to numpy arrays with np.nan for skipped points
+    raw_evals_arr = _convert_evals_to_dense_array(
         raw_evals=raw_evals,
+        points=evaluation_points,
+        f0=f0,
         unpacker=unpacker,
         registry=registry,
         is_scalar_out=scalar_out,
         is_vector_out=vector_out,
+        dtype=np.complex128 if is_complex_step else np.float64,
     )
 
+    if is_complex_step:
+        # the complex step formula only needs the imaginary parts; they do not depend
+        # on parameters outside the nonzero pattern, just as differences to f0
+        raw_evals_arr = np.where(np.isnan(raw_evals_arr), np.nan, raw_evals_arr.imag)
+        expansion_base = np.zeros_like(f0)
+    else:
+        expansion_base = f0
+
+    if sparsity is not None:
+        if not vector_out or pattern.shape[0] != len(f0):
+            raise ValueError(
+                "A sparsity pattern is only supported if func returns a 1d numpy array "
+                "whose length equals the number of rows of the sparsity pattern."
+            )
+        raw_evals_arr = _expand_colored_evals(
+            raw_evals_arr, step_size, colors, pattern, expansion_base
+        )
+
     # apply finite difference formulae
-    evals_data = np.array(raw_evals_arr).reshape(2, n_steps, len(x), -1)
+    evals_data = raw_evals_arr.reshape(2, n_steps, len(x), -1)
     evals_data_transposed = np.transpose(evals_data, axes=(0, 1, 3, 2))
     evals = Evals(pos=evals_data_transposed[0], neg=evals_data_transposed[1])
 
+    candidate_methods = (
+        ["complex_step"] if is_complex_step else ["forward", "backward", "central"]
+    )
     jac_candidates = {}
-    for m in ["forward", "backward", "central"]:
+    for m in candidate_methods:
         jac_candidates[m] = finite_differences.jacobian(evals, step_size, f0, m)
 
     # get the best derivative estimate out of all derivative estimates that could be
@@ -351,6 +422,7 @@ def first_derivative(
         "central": ["central", "forward", "backward"],
         "forward": ["forward", "backward"],
         "backward": ["backward", "forward"],
+        "complex_step": ["complex_step"],
     }
 
     if n_steps == 1:
@@ -367,7 +439,10 @@ def first_derivative(
         raise Exception(exc_info)
 
     # results processing
-    if is_fast_path and vector_out:
+    if sparsity is not None:
+        rows, cols = pattern.nonzero()
+        derivative = sp.csr_array((jac[rows, cols], (rows, cols)), shape=jac.shape)
+    elif is_fast_path and vector_out:
         derivative = jac
     elif is_fast_path and scalar_out:
         derivative = jac.flatten()
@@ -400,8 +475,9 @@ def second_derivative(
     f0: PyTree | None = None,
     n_cores: int = DEFAULT_N_CORES,
     error_handling: Literal["continue", "raise", "raise_strict"] = "continue",
-    batch_evaluator: Literal["joblib", "pathos"] | Callable = "joblib",
+    batch_evaluator: Literal["joblib", "pathos", "threading"] | Callable = "joblib",
     unpacker: Callable[[Any], PyTree] | None = None,
+    evaluation_cache: EvaluationCache | None = None,
     # deprecated
     lower_bounds: PyTree | None = None,
     upper_bounds: PyTree | None = None,
@@ -428,7 +504,9 @@ def second_derivative(
     see :func:`~optimagic.differentiation.generate_steps.generate_steps`.
 
     Args:
-        func: Function of which the derivative is calculated.
+        func: Function of which the derivative is calculated. If func is marked with
+            `optimagic.mark.vectorized`, the evaluation points are stacked and
+            evaluated in one call per core.
         params: 1d numpy array or
             :class:`pandas.DataFrame` with parameters at which the derivative is
             calculated. If it is a DataFrame, it can contain the columns "lower_bound"
@@ -471,11 +549,15 @@ def second_derivative(
             evaluations for one parameter failed) and "raise_strict" (raise an error
             as soon as a function evaluation fails).
         batch_evaluator: Name of a pre-implemented batch evaluator
-            (currently 'joblib' and 'pathos_mp') or Callable with the same interface
-            as the optimagic batch_evaluators.
+            (currently 'joblib', 'pathos_mp' and 'threading') or Callable with the
+            same interface as the optimagic batch_evaluators.
         unpacker: A callable that takes the output of func and returns the part of the
             output that is needed for the derivative calculation. If None, the output of
             func is used as is. Default None.
+        evaluation_cache: Cache of evaluations of func, keyed by the flattened
+            parameter vector. Points that are in the cache are not evaluated again
+            and new evaluations are stored in it. This allows to share evaluations
+            between several derivative calculations of the same func. Default None.
 
 
     Returns:
@@ -566,6 +648,12 @@ def second_derivative(
     func_kwargs = {} if func_kwargs is None else func_kwargs
     partialed_func = functools.partial(func, **func_kwargs)
 
+    vectorized = is_vectorized(func)
+    if vectorized and not isinstance(params, np.ndarray):
+        raise ValueError(
+            "Vectorized functions are only supported if params is a numpy array."
+        )
+
     implemented_methods = {"forward", "backward", "central_average", "central_cross"}
     if method not in implemented_methods:
         raise ValueError(f"Method has to be in {implemented_methods}.")
@@ -584,90 +672,65 @@ def second_derivative(
     )
     step_size = cast(NDArray[np.float64], step_size)
 
-    # generate parameter vectors at which func has to be evaluated as numpy arrays
-    evaluation_points = {  # type: ignore
-        "one_step": [],
-        "two_step": [],
-        "cross_step": [],
+    # describe the parameter vectors at which func has to be evaluated. They are only
+    # created chunk by chunk during the evaluation.
+    evaluation_points = {
+        "one_step": _get_one_step_points(x, step_size),
+        "two_step": _get_two_step_points(x, step_size, sign=1.0),
+        "cross_step": _get_two_step_points(x, step_size, sign=-1.0),
     }
-    for step_arr in step_size:
-        # single direction steps
-        for i, j in product(range(n_steps), range(len(x))):
-            if np.isnan(step_arr[i, j]):
-                evaluation_points["one_step"].append(np.nan)
-            else:
-                point = x.copy()
-                point[j] += step_arr[i, j]
-                evaluation_points["one_step"].append(point)
-        # two and cross direction steps
-        for i, j, k in product(range(n_steps), range(len(x)), range(len(x))):
-            if j > k or np.isnan(step_arr[i, j]) or np.isnan(step_arr[i, k]):
-                evaluation_points["two_step"].append(np.nan)
-                evaluation_points["cross_step"].append(np.nan)
-            else:
-                point = x.copy()
-                point[j] += step_arr[i, j]
-                point[k] += step_arr[i, k]
-                evaluation_points["two_step"].append(point)
-                if j == k:
-                    evaluation_points["cross_step"].append(np.nan)
-                else:
-                    point = x.copy()
-                    point[j] += step_arr[i, j]
-                    point[k] -= step_arr[i, k]
-                    evaluation_points["cross_step"].append(point)
 
     # convert the numpy arrays to whatever is needed by func
-    if not is_fast_path:
-        evaluation_points = {
-            # entries are either a numpy.ndarray or np.nan, we unflatten only
-            step_type: [
-                _unflatten_if_not_nan(p, params_treedef, registry) for p in points
-            ]
-            for step_type, points in evaluation_points.items()
-        }
+    to_params = (
+        None
+        if is_fast_path
+        else functools.partial(tree_unflatten, params_treedef, registry=registry)
+    )
 
     # we always evaluate f0, so we can fall back to one-sided derivatives if
     # two-sided derivatives fail. The extra cost is negligible in most cases.
-    if f0 is None:
-        evaluation_points["one_step"].append(params)
+    f0_params = params if f0 is None else None
 
     # do the function evaluations for one and two step, including error handling
     batch_error_handling = "raise" if error_handling == "raise_strict" else "continue"
-    raw_evals = _nan_skipping_batch_evaluator(
+    evals_list, f0_eval = _evaluate_points_in_chunks(
         func=partialed_func,
-        arguments=list(itertools.chain.from_iterable(evaluation_points.values())),
+        points=list(evaluation_points.values()),
+        f0_params=f0_params,
+        to_params=to_params,
         n_cores=n_cores,
         error_handling=batch_error_handling,
         batch_evaluator=batch_evaluator,
+        vectorized=vectorized,
+        evaluation_cache=evaluation_cache,
     )
 
     # extract information on exceptions that occurred during function evaluations
-    exc_info = "\n\n".join([val for val in raw_evals if isinstance(val, str)])
-    raw_evals = [val if not isinstance(val, str) else np.nan for val in raw_evals]
-
-    n_one_step, n_two_step, n_cross_step = map(len, evaluation_points.values())
+    all_evals = list(itertools.chain(*evals_list, [f0_eval]))
+    exc_info = "\n\n".join([val for val in all_evals if isinstance(val, str)])
     raw_evals = {
-        "one_step": raw_evals[:n_one_step],
-        "two_step": raw_evals[n_one_step : n_two_step + n_one_step],
-        "cross_step": raw_evals[n_two_step + n_one_step :],
+        step_type: [val if not isinstance(val, str) else np.nan for val in evals]
+        for step_type, evals in zip(evaluation_points, evals_list, strict=True)
     }
 
     # store full function value at params as func_value and a processed version of it
     # that we need to calculate derivatives as f0
     if f0 is None:
-        f0 = raw_evals["one_step"][-1]
-        raw_evals["one_step"] = raw_evals["one_step"][:-1]
+        f0 = f0_eval if not isinstance(f0_eval, str) else np.nan
     func_value = f0
 
     f0_tree = unpacker(f0)
     f0 = tree_leaves(f0_tree, registry=registry)
     f0 = np.array(f0, dtype=np.float64)
 
-    # convert the raw evaluations to numpy arrays
+    # convert the raw evaluations to numpy arrays with np.nan for skipped points
     raw_evals = {
-        step_type: _convert_evals_to_numpy(
-            raw_evals=evals, unpacker=unpacker, registry=registry
+        step_type: _convert_evals_to_dense_array(
+            raw_evals=evals,
+            points=evaluation_points[step_type],
+            f0=f0,
+            unpacker=unpacker,
+            registry=registry,
         )
         for step_type, evals in raw_evals.items()
     }
@@ -721,6 +784,136 @@ def second_derivative(
     return NumdiffResult(**result)
 
 
+@dataclass(frozen=True)
+class FirstAndSecondDerivativeResult:
+    """Result of a joint numerical calculation of first and second derivatives.
+
+    Attributes:
+        first_derivative: The result of the first derivative.
+        second_derivative: The result of the second derivative.
+        n_saved_evaluations: The number of function evaluations that were taken from
+            the evaluation cache instead of being repeated.
+
+    """
+
+    first_derivative: NumdiffResult
+    second_derivative: NumdiffResult
+    n_saved_evaluations: int
+
+
+def first_and_second_derivative(
+    func: Callable[[PyTree], PyTree],
+    params: PyTree,
+    *,
+    bounds: Bounds | None = None,
+    func_kwargs: dict[str, Any] | None = None,
+    first_derivative_method: Literal["central", "forward", "backward"] = "central",
+    second_derivative_method: Literal[
+        "forward", "backward", "central_average", "central_cross"
+    ] = "central_cross",
+    step_size: float | PyTree | None = None,
+    scaling_factor: float | PyTree = 1,
+    min_steps: float | PyTree | None = None,
+    f0: PyTree | None = None,
+    n_cores: int = DEFAULT_N_CORES,
+    error_handling: Literal["continue", "raise", "raise_strict"] = "continue",
+    batch_evaluator: Literal["joblib", "pathos", "threading"] | Callable = "joblib",
+    first_derivative_unpacker: Callable[[Any], PyTree] | None = None,
+    second_derivative_unpacker: Callable[[Any], PyTree] | None = None,
+    evaluation_cache: EvaluationCache | None = None,
+) -> FirstAndSecondDerivativeResult:
+    """Evaluate first and second derivative of func at params with shared evaluations.
+
+    Both derivatives are calculated with the same steps. Thus, the evaluation at params
+    and the evaluations with one step in one parameter are shared and func is only
+    evaluated once at each point. If step_size is not provided, the rule of thumb for
+    second derivatives is used, which is also appropriate for central first
+    derivatives.
+
+    The unpackers can extract different parts of the output of func, e.g. the
+    likelihood contributions for the first derivative and the total likelihood for the
+    second derivative.
+
+    Args:
+        func: Function of which the derivatives are calculated.
+        params: A pytree. See :ref:`params`.
+        bounds: Lower and upper bounds on the parameters. See :func:`first_derivative`.
+        func_kwargs: Additional keyword arguments for func, optional.
+        first_derivative_method: One of ["central", "forward", "backward"], default
+            "central".
+        second_derivative_method: One of ["forward", "backward", "central_average",
+            "central_cross"], default "central_cross".
+        step_size: Scalar or pytree with the same structure as params. See
+            :func:`first_derivative`.
+        scaling_factor: Scaling factor which is applied to step_size. Default 1.
+        min_steps: Minimal possible step sizes that can be chosen to accommodate
+            bounds.
+        f0: The output of func at params, optional.
+        n_cores: Number of processes used to parallelize the function evaluations.
+            Default 1.
+        error_handling: One of "continue", "raise" and "raise_strict". See
+            :func:`first_derivative`.
+        batch_evaluator: Name of a pre-implemented batch evaluator (currently
+            'joblib', 'pathos_mp' and 'threading') or Callable with the same interface
+            as the optimagic batch_evaluators.
+        first_derivative_unpacker: A callable that takes the output of func and
+            returns the part of the output that is needed for the first derivative.
+        second_derivative_unpacker: A callable that takes the output of func and
+            returns the part of the output that is needed for the second derivative.
+        evaluation_cache: Cache of evaluations of func. If None, a new cache that can
+            hold the evaluations of the first derivative is used.
+
+    Returns:
+        FirstAndSecondDerivativeResult: The results of both derivatives and the number
+            of saved function evaluations.
+
+    """
+    registry = get_registry(extended=True)
+    x = np.array(tree_just_flatten(params, registry=registry), dtype=np.float64)
+
+    if step_size is None:
+        step_size = np.finfo(float).eps ** (1 / 3) * np.maximum(np.abs(x), 0.1)
+
+    if evaluation_cache is None:
+        # enough to store all evaluations of the first derivative and f0
+        max_size = 2 * len(x) + 1
+        evaluation_cache = EvaluationCache(EvaluationCacheOptions(max_size=max_size))
+
+    hits_before = evaluation_cache.info().hits
+
+    shared_kwargs = {
+        "func": func,
+        "params": params,
+        "bounds": bounds,
+        "func_kwargs": func_kwargs,
+        "step_size": step_size,
+        "scaling_factor": scaling_factor,
+        "min_steps": min_steps,
+        "f0": f0,
+        "n_cores": n_cores,
+        "error_handling": error_handling,
+        "batch_evaluator": batch_evaluator,
+        "evaluation_cache": evaluation_cache,
+    }
+
+    first = first_derivative(
+        method=first_derivative_method,
+        unpacker=first_derivative_unpacker,
+        **shared_kwargs,
+    )
+    second = second_derivative(
+        method=second_derivative_method,
+        unpacker=second_derivative_unpacker,
+        **shared_kwargs,
+    )
+
+    return FirstAndSecondDerivativeResult(
+        first_derivative=first,
+        second_derivative=second,
+        n_saved_evaluations=evaluation_cache.info().hits - hits_before,
+    )
+
+
 def _is_1d_array(candidate: Any) -> bool:
     return isinstance(candidate, np.ndarray) and candidate.ndim == 1
 
@@ -921,7 +1114,12 @@ def _convert_richardson_candidates_to_frame(jac, err):
 
 
 def _convert_evals_to_numpy(
-    raw_evals, unpacker, registry, is_scalar_out=False, is_vector_out=False
+    raw_evals,
+    unpacker,
+    registry,
+    is_scalar_out=False,
+    is_vector_out=False,
+    dtype=np.float64,
 ):
     """Harmonize the output of the function evaluations.
 
@@ -936,16 +1134,16 @@ def _convert_evals_to_numpy(
     # convert pytrees to arrays
     if is_scalar_out:
         evals = [
-            np.array([val], dtype=float) if not _is_scalar_nan(val) else val
+            np.array([val], dtype=dtype) if not _is_scalar_nan(val) else val
             for val in evals
         ]
 
     elif is_vector_out:
-        evals = [val.astype(float) if not _is_scalar_nan(val) else val for val in evals]
+        evals = [val.astype(dtype) if not _is_scalar_nan(val) else val for val in evals]
     else:
         evals = [
             (
-                np.array(tree_leaves(val, registry=registry), dtype=np.float64)
+                np.array(tree_leaves(val, registry=registry), dtype=dtype)
                 if not _is_scalar_nan(val)
                 else val
             )
@@ -1108,7 +1306,7 @@ def _select_minimizer_along_axis(derivative, errors):
 
 
 def _nan_skipping_batch_evaluator(
-    func, arguments, n_cores, error_handling, batch_evaluator
+    func, arguments, n_cores, error_handling, batch_evaluator, vectorized=False
 ):
     """Evaluate func at each entry in arguments, skipping np.nan entries.
 
@@ -1121,6 +1319,8 @@ def _nan_skipping_batch_evaluator(
             of the output of func has to be the same for all elements in arguments.
         arguments (list): List with inputs for func.
         n_cores (int): Number of processes.
+        vectorized (bool): Whether func is vectorized. If True, the inputs are
+            evaluated in one call of func per core.
 
     Returns
         evaluations (list): The function evaluations, same length as arguments.
@@ -1139,9 +1339,21 @@ def _nan_skipping_batch_evaluator(
         )
 
     # evaluate functions
-    evaluations = batch_evaluator(
-        func=func, arguments=real_args, n_cores=n_cores, error_handling=error_handling
-    )
+    if vectorized:
+        evaluations = batch_evaluators.vectorized_batch_evaluate(
+            func=func,
+            arguments=real_args,
+            batch_evaluator=batch_evaluator,
+            n_cores=n_cores,
+            error_handling=error_handling,
+        )
+    else:
+        evaluations = batch_evaluator(
+            func=func,
+            arguments=real_args,
+            n_cores=n_cores,
+            error_handling=error_handling,
+        )
 
     # combine results
     evaluations = iter(evaluations)
@@ -1155,6 +1367,338 @@ def _nan_skipping_batch_evaluator(
     return results
 
 
+# Maximum number of entries of the array with evaluation points that is created at
+# once. This bounds the memory that is needed for the evaluation points, independent
+# of the number of parameters and steps.
+_MAX_CHUNK_ENTRIES = 2**20
+
+
+@dataclass(frozen=True)
+class _EvaluationPoints:
+    """Evaluation points for finite differences that are created on demand.
+
+    The points are arranged in a layout of shape (2, n_steps, dim_x) for points with
+    one step and (2, n_steps, dim_x, dim_x) for points with two steps. The first
+    dimension corresponds to positive and negative steps. The point at position
+    (s, i, j) is x + steps[s, i, j] * e_j and the point at position (s, i, j, k) is
+    x + steps[s, i, j] * e_j + sign * steps[s, i, k] * e_k.
+
+    If ``colors`` is provided, the layout has shape (2, n_steps, n_colors) and the
+    point at position (s, i, c) is x plus steps[s, i, j] * e_j for all j with color c.
+
+    If ``imaginary`` is True, the steps are multiplied by the imaginary unit and the
+    points are complex.
+
+    Only the points at ``positions`` are evaluated. All other points are skipped,
+    either because a step is np.nan or because they are not needed due to symmetry.
+
+    Attributes:
+        x (np.ndarray): 1d array with the parameters.
+        steps (np.ndarray): Array of shape (2, n_steps, dim_x) with the steps.
+        shape (tuple): Shape of the layout of the points.
+        positions (np.ndarray): 1d array with the flat positions of the points that
+            are evaluated.
+        sign (float): Sign of the second step for points with two steps.
+        colors (np.ndarray or None): 1d array with the color of each parameter.
+        imaginary (bool): Whether the steps are imaginary.
+
+    """
+
+    x: NDArray[np.float64]
+    steps: NDArray[np.float64]
+    shape: tuple[int, ...]
+    positions: NDArray[np.intp]
+    sign: float = 1.0
+    colors: NDArray[np.int_] | None = None
+    imaginary: bool = False
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def get_points(self, start: int, stop: int) -> NDArray[np.float64]:
+        """Create the evaluation points start, ..., stop - 1 as 2d array."""
+        idx = np.unravel_index(self.positions[start:stop], self.shape)
+        rows = np.arange(len(idx[0]))
+        unit = 1j if self.imaginary else 1.0
+        points = np.tile(self.x, (len(rows), 1)).astype(type(unit))
+        if self.colors is not None:
+            steps = self.steps[idx[0], idx[1]]
+            in_group = (self.colors == idx[2][:, None]) & np.isfinite(steps)
+            return points + unit * np.where(in_group, steps, 0)
+        points[rows, idx[2]] += unit * self.steps[idx[0], idx[1], idx[2]]
+        if len(self.shape) == 4:
+            points[rows, idx[3]] += self.sign * self.steps[idx[0], idx[1], idx[3]]
+        return points
+
+
+def _get_one_step_points(x, steps, imaginary=False):
+    """Get the evaluation points x + steps[s, i, j] * e_j for all finite steps."""
+    steps = np.array(steps, dtype=np.float64)
+    positions = np.flatnonzero(np.isfinite(steps))
+    return _EvaluationPoints(
+        x=x,
+        steps=steps,
+        shape=steps.shape,
+        positions=positions,
+        imaginary=imaginary,
+    )
+
+
+def _get_colored_points(x, steps, colors, imaginary=False):
+    """Get the evaluation points where all parameters of one color are perturbed.
+
+    A point is skipped if all steps of the parameters with its color are np.nan.
+
+    """
+    steps = np.array(steps, dtype=np.float64)
+    n_colors = int(colors.max()) + 1 if len(colors) else 0
+    has_step = np.zeros((*steps.shape[:2], n_colors), dtype=bool)
+    for color in range(n_colors):
+        has_step[..., color] = np.isfinite(steps[..., colors == color]).any(axis=-1)
+    return _EvaluationPoints(
+        x=x,
+        steps=steps,
+        shape=has_step.shape,
+        positions=np.flatnonzero(has_step),
+        colors=colors,
+        imaginary=imaginary,
+    )
+
+
+def _expand_colored_evals(raw_evals, steps, colors, pattern, f0):
+    """Reconstruct the evaluations with one step per parameter from colored points.
+
+    Since the parameters of one color do not share a nonzero row in the Jacobian, an
+    output in a nonzero row of parameter j only depends on the step in parameter j.
+    All other outputs do not depend on x_j, i.e. they are equal to f0.
+
+    Args:
+        raw_evals (np.ndarray): Array of shape (2 * n_steps * n_colors, dim_f) with the
+            evaluations at the colored points.
+        steps (Steps): Namedtuple with the steps of shape (n_steps, dim_x).
+        colors (np.ndarray): 1d array with the color of each parameter.
+        pattern (scipy.sparse.csc_array): The sparsity pattern.
+        f0 (np.ndarray): 1d array with the function value at x. For the complex step
+            method, these are zeros, the imaginary part of the function value at x.
+
+    Returns:
+        np.ndarray: Array of shape (2 * n_steps * dim_x, dim_f).
+
+    """
+    steps = np.array(steps, dtype=np.float64)
+    dim_f = raw_evals.shape[1]
+    evals = raw_evals.reshape(*steps.shape[:2], -1, dim_f)[:, :, colors]
+    evals = np.where(pattern.T.toarray(), evals, f0)
+    evals[~np.isfinite(steps)] = np.nan
+    return evals.reshape(-1, dim_f)
+
+
+def _get_two_step_points(x, steps, sign):
+    """Get the evaluation points with steps in two directions.
+
+    Due to symmetry, only the points with j <= k are evaluated. The points on the
+    diagonal are only needed for two steps in the same direction (sign=1) since for
+    cross steps (sign=-1) they coincide with x.
+
+    """
+    steps = np.array(steps, dtype=np.float64)
+    dim_x = steps.shape[-1]
+    is_finite = np.isfinite(steps)
+    is_upper = np.triu(np.ones((dim_x, dim_x), dtype=bool), k=0 if sign > 0 else 1)
+    mask = is_finite[..., :, None] & is_finite[..., None, :] & is_upper
+    return _EvaluationPoints(
+        x=x,
+        steps=steps,
+        shape=mask.shape,
+        positions=np.flatnonzero(mask),
+        sign=sign,
+    )
+
+
+def _evaluate_points_in_chunks(
+    func,
+    points,
+    f0_params,
+    to_params,
+    n_cores,
+    error_handling,
+    batch_evaluator,
+    vectorized,
+    evaluation_cache=None,
+):
+    """Evaluate func at finite difference points, creating the points in chunks.
+
+    The points of all entries in points are concatenated and split into chunks with at
+    most _MAX_CHUNK_ENTRIES entries, but at least n_cores points. Thus, the peak
+    memory does not grow with the total number of evaluation points.
+
+    Args:
+        func (callable): The function to evaluate.
+        points (list): List of _EvaluationPoints.
+        f0_params (pytree or None): If not None, func is also evaluated at f0_params,
+            which have to correspond to x. This is done together with the first chunk.
+        to_params (callable or None): Converts a 1d array into the input of func. If
+            None, func is called with 1d arrays.
+        n_cores (int): Number of processes.
+        error_handling (str): Error handling of the batch evaluator.
+        batch_evaluator (str or callable): The batch evaluator.
+        vectorized (bool): Whether func is vectorized.
+        evaluation_cache (EvaluationCache or None): Cache of evaluations of func, keyed
+            by the 1d parameter vector. Cached points are not evaluated again. New
+            evaluations are only stored after all points were evaluated, such that
+            they cannot evict entries that are needed later in the same call.
+
+    Returns:
+        list: One list with the evaluations for each entry in points.
+        Any: The evaluation at f0_params or None.
+
+    """
+    x = points[0].x
+    chunk_size = max(_MAX_CHUNK_ENTRIES // max(len(x), 1), n_cores, 1)
+    offsets = np.cumsum([0] + [len(p) for p in points])
+    n_total = int(offsets[-1])
+    chunk_starts = range(0, n_total, chunk_size) if n_total else range(1)
+    has_f0 = f0_params is not None
+
+    batch_kwargs = {
+        "func": func,
+        "n_cores": n_cores,
+        "error_handling": error_handling,
+        "batch_evaluator": batch_evaluator,
+        "vectorized": vectorized,
+    }
+
+    # a vectorized func would receive x and complex points as one complex array
+    evaluate_f0_separately = has_f0 and any(p.imaginary for p in points)
+
+    evals = []
+    is_new = []
+    if evaluate_f0_separately:
+        evals, is_new = _evaluate_with_cache(
+            [x], [f0_params], evaluation_cache, **batch_kwargs
+        )
+
+    for start in chunk_starts:
+        keys = list(_get_chunk(points, offsets, start, start + chunk_size))
+        arguments = keys if to_params is None else [to_params(p) for p in keys]
+        if start == 0 and has_f0 and not evaluate_f0_separately:
+            keys = [x, *keys]
+            arguments = [f0_params, *arguments]
+
+        chunk_evals, chunk_is_new = _evaluate_with_cache(
+            keys, arguments, evaluation_cache, **batch_kwargs
+        )
+        evals += chunk_evals
+        is_new += chunk_is_new
+
+    if evaluation_cache is not None:
+        keys = itertools.chain(
+            [x] if has_f0 else [],
+            *(
+                _get_chunk(points, offsets, start, start + chunk_size)
+                for start in chunk_starts
+            ),
+        )
+        for key, val, new in zip(keys, evals, is_new, strict=True):
+            # failed evaluations are represented by a traceback string
+            if new and not isinstance(val, str) and not np.iscomplexobj(key):
+                evaluation_cache.store(key, EvalTask.FUN, val)
+
+    shift = int(has_f0)
+    point_evals = [evals[a + shift : b + shift] for a, b in itertools.pairwise(offsets)]
+    f0_eval = evals[0] if has_f0 else None
+    return point_evals, f0_eval
+
+
+def _get_chunk(points, offsets, start, stop):
+    """Create the points start, ..., stop - 1 of the concatenated points as 2d array."""
+    return np.vstack(
+        [
+            p.get_points(max(start - offset, 0), max(stop - offset, 0))
+            for p, offset in zip(points, offsets[:-1], strict=True)
+        ]
+    )
+
+
+def _evaluate_with_cache(keys, arguments, evaluation_cache, **batch_kwargs):
+    """Evaluate func at all arguments whose keys are not in the evaluation cache.
+
+    Returns:
+        list: The evaluations, one per argument.
+        list: Booleans that indicate which evaluations are new.
+
+    """
+    evals = [_lookup(evaluation_cache, key) for key in keys]
+    missing = [i for i, val in enumerate(evals) if val is _NOT_CACHED]
+    if missing:
+        new_evals = _nan_skipping_batch_evaluator(
+            arguments=[arguments[i] for i in missing], **batch_kwargs
+        )
+        for i, val in zip(missing, new_evals, strict=True):
+            evals[i] = val
+    is_new = np.isin(np.arange(len(keys)), missing).tolist()
+    return evals, is_new
+
+
+# Marks evaluations that were not found in the evaluation cache
+_NOT_CACHED = object()
+
+
+def _lookup(evaluation_cache, x):
+    # the cache is keyed by real parameter vectors
+    if evaluation_cache is None or np.iscomplexobj(x):
+        return _NOT_CACHED
+    value = evaluation_cache.lookup(x).get(EvalTask.FUN, _NOT_CACHED)
+    evaluation_cache.record(hit=value is not _NOT_CACHED)
+    return value
+
+
+def _convert_evals_to_dense_array(
+    raw_evals,
+    points,
+    f0,
+    unpacker,
+    registry,
+    is_scalar_out=False,
+    is_vector_out=False,
+    dtype=np.float64,
+):
+    """Convert the evaluations at points to an array in the layout of the points.
+
+    Args:
+        raw_evals (list): The evaluations at the points that were evaluated.
+        points (_EvaluationPoints): The evaluation points.
+        f0 (np.ndarray): 1d array with the processed function value at x.
+        unpacker (callable): Extracts the relevant output of func.
+        registry (dict): The pytree registry.
+        is_scalar_out (bool): Whether func returns a scalar.
+        is_vector_out (bool): Whether func returns a 1d array.
+        dtype (type): The dtype of the output. np.complex128 for complex steps.
+
+    Returns:
+        np.ndarray: Array of shape (n_points_in_layout, dim_f). Rows of skipped points
+            are np.nan.
+
+    """
+    evals = _convert_evals_to_numpy(
+        raw_evals=raw_evals,
+        unpacker=unpacker,
+        registry=registry,
+        is_scalar_out=is_scalar_out,
+        is_vector_out=is_vector_out,
+        dtype=dtype,
+    )
+    if evals:
+        values = np.array(evals, dtype=dtype).reshape(len(evals), -1)
+    else:
+        values = np.empty((0, f0.size), dtype=dtype)
+    # if all evaluations failed, the values are scalar np.nan and are broadcast
+    dim_f = max(values.shape[1], f0.size)
+    out = np.full((int(np.prod(points.shape)), dim_f), np.nan, dtype=dtype)
+    out[points.positions] = values
+    return out
+
+
 def _split_into_str_and_int(s):
     """Splits string in str and int parts.
 
@@ -1202,11 +1746,3 @@ def _collect_additional_info(steps, evals, updated_candidates, target):
 
 def _is_scalar_nan(value):
     return isinstance(value, float) and np.isnan(value)
-
-
-def _unflatten_if_not_nan(leaves, treedef, registry):
-    if isinstance(leaves, np.ndarray):
-        out = tree_unflatten(treedef, leaves, registry=registry)
-    else:
-        out = leaves
-    return out
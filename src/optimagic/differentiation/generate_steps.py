@@ -34,6 +34,12 @@ def generate_steps(
     Where `np.finfo(float).eps` is machine accuracy. This rule of thumb
     is also used in statsmodels and scipy.
 
+    For the complex step method, the steps are imaginary. Since there is no
+    subtractive cancellation, they can be much smaller and the rule of thumb is
+    `np.finfo(float).eps * np.maximum(np.abs(x), 0.1)`. Imaginary steps leave the real
+    part of x unchanged, so they never conflict with bounds and only positive steps
+    are returned.
+
     The step generation is bound aware and will try to find a good solution if
     any step would violate a bound. For this, we use the following rules until
     no bounds are violated:
@@ -51,7 +57,7 @@ def generate_steps(
 
     Args:
         x (numpy.ndarray): 1d array at which the derivative is calculated.
-        method (str): One of ["central", "forward", "backward"]
+        method (str): One of ["central", "forward", "backward", "complex_step"]
         n_steps (int): Number of steps needed. For central methods, this is
             the number of steps per direction. It is 1 if no Richardson extrapolation
             is used.
@@ -85,9 +91,17 @@ def generate_steps(
             that steps.neg[i, j] = - steps.pos[i, j] unless one of them is NaN.
 
     """
+    if method == "complex_step":
+        target = "complex_step"
+
     base_steps = _calculate_or_validate_base_steps(
         base_steps, x, target, min_steps, scaling_factor
     )
+
+    if method == "complex_step":
+        pos = step_ratio ** np.arange(n_steps) * base_steps.reshape(-1, 1)
+        return Steps(pos=pos.T, neg=np.full_like(pos.T, np.nan))
+
     min_steps = base_steps if min_steps is None else min_steps
 
     assert (bounds.upper - bounds.lower >= 2 * min_steps).all(), (
@@ -128,8 +142,9 @@ def _calculate_or_validate_base_steps(base_steps, x, target, min_steps, scaling_
             base_steps * scaling_factor is the absolute value of the first (and possibly
             only) step used in the finite differences approximation of the derivative.
         x (numpy.ndarray): 1d array at which the derivative is evaluated
-        target (str): One of ["first_derivative", "second_derivative"]. This is used to
-            choose the appropriate rule of thumb for the base_steps.
+        target (str): One of ["first_derivative", "second_derivative",
+            "complex_step"]. This is used to choose the appropriate rule of thumb for
+            the base_steps.
         min_steps (numpy.ndarray or None): Minimal possible step sizes that can be
             chosen to accommodate bounds. Needs to have same length as x.
         scaling_factor (numpy.ndarray or float): Scaling factor which is applied to
@@ -166,6 +181,8 @@ def _calculate_or_validate_base_steps(base_steps, x, target, min_steps, scaling_
             base_steps = eps ** (1 / 2) * np.maximum(np.abs(x), 0.1) * scaling_factor
         elif target == "second_derivative":
             base_steps = eps ** (1 / 3) * np.maximum(np.abs(x), 0.1) * scaling_factor
+        elif target == "complex_step":
+            base_steps = eps * np.maximum(np.abs(x), 0.1) * scaling_factor
         else:
             raise ValueError(f"Invalid target: {target}.")
         if min_steps is not None:
@@ -1,7 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Callable, Literal, TypedDict
+from typing import Any, Callable, Literal, TypedDict
 
+import numpy as np
+import scipy.sparse as sp
+from numpy.typing import NDArray
 from typing_extensions import NotRequired
 
 from optimagic.config import DEFAULT_N_CORES
@@ -14,7 +17,9 @@ class NumdiffOptions:
 
     Attributes:
         method: The method to use for numerical differentiation. Can be "central",
-            "forward", or "backward".
+            "forward", "backward" or "complex_step". "complex_step" evaluates the
+            objective function at complex parameters and requires that the objective
+            function and the parameter transformations are complex-safe.
         step_size: The step size to use for numerical differentiation. If None, the
             default step size will be used.
         scaling_factor: The scaling factor to use for numerical differentiation.
@@ -22,7 +27,14 @@ class NumdiffOptions:
             the default minimum step size will be used.
         n_cores: The number of cores to use for numerical differentiation.
         batch_evaluator: The batch evaluator to use for numerical differentiation. Can
-            be "joblib" or "pathos", or a custom function.
+            be "joblib", "pathos" or "threading", or a custom function.
+        jac_sparsity: Sparsity pattern of the Jacobian of the objective function with
+            respect to the internal parameters during optimization. Either a boolean
+            array or scipy sparse matrix of shape (n_outputs, n_params) or "detect".
+            If "detect", the pattern is taken from the nonzero entries of the first
+            numerical Jacobian. Parameters whose columns do not share a nonzero row are
+            perturbed together, which can reduce the number of function evaluations
+            drastically. Only used for least-squares and likelihood problems.
 
     Raises:
         InvalidNumdiffError: If the numdiff options cannot be processed, e.g. because
@@ -31,13 +43,22 @@ class NumdiffOptions:
     """
 
     method: Literal[
-        "central", "forward", "backward", "central_cross", "central_average"
+        "central",
+        "forward",
+        "backward",
+        "complex_step",
+        "central_cross",
+        "central_average",
     ] = "central"
     step_size: float | None = None
     scaling_factor: float = 1
     min_steps: float | None = None
     n_cores: int = DEFAULT_N_CORES
-    batch_evaluator: Literal["joblib", "pathos"] | Callable = "joblib"  # type: ignore
+    batch_evaluator: Literal["joblib", "pathos", "threading"] | Callable = "joblib"  # type: ignore
+    # arrays cannot be compared with ==, so the pattern is excluded from comparisons
+    jac_sparsity: (
+        NDArray[np.bool_] | sp.sparray | sp.spmatrix | Literal["detect"] | None
+    ) = field(default=None, compare=False)
 
     def __post_init__(self) -> None:
         _validate_attribute_types_and_values(self)
@@ -45,13 +66,23 @@ class NumdiffOptions:
 
 class NumdiffOptionsDict(TypedDict):
     method: NotRequired[
-        Literal["central", "forward", "backward", "central_cross", "central_average"]
+        Literal[
+            "central",
+            "forward",
+            "backward",
+            "complex_step",
+            "central_cross",
+            "central_average",
+        ]
     ]
     step_size: NotRequired[float | None]
     scaling_factor: NotRequired[float]
     min_steps: NotRequired[float | None]
     n_cores: NotRequired[int]
-    batch_evaluator: NotRequired[Literal["joblib", "pathos"] | Callable]  # type: ignore
+    batch_evaluator: NotRequired[Literal["joblib", "pathos", "threading"] | Callable]  # type: ignore
+    jac_sparsity: NotRequired[
+        NDArray[np.bool_] | sp.sparray | sp.spmatrix | Literal["detect"] | None
+    ]
 
 
 def pre_process_numdiff_options(
@@ -88,7 +119,7 @@ def pre_process_numdiff_options(
                 f"Invalid numdiff options of type: {type(numdiff_options)}. Numdiff "
                 "options must be of type optimagic.NumdiffOptions, a dictionary with a"
                 "subset of the keys {'method', 'step_size', 'scaling_factor', "
-                "'min_steps', 'n_cores', 'batch_evaluator'}, or None."
+                "'min_steps', 'n_cores', 'batch_evaluator', 'jac_sparsity'}, or None."
             ) from e
 
     return numdiff_options
@@ -99,13 +130,14 @@ def _validate_attribute_types_and_values(options: NumdiffOptions) -> None:
         "central",
         "forward",
         "backward",
+        "complex_step",
         "central_cross",
         "central_average",
     }:
         raise InvalidNumdiffOptionsError(
             f"Invalid numdiff `method`: {options.method}. Numdiff `method` must be "
-            "one of 'central', 'forward', 'backward', 'central_cross', or "
-            "'central_average'."
+            "one of 'central', 'forward', 'backward', 'complex_step', 'central_cross', "
+            "or 'central_average'."
         )
 
     if options.step_size is not None and (
@@ -142,12 +174,48 @@ def _validate_attribute_types_and_values(options: NumdiffOptions) -> None:
     if not callable(options.batch_evaluator) and options.batch_evaluator not in {
         "joblib",
         "pathos",
+        "threading",
     }:
         raise InvalidNumdiffOptionsError(
             f"Invalid numdiff `batch_evaluator`: {options.batch_evaluator}. Batch "
-            "evaluator must be a callable or one of 'joblib', 'pathos'."
+            "evaluator must be a callable or one of 'joblib', 'pathos', 'threading'."
         )
 
+    if not _is_valid_jac_sparsity(options.jac_sparsity):
+        raise InvalidNumdiffOptionsError(
+            f"Invalid numdiff `jac_sparsity` of type {type(options.jac_sparsity)}. "
+            "jac_sparsity must be None, 'detect', or a 2d array or scipy sparse "
+            "matrix."
+        )
+
+
+def _is_valid_jac_sparsity(jac_sparsity: Any) -> bool:
+    if jac_sparsity is None or isinstance(jac_sparsity, str):
+        return jac_sparsity in (None, "detect")
+    return (sp.issparse(jac_sparsity) or isinstance(jac_sparsity, np.ndarray)) and (
+        jac_sparsity.ndim == 2
+    )
+
+
+def get_derivative_kwargs(options: NumdiffOptions) -> dict[str, Any]:
+    """Get the numdiff options as keyword arguments for numerical derivatives.
+
+    The jac_sparsity is not included because it only applies to the Jacobian of the
+    objective function during optimization.
+
+    Args:
+        options: The numdiff options.
+
+    Returns:
+        Keyword arguments for first_derivative and second_derivative.
+
+    """
+    return {
+        f.name: getattr(options, f.name)
+        for f in fields(options)
+        if f.name != "jac_sparsity"
+    }
+
 
 class NumdiffPurpose(str, Enum):
     OPTIMIZE = "optimize"
@@ -59,6 +59,10 @@ class InvalidNumdiffOptionsError(OptimagicError):
     """Exception for invalid user provided numdiff options."""
 
 
+class InvalidEvaluationCacheError(OptimagicError):
+    """Exception for invalid user provided evaluation cache options."""
+
+
 class NotInstalledError(OptimagicError):
     """Exception when optional dependencies are needed but not installed."""
 
@@ -70,6 +70,32 @@ class _KeyValueStore(Generic[InputType, OutputType], ABC):
 
         """
 
+    def select_after(self, key: int) -> list[OutputType]:
+        """Select all items whose primary key is larger than `key`.
+
+        Stores with an auto-incrementing primary key return the items that were
+        inserted after the item with primary key `key`. Stores that can filter by
+        primary key more efficiently should override this.
+
+        Args:
+            key: The primary key after which items are selected.
+
+        Returns:
+            A list of output items, sorted by primary key.
+
+        """
+        items = [item for item in self._select_all() if item[self.primary_key] > key]
+        return sorted(items, key=lambda item: item[self.primary_key])
+
+    def insert_many(self, values: list[InputType]) -> None:
+        """Insert several values into the key-value store.
+
+        Stores that can write several values at once should override this.
+
+        """
+        for value in values:
+            self.insert(value)
+
     @abstractmethod
     def _select_by_key(self, key: int) -> list[OutputType]:
         """Implement this method to select a value from the store by its primary key."""
@@ -106,6 +132,13 @@ class _KeyValueStore(Generic[InputType, OutputType], ABC):
 
         """
 
+    def flush(self) -> None:
+        """Write buffered items to the underlying storage.
+
+        Stores that write every item immediately do not need to override this.
+
+        """
+
     def to_df(self) -> pd.DataFrame:
         """Convert the store's data to a Pandas DataFrame.
 
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import os
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Generic, Type, TypeVar, cast
 
 import numpy as np
 import pandas as pd
 import sqlalchemy as sql
+from pybaum import tree_flatten, tree_unflatten
 from sqlalchemy.engine import Engine
 
 from optimagic.logging.base import (
@@ -23,6 +25,7 @@ from optimagic.logging.sqlalchemy import (
 from optimagic.logging.types import (
     ExistenceStrategy,
     ExistenceStrategyLiteral,
+    IterationColumns,
     IterationState,
     IterationStateWithId,
     ProblemInitialization,
@@ -31,6 +34,7 @@ from optimagic.logging.types import (
     StepResultWithId,
     StepType,
 )
+from optimagic.parameters.tree_registry import get_registry
 from optimagic.typing import (
     Direction,
     DirectionLiteral,
@@ -64,6 +68,53 @@ class LogOptions:
 _LogOptionsType = TypeVar("_LogOptionsType", bound=LogOptions)
 
 
+@dataclass
+class _FunHistoryCache:
+    """Evaluations with a function value that were already read from the log.
+
+    Attributes:
+        treedef: Tuple of the treedef of the params and the number of leaves. None if
+            the params are read from the serialized iterations.
+
+    """
+
+    treedef: tuple[PyTree, int] | None
+    params: list[PyTree] = field(default_factory=list)
+    fun: list[float] = field(default_factory=list)
+    time: list[float] = field(default_factory=list)
+    step: list[int | None] = field(default_factory=list)
+    last_rowid: int = 0
+
+    @property
+    def n_params(self) -> int | None:
+        return None if self.treedef is None else self.treedef[1]
+
+    def update_from_columns(self, columns: IterationColumns) -> None:
+        assert self.treedef is not None
+        treedef = self.treedef[0]
+        registry = get_registry(extended=True)
+        has_fun = columns.has_scalar_fun
+        self.params += [
+            tree_unflatten(treedef, flat.tolist(), registry=registry)
+            for flat in columns.flat_params[has_fun]
+        ]
+        self.fun += columns.scalar_fun[has_fun].tolist()
+        self.time += columns.timestamp[has_fun].tolist()
+        self.step += columns.step[has_fun].tolist()
+        if len(columns.rowid) > 0:
+            self.last_rowid = int(columns.rowid[-1])
+
+    def update_from_iterations(self, iterations: list[IterationStateWithId]) -> None:
+        for data in iterations:
+            if data.scalar_fun is not None:
+                self.params.append(data.params)
+                self.fun.append(data.scalar_fun)
+                self.time.append(data.timestamp)
+                self.step.append(data.step)
+        if iterations:
+            self.last_rowid = cast(int, iterations[-1].rowid)
+
+
 class LogReader(Generic[_LogOptionsType], ABC):
     """A class that manages the retrieving of optimization and exploration data.
 
@@ -76,6 +127,8 @@ class LogReader(Generic[_LogOptionsType], ABC):
     _problem_store: UpdatableKeyValueStore[
         ProblemInitialization, ProblemInitializationWithId
     ]
+    _fun_history_cache: _FunHistoryCache | None = None
+    _last_read_rowid: int = 0
 
     @property
     def problem_df(self) -> pd.DataFrame:
@@ -139,25 +192,101 @@ class LogReader(Generic[_LogOptionsType], ABC):
     def read_history(self) -> IterationHistory:
         """Read the entire iteration history from the iteration store.
 
+        Repeated calls on the same reader only read the iterations that were logged
+        since the previous call.
+
         Returns:
             An `IterationHistory` object containing the parameters,
                 criterion values, and runtimes.
 
         """
-        raw_res = self._iteration_store.select()
-        params_list = []
-        criterion_list = []
-        runtime_list = []
-        for data in raw_res:
-            if data.scalar_fun is not None:
-                params_list.append(data.params)
-                criterion_list.append(data.scalar_fun)
-                runtime_list.append(data.timestamp)
+        history = self._read_fun_history()
+        return IterationHistory(history["params"], history["fun"], history["time"])
 
-        times = np.array(runtime_list)
-        times -= times[0]
+    def read_new_iterations(self) -> IterationColumns:
+        """Read the numeric data of all iterations logged since the last call.
 
-        return IterationHistory(params_list, criterion_list, times)
+        This is meant for monitoring a running optimization. The reader remembers the
+        last rowid it returned, so the cost of each call only depends on the number of
+        new iterations.
+
+        Returns:
+            An `IterationColumns` object with the new iterations. All attributes are
+                empty if no new iterations were logged.
+
+        """
+        columns = self._get_iteration_store().select_numeric_columns(
+            min_rowid=self._last_read_rowid
+        )
+        if len(columns.rowid) > 0:
+            self._last_read_rowid = int(columns.rowid[-1])
+        return columns
+
+    def _get_iteration_store(self) -> IterationStore:
+        if not isinstance(self._iteration_store, IterationStore):
+            raise NotImplementedError(
+                f"{type(self).__name__} does not support reading numeric columns."
+            )
+        return self._iteration_store
+
+    def _read_fun_history(self) -> dict[str, Any]:
+        """Read params, fun, time and step of all evaluations with a function value.
+
+        The result is cached and only iterations that are newer than the cached ones
+        are read from the iteration store. If possible, they are read from the numeric
+        columns and the params are unflattened using the start params as template.
+        Otherwise, the serialized iteration states are read.
+
+        """
+        if self._fun_history_cache is None:
+            self._fun_history_cache = _FunHistoryCache(treedef=self._get_treedef())
+        cache = self._fun_history_cache
+
+        if cache.treedef is not None:
+            columns = self._get_iteration_store().select_numeric_columns(
+                min_rowid=cache.last_rowid
+            )
+            n_rows, n_params = columns.flat_params.shape
+            if n_rows > 0 and (
+                n_params != cache.n_params or np.isnan(columns.flat_params).any()
+            ):
+                # Fall back to the serialized iterations for the complete history.
+                cache = self._fun_history_cache = _FunHistoryCache(treedef=None)
+            else:
+                cache.update_from_columns(columns)
+
+        if cache.treedef is None:
+            cache.update_from_iterations(
+                self._iteration_store.select_after(cache.last_rowid)
+            )
+
+        times = np.array(cache.time, dtype=np.float64)
+        if len(times) > 0:
+            times -= times[0]
+
+        return {
+            "params": list(cache.params),
+            "fun": list(cache.fun),
+            "time": times,
+            "step": list(cache.step),
+        }
+
+    def _get_treedef(self) -> tuple[PyTree, int] | None:
+        """Get the treedef and number of leaves of the start params if possible.
+
+        Returns None if the params cannot be read from the numeric columns.
+
+        """
+        store = self._iteration_store
+        if not (isinstance(store, IterationStore) and store.has_numeric_columns):
+            return None
+        problems = self._problem_store.select(1)
+        if not problems:
+            return None
+        flat, treedef = tree_flatten(
+            problems[0].params, registry=get_registry(extended=True)
+        )
+        return treedef, len(flat)
 
     @staticmethod
     def _normalize_direction(
@@ -169,28 +298,8 @@ class LogReader(Generic[_LogOptionsType], ABC):
 
     def _build_history_dataframe(self) -> pd.DataFrame:
         steps = self._step_store.to_df()
-        raw_res = self._iteration_store.select()
-
-        history: dict[str, list[Any]] = {
-            "params": [],
-            "fun": [],
-            "time": [],
-            "step": [],
-        }
-
-        for data in raw_res:
-            if data.scalar_fun is not None:
-                history["params"].append(data.params)
-                history["fun"].append(data.scalar_fun)
-                history["time"].append(data.timestamp)
-                history["step"].append(data.step)
-
-        times = np.array(history["time"])
-        times -= times[0]
-        # For numpy arrays with ndim = 0, tolist() returns a scalar, which violates the
-        # type hinting list[Any] from above. As history["time"] is always a list, this
-        # case is safe to ignore.
-        history["time"] = times.tolist()  # type: ignore[assignment]
+        history = self._read_fun_history()
+        history["time"] = history["time"].tolist()
 
         df = pd.DataFrame(history)
         df = df.merge(
@@ -198,6 +307,7 @@ class LogReader(Generic[_LogOptionsType], ABC):
             left_on="step",
             right_on=f"{self._step_store.primary_key}",
         )
+        df["step"] = df["step"].astype(int)
         return df.drop(columns=f"{self._step_store.primary_key}")
 
     @staticmethod
@@ -346,6 +456,12 @@ class LogStore(Generic[_LogOptionsType, _LogReaderType], ABC):
 
         return logger_class.create(log_options)
 
+    def flush(self) -> None:
+        """Write all buffered log entries to the underlying stores."""
+        self.iteration_store.flush()
+        self.step_store.flush()
+        self.problem_store.flush()
+
     @classmethod
     @abstractmethod
     def create(
@@ -372,6 +488,16 @@ class SQLiteLogOptions(SQLAlchemyConfig, LogOptions):
             takes more than 100 ms, the logging overhead is negligible.
         if_database_exists (ExistenceStrategy): Strategy for handling an existing
             database file. One of “extend”, “replace”, “raise”.
+        buffer_size (int | None): If not None, iterations are collected in memory and
+            written to the database in one transaction as soon as `buffer_size`
+            iterations have accumulated. This removes the per-evaluation commit, which
+            dominates the logging overhead for cheap criterion functions.
+        flush_interval (float | None): If not None, buffered iterations are written to
+            the database at the latest after `flush_interval` seconds. A background
+            timer does this also if no further iterations arrive. Can be combined
+            with `buffer_size`. Independent of both options, the buffer is always
+            written at the end of each optimization step and of the optimization,
+            also if it terminates with an exception.
 
     """
 
@@ -381,6 +507,8 @@ class SQLiteLogOptions(SQLAlchemyConfig, LogOptions):
         fast_logging: bool = True,
         if_database_exists: ExistenceStrategy
         | ExistenceStrategyLiteral = ExistenceStrategy.RAISE,
+        buffer_size: int | None = None,
+        flush_interval: float | None = None,
     ):
         url = f"sqlite:///{path}"
         self._fast_logging = fast_logging
@@ -388,6 +516,16 @@ class SQLiteLogOptions(SQLAlchemyConfig, LogOptions):
         if isinstance(if_database_exists, str):
             if_database_exists = ExistenceStrategy(if_database_exists)
         self.if_database_exists = if_database_exists
+        if buffer_size is not None and buffer_size < 1:
+            raise ValueError(
+                f"buffer_size must be a positive integer, got {buffer_size}"
+            )
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError(
+                f"flush_interval must be a positive number, got {flush_interval}"
+            )
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
         super().__init__(url)
 
     @property
@@ -514,7 +652,11 @@ class _SQLiteLogStore(LogStore[SQLiteLogOptions, SQLiteLogReader]):
     def create(cls, log_options: SQLiteLogOptions) -> _SQLiteLogStore:
         cls._handle_existing_database(log_options.path, log_options.if_database_exists)
 
-        iteration_store = IterationStore(log_options)
+        iteration_store = IterationStore(
+            log_options,
+            buffer_size=log_options.buffer_size,
+            flush_interval=log_options.flush_interval,
+        )
         step_store = StepStore(log_options)
         problem_store = ProblemStore(log_options)
         return cls(iteration_store, step_store, problem_store)
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import threading
+import time
 import traceback
 import warnings
 from dataclasses import asdict, dataclass
 from functools import cached_property
 from typing import Any, Sequence, Type, cast
 
+import numpy as np
 import sqlalchemy as sql
-from sqlalchemy import Column, Integer, PickleType, String
+from pybaum import tree_just_flatten
+from sqlalchemy import Boolean, Column, Float, Integer, LargeBinary, PickleType, String
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.sql.base import Executable
 from sqlalchemy.sql.schema import MetaData
@@ -20,6 +24,7 @@ from optimagic.logging.base import (
     UpdatableKeyValueStore,
 )
 from optimagic.logging.types import (
+    IterationColumns,
     IterationState,
     IterationStateWithId,
     ProblemInitialization,
@@ -27,6 +32,8 @@ from optimagic.logging.types import (
     StepResult,
     StepResultWithId,
 )
+from optimagic.parameters.tree_registry import get_registry
+from optimagic.typing import PyTree
 
 
 class SQLAlchemyConfig:
@@ -143,6 +150,9 @@ class _SQLAlchemyStoreMixin:
         self._engine = db_config.create_engine()
         self._table_config = table_config
         self._table = table_config.create_table(db_config.metadata, self._engine)
+        # SQLite allows only one writer at a time. Serializing the writes avoids
+        # "database is locked" errors if evaluations run in several threads.
+        self._write_lock = threading.Lock()
 
     @property
     def column_names(self) -> list[str]:
@@ -179,18 +189,32 @@ class _SQLAlchemyStoreMixin:
         result = self._execute_read_statement(stmt)
         return result[::-1]
 
+    def _select_rows_after(self, key: int) -> list[Any]:
+        primary_key = getattr(self._table.c, self._table_config.primary_key)
+        stmt = self._table.select().where(primary_key > key).order_by(primary_key)
+        return self._execute_read_statement(stmt)
+
     def _insert(self, insert_values: dict[str, Any]) -> None:
         stmt = self._table.insert().values(**insert_values)
         self._execute_write_statement(stmt)
 
+    def _insert_many(self, insert_values: list[dict[str, Any]]) -> None:
+        # Passing a list of parameter sets makes sqlalchemy use executemany, i.e. all
+        # rows are written in a single transaction.
+        self._execute_write_statement(self._table.insert(), insert_values)
+
     def _execute_read_statement(self, statement: Executable) -> list[Any]:
         with self._engine.connect() as connection:
             return connection.execute(statement).fetchall()
 
-    def _execute_write_statement(self, statement: Executable) -> None:
+    def _execute_write_statement(
+        self,
+        statement: Executable,
+        parameters: list[dict[str, Any]] | None = None,
+    ) -> None:
         try:
-            with self._engine.begin() as connection:
-                connection.execute(statement)
+            with self._write_lock, self._engine.begin() as connection:
+                connection.execute(statement, parameters)
         except (KeyboardInterrupt, SystemExit):
             raise
         except Exception:
@@ -210,10 +234,21 @@ class SQLAlchemySimpleStore(
     where values are serialized and stored as BLOBs. The store does not support
     updating existing entries.
 
+    If `buffer_size` or `flush_interval` is set, inserted values are collected in
+    memory and written to the database in bulk. The buffer is flushed when it holds
+    `buffer_size` values, when more than `flush_interval` seconds have passed since the
+    last flush, when `flush` is called explicitly and before every read.
+
     Args:
             table_name: The name of the table.
             primary_key: The primary key column name.
             db_config: The SQLAlchemyConfig object for database configuration.
+            buffer_size: Maximum number of values that are buffered before they are
+                written to the database. None means no limit.
+            flush_interval: Maximum number of seconds between two writes to the
+                database. None means no limit.
+            extra_columns: Additional columns next to the serialized value. Subclasses
+                that use them need to fill them in `_to_row`.
 
     """
 
@@ -226,11 +261,21 @@ class SQLAlchemySimpleStore(
         db_config: SQLAlchemyConfig,
         input_type: Type[InputType],
         output_type: Type[OutputType],
+        buffer_size: int | None = None,
+        flush_interval: float | None = None,
+        extra_columns: list[sql.Column[Any]] | None = None,
     ):
         super().__init__(input_type, output_type, primary_key)
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._buffer: list[dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._last_flush = time.perf_counter()
+        self._flush_timer: threading.Timer | None = None
         columns = [
             sql.Column(primary_key, sql.Integer, primary_key=True, autoincrement=True),
             sql.Column(self._value_column, sql.PickleType(pickler=RobustPickler)),  # type:ignore
+            *(extra_columns or []),
         ]
         table_config = TableConfig(table_name, columns, self.primary_key)
 
@@ -242,6 +287,8 @@ class SQLAlchemySimpleStore(
         Type[SQLAlchemySimpleStore[Any, Any]],
         tuple[str, str, SQLAlchemyConfig, Type[Any], Type[Any]],
     ]:
+        # Copies (e.g. in worker processes) write directly to the database because
+        # nothing would flush their buffer.
         return SQLAlchemySimpleStore, (
             self.table_name,
             self.primary_key,
@@ -250,6 +297,10 @@ class SQLAlchemySimpleStore(
             self._output_type,
         )
 
+    @property
+    def is_buffered(self) -> bool:
+        return self._buffer_size is not None or self._flush_interval is not None
+
     def insert(self, value: InputType) -> None:
         """Insert a new value into the store.
 
@@ -257,13 +308,81 @@ class SQLAlchemySimpleStore(
             value: The value to insert into the store.
 
         """
-        self._insert({self._value_column: value})
+        if not self.is_buffered:
+            self._insert(self._to_row(value))
+            return
+
+        with self._buffer_lock:
+            self._buffer.append(self._to_row(value))
+            flush_due = self._flush_due()
+            if not flush_due:
+                self._start_flush_timer()
+
+        if flush_due:
+            self.flush()
+
+    def insert_many(self, values: list[InputType]) -> None:
+        """Insert several values into the store in a single transaction.
+
+        Args:
+            values: The values to insert into the store.
+
+        """
+        rows = [self._to_row(value) for value in values]
+        if not self.is_buffered:
+            if rows:
+                self._insert_many(rows)
+            return
+
+        with self._buffer_lock:
+            self._buffer.extend(rows)
+            flush_due = self._flush_due()
+            if not flush_due and self._buffer:
+                self._start_flush_timer()
+
+        if flush_due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered values to the database in a single transaction."""
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+            self._last_flush = time.perf_counter()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if rows:
+                self._insert_many(rows)
+
+    def _to_row(self, value: InputType) -> dict[str, Any]:
+        return {self._value_column: value}
+
+    def _start_flush_timer(self) -> None:
+        """Flush after flush_interval seconds, also if no further values arrive.
+
+        Must be called while holding the buffer lock.
+
+        """
+        if self._flush_interval is not None and self._flush_timer is None:
+            remaining = self._flush_interval - (time.perf_counter() - self._last_flush)
+            self._flush_timer = threading.Timer(max(remaining, 0), self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_due(self) -> bool:
+        if self._buffer_size is not None and len(self._buffer) >= self._buffer_size:
+            return True
+        if self._flush_interval is not None:
+            return time.perf_counter() - self._last_flush >= self._flush_interval
+        return False
 
     def _select_by_key(self, key: int) -> list[OutputType]:
+        self.flush()
         result = self._select_row_by_key(key)
         return self._post_process(result)
 
     def _select_all(self) -> list[OutputType]:
+        self.flush()
         result = self._select_all_rows()
         return self._post_process(result)
 
@@ -277,14 +396,29 @@ class SQLAlchemySimpleStore(
             A list of the last `n_rows` output values.
 
         """
+        self.flush()
         result = self._select_last_rows(n_rows)
         return self._post_process(result)
 
+    def select_after(self, key: int) -> list[OutputType]:
+        """Select all values that were inserted after the value with key `key`.
+
+        Args:
+            key: The primary key after which values are selected.
+
+        Returns:
+            A list of output values, sorted by primary key.
+
+        """
+        self.flush()
+        result = self._select_rows_after(key)
+        return self._post_process(result)
+
     def _post_process(self, results: Sequence[sql.Row]) -> list[OutputType]:  # type:ignore
         output_list = []
         for row in results:
             row_dict = {self.primary_key: row[0]}
-            row_dict.update(asdict(row[-1]))
+            row_dict.update(asdict(row._mapping[self._value_column]))
             output_list.append(self._output_type(**row_dict))
         return output_list
 
@@ -380,25 +514,174 @@ class SQLAlchemyTableStore(
 class IterationStore(SQLAlchemySimpleStore[IterationState, IterationStateWithId]):
     """Store for managing iteration data in an SQLite database.
 
+    Next to the serialized IterationState, the numeric fields and the flattened
+    external parameters are stored in separate columns. They can be read with
+    `select_numeric_columns` without de-serializing any pytrees. Databases created by
+    older versions of optimagic do not have these columns and are still supported.
+
     Args:
         db_config (SQLiteConfig): The SQLiteConfig object for database configuration.
+        buffer_size (int | None): Maximum number of buffered iterations. See
+            `SQLAlchemySimpleStore`.
+        flush_interval (float | None): Maximum number of seconds between two writes.
+            See `SQLAlchemySimpleStore`.
 
     """
 
     _TABLE_NAME = "optimization_iterations"
     _PRIMARY_KEY = "rowid"
+    _NUMERIC_COLUMNS = (
+        "timestamp",
+        "scalar_fun",
+        "has_scalar_fun",
+        "valid",
+        "step",
+        "flat_params",
+    )
 
     def __init__(
         self,
         db_config: SQLAlchemyConfig,
+        buffer_size: int | None = None,
+        flush_interval: float | None = None,
     ):
+        existing_columns = _get_existing_columns(db_config, self._TABLE_NAME)
+        self._has_numeric_columns = existing_columns is None or set(
+            self._NUMERIC_COLUMNS
+        ).issubset(existing_columns)
+
+        if self._has_numeric_columns:
+            extra_columns = [
+                Column("timestamp", Float),
+                Column("scalar_fun", Float),
+                # SQLite stores NaN as NULL, so missing values need their own column
+                Column("has_scalar_fun", Boolean),
+                Column("valid", Boolean),
+                Column("step", Integer),
+                Column("flat_params", LargeBinary),
+            ]
+        else:
+            extra_columns = []
+
         super().__init__(
             self._TABLE_NAME,
             self._PRIMARY_KEY,
             db_config,
             IterationState,
             IterationStateWithId,
+            buffer_size=buffer_size,
+            flush_interval=flush_interval,
+            extra_columns=extra_columns,
         )
+        self._registry = get_registry(extended=True)
+
+    def __reduce__(  # type:ignore[override]
+        self,
+    ) -> tuple[Type[IterationStore], tuple[SQLAlchemyConfig]]:
+        return IterationStore, (self._db_config,)
+
+    @property
+    def has_numeric_columns(self) -> bool:
+        return self._has_numeric_columns
+
+    def _to_row(self, value: IterationState) -> dict[str, Any]:
+        row = super()._to_row(value)
+        if self._has_numeric_columns:
+            row.update(
+                timestamp=value.timestamp,
+                scalar_fun=value.scalar_fun,
+                has_scalar_fun=value.scalar_fun is not None,
+                valid=value.valid,
+                step=value.step,
+                flat_params=self._flatten_params(value.params),
+            )
+        return row
+
+    def _flatten_params(self, params: PyTree) -> bytes | None:
+        try:
+            flat = tree_just_flatten(params, registry=self._registry)
+            return np.asarray(flat, dtype=np.float64).tobytes()
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            return None
+
+    def select_numeric_columns(self, min_rowid: int = 0) -> IterationColumns:
+        """Select the numeric columns of all iterations after `min_rowid`.
+
+        If the database has numeric columns, they are read in a single query. Otherwise,
+        the serialized iterations are read and converted.
+
+        Args:
+            min_rowid: Only iterations with a rowid larger than `min_rowid` are
+                selected. Pass the last rowid of a previous call to only read
+                iterations that were logged since then.
+
+        Returns:
+            The numeric columns of the selected iterations. Parameters that could not be
+            flattened to floats are represented by rows of NaNs.
+
+        """
+        self.flush()
+        primary_key = self._table.c[self._PRIMARY_KEY]
+        if self._has_numeric_columns:
+            names = (self._PRIMARY_KEY, *self._NUMERIC_COLUMNS)
+            stmt = (
+                sql.select(*[self._table.c[name] for name in names])
+                .where(primary_key > min_rowid)
+                .order_by(primary_key)
+            )
+            rows = self._execute_read_statement(stmt)
+        else:
+            rows = [
+                (
+                    value.rowid,
+                    value.timestamp,
+                    value.scalar_fun,
+                    value.scalar_fun is not None,
+                    value.valid,
+                    value.step,
+                    self._flatten_params(value.params),
+                )
+                for value in self.select_after(min_rowid)
+            ]
+        return _rows_to_iteration_columns(rows)
+
+
+def _rows_to_iteration_columns(rows: Sequence[Any]) -> IterationColumns:
+    columns = list(zip(*rows, strict=True)) if rows else [()] * 7
+    rowid, timestamp, scalar_fun, has_scalar_fun, valid, step, flat_params = columns
+
+    params_list = [np.frombuffer(p, dtype=np.float64) for p in flat_params if p]
+    n_params = len(params_list[0]) if params_list else 0
+    params_arr = np.full((len(rows), n_params), np.nan)
+    for i, p in enumerate(flat_params):
+        if p and len(p) == 8 * n_params:
+            params_arr[i] = np.frombuffer(p, dtype=np.float64)
+
+    return IterationColumns(
+        rowid=np.array(rowid, dtype=np.int64),
+        timestamp=np.array(timestamp, dtype=np.float64),
+        scalar_fun=np.array(scalar_fun, dtype=np.float64),
+        has_scalar_fun=np.array(has_scalar_fun, dtype=np.bool_),
+        valid=np.array(valid, dtype=np.bool_),
+        step=np.array(step, dtype=np.float64),
+        flat_params=params_arr,
+    )
+
+
+def _get_existing_columns(
+    db_config: SQLAlchemyConfig, table_name: str
+) -> set[str] | None:
+    """Get the column names of a table or None if the table does not exist."""
+    engine = db_config.create_engine()
+    try:
+        inspector = sql.inspect(engine)
+        if not inspector.has_table(table_name):
+            return None
+        return {column["name"] for column in inspector.get_columns(table_name)}
+    finally:
+        engine.dispose()
 
 
 class StepStore(SQLAlchemyTableStore[StepResult, StepResultWithId]):
@@ -2,6 +2,9 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Literal
 
+import numpy as np
+from numpy.typing import NDArray
+
 from optimagic.optimization.fun_value import SpecificFunctionValue
 from optimagic.typing import (
     DictLikeAccess,
@@ -19,6 +22,7 @@ class StepStatus(str, Enum):
         RUNNING: Indicates that the step is currently in progress.
         COMPLETE: Indicates that the step has completed successfully.
         SKIPPED: Indicates that the step was skipped.
+        FAILED: Indicates that the step raised an error.
 
     """
 
@@ -26,9 +30,10 @@ class StepStatus(str, Enum):
     RUNNING = "running"
     COMPLETE = "complete"
     SKIPPED = "skipped"
+    FAILED = "failed"
 
 
-StepStatusLiteral = Literal["scheduled", "running", "complete", "skipped"]
+StepStatusLiteral = Literal["scheduled", "running", "complete", "skipped", "failed"]
 
 
 class StepType(str, Enum):
@@ -138,6 +143,35 @@ class IterationStateWithId(IterationState):
             raise ValueError("rowid must not be None")
 
 
+@dataclass(frozen=True)
+class IterationColumns(DictLikeAccess):
+    """Numeric columns of logged criterion evaluations.
+
+    Each attribute has one entry per logged evaluation, sorted by rowid.
+
+    Attributes:
+        rowid: The unique IDs of the evaluations.
+        timestamp: The times at which the evaluations were started.
+        scalar_fun: The scalar function values. NaN if no function value was
+            calculated, e.g. for evaluations of the derivative only.
+        has_scalar_fun: Indicates if a function value was calculated. This
+            distinguishes missing function values from function values that are NaN.
+        valid: Indicates if the evaluations are valid.
+        step: The step ids. NaN if an evaluation does not belong to a step.
+        flat_params: Array of shape (n_evaluations, n_params) with the flattened
+            external parameters.
+
+    """
+
+    rowid: NDArray[np.int64]
+    timestamp: NDArray[np.float64]
+    scalar_fun: NDArray[np.float64]
+    has_scalar_fun: NDArray[np.bool_]
+    valid: NDArray[np.bool_]
+    step: NDArray[np.float64]
+    flat_params: NDArray[np.float64]
+
+
 @dataclass(frozen=True)
 class StepResult(DictLikeAccess):
     """Result of a process step.
@@ -62,6 +62,37 @@ def likelihood(func: VectorFuncT) -> VectorFuncT:
     return wrapper
 
 
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+
+
+def vectorized(func: FuncT) -> FuncT:
+    """Mark a function as vectorized.
+
+    A vectorized function takes a numpy array that stacks several parameter vectors
+    along a new first axis and returns a sequence with one function value per
+    parameter vector. optimagic then evaluates batches of parameters, e.g. for parallel
+    optimizers, multistart exploration and numerical derivatives, in one call instead
+    of one call per parameter vector.
+
+    Vectorized functions can only be used if params is a numpy array. The decorator
+    can be combined with the decorators that mark the problem type.
+
+    """
+    wrapper = func
+    try:
+        wrapper._vectorized = True  # type: ignore
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except Exception:
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):  # type: ignore
+            return func(*args, **kwargs)
+
+        wrapper._vectorized = True  # type: ignore
+    return wrapper
+
+
 # TODO: I get an error when adding bound=Algorithm to AlgorithmSubclass. Why?
 AlgorithmSubclass = TypeVar("AlgorithmSubclass")
 
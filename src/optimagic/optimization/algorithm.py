@@ -242,7 +242,11 @@ class Algorithm(ABC, metaclass=AlgorithmMeta):
                 step_id, {"status": str(StepStatus.RUNNING.value)}
             )
 
-        result = self._solve_internal_problem(problem, x0)
+        try:
+            result = self._solve_internal_problem(problem, x0)
+        finally:
+            if problem.logger:
+                problem.logger.flush()
 
         if (not self.algo_info.disable_history) and (result.history is None):
             result = replace(result, history=problem.history)
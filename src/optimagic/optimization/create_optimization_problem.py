@@ -3,6 +3,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Type
 
+import numpy as np
+from numpy.typing import NDArray
+
 from optimagic import deprecations
 from optimagic.algorithms import ALL_ALGORITHMS
 from optimagic.deprecations import (
@@ -23,10 +26,15 @@ from optimagic.exceptions import (
 )
 from optimagic.logging.logger import LogOptions, SQLiteLogOptions
 from optimagic.optimization.algorithm import AlgoInfo, Algorithm
+from optimagic.optimization.evaluation_cache import (
+    EvaluationCacheOptions,
+    pre_process_evaluation_cache,
+)
 from optimagic.optimization.fun_value import (
     SpecificFunctionValue,
     convert_fun_output_to_function_value,
     enforce_return_type,
+    enforce_return_type_vectorized,
     enforce_return_type_with_jac,
 )
 from optimagic.optimization.multistart_options import (
@@ -40,8 +48,10 @@ from optimagic.optimization.scipy_aliases import (
 from optimagic.parameters.bounds import Bounds, pre_process_bounds
 from optimagic.parameters.scaling import ScalingOptions, pre_process_scaling
 from optimagic.shared.process_user_function import (
+    devectorize,
     get_kwargs_from_args,
     infer_aggregation_level,
+    is_vectorized,
     partial_func_of_params,
 )
 from optimagic.typing import AggregationLevel, Direction, ErrorHandling, PyTree
@@ -68,6 +78,7 @@ class OptimizationProblem:
     """
 
     fun: Callable[[PyTree], SpecificFunctionValue]
+    vectorized_fun: Callable[[NDArray[np.float64]], list[SpecificFunctionValue]] | None
     params: PyTree
     algorithm: Algorithm
     bounds: Bounds | None
@@ -82,6 +93,7 @@ class OptimizationProblem:
     error_penalty: dict[str, Any] | None
     scaling: ScalingOptions | None
     multistart: MultistartOptions | None
+    evaluation_cache: EvaluationCacheOptions | None
     collect_history: bool
     skip_checks: bool
     direction: Direction
@@ -108,6 +120,7 @@ def create_optimization_problem(
     error_penalty,
     scaling,
     multistart,
+    evaluation_cache,
     collect_history,
     skip_checks,
     # scipy aliases
@@ -335,6 +348,7 @@ def create_optimization_problem(
     bounds = pre_process_bounds(bounds)
     scaling = pre_process_scaling(scaling)
     multistart = pre_process_multistart(multistart)
+    evaluation_cache = pre_process_evaluation_cache(evaluation_cache)
     numdiff_options = pre_process_numdiff_options(numdiff_options)
     constraints = deprecations.pre_process_constraints(constraints)
 
@@ -362,6 +376,17 @@ def create_optimization_problem(
         skip_checks=skip_checks,
     )
 
+    # Batch evaluations use the vectorized fun directly. All other evaluations use a
+    # version of it that takes a single parameter vector.
+    vectorized_fun = None
+    if is_vectorized(fun):
+        if not isinstance(params, np.ndarray):
+            raise InvalidFunctionError(
+                "Vectorized functions are only supported if params is a numpy array."
+            )
+        vectorized_fun = fun
+        fun = devectorize(fun)
+
     # This should be done as late as possible; It has to be done here to infer the
     # problem type until the decorator approach becomes mandatory.
     # TODO: Move this into `_optimize` as soon as we reach 0.6.0
@@ -374,6 +399,10 @@ def create_optimization_problem(
         raise InvalidFunctionError(msg) from e
 
     if deprecations.is_dict_output(fun_eval):
+        if vectorized_fun is not None:
+            raise InvalidFunctionError(
+                "Vectorized functions cannot return dictionaries."
+            )
         deprecations.throw_dict_output_warning()
 
     # ==================================================================================
@@ -402,6 +431,8 @@ def create_optimization_problem(
         fun_eval = convert_fun_output_to_function_value(fun_eval, problem_type)
 
     fun = enforce_return_type(problem_type)(fun)
+    if vectorized_fun is not None:
+        vectorized_fun = enforce_return_type_vectorized(problem_type)(vectorized_fun)
 
     # ==================================================================================
     # Process the user provided algorithm
@@ -519,6 +550,11 @@ def create_optimization_problem(
         if not isinstance(multistart, MultistartOptions | None):
             raise ValueError("multistart must be a MultistartOptions object or None")
 
+        if not isinstance(evaluation_cache, EvaluationCacheOptions | None):
+            raise ValueError(
+                "evaluation_cache must be an EvaluationCacheOptions object or None"
+            )
+
         if not isinstance(collect_history, bool):
             raise ValueError("collect_history must be a boolean")
 
@@ -528,6 +564,7 @@ def create_optimization_problem(
 
     problem = OptimizationProblem(
         fun=fun,
+        vectorized_fun=vectorized_fun,
         params=params,
         algorithm=algorithm,
         bounds=bounds,
@@ -540,6 +577,7 @@ def create_optimization_problem(
         error_penalty=error_penalty,
         scaling=scaling,
         multistart=multistart,
+        evaluation_cache=evaluation_cache,
         collect_history=collect_history,
         skip_checks=skip_checks,
         direction=direction,
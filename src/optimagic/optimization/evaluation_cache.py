@@ -0,0 +1,241 @@
+"""Cache for evaluations of the objective function and its derivatives.
+
+Optimizers frequently evaluate the same parameter vector more than once, e.g. when
+they request the function value and the derivative in separate calls or when a line
+search returns to the incumbent. The cache stores the results of such evaluations,
+keyed by the internal parameter vector.
+
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+from typing_extensions import NotRequired
+
+from optimagic.exceptions import InvalidEvaluationCacheError
+from optimagic.typing import EvalTask
+
+# ======================================================================================
+# Public Options
+# ======================================================================================
+
+
+@dataclass(frozen=True)
+class EvaluationCacheOptions:
+    """Options for the evaluation cache of an optimization.
+
+    Attributes:
+        max_size: The maximum number of parameter vectors for which results are
+            stored. If the cache is full, the results of the least recently used
+            parameter vector are dropped. Default 1000.
+        tolerance: Parameter vectors that coincide after rounding each entry to a
+            multiple of tolerance share their cached results. The default of 0 means
+            that results are only shared between identical parameter vectors.
+
+    Raises:
+        InvalidEvaluationCacheError: If the evaluation cache options cannot be
+            processed, e.g. because they do not have the correct type.
+
+    """
+
+    max_size: int = 1000
+    tolerance: float = 0.0
+
+    def __post_init__(self) -> None:
+        _validate_attribute_types_and_values(self)
+
+
+class EvaluationCacheOptionsDict(TypedDict):
+    max_size: NotRequired[int]
+    tolerance: NotRequired[float]
+
+
+def pre_process_evaluation_cache(
+    evaluation_cache: bool | EvaluationCacheOptions | EvaluationCacheOptionsDict | None,
+) -> EvaluationCacheOptions | None:
+    """Convert all valid types of evaluation_cache to EvaluationCacheOptions.
+
+    Args:
+        evaluation_cache: The user provided evaluation cache options.
+
+    Returns:
+        The evaluation cache options in the optimagic format or None if no cache
+        is used.
+
+    Raises:
+        InvalidEvaluationCacheError: If the evaluation cache options cannot be
+            processed, e.g. because they do not have the correct type.
+
+    """
+    if isinstance(evaluation_cache, bool):
+        evaluation_cache = EvaluationCacheOptions() if evaluation_cache else None
+    elif isinstance(evaluation_cache, EvaluationCacheOptions) or (
+        evaluation_cache is None
+    ):
+        pass
+    else:
+        try:
+            evaluation_cache = EvaluationCacheOptions(**evaluation_cache)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception as e:
+            if isinstance(e, InvalidEvaluationCacheError):
+                raise e
+            raise InvalidEvaluationCacheError(
+                f"Invalid evaluation cache options of type: {type(evaluation_cache)}. "
+                "Evaluation cache options must be of type "
+                "optimagic.EvaluationCacheOptions, a dictionary with valid keys, "
+                "None, or a boolean."
+            ) from e
+
+    return evaluation_cache
+
+
+def _validate_attribute_types_and_values(options: EvaluationCacheOptions) -> None:
+    if (
+        not isinstance(options.max_size, int | np.integer)
+        or isinstance(options.max_size, bool)
+        or options.max_size < 1
+    ):
+        raise InvalidEvaluationCacheError(
+            f"Invalid max_size: {options.max_size}. max_size must be a positive "
+            "integer."
+        )
+
+    if (
+        not isinstance(options.tolerance, int | float | np.number)
+        or isinstance(options.tolerance, bool)
+        or not np.isfinite(options.tolerance)
+        or options.tolerance < 0
+    ):
+        raise InvalidEvaluationCacheError(
+            f"Invalid tolerance: {options.tolerance}. tolerance must be a "
+            "non-negative float."
+        )
+
+
+# ======================================================================================
+# Internal cache
+# ======================================================================================
+
+
+@dataclass(frozen=True)
+class EvaluationCacheInfo:
+    """Statistics of an evaluation cache.
+
+    Attributes:
+        hits: Number of evaluations that were served from the cache.
+        misses: Number of evaluations that were not in the cache.
+        size: Number of parameter vectors that are currently stored.
+        max_size: Maximum number of stored parameter vectors.
+
+    """
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of evaluations that were served from the cache."""
+        n_lookups = self.hits + self.misses
+        return self.hits / n_lookups if n_lookups else 0.0
+
+
+class EvaluationCache:
+    """Bounded least recently used cache of evaluation results.
+
+    For each parameter vector, the results of several tasks (e.g. fun and jac) are
+    stored. The cache is thread-safe. Copies that are sent to other processes are
+    independent of the original.
+
+    Args:
+        options: The evaluation cache options.
+
+    """
+
+    def __init__(self, options: EvaluationCacheOptions) -> None:
+        self._max_size = options.max_size
+        self._tolerance = options.tolerance
+        self._entries: OrderedDict[bytes, dict[EvalTask, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def tolerance(self) -> float:
+        return self._tolerance
+
+    def lookup(self, x: NDArray[np.float64]) -> dict[EvalTask, Any]:
+        """Get the cached results at x.
+
+        Args:
+            x: The internal parameter vector.
+
+        Returns:
+            A dictionary that maps tasks to cached results. It is empty if nothing
+            is cached at x.
+
+        """
+        key = self._get_key(x)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+            self._entries.move_to_end(key)
+            return dict(entry)
+
+    def store(self, x: NDArray[np.float64], task: EvalTask, result: Any) -> None:
+        """Store the result of a task at x and evict old entries if necessary.
+
+        Args:
+            x: The internal parameter vector.
+            task: The evaluation task.
+            result: The result of the evaluation.
+
+        """
+        key = self._get_key(x)
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry[task] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def record(self, hit: bool) -> None:
+        """Update the hit and miss counters."""
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def info(self) -> EvaluationCacheInfo:
+        with self._lock:
+            return EvaluationCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._entries),
+                max_size=self._max_size,
+            )
+
+    def _get_key(self, x: NDArray[np.float64]) -> bytes:
+        x = np.asarray(x, dtype=np.float64)
+        if self._tolerance > 0:
+            return np.round(x / self._tolerance).astype(np.int64).tobytes()
+        # adding 0.0 maps -0.0 to 0.0 such that both share an entry
+        return np.ascontiguousarray(x + 0.0).tobytes()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -44,7 +44,7 @@ class ScalarFunctionValue(SpecificFunctionValue):
 
     def internal_value(self, solver_type: AggregationLevel) -> float:
         if solver_type == AggregationLevel.SCALAR:
-            val = float(self.value)
+            val = _to_scalar(self.value)
         else:
             raise InvalidFunctionError(
                 f"You are using a {solver_type.value} optimizer but provided a "
@@ -80,7 +80,7 @@ class LeastSquaresFunctionValue(SpecificFunctionValue):
         elif solver_type == AggregationLevel.LIKELIHOOD:
             val = resid**2
         else:
-            val = float(resid @ resid)
+            val = _to_scalar(resid @ resid)
         return val
 
 
@@ -108,7 +108,7 @@ class LikelihoodFunctionValue(SpecificFunctionValue):
         if solver_type == AggregationLevel.LIKELIHOOD:
             val = loglikes
         elif solver_type == AggregationLevel.SCALAR:
-            val = float(np.sum(loglikes))
+            val = _to_scalar(np.sum(loglikes))
         else:
             raise InvalidFunctionError(
                 "You are using a least_squares optimizer but provided a "
@@ -127,8 +127,21 @@ def _get_flat_value(value: PyTree) -> NDArray[np.float64]:
         registry = get_registry(extended=True)
         flat = tree_just_flatten(value, registry=registry)
 
-    flat_arr = np.asarray(flat, dtype=np.float64)
-    return flat_arr
+    flat_arr = np.asarray(flat)
+    dtype = np.complex128 if np.iscomplexobj(flat_arr) else np.float64
+    return flat_arr.astype(dtype, copy=False)
+
+
+def _to_scalar(value: Scalar) -> float:
+    """Convert a scalar to float, keeping complex values for complex step derivatives.
+
+    The aggregations in internal_value are analytic, so the imaginary parts of complex
+    function values carry the derivative information.
+
+    """
+    if np.iscomplexobj(value):
+        return complex(value)  # type: ignore[return-value]
+    return float(value)
 
 
 def convert_fun_output_to_function_value(
@@ -228,6 +241,34 @@ def enforce_return_type(
     return decorator_enforce
 
 
+def enforce_return_type_vectorized(
+    problem_type: AggregationLevel,
+) -> Callable[
+    [Callable[P, Any]],
+    Callable[P, list[SpecificFunctionValue]],
+]:
+    """Enforce a strict return type for vectorized objective functions.
+
+    Each of the function values returned by the vectorized function is converted like
+    in `enforce_return_type`.
+
+    """
+
+    def decorator_enforce(
+        func: Callable[P, Any],
+    ) -> Callable[P, list[SpecificFunctionValue]]:
+        @functools.wraps(func)
+        def wrapper_enforce(
+            *args: P.args, **kwargs: P.kwargs
+        ) -> list[SpecificFunctionValue]:
+            raw = func(*args, **kwargs)
+            return [convert_fun_output_to_function_value(r, problem_type) for r in raw]
+
+        return wrapper_enforce
+
+    return decorator_enforce
+
+
 def enforce_return_type_with_jac(
     problem_type: AggregationLevel,
 ) -> Callable[
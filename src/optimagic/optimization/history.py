@@ -1,12 +1,13 @@
+import threading
 import warnings
 from dataclasses import dataclass
-from functools import partial
+from functools import cache
 from typing import Any, Callable, Iterable, Literal
 
 import numpy as np
 import pandas as pd
 from numpy.typing import NDArray
-from pybaum import leaf_names, tree_just_flatten
+from pybaum import leaf_names, tree_just_flatten, tree_unflatten
 
 from optimagic.parameters.tree_registry import get_registry
 from optimagic.timing import CostModel
@@ -41,32 +42,64 @@ class History:
         example for usage during an optimization process, or with data, for example to
         recover a history from a log.
 
+        The data is stored in preallocated numpy arrays that grow geometrically. The
+        params are stored as flat float arrays and only converted back to pytrees when
+        they are requested. The first params serve as template for the conversion, so
+        all params in a history must have the same structure.
+
         """
         _validate_args_are_all_none_or_lists_of_same_length(
             params, fun, start_time, stop_time, batches, task
         )
 
         self.direction = direction
-        self._params = params if params is not None else []
-        self._fun = fun if fun is not None else []
-        self._start_time = start_time if start_time is not None else []
-        self._stop_time = stop_time if stop_time is not None else []
-        self._batches = batches if batches is not None else []
-        self._task = task if task is not None else []
+        self._n_entries = 0
+        self._params_template: PyTree = None
+        self._flat_params = np.empty((0, 0), dtype=np.float64)
+        self._fun = np.empty(0, dtype=np.float64)
+        self._fun_is_none = np.empty(0, dtype=np.bool_)
+        self._start_time = np.empty(0, dtype=np.float64)
+        self._stop_time = np.empty(0, dtype=np.float64)
+        self._batches = np.empty(0, dtype=np.int64)
+        self._task = np.empty(0, dtype=np.int8)
+        # Batch evaluators that use threads can add entries concurrently. The lock
+        # keeps the columns aligned and the batch ids of concurrent batches distinct.
+        self._lock = threading.RLock()
+
+        if params is not None:
+            self._append_entries(
+                params=params,
+                fun=fun,  # type: ignore[arg-type]
+                start_time=start_time,  # type: ignore[arg-type]
+                stop_time=stop_time,  # type: ignore[arg-type]
+                batches=batches,  # type: ignore[arg-type]
+                task=task,  # type: ignore[arg-type]
+            )
 
     # ==================================================================================
     # Methods to add entries to the history
     # ==================================================================================
 
     def add_entry(self, entry: HistoryEntry, batch_id: int | None = None) -> None:
-        if batch_id is None:
-            batch_id = self._get_next_batch_id()
-        self._params.append(entry.params)
-        self._fun.append(entry.fun)
-        self._start_time.append(entry.start_time)
-        self._stop_time.append(entry.stop_time)
-        self._batches.append(batch_id)
-        self._task.append(entry.task)
+        with self._lock:
+            if batch_id is None:
+                batch_id = self._get_next_batch_id()
+            if self._params_template is None:
+                self._params_template = entry.params
+            flat_params = _get_flat_params_array([entry.params], self._n_params)[0]
+            self._reserve(n_new=1, n_params=len(flat_params))
+
+            i = self._n_entries
+            self._flat_params[i] = flat_params
+            self._fun[i] = np.nan if entry.fun is None else entry.fun
+            self._fun_is_none[i] = entry.fun is None
+            self._start_time[i] = (
+                np.nan if entry.start_time is None else entry.start_time
+            )
+            self._stop_time[i] = np.nan if entry.stop_time is None else entry.stop_time
+            self._batches[i] = batch_id
+            self._task[i] = _TASK_CODES[entry.task]
+            self._n_entries += 1
 
     def add_batch(
         self, batch: list[HistoryEntry], batch_size: int | None = None
@@ -78,20 +111,119 @@ class History:
         if batch_size is None:
             batch_size = len(batch)
 
-        start = self._get_next_batch_id()
-        n_batches = int(np.ceil(len(batch) / batch_size))
-        ids = np.repeat(np.arange(start, start + n_batches), batch_size)[: len(batch)]
+        with self._lock:
+            start = self._get_next_batch_id()
+            n_batches = int(np.ceil(len(batch) / batch_size))
+            ids = np.repeat(np.arange(start, start + n_batches), batch_size)[
+                : len(batch)
+            ]
+
+            self._append_entries(
+                params=[entry.params for entry in batch],
+                fun=[entry.fun for entry in batch],
+                start_time=[entry.start_time for entry in batch],
+                stop_time=[entry.stop_time for entry in batch],
+                batches=ids.tolist(),
+                task=[entry.task for entry in batch],
+            )
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        # Only the filled part of the columns is pickled.
+        for name in _COLUMNS:
+            state[name] = state[name][: self._n_entries].copy()
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _append_entries(
+        self,
+        params: list[PyTree],
+        fun: list[float | None],
+        start_time: list[float | None],
+        stop_time: list[float | None],
+        batches: list[int | None],
+        task: list[EvalTask | None],
+    ) -> None:
+        """Append entries to the columns; all arguments are lists of the same length."""
+        n_new = len(params)
+        if n_new == 0:
+            return
+
+        with self._lock:
+            if self._params_template is None:
+                self._params_template = params[0]
+            flat_params = _get_flat_params_array(params, n_params=self._n_params)
+            self._reserve(n_new=n_new, n_params=flat_params.shape[1])
+            new = slice(self._n_entries, self._n_entries + n_new)
+            self._flat_params[new] = flat_params
+            self._fun[new] = np.array(fun, dtype=np.float64)  # converts None to nan
+            self._fun_is_none[new] = [f is None for f in fun]
+            self._start_time[new] = np.array(start_time, dtype=np.float64)
+            self._stop_time[new] = np.array(stop_time, dtype=np.float64)
+            self._batches[new] = [_MISSING if b is None else b for b in batches]
+            self._task[new] = [_TASK_CODES[t] for t in task]
+            self._n_entries += n_new
+
+    def _reserve(self, n_new: int, n_params: int) -> None:
+        """Make sure that the columns can hold n_new additional entries."""
+        n_required = self._n_entries + n_new
+        capacity = len(self._fun)
+        if n_required > capacity or self._flat_params.shape[1] != n_params:
+            # The number of params is only known once the first entry is added.
+            capacity = max(n_required, 2 * capacity, _MIN_CAPACITY)
+            for name in _COLUMNS:
+                old = getattr(self, name)
+                shape = (capacity, n_params) if old.ndim == 2 else (capacity,)
+                new = np.empty(shape, dtype=old.dtype)
+                if self._n_entries > 0:
+                    new[: self._n_entries] = old[: self._n_entries]
+                setattr(self, name, new)
 
-        for entry, id in zip(batch, ids, strict=False):
-            self.add_entry(entry, id)
+    @property
+    def _n_params(self) -> int | None:
+        return self._flat_params.shape[1] if self._n_entries > 0 else None
 
     def _get_next_batch_id(self) -> int:
-        if not self._batches:
+        if self._n_entries == 0:
             batch = 0
         else:
-            batch = self._batches[-1] + 1
+            batch = int(self._batches[self._n_entries - 1]) + 1
         return batch
 
+    # ==================================================================================
+    # Views on the filled part of the columns
+    # ==================================================================================
+
+    @property
+    def _fun_arr(self) -> NDArray[np.float64]:
+        """The function values with nan for missing values."""
+        return self._fun[: self._n_entries]
+
+    @property
+    def _flat_params_arr(self) -> NDArray[np.float64]:
+        return self._flat_params[: self._n_entries]
+
+    @property
+    def _start_time_arr(self) -> NDArray[np.float64]:
+        return self._start_time[: self._n_entries]
+
+    @property
+    def _stop_time_arr(self) -> NDArray[np.float64]:
+        return self._stop_time[: self._n_entries]
+
+    @property
+    def _batches_arr(self) -> NDArray[np.int64]:
+        return self._batches[: self._n_entries]
+
+    @property
+    def _task_arr(self) -> NDArray[np.int8]:
+        """The positions of the tasks in EvalTask, -1 for missing tasks."""
+        return self._task[: self._n_entries]
+
     # ==================================================================================
     # Properties and methods to access the history
     # ==================================================================================
@@ -116,17 +248,17 @@ class History:
         if monotone:
             fun = self.monotone_fun
         else:
-            fun = np.array(self.fun, dtype=np.float64)  # converts None to nan
+            fun = self._fun_arr.copy()
 
         timings = self._get_total_timings(cost_model)
-        task = _task_to_categorical(self.task)
+        task_codes = self._task_arr
 
         if not self._is_serial():
             # In the non-serial case, we take the batching into account and reduce
             # timings and fun to one value per batch.
             timings = _apply_reduction_to_batches(
                 data=timings,
-                batch_ids=self.batches,
+                batch_ids=self._batches_arr,
                 reduction_function=cost_model.aggregate_batch_time,
             )
 
@@ -135,24 +267,24 @@ class History:
             )
             fun = _apply_reduction_to_batches(
                 data=fun,
-                batch_ids=self.batches,
+                batch_ids=self._batches_arr,
                 reduction_function=min_or_max,  # type: ignore[arg-type]
             )
 
             # Verify that tasks are homogeneous in each batch, and select first if true.
-            tasks_and_batches = pd.DataFrame({"task": task, "batches": self.batches})
-            grouped_tasks = tasks_and_batches.groupby("batches")["task"]
-            if not grouped_tasks.nunique().eq(1).all():
-                raise ValueError("Tasks are not homogeneous in each batch.")
-
-            task = grouped_tasks.first().reset_index(drop=True)
+            batch_starts = self._get_homogeneous_batch_starts()
+            task_codes = task_codes[batch_starts]
 
         time = np.cumsum(timings)
+        task = _task_codes_to_categorical(task_codes)
         return pd.DataFrame({"fun": fun, "time": time, "task": task})
 
     @property
     def fun(self) -> list[float | None]:
-        return self._fun
+        fun: list[float | None] = self._fun_arr.tolist()
+        for i in np.flatnonzero(self._fun_is_none[: self._n_entries]):
+            fun[i] = None
+        return fun
 
     @property
     def monotone_fun(self) -> NDArray[np.float64]:
@@ -161,7 +293,7 @@ class History:
         If the value is None, the output at that position is nan.
 
         """
-        return _calculate_monotone_sequence(self.fun, direction=self.direction)
+        return _calculate_monotone_sequence(self._fun_arr, direction=self.direction)
 
     # Acceptance
     # ----------------------------------------------------------------------------------
@@ -176,7 +308,7 @@ class History:
         False.
 
         """
-        fun_arr = np.array(self.fun, dtype=np.float64)
+        fun_arr = self._fun_arr
         if self.direction == Direction.MINIMIZE:
             return fun_arr <= self.monotone_fun
         elif self.direction == Direction.MAXIMIZE:
@@ -205,67 +337,71 @@ class History:
                 row).
 
         """
-        wide = pd.DataFrame(self.flat_params, columns=self.flat_param_names)
-        wide["task"] = _task_to_categorical(self.task)
-        wide["fun"] = self.fun
+        fun = self._fun_arr
+        positions = np.arange(self._n_entries)
 
         # If requested, we collapse the batches and only keep the parameters that led to
         # the minimal (or maximal) function value in each batch.
         if collapse_batches and not self._is_serial():
-            wide["batches"] = self.batches
-
-            # Verify that tasks are homogeneous in each batch
-            if not wide.groupby("batches")["task"].nunique().eq(1).all():
-                raise ValueError("Tasks are not homogeneous in each batch.")
+            self._get_homogeneous_batch_starts()
 
             # We fill nans with inf or -inf to make sure that the idxmin/idxmax is
             # well-defined, since there is the possibility that all fun values are nans
             # in a batch.
-            if self.direction == Direction.MINIMIZE:
-                loc = (
-                    wide.assign(fun_without_nan=wide["fun"].fillna(np.inf))
-                    .groupby("batches")["fun_without_nan"]
-                    .idxmin()
+            grouped = pd.Series(
+                np.where(
+                    np.isnan(fun),
+                    np.inf if self.direction == Direction.MINIMIZE else -np.inf,
+                    fun,
                 )
+            ).groupby(self._batches_arr)
+            if self.direction == Direction.MINIMIZE:
+                positions = grouped.idxmin().to_numpy()
             elif self.direction == Direction.MAXIMIZE:
-                loc = (
-                    wide.assign(fun_without_nan=wide["fun"].fillna(-np.inf))
-                    .groupby("batches")["fun_without_nan"]
-                    .idxmax()
-                )
-
-            wide = wide.loc[loc].drop(columns="batches")
+                positions = grouped.idxmax().to_numpy()
 
         # We drop rows with missing values if requested. These correspond to parameters
         # that were used to calculate pure jacobians. This step must be done before
-        # dropping the fun column and before setting the counter.
+        # setting the counter.
         if dropna:
-            wide = wide.dropna(subset="fun")
-
-        wide["counter"] = np.arange(len(wide))
-
-        long = pd.melt(
-            wide,
-            var_name="name",
-            value_name="value",
-            id_vars=["task", "counter", "fun"],
+            positions = positions[~np.isnan(fun[positions])]
+
+        names = self.flat_param_names
+        n_params = len(names)
+        data = pd.DataFrame(
+            {
+                "counter": np.repeat(np.arange(len(positions)), n_params),
+                "name": np.tile(names, len(positions)),
+                "value": self._flat_params_arr[positions].ravel(),
+                "task": _task_codes_to_categorical(
+                    np.repeat(self._task_arr[positions], n_params)
+                ),
+                "fun": np.repeat(fun[positions], n_params),
+            }
         )
 
-        data = long.reindex(columns=["counter", "name", "value", "task", "fun"])
-
         return data.set_index(["counter", "name"]).sort_index()
 
     @property
     def params(self) -> list[PyTree]:
-        return self._params
+        return _get_params_from_flat_params(
+            self._flat_params_arr, template=self._params_template
+        )
 
     @property
-    def flat_params(self) -> list[list[float]]:
-        return _get_flat_params(self._params)
+    def flat_params(self) -> NDArray[np.float64]:
+        """The flattened parameters as 2d array with one row per history entry.
+
+        Up to optimagic 0.5.1, this was a list of lists.
+
+        """
+        return self._flat_params_arr.copy()
 
     @property
     def flat_param_names(self) -> list[str]:
-        return _get_flat_param_names(param=self._params[0])
+        if self._params_template is None:
+            return []
+        return _get_flat_param_names(param=self._params_template)
 
     # Time
     # ----------------------------------------------------------------------------------
@@ -287,7 +423,7 @@ class History:
             raise TypeError("cost_model must be a CostModel or 'wall_time'.")
 
         if cost_model == "wall_time":
-            return np.array(self.stop_time, dtype=np.float64) - self.start_time[0]
+            return self._stop_time_arr - self._start_time_arr[0]
 
         fun_time = self._get_timings_per_task(
             task=EvalTask.FUN, cost_factor=cost_model.fun
@@ -317,12 +453,10 @@ class History:
                 requested task, the time is 0.
 
         """
-        task_mask = np.array([1 if t == task else 0 for t in self.task])
+        task_mask = (self._task_arr == _TASK_CODES[task]).astype(np.int64)
         factor: float | NDArray[np.float64]
         if cost_factor is None:
-            factor = np.array(self.stop_time, dtype=np.float64) - np.array(
-                self.start_time, dtype=np.float64
-            )
+            factor = self._stop_time_arr - self._start_time_arr
         else:
             factor = cost_factor
 
@@ -330,28 +464,42 @@ class History:
 
     @property
     def start_time(self) -> list[float]:
-        return self._start_time
+        return self._start_time_arr.tolist()
 
     @property
     def stop_time(self) -> list[float]:
-        return self._stop_time
+        return self._stop_time_arr.tolist()
 
     # Batches and fast_path
     # ----------------------------------------------------------------------------------
 
     @property
-    def batches(self) -> list[int]:
-        return self._batches
+    def batches(self) -> list[int | None]:
+        return [None if b == _MISSING else b for b in self._batches_arr.tolist()]
 
     def _is_serial(self) -> bool:
-        return np.array_equal(self.batches, np.arange(len(self.batches)))
+        return np.array_equal(self._batches_arr, np.arange(self._n_entries))
+
+    def _get_homogeneous_batch_starts(self) -> NDArray[np.int64]:
+        """Get the start positions of all batches.
+
+        Raises:
+            ValueError: If the tasks are not homogeneous in each batch.
+
+        """
+        batches = self._batches_arr
+        tasks = self._task_arr
+        in_same_batch = batches[1:] == batches[:-1]
+        if (tasks[1:][in_same_batch] != tasks[:-1][in_same_batch]).any():
+            raise ValueError("Tasks are not homogeneous in each batch.")
+        return np.flatnonzero(np.append(True, ~in_same_batch))
 
     # Tasks
     # ----------------------------------------------------------------------------------
 
     @property
-    def task(self) -> list[EvalTask]:
-        return self._task
+    def task(self) -> list[EvalTask | None]:
+        return [_TASKS[code] if code >= 0 else None for code in self._task_arr]
 
     # ==================================================================================
     # Add deprecated dict access
@@ -364,7 +512,7 @@ class History:
             "`start_time` method instead."
         )
         warnings.warn(msg, FutureWarning)
-        arr = np.array(self._start_time)
+        arr = self._start_time_arr
         return (arr - arr[0]).tolist()
 
     @property
@@ -393,15 +541,70 @@ class History:
 # ======================================================================================
 
 
-def _get_flat_params(params: list[PyTree]) -> list[list[float]]:
-    fast_path = len(params) > 0 and _is_1d_array(params[0])
-    if fast_path:
-        flatten = lambda x: x.tolist()
-    else:
-        registry = get_registry(extended=True)
-        flatten = partial(tree_just_flatten, registry=registry)
+_TASKS: tuple[EvalTask, ...] = tuple(EvalTask)
+_TASK_CODES: dict[EvalTask | None, int] = {
+    None: -1,
+    **{task: code for code, task in enumerate(_TASKS)},
+}
+
+# Marks missing batch ids
+_MISSING = -1
 
-    return [flatten(p) for p in params]
+_COLUMNS = (
+    "_flat_params",
+    "_fun",
+    "_fun_is_none",
+    "_start_time",
+    "_stop_time",
+    "_batches",
+    "_task",
+)
+
+_MIN_CAPACITY = 64
+
+
+def _get_flat_params_array(
+    params: list[PyTree], n_params: int | None
+) -> NDArray[np.float64]:
+    """Flatten params to a 2d array with one row per params.
+
+    Raises:
+        ValueError: If the params do not have n_params entries or differ in structure.
+
+    """
+    try:
+        if _is_1d_array(params[0]):
+            flat = np.array(params, dtype=np.float64)
+        else:
+            registry = _get_extended_registry()
+            flat = np.array(
+                [tree_just_flatten(p, registry=registry) for p in params],
+                dtype=np.float64,
+            )
+    except ValueError as e:
+        raise ValueError("All params in a History must have the same structure.") from e
+
+    if flat.ndim != 2 or (n_params is not None and flat.shape[1] != n_params):
+        raise ValueError("All params in a History must have the same structure.")
+    return flat
+
+
+def _get_params_from_flat_params(
+    flat_params: NDArray[np.float64], template: PyTree
+) -> list[PyTree]:
+    if _is_1d_array(template):
+        return list(flat_params.copy())
+
+    registry = _get_extended_registry()
+    return [
+        tree_unflatten(template, flat.tolist(), registry=registry)
+        for flat in flat_params
+    ]
+
+
+@cache
+def _get_extended_registry() -> dict[type, Any]:
+    return get_registry(extended=True)
 
 
 def _get_flat_param_names(param: PyTree) -> list[str]:
@@ -420,7 +623,7 @@ def _is_1d_array(param: PyTree) -> bool:
 
 
 def _calculate_monotone_sequence(
-    sequence: list[float | None], direction: Direction
+    sequence: list[float | None] | NDArray[np.float64], direction: Direction
 ) -> NDArray[np.float64]:
     sequence_arr = np.array(sequence, dtype=np.float64)  # converts None to nan
     nan_mask = np.isnan(sequence_arr)
@@ -459,13 +662,17 @@ def _validate_args_are_all_none_or_lists_of_same_length(
 
 
 def _task_to_categorical(task: list[EvalTask]) -> "pd.Series[str]":
+    return _task_codes_to_categorical(np.array([_TASK_CODES[t] for t in task]))
+
+
+def _task_codes_to_categorical(codes: NDArray[np.int8]) -> "pd.Series[str]":
     EvalTaskDtype = pd.CategoricalDtype(categories=[t.value for t in EvalTask])
-    return pd.Series([t.value for t in task], dtype=EvalTaskDtype)
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=EvalTaskDtype))
 
 
 def _apply_reduction_to_batches(
     data: NDArray[np.float64],
-    batch_ids: list[int],
+    batch_ids: list[int] | NDArray[np.int64],
     reduction_function: Callable[[Iterable[float]], float],
 ) -> NDArray[np.float64]:
     """Apply a reduction operator on batches of data.
@@ -474,8 +681,8 @@ def _apply_reduction_to_batches(
 
     Args:
         data: 1d array with data.
-        batch_ids: A list with batch ids whose length is equal to the size of data.
-            Values need to be sorted and can be repeated.
+        batch_ids: A list or array with batch ids whose length is equal to the size of
+            data. Values need to be sorted and can be repeated.
         reduction_function: A reduction function that takes an iterable of floats as
             input (e.g., a numpy.ndarray or list of floats) and returns a scalar. The
             function must be able to handle NaN's.
@@ -522,7 +729,9 @@ def _apply_reduction_to_batches(
     return np.array(batch_results, dtype=np.float64)
 
 
-def _get_batch_starts_and_stops(batch_ids: list[int]) -> tuple[list[int], list[int]]:
+def _get_batch_starts_and_stops(
+    batch_ids: list[int] | NDArray[np.int64],
+) -> tuple[list[int], list[int]]:
     """Get start and stop indices of batches.
 
     This function assumes that batch_ids are non-empty and sorted.
@@ -1,18 +1,28 @@
+import itertools
 import time
 import warnings
 from copy import copy
-from dataclasses import asdict, dataclass, replace
+from dataclasses import dataclass, replace
 from typing import Any, Callable, cast
 
 import numpy as np
+import scipy.sparse as sp
 from numpy.typing import NDArray
 from typing_extensions import Self
 
 from optimagic.differentiation.derivatives import first_derivative
-from optimagic.differentiation.numdiff_options import NumdiffOptions
-from optimagic.exceptions import UserFunctionRuntimeError, get_traceback
+from optimagic.differentiation.numdiff_options import (
+    NumdiffOptions,
+    get_derivative_kwargs,
+)
+from optimagic.exceptions import (
+    InvalidFunctionError,
+    UserFunctionRuntimeError,
+    get_traceback,
+)
 from optimagic.logging.logger import LogStore
 from optimagic.logging.types import IterationState
+from optimagic.optimization.evaluation_cache import EvaluationCache
 from optimagic.optimization.fun_value import SpecificFunctionValue
 from optimagic.optimization.history import History, HistoryEntry
 from optimagic.parameters.bounds import Bounds
@@ -55,9 +65,13 @@ class InternalOptimizationProblem:
         linear_constraints: list[dict[str, Any]] | None,
         nonlinear_constraints: list[dict[str, Any]] | None,
         logger: LogStore[Any, Any] | None,
+        evaluation_cache: EvaluationCache | None = None,
+        vectorized_fun: Callable[[NDArray[np.float64]], list[SpecificFunctionValue]]
+        | None = None,
         # TODO: add hess and hessp
     ):
         self._fun = fun
+        self._vectorized_fun = vectorized_fun
         self._jac = jac
         self._fun_and_jac = fun_and_jac
         self._converter = converter
@@ -65,6 +79,12 @@ class InternalOptimizationProblem:
         self._direction = direction
         self._bounds = bounds
         self._numdiff_options = numdiff_options
+        # a gradient has only one row, so sparsity only pays off for Jacobians
+        self._jac_sparsity = (
+            None
+            if solver_type == AggregationLevel.SCALAR
+            else numdiff_options.jac_sparsity
+        )
         self._error_handling = error_handling
         self._error_penalty_func = error_penalty_func
         self._batch_evaluator = batch_evaluator
@@ -72,27 +92,45 @@ class InternalOptimizationProblem:
         self._linear_constraints = linear_constraints
         self._nonlinear_constraints = nonlinear_constraints
         self._logger = logger
+        self._evaluation_cache = evaluation_cache
+        self._collected_log_entries: list[IterationState] | None = None
         self._step_id: int | None = None
+        self._worker_functions: dict[str, Callable[..., Any]] = {}
+
+    def __copy__(self) -> Self:
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        # the worker functions belong to the state of self, which the copy can change
+        new._worker_functions = {}
+        return new
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "_worker_functions": {}}
 
     # ==================================================================================
     # Public methods used by optimizers
     # ==================================================================================
 
     def fun(self, x: NDArray[np.float64]) -> float | NDArray[np.float64]:
-        fun_value, hist_entry = self._evaluate_fun(x)
+        fun_value, hist_entry, log_entry = self._evaluate_fun(x)
         self._history.add_entry(hist_entry)
+        self._log([log_entry])
         return fun_value
 
     def jac(self, x: NDArray[np.float64]) -> NDArray[np.float64]:
-        jac_value, hist_entry = self._evaluate_jac(x)
+        self._detect_jac_sparsity_if_needed(x)
+        jac_value, hist_entry, log_entry = self._evaluate_jac(x)
         self._history.add_entry(hist_entry)
+        self._log([log_entry])
         return jac_value
 
     def fun_and_jac(
         self, x: NDArray[np.float64]
     ) -> tuple[float | NDArray[np.float64], NDArray[np.float64]]:
-        fun_and_jac_value, hist_entry = self._evaluate_fun_and_jac(x)
+        self._detect_jac_sparsity_if_needed(x)
+        fun_and_jac_value, hist_entry, log_entry = self._evaluate_fun_and_jac(x)
         self._history.add_entry(hist_entry)
+        self._log([log_entry])
         return fun_and_jac_value
 
     def batch_fun(
@@ -102,16 +140,11 @@ class InternalOptimizationProblem:
         batch_size: int | None = None,
     ) -> list[float | NDArray[np.float64]]:
         batch_size = n_cores if batch_size is None else batch_size
-        batch_result = self._batch_evaluator(
-            func=self._evaluate_fun,
-            arguments=x_list,
-            n_cores=n_cores,
-            # This should always be raise because errors are already handled
-            error_handling="raise",
-        )
+        batch_result = self._batch_evaluate(EvalTask.FUN, x_list, n_cores)
         fun_values = [result[0] for result in batch_result]
         hist_entries = [result[1] for result in batch_result]
         self._history.add_batch(hist_entries, batch_size)
+        self._log([result[2] for result in batch_result])
 
         return fun_values
 
@@ -123,16 +156,11 @@ class InternalOptimizationProblem:
     ) -> list[NDArray[np.float64]]:
         batch_size = n_cores if batch_size is None else batch_size
 
-        batch_result = self._batch_evaluator(
-            func=self._evaluate_jac,
-            arguments=x_list,
-            n_cores=n_cores,
-            # This should always be raise because errors are already handled
-            error_handling="raise",
-        )
+        batch_result = self._batch_evaluate(EvalTask.JAC, x_list, n_cores)
         jac_values = [result[0] for result in batch_result]
         hist_entries = [result[1] for result in batch_result]
         self._history.add_batch(hist_entries, batch_size)
+        self._log([result[2] for result in batch_result])
         return jac_values
 
     def batch_fun_and_jac(
@@ -142,16 +170,11 @@ class InternalOptimizationProblem:
         batch_size: int | None = None,
     ) -> list[tuple[float | NDArray[np.float64], NDArray[np.float64]]]:
         batch_size = n_cores if batch_size is None else batch_size
-        batch_result = self._batch_evaluator(
-            func=self._evaluate_fun_and_jac,
-            arguments=x_list,
-            n_cores=n_cores,
-            # This should always be raise because errors are already handled
-            error_handling="raise",
-        )
+        batch_result = self._batch_evaluate(EvalTask.FUN_AND_JAC, x_list, n_cores)
         fun_and_jac_values = [result[0] for result in batch_result]
         hist_entries = [result[1] for result in batch_result]
         self._history.add_batch(hist_entries, batch_size)
+        self._log([result[2] for result in batch_result])
 
         return fun_and_jac_values
 
@@ -162,16 +185,11 @@ class InternalOptimizationProblem:
         batch_size: int | None = None,
     ) -> list[float]:
         batch_size = n_cores if batch_size is None else batch_size
-        batch_result = self._batch_evaluator(
-            func=self._evaluate_exploration_fun,
-            arguments=x_list,
-            n_cores=n_cores,
-            # This should always be raise because errors are already handled
-            error_handling="raise",
-        )
+        batch_result = self._batch_evaluate(EvalTask.EXPLORATION, x_list, n_cores)
         fun_values = [result[0] for result in batch_result]
         hist_entries = [result[1] for result in batch_result]
         self._history.add_batch(hist_entries, batch_size)
+        self._log([result[2] for result in batch_result])
 
         return fun_values
 
@@ -190,6 +208,19 @@ class InternalOptimizationProblem:
         new._step_id = step_id
         return new
 
+    def with_log_collection(self) -> Self:
+        """Return a copy that collects log entries instead of writing them.
+
+        The copy has no logger, so it is cheap to send to a worker process. The log
+        entries of all evaluations are available as `collected_log_entries` and can be
+        written by a single writer in the parent process.
+
+        """
+        new = copy(self)
+        new._logger = None
+        new._collected_log_entries = []
+        return new
+
     # ==================================================================================
     # Public attributes
     # ==================================================================================
@@ -218,64 +249,265 @@ class InternalOptimizationProblem:
     def logger(self) -> LogStore[Any, Any] | None:
         return self._logger
 
+    @property
+    def evaluation_cache(self) -> EvaluationCache | None:
+        return self._evaluation_cache
+
+    @property
+    def collected_log_entries(self) -> list[IterationState] | None:
+        return self._collected_log_entries
+
     # ==================================================================================
     # Implementation of the public functions; The main difference is that the lower-
-    # level implementations return a history entry instead of adding it to the history
-    # directly so they can be called in parallel!
+    # level implementations return a history and log entry instead of adding them to
+    # the history and the log directly so they can be called in parallel. The entries
+    # are then written by the parent process.
     # ==================================================================================
 
-    def _evaluate_fun(
-        self, x: NDArray[np.float64]
-    ) -> tuple[float | NDArray[np.float64], HistoryEntry]:
-        fun_value, hist_entry, log_entry = self._pure_evaluate_fun(x)
+    def _log(self, log_entries: list[IterationState]) -> None:
+        if self._collected_log_entries is not None:
+            self._collected_log_entries.extend(log_entries)
+        elif self._logger:
+            self._logger.iteration_store.insert_many(log_entries)
+
+    def _for_workers(self) -> Self:
+        """Return a copy without logger, evaluation cache and history.
+
+        The copy can be cheaply sent to worker processes. Cache lookups for batch
+        evaluations are done in the parent process and the history and log are
+        written there.
+
+        """
+        new = copy(self)
+        new._logger = None
+        new._evaluation_cache = None
+        new._history = History(self.direction)
+        new._collected_log_entries = None
+        return new
+
+    def _get_worker_function(self, name: str) -> Callable[..., Any]:
+        """Get a method of the copy of self that is sent to worker processes.
 
-        if self._logger:
-            self._logger.iteration_store.insert(log_entry)
+        The copy and its bound methods are only created once. Since they do not
+        contain any state that changes between evaluations, batch evaluators that
+        recognize functions by identity, like PoolBatchEvaluator, can send them to each
+        worker only once.
 
-        return fun_value, hist_entry
+        """
+        if not self._worker_functions:
+            worker_problem = self._for_workers()
+            self._worker_functions = {
+                method: getattr(worker_problem, method)
+                for method in (
+                    "_evaluate_fun",
+                    "_evaluate_jac",
+                    "_evaluate_fun_and_jac",
+                    "_evaluate_exploration_fun",
+                    "_pure_evaluate_vectorized_fun",
+                    "_pure_vectorized_exploration_fun",
+                )
+            }
+        return self._worker_functions[name]
+
+    def _batch_evaluate(
+        self, task: EvalTask, x_list: list[NDArray[np.float64]], n_cores: int
+    ) -> list[tuple[Any, HistoryEntry, IterationState]]:
+        """Evaluate a task at several points and only send cache misses to workers."""
+        if task in (EvalTask.JAC, EvalTask.FUN_AND_JAC) and x_list:
+            self._detect_jac_sparsity_if_needed(x_list[0])
+        evaluate = self._get_worker_function(
+            {
+                EvalTask.FUN: "_evaluate_fun",
+                EvalTask.JAC: "_evaluate_jac",
+                EvalTask.FUN_AND_JAC: "_evaluate_fun_and_jac",
+                EvalTask.EXPLORATION: "_evaluate_exploration_fun",
+            }[task]
+        )
+
+        results = [self._lookup_cache(x, task) for x in x_list]
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        if missing:
+            x_missing = [x_list[i] for i in missing]
+            if self._vectorized_fun is not None and task in (
+                EvalTask.FUN,
+                EvalTask.EXPLORATION,
+            ):
+                new_results = self._batch_evaluate_vectorized(task, x_missing, n_cores)
+            else:
+                new_results = self._batch_evaluator(
+                    func=evaluate,
+                    arguments=x_missing,
+                    n_cores=n_cores,
+                    # This should always be raise because errors are already handled
+                    error_handling="raise",
+                )
+            for i, result in zip(missing, new_results, strict=True):
+                self._store_in_cache(x_list[i], task, result)
+                results[i] = result
+
+        return cast(list[tuple[Any, HistoryEntry, IterationState]], results)
+
+    def _batch_evaluate_vectorized(
+        self,
+        task: EvalTask,
+        x_list: list[NDArray[np.float64]],
+        n_cores: int,
+    ) -> list[tuple[Any, HistoryEntry, IterationState]]:
+        """Evaluate the vectorized fun in one call per chunk of x_list.
+
+        x_list is split into at most one chunk per core.
+
+        """
+        evaluate = self._get_worker_function(
+            {
+                EvalTask.FUN: "_pure_evaluate_vectorized_fun",
+                EvalTask.EXPLORATION: "_pure_vectorized_exploration_fun",
+            }[task]
+        )
+        n_chunks = max(min(int(n_cores), len(x_list)), 1)
+        chunks = [
+            [x_list[i] for i in positions]
+            for positions in np.array_split(np.arange(len(x_list)), n_chunks)
+        ]
+        chunk_results: list[list[tuple[Any, HistoryEntry, IterationState]]] = (
+            self._batch_evaluator(
+                func=evaluate,
+                arguments=chunks,
+                n_cores=n_cores,
+                error_handling="raise",
+            )
+        )
+        return list(itertools.chain.from_iterable(chunk_results))
+
+    def _evaluate_with_cache(
+        self,
+        x: NDArray[np.float64],
+        task: EvalTask,
+        evaluate: Callable[[NDArray[np.float64]], Any],
+        record: bool = True,
+    ) -> Any:
+        result = self._lookup_cache(x, task, record=record)
+        if result is None:
+            result = evaluate(x)
+            self._store_in_cache(x, task, result)
+        return result
+
+    def _lookup_cache(
+        self, x: NDArray[np.float64], task: EvalTask, record: bool = True
+    ) -> tuple[Any, HistoryEntry, IterationState] | None:
+        """Get a cached result of task at x with history and log entries.
+
+        Cache hits are recorded in the history and log like evaluations of x that take
+        no time. Therefore, the entries get new timestamps, the current step id and,
+        if the cache has a positive tolerance, the params that correspond to x.
+
+        If record is False, the lookup does not count as hit or miss. This is used for
+        lookups that are part of the evaluation of another task.
+
+        """
+        if self._evaluation_cache is None:
+            return None
+
+        cached = _get_cached_result(
+            self._evaluation_cache.lookup(x), task, self._solver_type
+        )
+        if record:
+            self._evaluation_cache.record(hit=cached is not None)
+        if cached is None:
+            return None
+
+        value, hist_entry, log_entry = cached
+        now = time.perf_counter()
+        hist_entry = replace(hist_entry, start_time=now, stop_time=now)
+        log_entry = replace(log_entry, timestamp=now, step=self._step_id)
+        # with a positive tolerance, the cached result can belong to a different x
+        if self._evaluation_cache.tolerance > 0:
+            params = self._converter.params_from_internal(x)
+            hist_entry = replace(hist_entry, params=params)
+            log_entry = replace(log_entry, params=params)
+        return _copy_value(value), hist_entry, log_entry
+
+    def _store_in_cache(
+        self,
+        x: NDArray[np.float64],
+        task: EvalTask,
+        result: tuple[Any, HistoryEntry, IterationState],
+    ) -> None:
+        # penalty values are not cached, such that errors are raised again if the
+        # error handling changes
+        if self._evaluation_cache is not None and result[2].valid:
+            value, hist_entry, log_entry = result
+            self._evaluation_cache.store(
+                x, task, (_copy_value(value), hist_entry, log_entry)
+            )
+
+    def _evaluate_fun(
+        self, x: NDArray[np.float64]
+    ) -> tuple[float | NDArray[np.float64], HistoryEntry, IterationState]:
+        return self._evaluate_with_cache(x, EvalTask.FUN, self._pure_evaluate_fun)
 
     def _evaluate_jac(
         self, x: NDArray[np.float64]
-    ) -> tuple[NDArray[np.float64], HistoryEntry]:
+    ) -> tuple[NDArray[np.float64], HistoryEntry, IterationState]:
+        return self._evaluate_with_cache(x, EvalTask.JAC, self._uncached_evaluate_jac)
+
+    def _uncached_evaluate_jac(
+        self, x: NDArray[np.float64]
+    ) -> tuple[NDArray[np.float64], HistoryEntry, IterationState]:
         if self._jac is not None:
             jac_value, hist_entry, log_entry = self._pure_evaluate_jac(x)
         else:
             if self._fun_and_jac is not None:
-                (_, jac_value), hist_entry, log_entry = self._pure_evaluate_fun_and_jac(
-                    x
-                )
+                fun_and_jac_result = self._pure_evaluate_fun_and_jac(x)
             else:
-                (_, jac_value), hist_entry, log_entry = (
-                    self._pure_evaluate_numerical_fun_and_jac(x)
-                )
+                fun_and_jac_result = self._pure_evaluate_numerical_fun_and_jac(x)
 
+            # the function value is a by-product that can be served from the cache
+            self._store_in_cache(x, EvalTask.FUN_AND_JAC, fun_and_jac_result)
+            (_, jac_value), hist_entry, log_entry = fun_and_jac_result
             hist_entry = replace(hist_entry, task=EvalTask.JAC)
 
-        if self._logger:
-            self._logger.iteration_store.insert(log_entry)
-
-        return jac_value, hist_entry
+        return jac_value, hist_entry, log_entry
 
     def _evaluate_exploration_fun(
         self, x: NDArray[np.float64]
-    ) -> tuple[float, HistoryEntry]:
-        fun_value, hist_entry, log_entry = self._pure_exploration_fun(x)
-
-        if self._logger:
-            self._logger.iteration_store.insert(log_entry)
-
-        return fun_value, hist_entry
+    ) -> tuple[float, HistoryEntry, IterationState]:
+        return self._evaluate_with_cache(
+            x, EvalTask.EXPLORATION, self._pure_exploration_fun
+        )
 
     def _evaluate_fun_and_jac(
         self, x: NDArray[np.float64]
-    ) -> tuple[tuple[float | NDArray[np.float64], NDArray[np.float64]], HistoryEntry]:
+    ) -> tuple[
+        tuple[float | NDArray[np.float64], NDArray[np.float64]],
+        HistoryEntry,
+        IterationState,
+    ]:
+        return self._evaluate_with_cache(
+            x, EvalTask.FUN_AND_JAC, self._uncached_evaluate_fun_and_jac
+        )
+
+    def _uncached_evaluate_fun_and_jac(
+        self, x: NDArray[np.float64]
+    ) -> tuple[
+        tuple[float | NDArray[np.float64], NDArray[np.float64]],
+        HistoryEntry,
+        IterationState,
+    ]:
         if self._fun_and_jac is not None:
             (fun_value, jac_value), hist_entry, log_entry = (
                 self._pure_evaluate_fun_and_jac(x)
             )
         elif self._jac is not None:
-            fun_value, hist_entry, log_entry_fun = self._pure_evaluate_fun(x)
-            jac_value, _, log_entry_jac = self._pure_evaluate_jac(x)
+            # fun or jac might be cached from earlier calls at the same x. These
+            # lookups are part of the lookup for fun_and_jac and are not recorded.
+            fun_value, hist_entry, log_entry_fun = self._evaluate_with_cache(
+                x, EvalTask.FUN, self._pure_evaluate_fun, record=False
+            )
+            jac_value, _, log_entry_jac = self._evaluate_with_cache(
+                x, EvalTask.JAC, self._uncached_evaluate_jac, record=False
+            )
             hist_entry = replace(hist_entry, task=EvalTask.FUN_AND_JAC)
             log_entry = log_entry_fun.combine(log_entry_jac)
         else:
@@ -283,10 +515,7 @@ class InternalOptimizationProblem:
                 self._pure_evaluate_numerical_fun_and_jac(x)
             )
 
-        if self._logger:
-            self._logger.iteration_store.insert(log_entry)
-
-        return (fun_value, jac_value), hist_entry
+        return (fun_value, jac_value), hist_entry, log_entry
 
     # ==================================================================================
     # Atomic evaluations of user provided functions or numerical derivatives
@@ -330,10 +559,79 @@ class InternalOptimizationProblem:
                 warnings.warn(msg)
                 fun_value, _ = self._error_penalty_func(x)
 
+        return self._process_fun_evaluation(
+            params=params,
+            fun_value=fun_value,
+            traceback=traceback,
+            start_time=start_time,
+            stop_time=time.perf_counter(),
+        )
+
+    def _pure_evaluate_vectorized_fun(
+        self, x_list: list[NDArray[np.float64]]
+    ) -> list[tuple[float | NDArray[np.float64], HistoryEntry, IterationState]]:
+        """Evaluate the vectorized fun at several points in one call.
+
+        If the call fails, the points are evaluated one by one, such that errors are
+        handled separately for each point.
+
+        """
+        evaluation = self._call_vectorized_fun(x_list)
+        if evaluation is None:
+            return [self._pure_evaluate_fun(x) for x in x_list]
+
+        return [
+            self._process_fun_evaluation(
+                params=params,
+                fun_value=fun_value,
+                traceback=None,
+                start_time=start_time,
+                stop_time=stop_time,
+            )
+            for params, fun_value, start_time, stop_time in evaluation
+        ]
+
+    def _call_vectorized_fun(
+        self, x_list: list[NDArray[np.float64]]
+    ) -> list[tuple[PyTree, SpecificFunctionValue, float, float]] | None:
+        """Call the vectorized fun with stacked params.
+
+        Returns:
+            One tuple of params, function value, start time and stop time per point
+            or None if the call failed. The time of the call is split evenly between
+            the points.
+
+        """
+        start_time = time.perf_counter()
+        params_list = [self._converter.params_from_internal(x) for x in x_list]
+        try:
+            fun_values = self._vectorized_fun(np.stack(params_list))  # type: ignore
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            return None
+
+        if len(fun_values) != len(x_list):
+            raise InvalidFunctionError(
+                "A vectorized function must return one function value per parameter "
+                f"vector. Expected {len(x_list)} function values, got "
+                f"{len(fun_values)}."
+            )
+
+        times = np.linspace(start_time, time.perf_counter(), len(x_list) + 1)
+        return list(zip(params_list, fun_values, times[:-1], times[1:], strict=True))
+
+    def _process_fun_evaluation(
+        self,
+        params: PyTree,
+        fun_value: SpecificFunctionValue,
+        traceback: str | None,
+        start_time: float,
+        stop_time: float,
+    ) -> tuple[float | NDArray[np.float64], HistoryEntry, IterationState]:
         algo_fun_value, hist_fun_value = _process_fun_value(
             value=fun_value, solver_type=self._solver_type, direction=self._direction
         )
-        stop_time = time.perf_counter()
 
         hist_entry = HistoryEntry(
             params=params,
@@ -413,6 +711,72 @@ class InternalOptimizationProblem:
 
         return out_jac, hist_entry, log_entry
 
+    def _detect_jac_sparsity_if_needed(self, x: NDArray[np.float64]) -> None:
+        """Replace a jac_sparsity of "detect" by the pattern detected at x.
+
+        This is done in the parent process before the first numerical Jacobian is
+        evaluated, such that all later evaluations and all workers reuse the pattern.
+        If the detection fails, the pattern is detected as part of each numerical
+        derivative, where errors are handled like all other evaluation errors.
+
+        """
+        is_numerical = self._jac is None and self._fun_and_jac is None
+        if not (is_numerical and isinstance(self._jac_sparsity, str)):
+            return
+        try:
+            sparsity = self._detect_jac_sparsity(self._get_numdiff_func(), x)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            return
+        self._jac_sparsity = sparsity
+        # the worker functions were created with the old value
+        self._worker_functions = {}
+
+    def _detect_jac_sparsity(
+        self,
+        func: Callable[[NDArray[np.float64]], Any],
+        x: NDArray[np.float64],
+    ) -> sp.csc_array:
+        """Get the sparsity pattern of the Jacobian from a probe evaluation.
+
+        The dense numerical Jacobian is evaluated at a random perturbation of x, such
+        that entries that are zero at x by coincidence are not mistaken for structural
+        zeros.
+
+        """
+        rng = np.random.default_rng(0)
+        probe = x + rng.uniform(-1e-2, 1e-2, size=len(x)) * (1 + np.abs(x))
+        lower = -np.inf if self._bounds.lower is None else self._bounds.lower
+        upper = np.inf if self._bounds.upper is None else self._bounds.upper
+        probe = np.clip(probe, lower, upper)
+        jac = first_derivative(
+            func,
+            probe,
+            bounds=self._bounds,
+            **get_derivative_kwargs(self._numdiff_options),
+            unpacker=lambda x: x.internal_value(self._solver_type),
+            error_handling="raise_strict",
+        ).derivative
+        return sp.csc_array(jac != 0)
+
+    def _get_numdiff_func(self) -> Callable[[NDArray[np.float64]], Any]:
+        """Get the function of which numerical derivatives are calculated."""
+
+        def func(x: NDArray[np.float64]) -> SpecificFunctionValue:
+            p = self._converter.params_from_internal(x)
+            return self._fun(p)
+
+        if self._vectorized_fun is not None:
+            # evaluate all steps of the numerical derivative in one call per core
+            def func(x: NDArray[np.float64]) -> list[SpecificFunctionValue]:  # type: ignore[misc]
+                p = np.stack([self._converter.params_from_internal(xi) for xi in x])
+                return self._vectorized_fun(p)  # type: ignore[misc]
+
+            func._vectorized = True  # type: ignore[attr-defined]
+
+        return func
+
     def _pure_evaluate_numerical_fun_and_jac(
         self, x: NDArray[np.float64]
     ) -> tuple[
@@ -422,22 +786,25 @@ class InternalOptimizationProblem:
     ]:
         start_time = time.perf_counter()
         traceback: None | str = None
-
-        def func(x: NDArray[np.float64]) -> SpecificFunctionValue:
-            p = self._converter.params_from_internal(x)
-            return self._fun(p)
+        func = self._get_numdiff_func()
 
         try:
+            sparsity = self._jac_sparsity
+            if isinstance(sparsity, str):
+                sparsity = self._detect_jac_sparsity(func, x)
             numdiff_res = first_derivative(
                 func,
                 x,
                 bounds=self._bounds,
-                **asdict(self._numdiff_options),
+                **get_derivative_kwargs(self._numdiff_options),
                 unpacker=lambda x: x.internal_value(self._solver_type),
                 error_handling="raise_strict",
+                sparsity=sparsity,
             )
             fun_value = numdiff_res.func_value
             jac_value = numdiff_res.derivative
+            if sparsity is not None:
+                jac_value = jac_value.toarray()
         except (KeyboardInterrupt, SystemExit):
             raise
         except Exception as e:
@@ -516,6 +883,40 @@ class InternalOptimizationProblem:
             warnings.warn(msg)
             fun_value, _ = self._error_penalty_func(x)
 
+        return self._process_exploration_evaluation(
+            params=params,
+            fun_value=fun_value,
+            traceback=traceback,
+            start_time=start_time,
+            stop_time=time.perf_counter(),
+        )
+
+    def _pure_vectorized_exploration_fun(
+        self, x_list: list[NDArray[np.float64]]
+    ) -> list[tuple[float, HistoryEntry, IterationState]]:
+        evaluation = self._call_vectorized_fun(x_list)
+        if evaluation is None:
+            return [self._pure_exploration_fun(x) for x in x_list]
+
+        return [
+            self._process_exploration_evaluation(
+                params=params,
+                fun_value=fun_value,
+                traceback=None,
+                start_time=start_time,
+                stop_time=stop_time,
+            )
+            for params, fun_value, start_time, stop_time in evaluation
+        ]
+
+    def _process_exploration_evaluation(
+        self,
+        params: PyTree,
+        fun_value: SpecificFunctionValue,
+        traceback: str | None,
+        start_time: float,
+        stop_time: float,
+    ) -> tuple[float, HistoryEntry, IterationState]:
         if not traceback:
             algo_fun_value, hist_fun_value = _process_fun_value(
                 value=fun_value,
@@ -529,8 +930,6 @@ class InternalOptimizationProblem:
             if self._direction == Direction.MAXIMIZE:
                 hist_fun_value = np.inf
 
-        stop_time = time.perf_counter()
-
         hist_entry = HistoryEntry(
             params=params,
             fun=hist_fun_value,
@@ -624,6 +1023,63 @@ class InternalOptimizationProblem:
         return (algo_fun_value, out_jac), hist_entry, log_entry
 
 
+def _get_cached_result(
+    cached: dict[EvalTask, Any], task: EvalTask, solver_type: AggregationLevel
+) -> tuple[Any, HistoryEntry, IterationState] | None:
+    """Get the result of task from cached results of the same or other tasks.
+
+    Args:
+        cached: Dictionary that maps tasks to cached results at one point.
+        task: The requested task.
+        solver_type: The aggregation level of the solver.
+
+    Returns:
+        The result of task or None if it cannot be constructed from cached results.
+
+    """
+    if task in cached:
+        return cached[task]
+
+    fun_and_jac = cached.get(EvalTask.FUN_AND_JAC)
+
+    if task == EvalTask.FUN and fun_and_jac is not None:
+        (fun_value, _), hist_entry, log_entry = fun_and_jac
+        return fun_value, replace(hist_entry, task=EvalTask.FUN), log_entry
+
+    if task == EvalTask.JAC and fun_and_jac is not None:
+        (_, jac_value), hist_entry, log_entry = fun_and_jac
+        return jac_value, replace(hist_entry, task=EvalTask.JAC), log_entry
+
+    if task == EvalTask.FUN_AND_JAC and {EvalTask.FUN, EvalTask.JAC} <= set(cached):
+        fun_value, hist_entry, log_entry_fun = cached[EvalTask.FUN]
+        jac_value, _, log_entry_jac = cached[EvalTask.JAC]
+        return (
+            (fun_value, jac_value),
+            replace(hist_entry, task=EvalTask.FUN_AND_JAC),
+            log_entry_fun.combine(log_entry_jac),
+        )
+
+    # for scalar solvers, fun and exploration_fun return the same values
+    if solver_type == AggregationLevel.SCALAR:
+        if task == EvalTask.FUN and EvalTask.EXPLORATION in cached:
+            value, hist_entry, log_entry = cached[EvalTask.EXPLORATION]
+            return value, replace(hist_entry, task=EvalTask.FUN), log_entry
+        if task == EvalTask.EXPLORATION and EvalTask.FUN in cached:
+            value, hist_entry, log_entry = cached[EvalTask.FUN]
+            return value, replace(hist_entry, task=EvalTask.EXPLORATION), log_entry
+
+    return None
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy arrays such that optimizers cannot modify cached results in place."""
+    if isinstance(value, tuple):
+        return tuple(_copy_value(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    return value
+
+
 def _process_fun_value(
     value: SpecificFunctionValue,
     solver_type: AggregationLevel,
@@ -13,12 +13,14 @@ First implemented in Python by Alisdair McKay (
 
 import warnings
 from dataclasses import replace
-from typing import Literal
+from typing import Iterable, Literal
 
 import numpy as np
 from numpy.typing import NDArray
 from scipy.stats import qmc, triang
 
+from optimagic.batch_evaluators import as_completed, submit_batch
+from optimagic.decorators import catch
 from optimagic.logging.logger import LogStore
 from optimagic.logging.types import StepStatus
 from optimagic.optimization.algorithm import Algorithm, InternalOptimizeResult
@@ -79,6 +81,7 @@ def run_multistart_optimization(
     )
 
     if logger:
+        logger.flush()
         logger.step_store.update(
             scheduled_steps[0], {"status": StepStatus.COMPLETE.value}
         )
@@ -128,24 +131,50 @@ def run_multistart_optimization(
 
     batch_evaluator = options.batch_evaluator
 
+    # In parallel runs, the local optimizations do not write to the log themselves.
+    # They return their log entries which are then written by the parent process. This
+    # avoids that every worker sets up its own database connection and that the workers
+    # compete for the database lock.
+    collect_logs = logger is not None and options.n_cores > 1
+    local_problem = internal_problem.with_error_handling(error_handling)
+    if collect_logs:
+        local_problem = local_problem.with_log_collection()
+
+    # Errors of local optimizations are caught here already, such that the log entries
+    # that were collected before the error occurred are returned with the traceback.
+    solve_and_catch = catch(
+        local_algorithm.solve_internal_problem,
+        default="__traceback__",
+        reraise=options.error_handling
+        in ["raise", ErrorHandling.RAISE, ErrorHandling.RAISE_STRICT],
+    )
+
     def single_optimization(x0, step_id):
         """Closure for running a single optimization, given a starting point."""
-        problem = internal_problem.with_error_handling(error_handling)
-        res = local_algorithm.solve_internal_problem(problem, x0, step_id)
-        return res
+        if collect_logs:
+            problem = local_problem.with_log_collection()
+            res = solve_and_catch(problem, x0, step_id)
+            return res, problem.collected_log_entries
+        return local_algorithm.solve_internal_problem(local_problem, x0, step_id)
 
     opt_counter = 0
     for batch in batched_sample:
         weight = options.weight_func(opt_counter, stopping_maxopt)
         starts = [weight * state["best_x"] + (1 - weight) * x for x in batch]
 
+        batch_steps = scheduled_steps[: len(batch)]
+        scheduled_steps = scheduled_steps[len(batch) :]
         arguments = [
             {"x0": x, "step_id": id_}
-            for x, id_ in zip(starts, scheduled_steps[: len(batch)], strict=False)
+            for x, id_ in zip(starts, batch_steps, strict=False)
         ]
-        scheduled_steps = scheduled_steps[len(batch) :]
 
-        batch_results = batch_evaluator(
+        if collect_logs and logger is not None:
+            for step in batch_steps:
+                logger.step_store.update(step, {"status": StepStatus.RUNNING.value})
+
+        futures = submit_batch(
+            batch_evaluator,
             func=single_optimization,
             arguments=arguments,
             unpack_symbol="**",
@@ -153,21 +182,64 @@ def run_multistart_optimization(
             error_handling=options.error_handling,
         )
 
-        state, is_converged = update_convergence_state(
-            current_state=state,
-            starts=starts,
-            results=batch_results,
-            convergence_criteria=convergence_criteria,
-            solver_type=local_algorithm.algo_info.solver_type,
-        )
-        opt_counter += len(batch)
+        update_kwargs = {
+            "starts": starts,
+            "steps": batch_steps,
+            "logger": logger if collect_logs else None,
+            "convergence_criteria": convergence_criteria,
+            "solver_type": local_algorithm.algo_info.solver_type,
+        }
+        positions = {future: i for i, future in enumerate(futures)}
+        if all(future.done() for future in futures):
+            # Blocking batch evaluators return all results at once. Convergence is
+            # checked once per batch, as all local optimizations were run anyway.
+            groups: Iterable[list] = [futures]
+        else:
+            # Results are processed as soon as they arrive, such that local
+            # optimizations that did not start yet can be cancelled once multistart
+            # has converged.
+            groups = ([future] for future in as_completed(futures))
+
+        processed = []
+        is_converged = False
+        for group in groups:
+            indices = [positions[future] for future in group]
+            state, is_converged = _update_state_with_results(
+                futures=group, indices=indices, state=state, **update_kwargs
+            )
+            processed += indices
+            if is_converged:
+                break
+
         if is_converged:
+            for future in futures:
+                future.cancel()
+            # optimizations that finished in the meantime are still taken into account
+            finished = [
+                i
+                for i, future in enumerate(futures)
+                if i not in processed and future.done() and not future.cancelled()
+            ]
+            if finished:
+                state, _ = _update_state_with_results(
+                    futures=[futures[i] for i in finished],
+                    indices=finished,
+                    state=state,
+                    **update_kwargs,
+                )
+                processed += finished
+
             if logger:
-                for step in scheduled_steps:
+                unfinished = [
+                    step for i, step in enumerate(batch_steps) if i not in processed
+                ]
+                for step in unfinished + scheduled_steps:
                     new_status = StepStatus.SKIPPED.value
                     logger.step_store.update(step, {"status": new_status})
             break
 
+        opt_counter += len(batch)
+
     multistart_info = {
         "start_parameters": state["start_history"],
         "local_optima": state["result_history"],
@@ -181,6 +253,71 @@ def run_multistart_optimization(
     return res
 
 
+def _update_state_with_results(
+    *, futures, indices, starts, steps, state, logger, convergence_criteria, solver_type
+):
+    """Update the convergence state with the results of local optimizations.
+
+    Args:
+        futures (list): The done futures of the local optimizations.
+        indices (list): The positions of the futures in the batch.
+        starts (list): The start parameters of all local optimizations in the batch.
+        steps (list): The step ids of all local optimizations in the batch.
+        state (dict): The current convergence state.
+        logger (LogStore or None): If not None, the results contain the collected log
+            entries of the local optimizations, which are written to this logger.
+        convergence_criteria (dict): See update_convergence_state.
+        solver_type: See update_convergence_state.
+
+    Returns:
+        dict: The updated state.
+        bool: A bool that indicates if the optimizer has converged.
+
+    """
+    results = [future.result() for future in futures]
+    if logger is not None:
+        results = _write_collected_logs(results, [steps[i] for i in indices], logger)
+    return update_convergence_state(
+        current_state=state,
+        starts=[starts[i] for i in indices],
+        results=results,
+        convergence_criteria=convergence_criteria,
+        solver_type=solver_type,
+    )
+
+
+def _write_collected_logs(batch_results, steps, logger):
+    """Write the log entries collected by parallel local optimizations.
+
+    The steps of failed optimizations are marked as failed. Their log entries are
+    written nevertheless.
+
+    Args:
+        batch_results (list): List of tuples with the result of a local optimization and
+            its collected log entries. The result of a failed optimization is a
+            traceback string. If the log entries could not be collected, the whole
+            tuple is replaced by a traceback string.
+        steps (list): The step ids of the local optimizations.
+        logger (LogStore): The logger of the parent process.
+
+    Returns:
+        list: The results of the local optimizations.
+
+    """
+    results = []
+    for step, batch_result in zip(steps, batch_results, strict=True):
+        if isinstance(batch_result, str):
+            res, log_entries = batch_result, []
+        else:
+            res, log_entries = batch_result
+        logger.iteration_store.insert_many(log_entries)
+        status = StepStatus.FAILED if isinstance(res, str) else StepStatus.COMPLETE
+        logger.step_store.update(step, {"status": status.value})
+        results.append(res)
+    logger.flush()
+    return results
+
+
 def determine_steps(n_samples, stopping_maxopt):
     """Determine the number and type of steps for the multistart optimization.
 
@@ -45,8 +45,11 @@ class MultistartOptions:
             for convergence. Determines the maximum relative distance two parameter
             vecctors can have to be considered equal. Defaults to 0.01.
         n_cores: The number of cores to use for parallelization. Defaults to 1.
-        batch_evaluator: The evaluator to use for batch evaluation. Allowed are "joblib"
-            and "pathos", or a custom callable.
+        batch_evaluator: The evaluator to use for batch evaluation. Allowed are
+            "joblib", "pathos" and "threading", or a custom callable. With an
+            instance of optimagic.batch_evaluators.PoolBatchEvaluator, the results of
+            local optimizations are processed as they arrive and local optimizations
+            that did not start yet are cancelled after convergence.
         batch_size: The batch size for batch evaluation. Must be larger than n_cores
             or None.
         seed: The seed for the random number generator.
@@ -71,7 +74,9 @@ class MultistartOptions:
     convergence_xtol_rel: float | None = None
     convergence_max_discoveries: int = 2
     n_cores: int = 1
-    batch_evaluator: Literal["joblib", "pathos"] | BatchEvaluator = "joblib"
+    batch_evaluator: Literal["joblib", "pathos", "threading"] | BatchEvaluator = (
+        "joblib"
+    )
     batch_size: int | None = None
     seed: int | np.random.Generator | None = None
     error_handling: Literal["raise", "continue"] | None = None
@@ -100,7 +105,9 @@ class MultistartOptionsDict(TypedDict):
     convergence_xtol_rel: NotRequired[float | None]
     convergence_max_discoveries: NotRequired[int]
     n_cores: NotRequired[int]
-    batch_evaluator: NotRequired[Literal["joblib", "pathos"] | BatchEvaluator]
+    batch_evaluator: NotRequired[
+        Literal["joblib", "pathos", "threading"] | BatchEvaluator
+    ]
     batch_size: NotRequired[int | None]
     seed: NotRequired[int | np.random.Generator | None]
     error_handling: NotRequired[Literal["raise", "continue"] | None]
@@ -250,10 +257,11 @@ def _validate_attribute_types_and_values(options: MultistartOptions) -> None:
     if not callable(options.batch_evaluator) and options.batch_evaluator not in (
         "joblib",
         "pathos",
+        "threading",
     ):
         raise InvalidMultistartError(
             f"Invalid batch evaluator: {options.batch_evaluator}. Batch evaluator "
-            "must be a Callable or one of 'joblib' or 'pathos'."
+            "must be a Callable or one of 'joblib', 'pathos' or 'threading'."
         )
 
     if options.batch_size is not None and (
@@ -19,7 +19,7 @@ from typing import Any, Callable, Sequence, Type, cast
 
 from scipy.optimize import Bounds as ScipyBounds
 
-from optimagic.batch_evaluators import process_batch_evaluator
+from optimagic.batch_evaluators import PoolBatchEvaluator
 from optimagic.constraints import Constraint
 from optimagic.differentiation.numdiff_options import NumdiffOptions, NumdiffOptionsDict
 from optimagic.exceptions import (
@@ -33,6 +33,11 @@ from optimagic.optimization.create_optimization_problem import (
     create_optimization_problem,
 )
 from optimagic.optimization.error_penalty import get_error_penalty_function
+from optimagic.optimization.evaluation_cache import (
+    EvaluationCache,
+    EvaluationCacheOptions,
+    EvaluationCacheOptionsDict,
+)
 from optimagic.optimization.fun_value import FunctionValue
 from optimagic.optimization.internal_optimization_problem import (
     InternalBounds,
@@ -57,7 +62,10 @@ from optimagic.parameters.bounds import Bounds
 from optimagic.parameters.conversion import (
     get_converter,
 )
-from optimagic.parameters.nonlinear_constraints import process_nonlinear_constraints
+from optimagic.parameters.nonlinear_constraints import (
+    get_constraint_evaluation_cache_info,
+    process_nonlinear_constraints,
+)
 from optimagic.parameters.scaling import ScalingOptions, ScalingOptionsDict
 from optimagic.typing import (
     AggregationLevel,
@@ -104,6 +112,9 @@ def maximize(
     error_penalty: dict[str, float] | None = None,
     scaling: bool | ScalingOptions | ScalingOptionsDict = False,
     multistart: bool | MultistartOptions | MultistartOptionsDict = False,
+    evaluation_cache: bool
+    | EvaluationCacheOptions
+    | EvaluationCacheOptionsDict = False,
     collect_history: bool = True,
     skip_checks: bool = False,
     # scipy aliases
@@ -202,6 +213,11 @@ def maximize(
             multistart approach, provide a dictionary or an instance of
             :class:`optimagic.MultistartOptions`. For details and examples see
             :ref:`how-to-multistart`.
+        evaluation_cache: If None or False, every requested evaluation is done. If
+            True, results of evaluations are stored and re-used when the optimizer
+            requests the same parameters again. To customize the size of the cache
+            and the tolerance below which parameters are considered equal, provide a
+            dictionary or an instance of :class:`optimagic.EvaluationCacheOptions`.
         collect_history: If True, the optimization history is collected and returned
             in the OptimizeResult. This is required to create `criterion_plot` or
             `params_plot` from an OptimizeResult.
@@ -251,6 +267,7 @@ def maximize(
         error_penalty=error_penalty,
         scaling=scaling,
         multistart=multistart,
+        evaluation_cache=evaluation_cache,
         collect_history=collect_history,
         skip_checks=skip_checks,
         # scipy aliases
@@ -301,6 +318,9 @@ def minimize(
     error_penalty: dict[str, float] | None = None,
     scaling: bool | ScalingOptions | ScalingOptionsDict = False,
     multistart: bool | MultistartOptions | MultistartOptionsDict = False,
+    evaluation_cache: bool
+    | EvaluationCacheOptions
+    | EvaluationCacheOptionsDict = False,
     collect_history: bool = True,
     skip_checks: bool = False,
     # scipy aliases
@@ -399,6 +419,11 @@ def minimize(
             multistart approach, provide a dictionary or an instance of
             :class:`optimagic.MultistartOptions`. For details and examples see
             :ref:`how-to-multistart`.
+        evaluation_cache: If None or False, every requested evaluation is done. If
+            True, results of evaluations are stored and re-used when the optimizer
+            requests the same parameters again. To customize the size of the cache
+            and the tolerance below which parameters are considered equal, provide a
+            dictionary or an instance of :class:`optimagic.EvaluationCacheOptions`.
         collect_history: If True, the optimization history is collected and returned
             in the OptimizeResult. This is required to create `criterion_plot` or
             `params_plot` from an OptimizeResult.
@@ -448,6 +473,7 @@ def minimize(
         error_penalty=error_penalty,
         scaling=scaling,
         multistart=multistart,
+        evaluation_cache=evaluation_cache,
         collect_history=collect_history,
         skip_checks=skip_checks,
         # scipy aliases
@@ -594,7 +620,15 @@ def _optimize(problem: OptimizationProblem) -> OptimizeResult:
     # ==================================================================================
     # TODO: Make batch evaluator an argument of maximize and minimize and move this
     # to create_optimization_problem
-    batch_evaluator = process_batch_evaluator("joblib")
+    # The workers are kept alive for the whole optimization, such that the internal
+    # problem is only sent to each of them once.
+    batch_evaluator = PoolBatchEvaluator()
+
+    evaluation_cache = (
+        None
+        if problem.evaluation_cache is None
+        else EvaluationCache(problem.evaluation_cache)
+    )
 
     # ==================================================================================
     # Create the InternalOptimizationProblem
@@ -602,6 +636,7 @@ def _optimize(problem: OptimizationProblem) -> OptimizeResult:
 
     internal_problem = InternalOptimizationProblem(
         fun=problem.fun,
+        vectorized_fun=problem.vectorized_fun,
         jac=problem.jac,
         fun_and_jac=problem.fun_and_jac,
         converter=converter,
@@ -616,43 +651,53 @@ def _optimize(problem: OptimizationProblem) -> OptimizeResult:
         linear_constraints=None,
         nonlinear_constraints=internal_nonlinear_constraints,
         logger=logger,
+        evaluation_cache=evaluation_cache,
     )
 
     # ==================================================================================
     # Do actual optimization
     # ==================================================================================
-    if problem.multistart is None:
-        steps = [{"type": "optimization", "name": "optimization"}]
-
-        # TODO: Actually use the step ids
-        step_id = log_scheduled_steps_and_get_ids(  # noqa: F841
-            steps=steps,
-            logger=logger,
-        )[0]
-
-        raw_res = problem.algorithm.solve_internal_problem(internal_problem, x, step_id)
+    try:
+        if problem.multistart is None:
+            steps = [{"type": "optimization", "name": "optimization"}]
+
+            # TODO: Actually use the step ids
+            step_id = log_scheduled_steps_and_get_ids(  # noqa: F841
+                steps=steps,
+                logger=logger,
+            )[0]
+
+            raw_res = problem.algorithm.solve_internal_problem(
+                internal_problem, x, step_id
+            )
 
-    else:
-        multistart_options = get_internal_multistart_options_from_public(
-            options=problem.multistart,
-            params=problem.params,
-            params_to_internal=converter.params_to_internal,
-        )
+        else:
+            multistart_options = get_internal_multistart_options_from_public(
+                options=problem.multistart,
+                params=problem.params,
+                params_to_internal=converter.params_to_internal,
+            )
 
-        sampling_bounds = InternalBounds(
-            lower=internal_params.soft_lower_bounds,
-            upper=internal_params.soft_upper_bounds,
-        )
+            sampling_bounds = InternalBounds(
+                lower=internal_params.soft_lower_bounds,
+                upper=internal_params.soft_upper_bounds,
+            )
 
-        raw_res = run_multistart_optimization(
-            local_algorithm=problem.algorithm,
-            internal_problem=internal_problem,
-            x=x,
-            sampling_bounds=sampling_bounds,
-            options=multistart_options,
-            logger=logger,
-            error_handling=problem.error_handling,
-        )
+            try:
+                raw_res = run_multistart_optimization(
+                    local_algorithm=problem.algorithm,
+                    internal_problem=internal_problem,
+                    x=x,
+                    sampling_bounds=sampling_bounds,
+                    options=multistart_options,
+                    logger=logger,
+                    error_handling=problem.error_handling,
+                )
+            finally:
+                if logger is not None:
+                    logger.flush()
+    finally:
+        batch_evaluator.shutdown()
 
     # ==================================================================================
     # Process the result
@@ -694,4 +739,11 @@ def _optimize(problem: OptimizationProblem) -> OptimizeResult:
 
     res.logger = log_reader
 
+    if evaluation_cache is not None:
+        res.evaluation_cache_info = evaluation_cache.info()
+
+    res.constraint_evaluation_cache_info = get_constraint_evaluation_cache_info(
+        internal_nonlinear_constraints
+    )
+
     return res
@@ -7,6 +7,7 @@ import pandas as pd
 
 from optimagic import deprecations
 from optimagic.logging.logger import LogReader
+from optimagic.optimization.evaluation_cache import EvaluationCacheInfo
 from optimagic.optimization.history import History
 from optimagic.shared.compat import pd_df_map
 from optimagic.typing import PyTree
@@ -35,6 +36,11 @@ class OptimizeResult:
         history: Optimization history.
         convergence_report: The convergence report.
         multistart_info: Multistart information.
+        evaluation_cache_info: Hit and miss counts of the evaluation cache. None if
+            no evaluation cache was used.
+        constraint_evaluation_cache_info: Hit and miss counts of the caches of the
+            nonlinear constraints. Each hit is a saved evaluation of a constraint
+            function or its Jacobian. None if there are no nonlinear constraints.
         algorithm_output: Additional algorithm specific information.
 
     """
@@ -64,6 +70,8 @@ class OptimizeResult:
     convergence_report: Dict | None = None
 
     multistart_info: Optional["MultistartInfo"] = None
+    evaluation_cache_info: EvaluationCacheInfo | None = None
+    constraint_evaluation_cache_info: EvaluationCacheInfo | None = None
     algorithm_output: Dict[str, Any] | None = None
     logger: LogReader | None = None
 
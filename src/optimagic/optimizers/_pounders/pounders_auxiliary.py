@@ -3,7 +3,7 @@
 from typing import NamedTuple
 
 import numpy as np
-from scipy.linalg import qr_multiply
+from scipy.linalg import qr, qr_multiply, solve_triangular
 
 from optimagic.optimizers._pounders.bntr import (
     bntr,
@@ -556,8 +556,6 @@ def get_feature_matrices_residual_model(
 
     m_mat = np.zeros((n_maxinterp, n_params + 1))
     m_mat[:, 0] = 1
-    m_mat_pad = np.zeros((n_maxinterp, n_maxinterp))
-    m_mat_pad[:n_maxinterp, : n_params + 1] = m_mat
 
     n_mat = np.zeros((n_maxinterp, n_poly_features))
 
@@ -569,6 +567,10 @@ def get_feature_matrices_residual_model(
     point = history.get_n_fun() - 1
     n_modelpoints = n_params + 1
 
+    conditioning = _QuadraticPartConditioning(
+        m_mat[:n_modelpoints], n_max_rows=n_maxinterp - n_modelpoints
+    )
+
     while (n_modelpoints < n_maxinterp) and (point >= 0):
         reject = False
 
@@ -589,36 +591,39 @@ def get_feature_matrices_residual_model(
             point -= 1
             continue
 
-        m_mat[n_modelpoints, 1:] = history.get_centered_xs(center_info, index=point)
+        m_mat[n_modelpoints, 1:] = candidate_x
         n_mat[n_modelpoints, :] = _get_monomial_basis(m_mat[n_modelpoints, 1:])
 
-        m_mat_pad = np.zeros((n_maxinterp, n_maxinterp))
-        m_mat_pad[:n_maxinterp, : n_params + 1] = m_mat
-
-        _n_z_mat, _ = qr_multiply(
-            m_mat_pad[: n_modelpoints + 1, :],
-            n_mat.T[:n_poly_features, : n_modelpoints + 1],
+        beta = conditioning.get_smallest_singular_value_with_candidate(
+            m_mat[: n_modelpoints + 1], n_mat[: n_modelpoints + 1]
         )
-        beta = np.linalg.svd(_n_z_mat.T[n_params + 1 :], compute_uv=False)
 
-        if beta[min(n_modelpoints - n_params, n_poly_features) - 1] > theta2:
+        if beta > theta2:
             # Accept point
+            conditioning.add_candidate()
             model_indices[n_modelpoints] = point
-            n_z_mat = _n_z_mat
 
             n_modelpoints += 1
 
         point -= 1
 
-    z_mat, _ = qr_multiply(
-        m_mat_pad[:n_modelpoints, :],
-        np.eye(n_maxinterp)[:, :n_modelpoints],
-    )
+    m_mat_pad = np.zeros((n_maxinterp, n_maxinterp))
+    m_mat_pad[:, : n_params + 1] = m_mat
 
-    # Just-identified case
     if n_modelpoints == (n_params + 1):
+        # Just-identified case
         n_z_mat = np.zeros((n_maxinterp, n_poly_features))
         n_z_mat[:n_params, :n_params] = np.eye(n_params)
+    else:
+        n_z_mat, _ = qr_multiply(
+            m_mat_pad[:n_modelpoints, :],
+            n_mat.T[:n_poly_features, :n_modelpoints],
+        )
+
+    z_mat, _ = qr_multiply(
+        m_mat_pad[:n_modelpoints, :],
+        np.eye(n_maxinterp)[:, :n_modelpoints],
+    )
 
     return (
         m_mat[: n_params + 1, : n_params + 1],
@@ -629,6 +634,131 @@ def get_feature_matrices_residual_model(
     )
 
 
+class _QuadraticPartConditioning:
+    """Incrementally track the conditioning of the quadratic part of the model.
+
+    Let m_mat have the rows [1, x_i] and n_mat the rows _get_monomial_basis(x_i) of the
+    points in the model and let z be an orthonormal basis of the null space of m_mat.T.
+    A candidate point is added to the model if the smallest singular value of
+    z.T @ n_mat stays above theta2. The singular values do not depend on the choice of
+    z.
+
+    If the rows a and nu are appended to m_mat and n_mat, the null space grows by the
+    vector [u, 1] with u = -m_mat @ (m_mat.T @ m_mat)^(-1) @ a, which is orthogonal to
+    all old basis vectors. Thus, z.T @ n_mat grows by the row
+    b = (n_mat.T @ u + nu) / sqrt(1 + u @ u). We keep a QR decomposition
+    (z.T @ n_mat).T = q @ r, which is updated with one Gram-Schmidt step per
+    candidate. The singular values of the small triangular r equal those of
+    z.T @ n_mat. This costs O(n_params^3) per candidate instead of O(n_params^4) for
+    a new QR and SVD of the full matrices.
+
+    The update requires m_mat to have full column rank. Appending rows cannot make
+    m_mat worse conditioned. Thus, if the initial m_mat is ill-conditioned, the
+    singular values are calculated from a new QR decomposition of the full matrices
+    for all candidates.
+
+    Args:
+        m_mat (np.ndarray): Feature matrix of the linear terms of the n_params + 1
+            affinely independent points in the model. Shape (n_params + 1,
+            n_params + 1).
+        n_max_rows (int): Maximum number of points that are added.
+
+    """
+
+    def __init__(self, m_mat, n_max_rows):
+        n_params = m_mat.shape[1] - 1
+        n_poly_features = n_params * (n_params + 1) // 2
+        self.r_mat_linear = qr(m_mat, mode="r")[0]
+        self.is_ill_conditioned = np.linalg.cond(self.r_mat_linear) > 1 / np.sqrt(
+            np.finfo(float).eps
+        )
+        self.b_mat = np.zeros((n_max_rows, n_poly_features))
+        self.q_mat = np.zeros((n_poly_features, n_max_rows))
+        self.r_mat = np.zeros((n_max_rows, n_max_rows))
+        self.n_rows = 0
+        self._candidate = None
+
+    def get_smallest_singular_value_with_candidate(self, m_mat, n_mat):
+        """Get the smallest singular value of z.T @ n_mat if the last row is added.
+
+        Args:
+            m_mat (np.ndarray): Feature matrix of the linear terms of the points in the
+                model and the candidate in the last row.
+            n_mat (np.ndarray): Feature matrix of the square terms of the points in
+                the model and the candidate in the last row.
+
+        Returns:
+            float: The smallest singular value.
+
+        """
+        k = self.n_rows
+        n_poly_features = self.b_mat.shape[1]
+
+        if self.is_ill_conditioned:
+            return self._get_smallest_singular_value_from_full_matrices(m_mat, n_mat)
+
+        y = solve_triangular(
+            self.r_mat_linear,
+            solve_triangular(self.r_mat_linear, m_mat[-1], trans="T"),
+        )
+        u = -m_mat[:-1] @ y
+        b = (n_mat[:-1].T @ u + n_mat[-1]) / np.sqrt(1 + u @ u)
+
+        if k < n_poly_features:
+            # Gram-Schmidt with reorthogonalization
+            q = self.q_mat[:, :k]
+            c = q.T @ b
+            residual = b - q @ c
+            correction = q.T @ residual
+            c += correction
+            residual -= q @ correction
+            rho = np.linalg.norm(residual)
+
+            r_mat = np.zeros((k + 1, k + 1))
+            r_mat[:k, :k] = self.r_mat[:k, :k]
+            r_mat[:k, k] = c
+            r_mat[k, k] = rho
+            beta = np.linalg.svd(r_mat, compute_uv=False)[-1]
+            q_col = residual / rho if rho > 0 else residual
+        else:
+            # more points than square terms; z.T @ n_mat has more rows than columns
+            b_mat = np.vstack([self.b_mat[:k], b])
+            beta = np.linalg.svd(b_mat, compute_uv=False)[n_poly_features - 1]
+            c = rho = q_col = None
+
+        self._candidate = (m_mat[-1], b, c, rho, q_col)
+        return beta
+
+    def add_candidate(self):
+        """Add the last candidate to the model."""
+        if self.is_ill_conditioned:
+            self.n_rows += 1
+            return
+
+        a, b, c, rho, q_col = self._candidate
+        k = self.n_rows
+
+        self.r_mat_linear = qr(np.vstack([self.r_mat_linear, a]), mode="r")[0][:-1]
+        self.b_mat[k] = b
+        if q_col is not None:
+            self.q_mat[:, k] = q_col
+            self.r_mat[:k, k] = c
+            self.r_mat[k, k] = rho
+        self.n_rows += 1
+        self._candidate = None
+
+    def _get_smallest_singular_value_from_full_matrices(self, m_mat, n_mat):
+        n_params = m_mat.shape[1] - 1
+        n_poly_features, n_max_rows = self.q_mat.shape
+
+        m_mat_pad = np.zeros((len(m_mat), n_params + 1 + n_max_rows))
+        m_mat_pad[:, : n_params + 1] = m_mat
+        n_z_mat, _ = qr_multiply(m_mat_pad, n_mat.T)
+        beta = np.linalg.svd(n_z_mat.T[n_params + 1 :], compute_uv=False)
+
+        return beta[min(self.n_rows + 1, n_poly_features) - 1]
+
+
 def fit_residual_model(
     m_mat,
     n_mat,
@@ -776,16 +906,9 @@ def _get_monomial_basis(x):
         np.ndarray: Monomial basis of x of shape (n_params * (n_params + 1) / 2,).
 
     """
-    n_params = len(x)
-    monomial_basis = np.zeros(int(n_params * (n_params + 1) / 2))
-
-    j = 0
-    for i in range(n_params):
-        monomial_basis[j] = 0.5 * x[i] ** 2
-        j += 1
-
-        for k in range(i + 1, n_params):
-            monomial_basis[j] = x[i] * x[k] / np.sqrt(2)
-            j += 1
+    # the upper triangle in row-major order is x(1)^2, x(1)*x(2), ..., x(2)^2, ...
+    rows, cols = np.triu_indices(len(x))
+    monomial_basis = x[rows] * x[cols] / np.sqrt(2)
+    monomial_basis[rows == cols] = 0.5 * np.float_power(x, 2)
 
     return monomial_basis
@@ -158,7 +158,8 @@ class Converter:
 
 
 def _fast_params_from_internal(x, return_type="tree"):
-    x = x.astype(float)
+    # complex parameters are kept for complex step derivatives
+    x = x.astype(np.result_type(x, float))
     if return_type == "tree_and_flat":
         return x, x
     else:
@@ -1,5 +1,4 @@
 import itertools
-from dataclasses import asdict
 from functools import partial
 
 import numpy as np
@@ -7,10 +6,17 @@ import pandas as pd
 from pybaum import tree_flatten, tree_just_flatten, tree_unflatten
 
 from optimagic.differentiation.derivatives import first_derivative
+from optimagic.differentiation.numdiff_options import get_derivative_kwargs
 from optimagic.exceptions import InvalidConstraintError, InvalidFunctionError
 from optimagic.optimization.algo_options import CONSTRAINTS_ABSOLUTE_TOLERANCE
+from optimagic.optimization.evaluation_cache import (
+    EvaluationCache,
+    EvaluationCacheInfo,
+    EvaluationCacheOptions,
+)
 from optimagic.parameters.block_trees import block_tree_to_matrix
 from optimagic.parameters.tree_registry import get_registry
+from optimagic.typing import EvalTask
 
 
 def process_nonlinear_constraints(
@@ -49,19 +55,52 @@ def process_nonlinear_constraints(
     constraint_evals = []
     for _constraint in nonlinear_constraints:
         _eval = _check_validity_and_return_evaluation(_constraint, params, skip_checks)
+        if _eval is None:
+            _eval = _constraint["func"](_process_selector(_constraint)(params))
         constraint_evals.append(_eval)
 
+    # Optimizers often request the constraint function and its Jacobian several times
+    # at the same x, e.g. once per component if a vector constraint is split into
+    # scalar constraints. Each cache stores the evaluations at the most recent x.
+    caches = [
+        EvaluationCache(EvaluationCacheOptions(max_size=1))
+        for _ in nonlinear_constraints
+    ]
+
+    # The Jacobians of all constraints without closed-form derivative are calculated
+    # together.
+    is_numerical = ["derivative" not in c for c in nonlinear_constraints]
+    numerical_jacobians = _get_numerical_jacobians_func(
+        constraints=list(itertools.compress(nonlinear_constraints, is_numerical)),
+        constraint_evals=list(itertools.compress(constraint_evals, is_numerical)),
+        caches=list(itertools.compress(caches, is_numerical)),
+        params=params,
+        bounds=bounds,
+        converter=converter,
+        numdiff_options=numdiff_options,
+    )
+    positions = np.cumsum(is_numerical) - 1
+
     processed = []
-    for _constraint, _eval in zip(
-        nonlinear_constraints, constraint_evals, strict=False
+    for _constraint, _eval, _cache, _is_numerical, _position in zip(
+        nonlinear_constraints,
+        constraint_evals,
+        caches,
+        is_numerical,
+        positions,
+        strict=True,
     ):
         _processed_constraint = _process_nonlinear_constraint(
             _constraint,
             constraint_eval=_eval,
+            cache=_cache,
+            numerical_jacobian=(
+                partial(_get_item, func=numerical_jacobians, position=_position)
+                if _is_numerical
+                else None
+            ),
             params=params,
-            bounds=bounds,
             converter=converter,
-            numdiff_options=numdiff_options,
         )
         processed.append(_processed_constraint)
 
@@ -69,65 +108,57 @@ def process_nonlinear_constraints(
 
 
 def _process_nonlinear_constraint(
-    c, constraint_eval, params, bounds, converter, numdiff_options
+    c, constraint_eval, cache, numerical_jacobian, params, converter
 ):
-    """Process a single nonlinear constraint."""
+    """Process a single nonlinear constraint.
+
+    Args:
+        c (dict): The nonlinear constraint.
+        constraint_eval: Evaluation of the constraint function at params.
+        cache (EvaluationCache): Cache of the evaluations of the constraint function
+            and its Jacobian.
+        numerical_jacobian (callable or None): Function that returns the numerical
+            Jacobian of the constraint at internal parameters. None if the constraint
+            has a closed-form derivative.
+        params (pytree): The external parameters.
+        converter (Converter): NamedTuple with methods to convert between internal and
+            external parameters, derivatives and function outputs.
+
+    Returns:
+        dict: The processed constraint.
+
+    """
 
     # ==================================================================================
-    # Process selector and evaluate functions if necessary
+    # Process selector
     # ==================================================================================
 
     external_selector = _process_selector(c)  # functional selector
 
     constraint_func = c["func"]
 
-    if constraint_eval is None:
-        selected = external_selector(params)
-        constraint_eval = constraint_func(selected)
-
-    if bounds is not None:
-        # TODO: use bounds for numerical derivative; For this to work we need to
-        # extend bounds to the full params pytree before passing them to
-        # process_nonlinear_constraints.
+    _n_constr = len(np.atleast_1d(constraint_eval))
 
-        # constraint_bounds = replace(
-        #     bounds,
-        #     lower=external_selector(bounds.lower),
-        #     upper=external_selector(bounds.upper),
-        # )
-        constraint_bounds = None
-    else:
-        constraint_bounds = None
+    def _constraint_value(x):
+        def _evaluate(x):
+            params = converter.params_from_internal(x)
+            return constraint_func(external_selector(params))
 
-    _n_constr = len(np.atleast_1d(constraint_eval))
+        return _evaluate_with_cache(cache, x, EvalTask.FUN, _evaluate)
 
     # ==================================================================================
     # Consolidate and transform jacobian
     # ==================================================================================
 
-    # process numdiff_options for numerical derivative
-
-    if "derivative" in c:
-        if not callable(c["derivative"]):
-            msg = "Jacobian of constraints needs to be callable."
-            raise ValueError(msg)
-        jacobian = c["derivative"]
-    else:
-        # use finite-differences if no closed-form jacobian is defined
-        def jacobian(p):
-            return first_derivative(
-                constraint_func,
-                p,
-                bounds=constraint_bounds,
-                error_handling="raise_strict",
-                **asdict(numdiff_options),
-            ).derivative
+    if "derivative" in c and not callable(c["derivative"]):
+        msg = "Jacobian of constraints needs to be callable."
+        raise ValueError(msg)
 
     # To define the internal Jacobian we need to know which parameters enter the
     # contraint function.
     selection_indices, n_params = _get_selection_indices(params, external_selector)
 
-    def _internal_jacobian(x):
+    def _internal_jacobian_from_derivative(x):
         """Return Jacobian of constraint at internal parameters.
 
         The constraint function is written to be evaluated on a selection of the
@@ -140,7 +171,7 @@ def _process_nonlinear_constraint(
         """
         params = converter.params_from_internal(x)
         selected = external_selector(params)
-        jac = jacobian(selected)
+        jac = c["derivative"](selected)
         jac_matrix = block_tree_to_matrix(jac, constraint_eval, selected)
         jac_extended = _extend_jacobian(jac_matrix, selection_indices, n_params)
         jac_internal = converter.derivative_to_internal(
@@ -148,6 +179,19 @@ def _process_nonlinear_constraint(
         )
         return np.atleast_2d(jac_internal)
 
+    # use finite-differences if no closed-form jacobian is defined
+    _internal_jacobian_without_cache = (
+        _internal_jacobian_from_derivative
+        if numerical_jacobian is None
+        else numerical_jacobian
+    )
+
+    def _internal_jacobian(x):
+        jac = _evaluate_with_cache(
+            cache, x, EvalTask.JAC, _internal_jacobian_without_cache
+        )
+        return jac.copy()
+
     # ==================================================================================
     # Transform constraint function and derive bounds
     # ==================================================================================
@@ -163,9 +207,7 @@ def _process_nonlinear_constraint(
         _value = np.atleast_1d(np.array(c["value"], dtype=float))
 
         def internal_constraint_func(x):
-            params = converter.params_from_internal(x)
-            select = external_selector(params)
-            out = np.atleast_1d(constraint_func(select)) - _value
+            out = np.atleast_1d(_constraint_value(x)) - _value
             return out
 
         jacobian_from_internal = _internal_jacobian
@@ -181,9 +223,7 @@ def _process_nonlinear_constraint(
         # a transformation.
 
         def _internal_constraint_func(x):
-            params = converter.params_from_internal(x)
-            select = external_selector(params)
-            return np.atleast_1d(constraint_func(select))
+            return np.array(_constraint_value(x), ndmin=1)
 
         lower_bounds = c.get("lower_bounds", 0)
         upper_bounds = c.get("upper_bounds", np.inf)
@@ -206,11 +246,186 @@ def _process_nonlinear_constraint(
         "fun": internal_constraint_func,  # internal name for 'func'
         "jac": jacobian_from_internal,  # internal name for 'derivative'
         "tol": c.get("tol", CONSTRAINTS_ABSOLUTE_TOLERANCE),
+        "evaluation_cache": cache,
     }
 
     return internal_constr
 
 
+def _get_numerical_jacobians_func(
+    constraints, constraint_evals, caches, params, bounds, converter, numdiff_options
+):
+    """Create a function that calculates the Jacobians of several constraints at once.
+
+    The constraint functions are stacked into one vector function of the flat external
+    parameters that enter at least one of them. Its Jacobian is calculated in one call
+    of first_derivative, such that all function evaluations can be parallelized with
+    the n_cores of the numdiff options. Parameters that do not enter a common
+    constraint are perturbed together. At each evaluation point, only the constraints
+    that depend on a perturbed parameter are evaluated.
+
+    Args:
+        constraints (list[dict]): Nonlinear constraints without closed-form derivative.
+        constraint_evals (list): Evaluations of the constraint functions at params.
+        caches (list[EvaluationCache]): Evaluation caches of the constraints. The
+            constraint values in the caches are reused and the Jacobians are stored in
+            them.
+        params (pytree): The external parameters.
+        bounds (Bounds): Bounds object containing information on the bounds of the
+            parameters.
+        converter (Converter): NamedTuple with methods to convert between internal and
+            external parameters, derivatives and function outputs.
+        numdiff_options (NumdiffOptions): Options for numerical derivatives.
+
+    Returns:
+        callable: Function of the internal parameter vector that returns the list of
+            Jacobians of the constraints at the internal parameters.
+
+    """
+    if bounds is not None:
+        # TODO: use bounds for numerical derivative; For this to work we need to
+        # extend bounds to the full params pytree before passing them to
+        # process_nonlinear_constraints.
+
+        # constraint_bounds = replace(
+        #     bounds,
+        #     lower=external_selector(bounds.lower),
+        #     upper=external_selector(bounds.upper),
+        # )
+        constraint_bounds = None
+    else:
+        constraint_bounds = None
+
+    registry = get_registry(extended=True)
+    _, params_treedef = tree_flatten(params, registry=registry)
+    selectors = [_process_selector(c) for c in constraints]
+
+    selections = []
+    n_params = 0
+    for selector in selectors:
+        selection_indices, n_params = _get_selection_indices(params, selector)
+        selections.append(selection_indices)
+    used_indices = np.unique(np.concatenate([np.arange(0), *selections]))
+
+    n_outputs = [len(tree_just_flatten(e, registry=registry)) for e in constraint_evals]
+    row_bounds = np.cumsum([0, *n_outputs])
+    depends_on = np.zeros((len(constraints), len(used_indices)), dtype=bool)
+    for i, selection_indices in enumerate(selections):
+        depends_on[i] = np.isin(used_indices, selection_indices)
+    sparsity = np.repeat(depends_on, n_outputs, axis=0)
+
+    def _stacked_constraint_func(used_params, flat_params, values_at_flat_params):
+        is_perturbed = used_params != flat_params[used_indices]
+        flat_params = flat_params.astype(np.result_type(flat_params, used_params))
+        flat_params[used_indices] = used_params
+        params = tree_unflatten(params_treedef, flat_params, registry=registry)
+        values = []
+        for i, (c, selector) in enumerate(zip(constraints, selectors, strict=True)):
+            if is_perturbed[depends_on[i]].any():
+                value = tree_just_flatten(
+                    c["func"](selector(params)), registry=registry
+                )
+            else:
+                value = values_at_flat_params[row_bounds[i] : row_bounds[i + 1]]
+            values.append(value)
+        return np.array(list(itertools.chain.from_iterable(values)))
+
+    def numerical_jacobians(x):
+        params = converter.params_from_internal(x)
+        flat_params = np.array(
+            tree_just_flatten(params, registry=registry), dtype=float
+        )
+
+        # reuse the constraint values at x if they were already evaluated
+        constraint_values = []
+        for c, selector, cache in zip(constraints, selectors, caches, strict=True):
+            value = cache.lookup(x).get(EvalTask.FUN)
+            cache.record(hit=value is not None)
+            if value is None:
+                value = c["func"](selector(params))
+                cache.store(x, EvalTask.FUN, value)
+            constraint_values.append(value)
+        f0 = np.array(
+            list(
+                itertools.chain.from_iterable(
+                    tree_just_flatten(value, registry=registry)
+                    for value in constraint_values
+                )
+            )
+        )
+
+        jac = first_derivative(
+            partial(
+                _stacked_constraint_func,
+                flat_params=flat_params,
+                values_at_flat_params=f0,
+            ),
+            flat_params[used_indices],
+            bounds=constraint_bounds,
+            error_handling="raise_strict",
+            f0=f0,
+            sparsity=sparsity,
+            **get_derivative_kwargs(numdiff_options),
+        ).derivative.toarray()
+
+        jacobians = []
+        for cache, start, stop in zip(
+            caches, row_bounds[:-1], row_bounds[1:], strict=True
+        ):
+            jac_extended = np.zeros((stop - start, n_params))
+            jac_extended[:, used_indices] = jac[start:stop]
+            jac_internal = converter.derivative_to_internal(
+                jac_extended, x, jac_is_flat=True
+            )
+            jac_internal = np.atleast_2d(jac_internal)
+            cache.store(x, EvalTask.JAC, jac_internal)
+            jacobians.append(jac_internal)
+        return jacobians
+
+    return numerical_jacobians
+
+
+def _get_item(x, func, position):
+    return func(x)[position]
+
+
+def get_constraint_evaluation_cache_info(nonlinear_constraints):
+    """Sum up the statistics of the evaluation caches of nonlinear constraints.
+
+    Each hit is an evaluation of a constraint function or its Jacobian that was
+    saved.
+
+    Args:
+        nonlinear_constraints (list[dict]): List of processed constraints.
+
+    Returns:
+        EvaluationCacheInfo or None: The summed statistics. None if there are no
+            nonlinear constraints.
+
+    """
+    infos = [c["evaluation_cache"].info() for c in nonlinear_constraints]
+    if not infos:
+        return None
+    return EvaluationCacheInfo(
+        hits=sum(info.hits for info in infos),
+        misses=sum(info.misses for info in infos),
+        size=sum(info.size for info in infos),
+        max_size=sum(info.max_size for info in infos),
+    )
+
+
+def _evaluate_with_cache(cache, x, task, func):
+    """Evaluate func at x or return the cached result of the same task at x."""
+    cached = cache.lookup(x)
+    cache.record(hit=task in cached)
+    if task in cached:
+        result = cached[task]
+    else:
+        result = func(x)
+        cache.store(x, task, result)
+    return result
+
+
 def equality_as_inequality_constraints(nonlinear_constraints):
     """Return constraints where equality constraints are converted to inequality."""
     constraints = [_equality_to_inequality(c) for c in nonlinear_constraints]
@@ -238,6 +453,8 @@ def _equality_to_inequality(c):
             "tol": c["tol"],
             "type": "ineq",
         }
+        if "evaluation_cache" in c:
+            out["evaluation_cache"] = c["evaluation_cache"]
     else:
         out = c
     return out
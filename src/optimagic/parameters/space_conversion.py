@@ -41,6 +41,7 @@ import numpy as np
 
 import optimagic.parameters.kernel_transformations as kt
 from optimagic.parameters.process_constraints import process_constraints
+from optimagic.utilities import number_of_triangular_elements_to_dimension
 
 
 def get_space_converter(
@@ -83,8 +84,7 @@ def get_space_converter(
         transformations=transformations,
     )
 
-    _params_from_internal = partial(
-        reparametrize_from_internal,
+    _params_from_internal = get_reparametrize_from_internal(
         fixed_values=constr_info["internal_fixed_values"],
         pre_replacements=constr_info["pre_replacements"],
         transformations=transformations,
@@ -232,6 +232,134 @@ def reparametrize_from_internal(
     return external_values
 
 
+def get_reparametrize_from_internal(
+    fixed_values,
+    pre_replacements,
+    transformations,
+    post_replacements,
+):
+    """Get a fast function that is equivalent to reparametrize_from_internal.
+
+    reparametrize_from_internal is called for each evaluation of the criterion function.
+    Here, all work that does not depend on the internal parameters is done once: The
+    masks and positions of the replacement steps are pre-computed and transformations
+    of the same type and size are grouped such that each group is transformed with one
+    vectorized kernel.
+
+    Args:
+        fixed_values (numpy.ndarray): See reparametrize_from_internal.
+        pre_replacements (numpy.ndarray): See reparametrize_from_internal.
+        transformations (list): Processed transforming constraints.
+        post_replacements (numpy.ndarray): See reparametrize_from_internal.
+
+    Returns:
+        callable: Function that maps a 1d numpy array with internal parameters to a
+            1d numpy array with external parameters.
+
+    """
+    pre_mask = pre_replacements >= 0
+    post_mask = post_replacements >= 0
+
+    groups = {}
+    for constr in transformations:
+        key = (constr["type"], len(constr["index"]))
+        groups.setdefault(key, []).append(constr)
+
+    kernels = []
+    for (constr_type, dim), constraints in groups.items():
+        kernel = _get_vectorized_kernel(constr_type, dim, constraints)
+        index = np.array([constr["index"] for constr in constraints], dtype=int)
+        kernels.append((kernel, index))
+
+    return partial(
+        _reparametrize_from_internal_with_plan,
+        fixed_values=fixed_values,
+        pre_mask=pre_mask,
+        pre_positions=pre_replacements[pre_mask],
+        kernels=tuple(kernels),
+        post_mask=post_mask if post_mask.any() else None,
+        post_positions=post_replacements[post_mask],
+    )
+
+
+def _reparametrize_from_internal_with_plan(
+    internal,
+    fixed_values,
+    pre_mask,
+    pre_positions,
+    kernels,
+    post_mask,
+    post_positions,
+):
+    # the result is complex if the internal values are complex
+    external_values = fixed_values.astype(np.result_type(fixed_values, internal))
+    external_values[pre_mask] = internal[pre_positions]
+
+    for kernel, index in kernels:
+        external_values[index] = kernel(external_values[index])
+
+    if post_mask is not None:
+        external_values[post_mask] = external_values[post_positions]
+
+    return external_values
+
+
+def _get_vectorized_kernel(constr_type, dim, constraints):
+    """Get a kernel that transforms several blocks of parameters from internal.
+
+    The kernel is applied to a 2d array where each row contains the parameters of one
+    constraint. It is equivalent to applying the corresponding function of
+    kernel_transformations to each row.
+
+    """
+    if constr_type == "probability":
+        kernel = _probability_from_internal_vectorized
+    elif constr_type in ("covariance", "sdcorr"):
+        dim_matrix = number_of_triangular_elements_to_dimension(dim)
+        kernel = partial(
+            _covariance_from_internal_vectorized,
+            dim=dim_matrix,
+            tril_indices=np.tril_indices(dim_matrix),
+            sdcorr_indices=np.tril_indices(dim_matrix, k=-1)
+            if constr_type == "sdcorr"
+            else None,
+        )
+    elif constr_type == "linear":
+        kernel = partial(
+            _linear_from_internal_vectorized,
+            from_internal=np.stack([constr["from_internal"] for constr in constraints]),
+        )
+    else:
+        raise ValueError(f"Invalid transforming constraint type: {constr_type}.")
+    return kernel
+
+
+def _probability_from_internal_vectorized(internal_values):
+    return internal_values / internal_values.sum(axis=1, keepdims=True)
+
+
+def _covariance_from_internal_vectorized(
+    internal_values, dim, tril_indices, sdcorr_indices
+):
+    """Undo cholesky reparametrizations; return sdcorr params if sdcorr_indices."""
+    dtype = np.result_type(internal_values, float)
+    chol = np.zeros((len(internal_values), dim, dim), dtype=dtype)
+    chol[:, tril_indices[0], tril_indices[1]] = internal_values
+    cov = chol @ np.swapaxes(chol, 1, 2)
+    if sdcorr_indices is None:
+        out = cov[:, tril_indices[0], tril_indices[1]]
+    else:
+        sds = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+        inv_sds = 1 / sds
+        corr = cov * inv_sds[:, :, None] * inv_sds[:, None, :]
+        out = np.hstack([sds, corr[:, sdcorr_indices[0], sdcorr_indices[1]]])
+    return out
+
+
+def _linear_from_internal_vectorized(internal_values, from_internal):
+    return (from_internal @ internal_values[:, :, None])[:, :, 0]
+
+
 def convert_external_derivative_to_internal(
     external_derivative,
     internal_values,
@@ -374,7 +502,8 @@ def pre_replace(internal_values, fixed_values, pre_replacements):
         array([2., 0., 1.])
 
     """
-    pre_replaced = fixed_values.copy()
+    # the result is complex if the internal values are complex
+    pre_replaced = fixed_values.astype(np.result_type(fixed_values, internal_values))
 
     mask = pre_replacements >= 0
     positions = pre_replacements[mask]
@@ -1,6 +1,8 @@
+from functools import partial
 from typing import Callable, NamedTuple
 
 import numpy as np
+import pandas as pd
 from pybaum import leaf_names, tree_flatten, tree_just_flatten, tree_unflatten
 
 from optimagic.exceptions import InvalidFunctionError
@@ -105,12 +107,136 @@ def _get_params_flatten(registry):
 
 
 def _get_params_unflatten(registry, treedef):
+    """Get a function that is equivalent to tree_unflatten with a fixed treedef.
+
+    tree_unflatten flattens every container in treedef again whenever it is called. To
+    keep the unflattening of params cheap, this is done only once here. The resulting
+    function only calls the unflatten functions of the registry. Numpy arrays, Series
+    and params DataFrames that only contain leaves are constructed directly from
+    slices of the flat parameter vector.
+
+    """
+    unflatten, _ = _compile_unflatten(treedef, registry)
+
     def params_unflatten(x):
-        return tree_unflatten(treedef=treedef, leaves=list(x), registry=registry)
+        if not isinstance(x, np.ndarray):
+            x = list(x)
+        return unflatten(x)
 
     return params_unflatten
 
 
+def _compile_unflatten(treedef, registry):
+    """Compile the unflatten function for a subtree.
+
+    Args:
+        treedef: The subtree that is used as treedef.
+        registry (dict): The pytree registry.
+
+    Returns:
+        callable: Function that takes a 1d numpy array or list with the leaves of the
+            subtree and returns the unflattened subtree.
+        int: The number of leaves of the subtree.
+
+    """
+    tree_type = type(treedef)
+    if tree_type not in registry:
+        leaves, _ = tree_flatten(treedef, registry=registry)
+        if len(leaves) == 1 and leaves[0] is treedef:
+            return _unflatten_leaf, 1
+        # Containers that are not registered by their type, e.g. namedtuples
+        func = partial(_unflatten_subtree, treedef=treedef, registry=registry)
+        return func, len(leaves)
+
+    items, aux_data = registry[tree_type]["flatten"](treedef)
+    children = [_compile_unflatten(item, registry) for item in items]
+    n_leaves = sum(n for _, n in children)
+
+    if any(func is not _unflatten_leaf for func, _ in children):
+        func = partial(
+            _unflatten_container,
+            unflatten=registry[tree_type]["unflatten"],
+            aux_data=aux_data,
+            children=children,
+        )
+    elif tree_type is np.ndarray:
+        func = partial(_unflatten_array, shape=treedef.shape)
+    elif tree_type is pd.Series:
+        func = partial(_unflatten_series, index=treedef.index, name=treedef.name)
+    elif tree_type is pd.DataFrame and _is_float_params_df(treedef):
+        func = partial(
+            _unflatten_float_params_df,
+            data=treedef.to_numpy(dtype=np.float64),
+            value_position=treedef.columns.get_loc("value"),
+            index=treedef.index,
+            columns=treedef.columns,
+            fallback=partial(
+                _unflatten_flat_container,
+                unflatten=registry[tree_type]["unflatten"],
+                aux_data=aux_data,
+            ),
+        )
+    else:
+        func = partial(
+            _unflatten_flat_container,
+            unflatten=registry[tree_type]["unflatten"],
+            aux_data=aux_data,
+        )
+
+    return func, n_leaves
+
+
+def _unflatten_leaf(leaves):
+    return leaves[0]
+
+
+def _unflatten_container(leaves, unflatten, aux_data, children):
+    items = []
+    start = 0
+    for func, n_leaves in children:
+        items.append(func(leaves[start : start + n_leaves]))
+        start += n_leaves
+    return unflatten(aux_data, items)
+
+
+def _unflatten_subtree(leaves, treedef, registry):
+    return tree_unflatten(treedef, list(leaves), registry=registry)
+
+
+def _unflatten_flat_container(leaves, unflatten, aux_data):
+    return unflatten(aux_data, list(leaves))
+
+
+def _unflatten_array(leaves, shape):
+    return np.array(leaves).reshape(shape)
+
+
+def _unflatten_series(leaves, index, name):
+    return pd.Series(np.array(leaves), index=index, name=name)
+
+
+def _is_float_params_df(df):
+    return (
+        "value" in df
+        and df.columns.is_unique
+        and all(dtype == np.float64 for dtype in df.dtypes)
+    )
+
+
+def _unflatten_float_params_df(leaves, data, value_position, index, columns, fallback):
+    """Construct a params DataFrame in which all columns have dtype float.
+
+    This is much faster than assigning the value column to a copy of the DataFrame.
+    Other dtypes of leaves, e.g. integers or complex numbers, are handled by fallback.
+
+    """
+    if not isinstance(leaves, np.ndarray) or leaves.dtype != np.float64:
+        return fallback(leaves)
+    data = data.copy()
+    data[:, value_position] = leaves
+    return pd.DataFrame(data, index=index, columns=columns)
+
+
 def _get_best_key_and_aggregator(needed_key, available_keys):
     if needed_key in available_keys:
         key = needed_key
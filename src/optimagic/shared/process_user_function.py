@@ -1,7 +1,9 @@
 """Process user provided functions."""
 
 import inspect
-from functools import partial, update_wrapper
+from functools import partial, update_wrapper, wraps
+
+import numpy as np
 
 from optimagic.exceptions import InvalidFunctionError, InvalidKwargsError
 from optimagic.optimization.fun_value import (
@@ -138,3 +140,23 @@ def infer_aggregation_level(func):
     else:
         out = AggregationLevel.SCALAR
     return out
+
+
+def is_vectorized(func):
+    """Check if a function was marked as vectorized with `optimagic.mark.vectorized`."""
+    return bool(getattr(func, "_vectorized", False))
+
+
+def devectorize(func):
+    """Convert a vectorized function into a function of a single parameter vector.
+
+    Attributes left by mark decorators, such as the problem type, are preserved.
+
+    """
+
+    @wraps(func)
+    def wrapper(params, *args, **kwargs):
+        return func(np.asarray(params)[np.newaxis], *args, **kwargs)[0]
+
+    wrapper._vectorized = False
+    return wrapper
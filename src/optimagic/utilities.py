@@ -13,7 +13,7 @@ with warnings.catch_warnings():
 
 def chol_params_to_lower_triangular_matrix(params):
     dim = number_of_triangular_elements_to_dimension(len(params))
-    mat = np.zeros((dim, dim))
+    mat = np.zeros((dim, dim), dtype=np.result_type(np.asarray(params), float))
     mat[np.tril_indices(dim)] = params
     return mat
 
@@ -41,7 +41,7 @@ def cov_matrix_to_params(cov):
 def sdcorr_params_to_sds_and_corr(sdcorr_params):
     dim = number_of_triangular_elements_to_dimension(len(sdcorr_params))
     sds = np.array(sdcorr_params[:dim])
-    corr = np.eye(dim)
+    corr = np.eye(dim, dtype=np.result_type(np.asarray(sdcorr_params), float))
     corr[np.tril_indices(dim, k=-1)] = sdcorr_params[dim:]
     corr += np.tril(corr, k=-1).T
     return sds, corr
@@ -29,9 +29,13 @@ def criterion_plot(
     """Plot the criterion history of an optimization.
 
     Args:
-        results (Union[List, Dict][Union[OptimizeResult, pathlib.Path, str]): A (list or
-            dict of) optimization results with collected history. If dict, then the
-            key is used as the name in a legend.
+        results (Union[List, Dict][Union[OptimizeResult, pathlib.Path, str,
+            LogReader]): A (list or dict of) optimization results with collected
+            history, paths to log files or log readers. If dict, then the key is used
+            as the name in a legend. Log readers remember what they have already read.
+            To monitor a running optimization, create the reader once and pass it to
+            every call of criterion_plot. Each refresh then only reads the iterations
+            logged since the previous call.
         names (Union[List[str], str]): Names corresponding to res or entries in res.
         max_evaluations (int): Clip the criterion history after that many entries.
         template (str): The template for the figure. Default is "plotly_white".
@@ -71,13 +75,13 @@ def criterion_plot(
             _data = _extract_plotting_data_from_results_object(
                 res, stack_multistart, show_exploration, plot_name="criterion_plot"
             )
-        elif isinstance(res, (str, Path)):
+        elif isinstance(res, (str, Path, LogReader)):
             _data = _extract_plotting_data_from_database(
                 res, stack_multistart, show_exploration
             )
         else:
-            msg = "results must be (or contain) an OptimizeResult or a path to a log"
-            f"file, but is type {type(res)}."
+            msg = "results must be (or contain) an OptimizeResult, a path to a log"
+            f"file or a LogReader, but is type {type(res)}."
             raise TypeError(msg)
 
         _data["name"] = name
@@ -172,7 +176,7 @@ def _harmonize_inputs_to_dict(results, names):
     if not isinstance(names, list) and names is not None:
         names = [names]
 
-    if isinstance(results, OptimizeResult):
+    if isinstance(results, (OptimizeResult, str, Path, LogReader)):
         results = [results]
 
     if names is not None and len(names) != len(results):
@@ -216,8 +220,9 @@ def params_plot(
     """Plot the params history of an optimization.
 
     Args:
-        result (Union[OptimizeResult, pathlib.Path, str]): An optimization results with
-            collected history. If dict, then the key is used as the name in a legend.
+        result (Union[OptimizeResult, pathlib.Path, str, LogReader]): An optimization
+            results with collected history, a path to a log file or a log reader. If
+            dict, then the key is used as the name in a legend.
         selector (callable): A callable that takes params and returns a subset
             of params. If provided, only the selected subset of params is plotted.
         max_evaluations (int): Clip the criterion history after that many entries.
@@ -241,7 +246,7 @@ def params_plot(
             plot_name="params_plot",
         )
         start_params = result.start_params
-    elif isinstance(result, (str, Path)):
+    elif isinstance(result, (str, Path, LogReader)):
         data = _extract_plotting_data_from_database(
             result,
             stack_multistart=True,
@@ -249,7 +254,9 @@ def params_plot(
         )
         start_params = data["start_params"]
     else:
-        raise TypeError("result must be an OptimizeResult or a path to a log file.")
+        raise TypeError(
+            "result must be an OptimizeResult, a path to a log file or a LogReader."
+        )
 
     if data["stacked_local_histories"] is not None:
         history = data["stacked_local_histories"].params
@@ -369,7 +376,8 @@ def _extract_plotting_data_from_database(res, stack_multistart, show_exploration
     """Extract data for plotting from database.
 
     Args:
-        res (str or pathlib.Path): A path to an optimization database.
+        res (str, pathlib.Path or LogReader): A path to an optimization database or a
+            reader of the database.
         stack_multistart (bool): Whether to combine multistart histories into a single
             history. Default is False.
         show_exploration (bool): If True, exploration samples of a multistart
@@ -387,7 +395,10 @@ def _extract_plotting_data_from_database(res, stack_multistart, show_exploration
         are stacked into a single one.
 
     """
-    reader = LogReader.from_options(SQLiteLogOptions(res))
+    if isinstance(res, LogReader):
+        reader = res
+    else:
+        reader = LogReader.from_options(SQLiteLogOptions(res))
     _problem_table = reader.problem_df
 
     direction = _problem_table["direction"].tolist()[-1]
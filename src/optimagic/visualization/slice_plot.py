@@ -8,7 +8,10 @@ from plotly import graph_objects as go
 from pybaum import tree_just_flatten
 
 from optimagic import deprecations
-from optimagic.batch_evaluators import process_batch_evaluator
+from optimagic.batch_evaluators import (
+    process_batch_evaluator,
+    vectorized_batch_evaluate,
+)
 from optimagic.config import DEFAULT_N_CORES, PLOTLY_TEMPLATE
 from optimagic.deprecations import replace_and_warn_about_deprecated_bounds
 from optimagic.optimization.fun_value import (
@@ -18,7 +21,11 @@ from optimagic.optimization.fun_value import (
 from optimagic.parameters.bounds import pre_process_bounds
 from optimagic.parameters.conversion import get_converter
 from optimagic.parameters.tree_registry import get_registry
-from optimagic.shared.process_user_function import infer_aggregation_level
+from optimagic.shared.process_user_function import (
+    devectorize,
+    infer_aggregation_level,
+    is_vectorized,
+)
 from optimagic.typing import AggregationLevel
 from optimagic.visualization.plotting_utilities import combine_plots, get_layout_kwargs
 
@@ -56,7 +63,9 @@ def slice_plot(
 
     Args:
         criterion (callable): criterion function that takes params and returns scalar,
-            PyTree or FunctionValue object.
+            PyTree or FunctionValue object. If it is marked with
+            `optimagic.mark.vectorized`, the grid points are evaluated in one call per
+            core.
         params (pytree): A pytree with parameters.
         bounds: Lower and upper bounds on the parameters. The bounds are used to create
             a grid over which slice plots are drawn. The most general and preferred
@@ -115,15 +124,27 @@ def slice_plot(
     else:
         title_kwargs = None
 
+    vectorized = is_vectorized(func)
+
     if func_kwargs is not None:
         func = partial(func, **func_kwargs)
 
+    if vectorized:
+        if not isinstance(params, np.ndarray):
+            raise ValueError(
+                "Vectorized functions are only supported if params is a numpy array."
+            )
+        vectorized_func = func
+        func = devectorize(func)
+
     func_eval = func(params)
 
     # ==================================================================================
     # handle deprecated function output
     # ==================================================================================
     if deprecations.is_dict_output(func_eval):
+        if vectorized:
+            raise ValueError("Vectorized functions cannot return dictionaries.")
         msg = (
             "Functions that return dictionaries are deprecated in slice_plot and will "
             "raise an error in version 0.6.0. Please pass a function that returns a "
@@ -194,12 +215,27 @@ def slice_plot(
 
     batch_evaluator = process_batch_evaluator(batch_evaluator)
 
-    func_values = batch_evaluator(
-        func=func,
-        arguments=evaluation_points,
-        error_handling="continue",
-        n_cores=n_cores,
-    )
+    if vectorized:
+        func_values = vectorized_batch_evaluate(
+            func=vectorized_func,
+            arguments=evaluation_points,
+            batch_evaluator=batch_evaluator,
+            n_cores=n_cores,
+            error_handling="continue",
+        )
+        func_values = [
+            val
+            if isinstance(val, str)
+            else convert_fun_output_to_function_value(val, problem_type)
+            for val in func_values
+        ]
+    else:
+        func_values = batch_evaluator(
+            func=func,
+            arguments=evaluation_points,
+            error_handling="continue",
+            n_cores=n_cores,
+        )
 
     # add NaNs where an evaluation failed
     func_values = [
@@ -5,6 +5,7 @@ import seaborn as sns
 import statsmodels.api as sm
 
 from estimagic import bootstrap
+from estimagic.bootstrap import _summarize_outcome_chunks
 
 
 def aaae(obj1, obj2, decimal=6):
@@ -231,6 +232,87 @@ def test_cov_wrong_return_type(setup):
     assert str(error.value) == expected_msg
 
 
+@pytest.mark.parametrize("sampling", ["weights", "batched_weights"])
+def test_bootstrap_with_weights_sampling(sampling, setup):
+    def _weighted_mean(data, weights):
+        means = weights @ data.to_numpy() / weights.sum(axis=-1, keepdims=True)
+        if sampling == "weights":
+            means = pd.Series(means, index=data.columns)
+        else:
+            means = [pd.Series(m, index=data.columns) for m in means]
+        return means
+
+    result = bootstrap(
+        data=setup["df"], outcome=_weighted_mean, seed=123, sampling=sampling
+    )
+
+    aaae(result.base_outcome, setup["df"].mean())
+    assert result.se().index.tolist() == ["x1", "x2"]
+    assert (result.se() > 0).all()
+
+
+def test_bootstrap_in_chunks_with_outcomes_path(setup, tmp_path):
+    path = tmp_path / "outcomes.npy"
+    result = bootstrap(
+        data=setup["df"],
+        outcome=_outcome_func,
+        seed=123,
+        n_draws=100,
+        chunk_size=30,
+        outcomes_path=path,
+    )
+
+    stored = np.load(path)
+    assert stored.shape == (100, 2)
+    aaae(result.cov(return_type="array"), np.cov(stored, rowvar=False))
+    assert len(result.outcomes) == 100
+
+
+def test_bootstrap_in_chunks_without_outcomes_path(setup, tmp_path):
+    kwargs = {"data": setup["df"], "outcome": _outcome_func, "n_draws": 500}
+    chunked = bootstrap(seed=123, chunk_size=40, **kwargs)
+    exact = bootstrap(
+        seed=123, chunk_size=40, outcomes_path=tmp_path / "out.npy", **kwargs
+    )
+
+    aaae(chunked.cov(), exact.cov())
+    for ci_method in ["percentile", "bc", "t", "normal", "basic"]:
+        aaae(chunked.ci(ci_method), exact.ci(ci_method))
+
+    with pytest.raises(ValueError, match="not stored"):
+        chunked.outcomes  # noqa: B018
+
+
+def test_bootstrap_in_chunks_extends_existing_result(setup):
+    kwargs = {"data": setup["df"], "outcome": _outcome_func}
+    first = bootstrap(n_draws=50, seed=1, **kwargs)
+    result = bootstrap(
+        existing_result=first, n_draws=80, chunk_size=20, seed=2, **kwargs
+    )
+    assert result._moments.n == 80
+
+
+def test_summarize_outcome_chunks_skips_empty_chunks():
+    outcomes = [np.array([1.0, 2.0]), np.array([2.0, 5.0]), np.array([4.0, 3.0])]
+    result = _summarize_outcome_chunks(
+        base_outcome=outcomes[0],
+        chunks=iter([[], outcomes[:2], [], outcomes[2:]]),
+        n_draws=3,
+        outcomes_path=None,
+    )
+    aaae(result.cov(), np.cov(np.array(outcomes), rowvar=False))
+
+
+def test_summarize_outcome_chunks_without_outcomes():
+    with pytest.raises(RuntimeError, match="all bootstrap outcomes failed"):
+        _summarize_outcome_chunks(
+            base_outcome=np.zeros(2),
+            chunks=iter([[], []]),
+            n_draws=2,
+            outcomes_path=None,
+        )
+
+
 def test_existing_result(seaborn_example):
     first_result = bootstrap(
         data=seaborn_example["df"], outcome=_outcome_ols, seed=1234
@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_array_equal as aae
+
+from estimagic import bootstrap
+from estimagic.bootstrap_checkpoint import BootstrapCheckpoint, get_draw_rngs
+
+
+@pytest.fixture()
+def data():
+    rng = np.random.default_rng(seed=0)
+    df = pd.DataFrame(rng.normal(size=(50, 2)), columns=["x1", "x2"])
+    df["cluster"] = np.repeat(np.arange(10), 5)
+    return df
+
+
+def _mean(data):
+    return data[["x1", "x2"]].mean()
+
+
+def test_get_draw_rngs_matches_spawned_seed_sequences():
+    children = np.random.SeedSequence(123).spawn(5)
+    expected = [np.random.default_rng(child).random() for child in children[2:]]
+    calculated = [rng.random() for rng in get_draw_rngs(123, [2, 3, 4])]
+    aae(calculated, expected)
+
+
+@pytest.mark.parametrize("cluster_by", [None, "cluster"])
+def test_resumed_bootstrap_equals_uninterrupted_bootstrap(data, cluster_by, tmp_path):
+    kwargs = {"data": data, "outcome": _mean, "cluster_by": cluster_by, "seed": 1}
+
+    bootstrap(n_draws=30, checkpoint_path=tmp_path / "resumed.db", **kwargs)
+    resumed = bootstrap(n_draws=60, checkpoint_path=tmp_path / "resumed.db", **kwargs)
+    uninterrupted = bootstrap(
+        n_draws=60, checkpoint_path=tmp_path / "full.db", **kwargs
+    )
+
+    aae(resumed._internal_outcomes, uninterrupted._internal_outcomes)
+
+
+def test_checkpointed_bootstrap_does_not_depend_on_n_cores(data, tmp_path):
+    kwargs = {"data": data, "outcome": _mean, "n_draws": 20, "seed": 1}
+    serial = bootstrap(n_cores=1, checkpoint_path=tmp_path / "serial.db", **kwargs)
+    parallel = bootstrap(n_cores=2, checkpoint_path=tmp_path / "parallel.db", **kwargs)
+    aae(serial._internal_outcomes, parallel._internal_outcomes)
+
+
+def test_bootstrap_resumes_after_interruption(data, tmp_path):
+    n_calls = []
+    interrupt = True
+
+    def _interrupted_mean(data):
+        n_calls.append(1)
+        if interrupt and len(n_calls) > 25:
+            raise KeyboardInterrupt()
+        return _mean(data)
+
+    path = tmp_path / "checkpoint.db"
+    kwargs = {"data": data, "n_draws": 40, "seed": 1, "chunk_size": 10}
+    with pytest.raises(KeyboardInterrupt):
+        bootstrap(outcome=_interrupted_mean, checkpoint_path=path, **kwargs)
+
+    assert BootstrapCheckpoint(path).get_completed_draws() == set(range(20))
+
+    interrupt = False
+    resumed = bootstrap(outcome=_interrupted_mean, checkpoint_path=path, **kwargs)
+    expected = bootstrap(outcome=_mean, checkpoint_path=tmp_path / "full.db", **kwargs)
+    aae(resumed.cov(return_type="array"), expected.cov(return_type="array"))
+
+
+def test_resuming_checkpoint_with_different_seed_raises(data, tmp_path):
+    path = tmp_path / "checkpoint.db"
+    bootstrap(data=data, outcome=_mean, n_draws=5, seed=1, checkpoint_path=path)
+    bootstrap(data=data, outcome=_mean, n_draws=10, seed=None, checkpoint_path=path)
+    with pytest.raises(ValueError, match="different seed"):
+        bootstrap(data=data, outcome=_mean, n_draws=10, seed=2, checkpoint_path=path)
+
+
+def _weighted_mean(data, weights=None):
+    return data[["x1", "x2"]].mul(1 if weights is None else weights, axis=0).mean()
+
+
+def _median(data):
+    return data[["x1", "x2"]].median()
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        {"outcome": _median},
+        {"cluster_by": "cluster"},
+        {"weight_by": "weight"},
+        {"sampling": "weights"},
+    ],
+)
+def test_resuming_checkpoint_with_different_settings_raises(data, changed, tmp_path):
+    data["weight"] = 1.0
+    path = tmp_path / "checkpoint.db"
+    kwargs = {
+        "data": data,
+        "outcome": _weighted_mean,
+        "seed": 1,
+        "checkpoint_path": path,
+    }
+    bootstrap(n_draws=5, **kwargs)
+    with pytest.raises(ValueError, match="different bootstrap settings"):
+        bootstrap(n_draws=10, **{**kwargs, **changed})
+
+
+def test_checkpoint_with_existing_result_raises(data, tmp_path):
+    first = bootstrap(data=data, outcome=_mean, n_draws=5, seed=1)
+    with pytest.raises(ValueError, match="existing_result"):
+        bootstrap(
+            data=data,
+            outcome=_mean,
+            existing_result=first,
+            checkpoint_path=tmp_path / "checkpoint.db",
+        )
+
+
+def test_checkpoint_can_be_resumed_with_the_same_generator(data, tmp_path):
+    path = tmp_path / "checkpoint.db"
+    rng = np.random.default_rng(seed=1)
+    kwargs = {"data": data, "outcome": _mean, "checkpoint_path": path}
+    bootstrap(n_draws=5, seed=rng, **kwargs)
+    rng.random()
+    resumed = bootstrap(n_draws=10, seed=rng, **kwargs)
+    expected = bootstrap(
+        data=data,
+        outcome=_mean,
+        n_draws=10,
+        seed=np.random.default_rng(seed=1),
+        checkpoint_path=tmp_path / "full.db",
+    )
+    aae(resumed._internal_outcomes, expected._internal_outcomes)
+
+
+def test_checkpointed_bootstrap_warns_about_failed_draws(data, tmp_path):
+    def _sometimes_failing_mean(data):
+        if 0 not in data.index:
+            raise ValueError("Failed draw.")
+        return _mean(data)
+
+    with pytest.warns(UserWarning, match=r"failed for \d+ of 30 samples"):
+        result = bootstrap(
+            data=data,
+            outcome=_sometimes_failing_mean,
+            n_draws=30,
+            seed=1,
+            checkpoint_path=tmp_path / "checkpoint.db",
+        )
+
+    n_failed = BootstrapCheckpoint(tmp_path / "checkpoint.db").count_failed_draws(30)
+    assert 0 < n_failed < 30
+    assert len(result._internal_outcomes) == 30 - n_failed
@@ -5,8 +5,13 @@ import pandas as pd
 import pytest
 from pybaum import tree_just_flatten
 
-from estimagic.bootstrap_ci import calculate_ci, check_inputs
+from estimagic.bootstrap_ci import (
+    calculate_ci,
+    calculate_ci_from_summaries,
+    check_inputs,
+)
 from estimagic.bootstrap_samples import get_bootstrap_indices
+from estimagic.bootstrap_streaming import OnlineMoments, QuantileSketch
 from optimagic.parameters.tree_registry import get_registry
 from optimagic.utilities import get_rng
 
@@ -81,6 +86,22 @@ def test_ci(outcome, method, setup, expected):
     aaae(upper, expected[method + "_ci"][:, 1])
 
 
+@pytest.mark.parametrize("method", ["percentile", "bc", "t", "normal", "basic"])
+def test_ci_from_summaries_without_compaction_is_exact(method, setup):
+    estimates = setup["estimates"]
+    base_outcome = setup["df"].mean(axis=0).to_numpy()
+
+    expected = calculate_ci(base_outcome, estimates, ci_method=method)
+    calculated = calculate_ci_from_summaries(
+        base_outcome,
+        QuantileSketch.from_outcomes(estimates[:2]).update(estimates[2:]),
+        OnlineMoments.from_outcomes(estimates[:2]).update(estimates[2:]),
+        ci_method=method,
+    )
+
+    aaae(calculated, expected)
+
+
 def test_check_inputs_data():
     data = "this is not a data frame"
     expected_msg = "Data must be a pandas.DataFrame or pandas.Series."
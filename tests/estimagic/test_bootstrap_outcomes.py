@@ -7,6 +7,7 @@ from numpy.testing import assert_array_almost_equal as aaae
 
 from estimagic.bootstrap_outcomes import (
     _get_bootstrap_outcomes_from_indices,
+    _get_bootstrap_outcomes_from_weights,
     get_bootstrap_outcomes,
 )
 from optimagic.batch_evaluators import joblib_batch_evaluator
@@ -117,3 +118,119 @@ def test_get_bootstrap_estimates_with_some_errors_and_continue(data):
         )
 
     assert 30 <= len(res_flat) <= 70
+
+
+@pytest.mark.parametrize("n_cores", [1, 2, 3])
+def test_bootstrap_estimates_from_indices_data_is_shipped_once_per_chunk(data, n_cores):
+    calls = []
+
+    def _counting_batch_evaluator(func, arguments, **kwargs):
+        calls.append(len(arguments))
+        return joblib_batch_evaluator(func, arguments, **kwargs)
+
+    indices = [np.array([1, 3]), np.array([0, 2]), np.array([0, 0]), np.array([3])]
+    calculated = _get_bootstrap_outcomes_from_indices(
+        indices=indices,
+        data=data,
+        outcome=functools.partial(np.mean, axis=0),
+        n_cores=n_cores,
+        error_handling="raise",
+        batch_evaluator=_counting_batch_evaluator,
+    )
+
+    expected = [[3.0, 6.0], [2, 8], [1, 10], [4, 5]]
+    aaae(calculated, expected)
+    assert calls == [n_cores]
+
+
+def test_bootstrap_estimates_from_indices_with_some_errors_in_chunk(data):
+    def _fail_on_first_obs(data):
+        if 0 in data.index:
+            raise ValueError()
+        return data.mean()
+
+    with pytest.warns(UserWarning):
+        calculated = _get_bootstrap_outcomes_from_indices(
+            indices=[np.array([1, 3]), np.array([0, 2]), np.array([2, 3])],
+            data=data,
+            outcome=_fail_on_first_obs,
+            n_cores=1,
+            error_handling="continue",
+            batch_evaluator=joblib_batch_evaluator,
+        )
+
+    aaae(calculated, [[3.0, 6.0], [3.5, 5.5]])
+
+
+def _weighted_mean(data, weights):
+    return weights @ data.to_numpy() / weights.sum(axis=-1, keepdims=True)
+
+
+@pytest.mark.parametrize("batched", [False, True])
+@pytest.mark.parametrize("n_cores", [1, 2])
+def test_bootstrap_estimates_from_weights(data, batched, n_cores):
+    calculated = _get_bootstrap_outcomes_from_weights(
+        weight_chunks=[
+            np.array([[0, 1, 0, 1], [1, 0, 1, 0]]),
+            np.array([[2, 0, 0, 0]]),
+        ],
+        data=data,
+        outcome=_weighted_mean,
+        n_cores=n_cores,
+        error_handling="raise",
+        batch_evaluator=joblib_batch_evaluator,
+        batched=batched,
+    )
+    expected = [[3.0, 6.0], [2, 8], [1, 10]]
+    aaae(calculated, expected)
+
+
+def test_bootstrap_estimates_from_batched_weights_with_wrong_length(data):
+    with pytest.raises(ValueError, match="one outcome per row"):
+        _get_bootstrap_outcomes_from_weights(
+            weight_chunks=[np.ones((3, 4), dtype=int)],
+            data=data,
+            outcome=lambda data, weights: [data.mean()],  # noqa: ARG005
+            n_cores=1,
+            error_handling="raise",
+            batch_evaluator=joblib_batch_evaluator,
+            batched=True,
+        )
+
+
+@pytest.mark.parametrize("sampling", ["weights", "batched_weights"])
+def test_get_bootstrap_outcomes_with_weights_matches_rows(sampling):
+    rng = get_rng(seed=1234)
+    data = pd.DataFrame(rng.normal(size=(200, 2)), columns=["x1", "x2"])
+    data["cluster"] = np.repeat(np.arange(50), 4)
+
+    rows = get_bootstrap_outcomes(
+        data=data,
+        outcome=lambda data: _mean_return_array(data[["x1", "x2"]]),
+        cluster_by="cluster",
+        rng=get_rng(seed=1),
+        n_draws=2_000,
+    )
+    weighted = get_bootstrap_outcomes(
+        data=data,
+        outcome=lambda data, weights: _weighted_mean(data[["x1", "x2"]], weights),
+        cluster_by="cluster",
+        rng=get_rng(seed=1),
+        n_draws=2_000,
+        sampling=sampling,
+    )
+
+    aaae(np.mean(rows, axis=0), np.mean(weighted, axis=0), decimal=2)
+    ratio = np.var(weighted, axis=0) / np.var(rows, axis=0)
+    assert np.all((ratio > 0.85) & (ratio < 1.15))
+
+
+def test_get_bootstrap_outcomes_invalid_sampling(data):
+    with pytest.raises(ValueError, match="sampling must be"):
+        get_bootstrap_outcomes(
+            data=data,
+            outcome=_mean_return_array,
+            rng=get_rng(seed=1234),
+            n_draws=2,
+            sampling="invalid",
+        )
@@ -8,9 +8,14 @@ from pandas.testing import assert_series_equal as ase
 from estimagic.bootstrap_samples import (
     _calculate_bootstrap_indices_weights,
     _convert_cluster_ids_to_indices,
+    _expand_cluster_codes,
     _get_bootstrap_samples_from_indices,
+    _get_cluster_index,
+    generate_bootstrap_indices,
+    generate_bootstrap_weights,
     get_bootstrap_indices,
     get_bootstrap_samples,
+    get_bootstrap_weights,
 )
 from optimagic.utilities import get_rng
 
@@ -86,6 +91,82 @@ def test_convert_cluster_ids_to_indices():
     aae(calculated, expected)
 
 
+def test_convert_cluster_ids_to_indices_with_string_clusters():
+    cluster_col = pd.Series(["b", "a", "b", "c", "a"])
+    drawn_clusters = np.array([["c", "b", "c"], ["a", "a", "b"]])
+    calculated = _convert_cluster_ids_to_indices(cluster_col, drawn_clusters)
+    aae(calculated[0], np.array([3, 0, 2, 3]))
+    aae(calculated[1], np.array([1, 4, 1, 4, 0, 2]))
+
+
+def test_get_cluster_index():
+    codes = np.array([1, 1, 0, 2, 0, 1])
+    positions, offsets = _get_cluster_index(codes, n_clusters=4)
+    aae(positions, np.array([2, 4, 0, 1, 5, 3]))
+    aae(offsets, np.array([0, 2, 5, 6, 6]))
+    aae(_expand_cluster_codes(np.array([3, 2, 0]), positions, offsets), [3, 2, 4])
+
+
+@pytest.mark.parametrize("cluster_by", [None, "hh"])
+def test_generate_bootstrap_indices_yields_chunks(data, cluster_by):
+    rng = get_rng(seed=12345)
+    chunks = list(
+        generate_bootstrap_indices(
+            data, rng=rng, cluster_by=cluster_by, n_draws=7, chunk_size=3
+        )
+    )
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    for chunk in chunks:
+        for indices in chunk:
+            assert indices.ndim == 1
+            assert set(indices).issubset(range(900))
+
+
+def test_get_bootstrap_weights_sum_to_number_of_observations(data):
+    rng = get_rng(seed=12345)
+    weights = get_bootstrap_weights(data, n_draws=3, rng=rng)
+    assert weights.shape == (3, 900)
+    aae(weights.sum(axis=1), np.full(3, 900))
+
+
+def test_get_bootstrap_weights_with_clustering_leaves_households_intact(data):
+    rng = get_rng(seed=12345)
+    weights = get_bootstrap_weights(data, cluster_by="hh", n_draws=5, rng=rng)
+    for draw in weights:
+        by_household = pd.Series(draw).groupby(data["hh"])
+        assert (by_household.nunique() == 1).all()
+        assert by_household.first().sum() == data["hh"].nunique()
+
+
+@pytest.mark.parametrize("cluster_by", [None, "hh"])
+def test_generate_bootstrap_weights_yields_chunks(data, cluster_by):
+    rng = get_rng(seed=12345)
+    chunks = list(
+        generate_bootstrap_weights(
+            data, rng=rng, cluster_by=cluster_by, n_draws=7, chunk_size=3
+        )
+    )
+    assert [chunk.shape for chunk in chunks] == [(3, 900), (3, 900), (1, 900)]
+    for chunk in chunks:
+        assert np.issubdtype(chunk.dtype, np.integer)
+        assert (chunk >= 0).all()
+
+
+def test_get_bootstrap_weights_without_draws(data):
+    weights = get_bootstrap_weights(data, n_draws=0, rng=get_rng(seed=12345))
+    assert weights.shape == (0, 900)
+
+
+def test_get_bootstrap_weights_with_extreme_weights(data):
+    rng = get_rng(seed=12345)
+    weights = np.zeros(900)
+    weights[0] = 1.0
+    data["weights"] = weights
+    res = get_bootstrap_weights(data, weight_by="weights", n_draws=1, rng=rng)
+    assert res[0, 0] == 900
+    assert res[0, 1:].sum() == 0
+
+
 def test_get_bootstrap_samples_from_indices():
     indices = [np.array([0, 1])]
     data = pd.DataFrame(np.arange(6).reshape(3, 2))
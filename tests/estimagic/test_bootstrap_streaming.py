@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal as aaae
+
+from estimagic.bootstrap_streaming import OnlineMoments, QuantileSketch
+from optimagic.utilities import get_rng
+
+
+@pytest.fixture()
+def outcomes():
+    rng = get_rng(seed=1234)
+    return rng.standard_t(df=5, size=(10_000, 3))
+
+
+def _summarize_in_chunks(summary_class, outcomes, n_chunks, **kwargs):
+    chunks = np.array_split(outcomes, n_chunks)
+    summary = summary_class.from_outcomes(chunks[0], **kwargs)
+    for chunk in chunks[1:]:
+        summary = summary.update(chunk)
+    return summary
+
+
+@pytest.mark.parametrize("n_chunks", [1, 3, 100])
+def test_online_moments(outcomes, n_chunks):
+    moments = _summarize_in_chunks(OnlineMoments, outcomes, n_chunks)
+    assert moments.n == len(outcomes)
+    aaae(moments.mean, outcomes.mean(axis=0))
+    aaae(moments.cov, np.cov(outcomes, rowvar=False))
+    aaae(moments.std, np.std(outcomes, axis=0))
+
+
+def test_quantile_sketch_is_exact_below_capacity(outcomes):
+    sketch = _summarize_in_chunks(QuantileSketch, outcomes, 5, capacity=20_000)
+    q = np.array([0.025, 0.5, 0.975])
+    aaae(sketch.quantile(q), np.diagonal(np.quantile(outcomes, q, axis=0)))
+    x = np.array([-2.0, 0.0, 1.5])
+    aaae(sketch.cdf(x), (outcomes <= x).mean(axis=0))
+
+
+@pytest.mark.parametrize("n_chunks", [1, 10, 200])
+def test_quantile_sketch_with_compaction(outcomes, n_chunks):
+    sketch = _summarize_in_chunks(QuantileSketch, outcomes, n_chunks, capacity=500)
+    assert sketch.n == len(outcomes)
+    assert sum(len(level) for level in sketch.levels) <= 500 * len(sketch.levels)
+    for q in [0.025, 0.5, 0.975]:
+        # share of outcomes below the approximate quantile
+        calculated = (outcomes <= sketch.quantile(q)).mean(axis=0)
+        aaae(calculated, np.full(3, q), decimal=2)
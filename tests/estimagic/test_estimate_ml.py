@@ -18,6 +18,11 @@ from estimagic.examples.logit import (
     scalar_logit_fun_and_jac,
 )
 from optimagic import mark
+from optimagic.differentiation.numdiff_options import (
+    NumdiffPurpose,
+    get_default_numdiff_options,
+    get_derivative_kwargs,
+)
 from optimagic.optimizers import scipy_optimizers
 from optimagic.parameters.bounds import Bounds
 
@@ -470,3 +475,49 @@ def test_caching(normal_inputs):
 
     cov = got.cov(method="robust", return_type="array", seed=0)
     assert_array_equal(list(got._cache.values())[0], cov)
+
+
+def test_numerical_jacobian_uses_its_own_steps(normal_inputs):
+    y = normal_inputs["y"][:100]
+    got = estimate_ml(
+        normal_loglike,
+        {"mean": 1.0, "sd": 1.0},
+        optimize_options=False,
+        loglike_kwargs={"y": y},
+    )
+
+    expected = om.first_derivative(
+        lambda x: normal_loglike({"mean": x[0], "sd": x[1]}, y),
+        np.ones(2),
+        **get_derivative_kwargs(
+            get_default_numdiff_options(purpose=NumdiffPurpose.ESTIMATE_JACOBIAN)
+        ),
+    ).derivative
+    assert_array_equal(got._internal_jacobian, expected)
+
+
+def test_numerical_jacobian_and_hessian_share_function_value(normal_inputs):
+    calls = []
+
+    def loglike(params, y):
+        calls.append(1)
+        return normal_loglike(params, y)
+
+    params = {"mean": 1.0, "sd": 1.0}
+    kwargs = {"y": normal_inputs["y"][:100]}
+
+    estimate_ml(loglike, params, optimize_options=False, loglike_kwargs=kwargs)
+    n_with_hessian = len(calls)
+
+    calls.clear()
+    estimate_ml(
+        loglike,
+        params,
+        optimize_options=False,
+        loglike_kwargs=kwargs,
+        hessian=False,
+    )
+    # the function value at the estimates is calculated once and not again for the
+    # Jacobian; central differences need two evaluations per parameter
+    assert len(calls) == 1 + 2 * 2
+    assert n_with_hessian > len(calls)
@@ -88,6 +88,80 @@ def test_stratification(jac, design_options):
     np.allclose(calculated, expected)
 
 
+@pytest.fixture()
+def random_design():
+    rng = np.random.default_rng(1234)
+    jac = rng.normal(size=(200, 3))
+    design_info = pd.DataFrame(
+        {
+            "psu": rng.integers(0, 30, size=200),
+            "strata": rng.choice(["a", "b", "c"], size=200),
+        }
+    )
+    # a stratum with a single psu
+    design_info.loc[:4, "strata"] = "d"
+    design_info.loc[:4, "psu"] = 100
+    design_info["fpc"] = design_info["strata"].map(
+        {"a": 0.9, "b": 0.8, "c": 1, "d": 0.5}
+    )
+    return jac, design_info
+
+
+def test_clustering_with_many_clusters(random_design):
+    jac, design_info = random_design
+    calculated = _clustering(jac, design_info)
+
+    psu_sums = pd.DataFrame(jac).groupby(design_info["psu"]).sum().to_numpy()
+    n_clusters = len(psu_sums)
+    expected = n_clusters / (n_clusters - 1) * psu_sums.T @ psu_sums
+    aaae(calculated, expected)
+
+
+def test_stratification_with_many_clusters(random_design):
+    jac, design_info = random_design
+    calculated = _stratification(jac, design_info)
+
+    # psu sums are taken over all observations of a psu, even across strata
+    psu_sums = pd.DataFrame(jac).groupby(design_info["psu"]).sum()
+    expected = np.zeros((3, 3))
+    for _, group in design_info.groupby("strata"):
+        psu_jac = psu_sums.loc[group["psu"].unique()].to_numpy()
+        n_psu = len(psu_jac)
+        fpc = group["fpc"].iloc[0]
+        if n_psu > 1:
+            deviations = psu_jac - psu_jac.mean(axis=0)
+            expected += fpc * n_psu / (n_psu - 1) * deviations.T @ deviations
+        else:
+            expected += fpc * psu_jac.T @ psu_jac
+
+    aaae(calculated, expected)
+
+
+def test_stratification_without_psu_does_not_modify_design_info(random_design):
+    jac, design_info = random_design
+    design_info = design_info.drop(columns="psu")
+    calculated = _stratification(jac, design_info)
+
+    expected = _stratification(jac, design_info.assign(psu=design_info.index))
+    aaae(calculated, expected)
+    assert "psu" not in design_info
+
+
+@pytest.mark.parametrize("meat_func", [_clustering, _stratification])
+def test_meat_with_jacobian_in_chunks(random_design, meat_func):
+    jac, design_info = random_design
+    chunks = (jac[start : start + 64] for start in range(0, len(jac), 64))
+    calculated = meat_func(chunks, design_info)
+    expected = meat_func(jac, design_info)
+    aaae(calculated, expected)
+
+
+def test_meat_with_jacobian_chunks_that_do_not_match_design_info(random_design):
+    jac, design_info = random_design
+    with pytest.raises(ValueError, match="rows"):
+        _clustering([jac[:100], jac[100:150]], design_info)
+
+
 def test_sandwich_step(hess):
     calculated = _sandwich_step(hess, meat=np.ones((4, 4)))
 
@@ -5,7 +5,7 @@ from numpy.testing import assert_array_almost_equal as aaae
 from scipy import stats
 
 from estimagic.config import EXAMPLE_DIR
-from estimagic.msm_covs import cov_optimal
+from estimagic.msm_covs import cov_optimal, cov_robust
 from estimagic.msm_sensitivity import (
     calculate_actual_sensitivity_to_noise,
     calculate_actual_sensitivity_to_removal,
@@ -199,3 +199,83 @@ def test_sensitivity_to_weighting(jac, weights, moments_cov, params_cov_opt, par
     )
 
     aaae(calculated, expected)
+
+
+@pytest.fixture()
+def diagonal_weights(moments_cov):
+    return np.diag(1 / np.diagonal(moments_cov))
+
+
+def test_actual_sensitivity_to_removal_with_non_optimal_weights(
+    jac, diagonal_weights, moments_cov
+):
+    params_cov = cov_robust(jac, diagonal_weights, moments_cov)
+    calculated = calculate_actual_sensitivity_to_removal(
+        jac, diagonal_weights, moments_cov, params_cov
+    )
+
+    expected = []
+    for k in range(len(moments_cov)):
+        weights_k = diagonal_weights.copy()
+        weights_k[k, :] = 0
+        weights_k[:, k] = 0
+        sigma_k = cov_robust(jac, weights_k, moments_cov)
+        expected.append(np.diagonal(sigma_k - params_cov))
+
+    expected = np.array(expected).T / np.diagonal(params_cov).reshape(-1, 1)
+    aaae(calculated, expected)
+
+
+def test_fundamental_sensitivity_to_removal_equals_removing_moments(
+    jac, moments_cov, params_cov_opt
+):
+    calculated = calculate_fundamental_sensitivity_to_removal(
+        jac, moments_cov, params_cov_opt
+    )
+
+    expected = []
+    for k in range(len(moments_cov)):
+        jac_k = np.delete(jac, k, axis=0)
+        moments_cov_k = np.delete(np.delete(moments_cov, k, axis=0), k, axis=1)
+        sigma_k = cov_optimal(jac_k, np.linalg.inv(moments_cov_k))
+        expected.append(np.diagonal(sigma_k - params_cov_opt))
+
+    expected = np.array(expected).T / np.diagonal(params_cov_opt).reshape(-1, 1)
+    aaae(calculated, expected)
+
+
+def test_sensitivity_to_weighting_with_non_optimal_weights(
+    jac, diagonal_weights, moments_cov
+):
+    params_cov = cov_robust(jac, diagonal_weights, moments_cov)
+    calculated = calculate_sensitivity_to_weighting(
+        jac, diagonal_weights, moments_cov, params_cov
+    )
+
+    gwg_inverse = np.linalg.inv(jac.T @ diagonal_weights @ jac)
+    expected = []
+    for k in range(len(moments_cov)):
+        mask = np.zeros_like(diagonal_weights)
+        mask[k, k] = 1
+        derivative = (
+            -gwg_inverse @ jac.T @ mask @ jac @ params_cov
+            + gwg_inverse
+            @ jac.T
+            @ mask
+            @ moments_cov
+            @ diagonal_weights
+            @ jac
+            @ gwg_inverse
+            + gwg_inverse
+            @ jac.T
+            @ diagonal_weights
+            @ moments_cov
+            @ mask
+            @ jac
+            @ gwg_inverse
+            - params_cov @ jac.T @ mask @ jac @ gwg_inverse
+        )
+        expected.append(np.diagonal(derivative))
+
+    expected = np.array(expected).T / np.diagonal(params_cov).reshape(-1, 1)
+    aaae(calculated, expected * np.diagonal(diagonal_weights))
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from optimagic.differentiation.coloring import get_column_coloring, process_sparsity
+
+
+def _assert_valid_coloring(pattern, colors):
+    pattern = np.asarray(pattern, dtype=bool)
+    for color in np.unique(colors):
+        assert pattern[:, colors == color].sum(axis=1).max() <= 1
+
+
+def test_coloring_of_tridiagonal_pattern():
+    pattern = sum(np.eye(10, k=k, dtype=int) for k in (-1, 0, 1))
+    colors = get_column_coloring(pattern)
+    assert colors.max() == 2
+    _assert_valid_coloring(pattern, colors)
+
+
+def test_coloring_of_dense_pattern():
+    colors = get_column_coloring(np.ones((2, 4)))
+    assert sorted(colors) == [0, 1, 2, 3]
+
+
+def test_coloring_of_block_pattern():
+    # 20 observations, each depends on one of 5 groups of 3 parameters
+    groups = np.repeat(np.arange(5), 4)
+    pattern = np.repeat(np.eye(5, dtype=bool)[groups], 3, axis=1)
+    colors = get_column_coloring(sp.csr_array(pattern))
+    assert colors.max() == 2
+    _assert_valid_coloring(pattern, colors)
+
+
+def test_coloring_of_random_pattern():
+    rng = np.random.default_rng(1234)
+    pattern = rng.uniform(size=(30, 50)) < 0.05
+    colors = get_column_coloring(pattern)
+    _assert_valid_coloring(pattern, colors)
+
+
+def test_process_sparsity():
+    got = process_sparsity(np.array([[1, 0], [0, 2]]), dim_x=2)
+    assert isinstance(got, sp.csc_array)
+    assert got.dtype == bool
+    assert got.nnz == 2
+
+
+def test_process_sparsity_with_wrong_shape():
+    with pytest.raises(ValueError, match="sparsity pattern has shape"):
+        process_sparsity(np.ones((2, 3)), dim_x=2)
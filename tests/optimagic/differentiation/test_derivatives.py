@@ -6,22 +6,29 @@ from typing import get_type_hints
 import numpy as np
 import pandas as pd
 import pytest
+import scipy.sparse as sp
 from numpy.testing import assert_array_almost_equal as aaae
 from pandas.testing import assert_frame_equal
+from pybaum import tree_just_flatten
 from scipy.optimize._numdiff import approx_derivative
 
+from optimagic import mark
+from optimagic.differentiation import derivatives
 from optimagic.differentiation.derivatives import (
     Evals,
     NumdiffResult,
     _consolidate_one_step_derivatives,
     _convert_evaluation_data_to_frame,
     _convert_richardson_candidates_to_frame,
+    _get_one_step_points,
+    _get_two_step_points,
     _is_scalar_nan,
     _nan_skipping_batch_evaluator,
     _reshape_cross_step_evals,
     _reshape_one_step_evals,
     _reshape_two_step_evals,
     _select_minimizer_along_axis,
+    first_and_second_derivative,
     first_derivative,
     second_derivative,
 )
@@ -33,7 +40,12 @@ from optimagic.examples.numdiff_functions import (
     logit_loglikeobs,
     logit_loglikeobs_jacobian,
 )
+from optimagic.optimization.evaluation_cache import (
+    EvaluationCache,
+    EvaluationCacheOptions,
+)
 from optimagic.parameters.bounds import Bounds
+from optimagic.parameters.tree_registry import get_registry
 
 
 @pytest.fixture()
@@ -383,6 +395,63 @@ def test_second_derivative_with_unpacking():
     aaae(got.derivative, np.eye(3) * 2, decimal=4)
 
 
+@pytest.mark.parametrize("n_cores", [1, 2])
+def test_first_derivative_with_vectorized_func(n_cores):
+    calls = []
+
+    @mark.vectorized
+    def f(x):
+        calls.append(len(x))
+        return np.sin(x).sum(axis=1)
+
+    got = first_derivative(
+        f, np.arange(3.0), n_cores=n_cores, batch_evaluator="threading"
+    )
+
+    aaae(got.derivative, np.cos(np.arange(3.0)))
+    assert np.isscalar(got.func_value)
+    assert len(calls) == n_cores
+    assert sum(calls) == 7
+
+
+def test_second_derivative_with_vectorized_func():
+    calls = []
+
+    @mark.vectorized
+    def f(x):
+        calls.append(len(x))
+        return (x**2).sum(axis=1)
+
+    got = second_derivative(f, np.ones(3), n_cores=1)
+
+    aaae(got.derivative, np.eye(3) * 2, decimal=4)
+    assert len(calls) == 1
+
+
+def test_first_derivative_with_vectorized_func_and_pytree_params():
+    @mark.vectorized
+    def f(x):
+        return x
+
+    with pytest.raises(ValueError, match="Vectorized functions"):
+        first_derivative(f, {"a": 1.0})
+
+
+def test_nan_skipping_batch_evaluator_with_vectorized_func():
+    arglist = [np.nan, np.ones(2), np.array([3, 4]), np.nan]
+    calculated = _nan_skipping_batch_evaluator(
+        func=lambda x: (x**2).sum(axis=1),
+        arguments=arglist,
+        n_cores=1,
+        error_handling="continue",
+        batch_evaluator="joblib",
+        vectorized=True,
+    )
+    assert np.isnan(calculated[0])
+    assert calculated[1:3] == [2, 25]
+    assert np.isnan(calculated[3])
+
+
 @pytest.mark.filterwarnings("ignore:The dictionary access for")
 def test_numdiff_result_getitem():
     res = NumdiffResult(
@@ -398,8 +467,9 @@ def test_numdiff_result_getitem():
 
 
 def test_first_and_second_derivative_have_same_type_hints():
-    # exclude method from comparison, as the argument options differ here
-    exclude = ["method"]
+    # exclude method from comparison, as the argument options differ here, and
+    # sparsity, as it is only supported for first derivatives
+    exclude = ["method", "sparsity"]
     first_hints = {
         k: v for k, v in get_type_hints(first_derivative).items() if k not in exclude
     }
@@ -469,3 +539,265 @@ def test_second_derivative_pytree_min_steps():
     assert np.allclose(got.derivative["a"]["a"], np.eye(3) * 2)
     assert np.allclose(got.derivative["a"]["b"], np.zeros(3))
     assert np.allclose(got.derivative["b"]["b"], 0)
+
+
+def _points_to_layout(points):
+    out = np.full((int(np.prod(points.shape)), len(points.x)), np.nan)
+    out[points.positions] = points.get_points(0, len(points))
+    return out
+
+
+def test_get_one_step_points():
+    x = np.array([1.0, 2.0])
+    steps = Steps(pos=np.array([[0.1, np.nan]]), neg=np.array([[-0.1, -0.2]]))
+    got = _points_to_layout(_get_one_step_points(x, steps))
+    expected = np.array(
+        [[1.1, 2.0], [np.nan, np.nan], [0.9, 2.0], [1.0, 1.8]],
+    )
+    aaae(got, expected)
+
+
+@pytest.mark.parametrize("sign", [1.0, -1.0])
+def test_get_two_step_points(sign):
+    x = np.array([1.0, 2.0, 3.0])
+    pos = np.array([[0.1, 0.2, np.nan], [0.2, 0.4, 0.6]])
+    steps = Steps(pos=pos, neg=-pos)
+    got = _points_to_layout(_get_two_step_points(x, steps, sign=sign))
+
+    expected = []
+    for step_arr in steps:
+        for i, j, k in np.ndindex(2, 3, 3):
+            if (
+                j > k
+                or (j == k and sign < 0)
+                or np.isnan(step_arr[i, j])
+                or np.isnan(step_arr[i, k])
+            ):
+                expected.append(np.full(3, np.nan))
+            else:
+                point = x.copy()
+                point[j] += step_arr[i, j]
+                point[k] += sign * step_arr[i, k]
+                expected.append(point)
+
+    aaae(got, np.array(expected))
+
+
+@pytest.mark.parametrize("params", [np.arange(4.0), {"a": 0.0, "b": np.arange(1, 4.0)}])
+def test_derivatives_with_small_chunks(params, monkeypatch):
+    def f(params):
+        x = (
+            params
+            if isinstance(params, np.ndarray)
+            else np.r_[params["a"], params["b"]]
+        )
+        return (x**3).sum()
+
+    expected_first = first_derivative(f, params).derivative
+    expected_second = second_derivative(f, params).derivative
+
+    monkeypatch.setattr(derivatives, "_MAX_CHUNK_ENTRIES", 8)
+
+    got_first = first_derivative(f, params).derivative
+    got_second = second_derivative(f, params).derivative
+
+    registry = get_registry(extended=True)
+    aaae(
+        tree_just_flatten(got_first, registry=registry),
+        tree_just_flatten(expected_first, registry=registry),
+    )
+    aaae(
+        tree_just_flatten(got_second, registry=registry),
+        tree_just_flatten(expected_second, registry=registry),
+    )
+
+
+def _banded_func(x):
+    out = x**2
+    out[1:] += np.sin(x[:-1])
+    out[:-1] += x[1:] ** 3
+    return out
+
+
+@pytest.mark.parametrize("method", ["central", "forward", "backward"])
+def test_first_derivative_with_sparsity(method):
+    calls = []
+
+    def f(x):
+        calls.append(1)
+        return _banded_func(x)
+
+    x = np.linspace(0.1, 1, 20)
+    pattern = sum(np.eye(20, k=k, dtype=bool) for k in (-1, 0, 1))
+    bounds = Bounds(lower=np.full(20, 0.1), upper=np.full(20, 1.0))
+
+    expected = first_derivative(f, x, method=method, bounds=bounds).derivative
+    calls.clear()
+    got = first_derivative(
+        f, x, method=method, bounds=bounds, sparsity=pattern
+    ).derivative
+
+    assert isinstance(got, sp.csr_array)
+    assert got.nnz == pattern.sum()
+    aaae(got.toarray(), expected)
+    # three colors per step direction, f0 and a few points due to the binding bounds
+    assert len(calls) <= 10
+
+
+def test_first_derivative_with_sparsity_and_pytree_params():
+    with pytest.raises(ValueError, match="sparsity pattern is only supported"):
+        first_derivative(lambda p: p["a"], {"a": np.ones(2)}, sparsity=np.eye(2))
+
+
+def test_first_derivative_with_sparsity_and_scalar_output():
+    with pytest.raises(ValueError, match="sparsity pattern is only supported"):
+        first_derivative(lambda x: x.sum(), np.ones(2), sparsity=np.eye(2))
+
+
+def test_first_and_second_derivative_share_evaluations():
+    calls = []
+
+    def f(x):
+        calls.append(1)
+        return {"contribs": np.exp(x) * x[::-1], "value": (np.exp(x) * x[::-1]).sum()}
+
+    x = np.array([0.5, 1.0, 1.5])
+    step_size = np.finfo(float).eps ** (1 / 3) * np.maximum(np.abs(x), 0.1)
+
+    expected_first = first_derivative(
+        f, x, step_size=step_size, unpacker=lambda out: out["contribs"]
+    ).derivative
+    calls.clear()
+    expected_second = second_derivative(
+        f, x, step_size=step_size, unpacker=lambda out: out["value"]
+    ).derivative
+    n_second_calls = len(calls)
+
+    calls.clear()
+    got = first_and_second_derivative(
+        f,
+        x,
+        first_derivative_unpacker=lambda out: out["contribs"],
+        second_derivative_unpacker=lambda out: out["value"],
+    )
+
+    aaae(got.first_derivative.derivative, expected_first)
+    aaae(got.second_derivative.derivative, expected_second)
+    # f0 and one step per parameter and direction
+    assert got.n_saved_evaluations == 2 * len(x) + 1
+    assert len(calls) == n_second_calls
+
+
+def test_first_derivative_with_evaluation_cache():
+    calls = []
+
+    def f(x):
+        calls.append(1)
+        return x**2
+
+    cache = EvaluationCache(EvaluationCacheOptions())
+    x = np.array([1.0, 2.0])
+    first = first_derivative(f, x, evaluation_cache=cache).derivative
+    assert len(calls) == 5
+
+    second = first_derivative(f, x, evaluation_cache=cache).derivative
+    assert len(calls) == 5
+    assert cache.info().hits == 5
+    aaae(first, second)
+
+
+def test_first_derivative_complex_step_jacobian(binary_choice_inputs):
+    fix = binary_choice_inputs
+    func = partial(logit_loglikeobs, y=fix["y"], x=fix["x"])
+    calculated = first_derivative(func, fix["params_np"], method="complex_step")
+    expected = logit_loglikeobs_jacobian(fix["params_np"], fix["y"], fix["x"])
+    aaae(calculated.derivative, expected, decimal=14)
+
+
+def test_first_derivative_complex_step_needs_one_evaluation_per_parameter():
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return np.exp(x) @ x
+
+    x = np.array([0.5, -1.0, 2.0])
+    got = first_derivative(f, x, method="complex_step", f0=f(x))
+    calls = calls[1:]
+
+    aaae(got.derivative, np.exp(x) * (1 + x), decimal=14)
+    assert len(calls) == len(x)
+    assert all(np.iscomplexobj(c) for c in calls)
+
+
+def test_first_derivative_complex_step_with_pytree_params():
+    params = {"a": np.array([1.0, 2.0]), "b": pd.Series([3.0], index=["c"])}
+    got = first_derivative(
+        lambda p: (p["a"] ** 3).sum() * p["b"]["c"],
+        params,
+        method="complex_step",
+    ).derivative
+    aaae(got["a"], np.array([9.0, 36.0]), decimal=14)
+    aaae(got["b"], np.array([9.0]), decimal=14)
+
+
+def test_first_derivative_complex_step_at_bounds():
+    x = np.array([0.0, 1.0])
+    got = first_derivative(
+        np.sin,
+        x,
+        method="complex_step",
+        bounds=Bounds(lower=x, upper=x),
+    ).derivative
+    aaae(got, np.diag(np.cos(x)), decimal=14)
+
+
+def test_first_derivative_complex_step_with_vectorized_func():
+    calls = []
+
+    @mark.vectorized
+    def f(x):
+        calls.append(x)
+        return np.exp(x).sum(axis=1)
+
+    x = np.array([0.5, 1.0])
+    got = first_derivative(f, x, method="complex_step")
+    aaae(got.derivative, np.exp(x), decimal=14)
+    assert isinstance(got.func_value, float)
+    # f0 is not stacked with the complex points
+    assert [c.dtype for c in calls] == [np.float64, np.complex128]
+
+
+def test_first_derivative_complex_step_with_sparsity():
+    x = np.linspace(0.1, 1, 20)
+    pattern = sum(np.eye(20, k=k, dtype=bool) for k in (-1, 0, 1))
+    expected = first_derivative(_banded_func, x, method="complex_step").derivative
+    got = first_derivative(
+        _banded_func, x, method="complex_step", sparsity=pattern
+    ).derivative
+    aaae(got.toarray(), expected, decimal=14)
+
+
+def test_first_derivative_complex_step_with_failed_evaluation():
+    def f(x):
+        if np.iscomplexobj(x) and x[0].imag != 0:
+            raise ValueError()
+        return x**2
+
+    with pytest.warns(UserWarning):
+        got = first_derivative(f, np.ones(2), method="complex_step").derivative
+    assert np.isnan(got[:, 0]).all()
+    aaae(got[:, 1], np.array([0, 2.0]))
+
+
+def test_first_derivative_complex_step_is_not_cached():
+    cache = EvaluationCache(EvaluationCacheOptions())
+    x = np.ones(2)
+    first_derivative(lambda x: x**2, x, method="complex_step", evaluation_cache=cache)
+    assert cache.info().size == 1
+
+
+def test_first_derivative_complex_step_with_n_steps():
+    with pytest.raises(ValueError, match="Richardson extrapolation is not supported"):
+        with pytest.warns(FutureWarning):
+            first_derivative(lambda x: x, np.ones(2), method="complex_step", n_steps=2)
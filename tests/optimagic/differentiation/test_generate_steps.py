@@ -95,6 +95,23 @@ def test_calculate_or_validate_base_steps_hessian():
     aaae(calculated, expected, decimal=12)
 
 
+def test_generate_steps_complex_step():
+    x = np.array([0.05, 1, -5])
+    steps = generate_steps(
+        x=x,
+        method="complex_step",
+        n_steps=1,
+        target="first_derivative",
+        base_steps=None,
+        scaling_factor=1.0,
+        bounds=Bounds(lower=x, upper=x),
+        step_ratio=2,
+        min_steps=None,
+    )
+    aaae(steps.pos, np.array([[0.1, 1, 5]]) * np.finfo(float).eps, decimal=30)
+    assert np.isnan(steps.neg).all()
+
+
 def test_set_unused_side_to_nan_forward():
     pos = np.ones((3, 2))
     neg = -np.ones((3, 2))
@@ -1,7 +1,10 @@
+import numpy as np
 import pytest
+import scipy.sparse as sp
 
 from optimagic.differentiation.numdiff_options import (
     NumdiffOptions,
+    get_derivative_kwargs,
     pre_process_numdiff_options,
 )
 from optimagic.exceptions import InvalidNumdiffOptionsError
@@ -83,3 +86,18 @@ def test_numdiff_options_invalid_batch_evaluator():
         InvalidNumdiffOptionsError, match="Invalid numdiff `batch_evaluator`:"
     ):
         NumdiffOptions(batch_evaluator="invalid")
+
+
+@pytest.mark.parametrize("jac_sparsity", ["invalid", np.ones(3), [[1, 0]]])
+def test_numdiff_options_invalid_jac_sparsity(jac_sparsity):
+    with pytest.raises(
+        InvalidNumdiffOptionsError, match="Invalid numdiff `jac_sparsity`"
+    ):
+        NumdiffOptions(jac_sparsity=jac_sparsity)
+
+
+@pytest.mark.parametrize("jac_sparsity", [None, "detect", np.eye(2), sp.eye(2)])
+def test_get_derivative_kwargs(jac_sparsity):
+    got = get_derivative_kwargs(NumdiffOptions(jac_sparsity=jac_sparsity))
+    assert "jac_sparsity" not in got
+    assert got["method"] == "central"
@@ -1,8 +1,9 @@
-from dataclasses import asdict
+from dataclasses import asdict, replace
 
 import numpy as np
 import pandas as pd
 import pytest
+from numpy.testing import assert_array_almost_equal as aaae
 from pybaum import tree_equal, tree_just_flatten
 
 from optimagic.logging.logger import (
@@ -12,6 +13,7 @@ from optimagic.logging.logger import (
     SQLiteLogOptions,
     SQLiteLogReader,
 )
+from optimagic.logging.types import IterationState
 from optimagic.optimization.optimize import minimize
 from optimagic.parameters.tree_registry import get_registry
 from optimagic.typing import Direction
@@ -88,6 +90,97 @@ def test_log_reader_read_multistart_history(example_db):
     )
 
 
+def test_log_reader_read_history_uses_numeric_columns(example_db, monkeypatch):
+    reader = SQLiteLogReader(example_db)
+    expected = reader.read_history()
+
+    def _raise(*args, **kwargs):
+        raise AssertionError("Serialized iterations should not be read.")
+
+    monkeypatch.setattr(reader._iteration_store, "select", _raise)
+    monkeypatch.setattr(reader._iteration_store, "select_after", _raise)
+    res = SQLiteLogReader(example_db).read_history()
+
+    assert res["fun"] == expected["fun"]
+    aaae(res["time"], expected["time"])
+    assert res["params"][0] == {"a": 1, "b": 2, "c": 3}
+
+
+def test_log_reader_read_history_with_dataframe_params(tmp_path):
+    params = pd.DataFrame({"value": [1.0, 2.0], "lower_bound": [-5, -5]})
+    path = tmp_path / "test.db"
+    minimize(
+        fun=lambda p: p["value"] @ p["value"],
+        params=params,
+        algorithm="scipy_lbfgsb",
+        logging=path,
+    )
+
+    res = SQLiteLogReader(path).read_history()
+    pd.testing.assert_frame_equal(res["params"][0], params)
+
+
+def _copy_first_iteration(store, **kwargs):
+    first = asdict(store.select(1)[0])
+    first.pop("rowid")
+    return replace(IterationState(**first), **kwargs)
+
+
+def test_log_reader_read_new_iterations(example_db):
+    reader = SQLiteLogReader(example_db)
+    n_rows = len(reader._iteration_store.select())
+
+    first = reader.read_new_iterations()
+    second = reader.read_new_iterations()
+
+    assert len(first.rowid) == n_rows
+    assert first.scalar_fun[0] == 14
+    aaae(first.flat_params[0], [1, 2, 3])
+    assert len(second.rowid) == 0
+
+    store = reader._iteration_store
+    store.insert(_copy_first_iteration(store, scalar_fun=100.0))
+    third = reader.read_new_iterations()
+    aaae(third.rowid, [n_rows + 1])
+    aaae(third.scalar_fun, [100.0])
+
+
+def test_log_reader_read_history_keeps_nan_function_values(example_db):
+    reader = SQLiteLogReader(example_db)
+    n_evals = len(reader.read_history()["fun"])
+
+    store = reader._iteration_store
+    store.insert(_copy_first_iteration(store, scalar_fun=np.nan))
+    store.insert(_copy_first_iteration(store, scalar_fun=None))
+    res = reader.read_history()
+
+    assert len(res["fun"]) == n_evals + 1
+    assert np.isnan(res["fun"][-1])
+
+
+def test_log_reader_read_history_is_incremental(example_db, monkeypatch):
+    reader = SQLiteLogReader(example_db)
+    first = reader.read_history()
+
+    store = reader._iteration_store
+    store.insert(_copy_first_iteration(store, scalar_fun=100.0))
+    new_rowid = store.select_last_rows(1)[0].rowid
+
+    calls = []
+    select_numeric_columns = store.select_numeric_columns
+
+    def _spy(min_rowid):
+        calls.append(min_rowid)
+        return select_numeric_columns(min_rowid=min_rowid)
+
+    monkeypatch.setattr(store, "select_numeric_columns", _spy)
+    second = reader.read_history()
+
+    assert calls == [new_rowid - 1]
+    assert second["fun"] == [*first["fun"], 100.0]
+    assert second["params"][-1] == {"a": 1, "b": 2, "c": 3}
+
+
 def test_read_steps_table(example_db):
     res = SQLiteLogReader(example_db)._step_store.to_df()
     assert isinstance(res, pd.DataFrame)
@@ -106,6 +199,57 @@ def test_non_existing_database_raises_error(tmp_path):
         SQLiteLogReader(tmp_path / "i_do_not_exist.db").read_start_params()
 
 
+@pytest.mark.parametrize(
+    "buffer_options",
+    [{"buffer_size": 4}, {"flush_interval": 60}, {"buffer_size": 1000}],
+)
+def test_buffered_logging_writes_all_iterations(tmp_path, buffer_options):
+    def _crit(params):
+        return params @ params
+
+    res = minimize(
+        fun=_crit,
+        params=np.arange(5),
+        algorithm="scipy_lbfgsb",
+        logging=SQLiteLogOptions(tmp_path / "buffered.db", **buffer_options),
+    )
+    history = SQLiteLogReader(tmp_path / "buffered.db").read_history()
+
+    assert len(history["fun"]) == res.n_fun_evals
+    assert history["fun"][0] == 30
+
+
+def test_buffered_logging_flushes_on_exception(tmp_path):
+    path = tmp_path / "buffered.db"
+    n_evals = 0
+
+    def _crit(params):
+        nonlocal n_evals
+        n_evals += 1
+        if n_evals > 3:
+            raise RuntimeError("Stop the optimization.")
+        return params @ params
+
+    with pytest.raises(Exception):  # noqa: B017
+        minimize(
+            fun=_crit,
+            params=np.arange(5),
+            algorithm="scipy_neldermead",
+            logging=SQLiteLogOptions(path, buffer_size=1000),
+        )
+
+    # the first evaluation happens before the optimization is started and is not logged
+    assert len(SQLiteLogReader(path).read_history()["fun"]) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"buffer_size": 0}, {"flush_interval": 0}, {"flush_interval": -1}]
+)
+def test_invalid_buffer_options(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        SQLiteLogOptions(tmp_path / "test.db", **kwargs)
+
+
 def test_available_log_options():
     available_types = LogOptions.available_option_types()
     assert len(available_types) == 1
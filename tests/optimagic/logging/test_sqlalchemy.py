@@ -1,12 +1,16 @@
 import pickle
 import sys
+import time
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
 
 import numpy as np
 import pytest
-from sqlalchemy import inspect
+from numpy.testing import assert_array_almost_equal as aaae
+from sqlalchemy import Column, Integer, MetaData, PickleType, Table, inspect
 
 from optimagic.logging import ExistenceStrategy
+from optimagic.logging.base import RobustPickler
 from optimagic.logging.logger import LogStore, SQLiteLogOptions
 from optimagic.logging.sqlalchemy import IterationStore, StepStore
 from optimagic.logging.types import (
@@ -128,6 +132,111 @@ class TestIterationStore:
                 )
             )
 
+    def test_buffered_insert_is_written_in_bulk(self, tmp_path):
+        store = IterationStore(SQLiteLogOptions(tmp_path / "test.db"), buffer_size=3)
+        assert store.is_buffered
+
+        for i in range(2):
+            store.insert(self.create_test_point(i))
+        assert store._select_all_rows() == []
+
+        store.insert(self.create_test_point(2))
+        assert len(store._select_all_rows()) == 3
+
+    def test_buffered_select_flushes(self, tmp_path):
+        store = IterationStore(SQLiteLogOptions(tmp_path / "test.db"), buffer_size=100)
+        for i in range(5):
+            store.insert(self.create_test_point(i))
+
+        assert [row.step for row in store.select()] == list(range(5))
+        assert store.select_last_rows(1)[0].rowid == 5
+
+    def test_buffered_insert_flush_interval(self, tmp_path):
+        store = IterationStore(
+            SQLiteLogOptions(tmp_path / "test.db"), flush_interval=1e-12
+        )
+        store.insert(self.create_test_point(0))
+        assert len(store._select_all_rows()) == 1
+
+    def test_buffered_insert_is_flushed_by_timer(self, tmp_path):
+        store = IterationStore(
+            SQLiteLogOptions(tmp_path / "test.db"), flush_interval=0.05
+        )
+        store.insert(self.create_test_point(0))
+        assert store._select_all_rows() == []
+
+        for _ in range(100):
+            time.sleep(0.05)
+            if store._select_all_rows():
+                break
+        assert len(store._select_all_rows()) == 1
+        assert store._flush_timer is None
+
+    def test_unpickled_buffered_store_is_not_buffered(self, tmp_path):
+        store = IterationStore(SQLiteLogOptions(tmp_path / "test.db"), buffer_size=10)
+        unpickled_store = pickle.loads(pickle.dumps(store))
+        assert not unpickled_store.is_buffered
+
+    def test_select_numeric_columns(self, store):
+        for i in range(3):
+            store.insert(self.create_test_point(i))
+        store.insert(replace(self.create_test_point(3), scalar_fun=None))
+        store.insert(replace(self.create_test_point(4), scalar_fun=np.nan))
+
+        columns = store.select_numeric_columns()
+
+        aaae(columns.rowid, [1, 2, 3, 4, 5])
+        aaae(columns.timestamp, 123456.0 + np.arange(5))
+        aaae(columns.scalar_fun, [0.5, 1.5, 2.5, np.nan, np.nan])
+        assert columns.has_scalar_fun.tolist() == [True, True, True, False, True]
+        aaae(columns.step, [0, 1, 2, 3, 4])
+        assert columns.valid.all()
+        aaae(columns.flat_params, np.arange(5).reshape(-1, 1) + np.array([0, 1]))
+
+    def test_select_numeric_columns_empty_store(self, store):
+        columns = store.select_numeric_columns()
+        assert columns.rowid.shape == (0,)
+        assert columns.flat_params.shape == (0, 0)
+
+    def test_store_without_numeric_columns(self, tmp_path):
+        options = SQLiteLogOptions(tmp_path / "test.db")
+        # mimic a database that was created by an older version of optimagic
+        engine = options.create_engine()
+        metadata = MetaData()
+        Table(
+            IterationStore._TABLE_NAME,
+            metadata,
+            Column("rowid", Integer, primary_key=True, autoincrement=True),
+            Column("serialized_value", PickleType(pickler=RobustPickler)),
+        )
+        metadata.create_all(engine)
+
+        store = IterationStore(options)
+        store.insert(self.create_test_point(0))
+
+        assert not store.has_numeric_columns
+        assert store.select()[0].scalar_fun == 0.5
+        columns = store.select_numeric_columns()
+        aaae(columns.scalar_fun, [0.5])
+        assert columns.has_scalar_fun.tolist() == [True]
+        aaae(columns.flat_params, [[0, 1]])
+
+    def test_select_numeric_columns_after_rowid(self, store):
+        for i in range(5):
+            store.insert(self.create_test_point(i))
+
+        columns = store.select_numeric_columns(min_rowid=3)
+
+        aaae(columns.rowid, [4, 5])
+        aaae(columns.step, [3, 4])
+
+    def test_select_after(self, store):
+        for i in range(5):
+            store.insert(self.create_test_point(i))
+
+        assert [row.rowid for row in store.select_after(2)] == [3, 4, 5]
+        assert store.select_after(5) == []
+
 
 class TestStepStore:
     @pytest.fixture
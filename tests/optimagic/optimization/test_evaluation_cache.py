@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+import optimagic as om
+from optimagic.exceptions import InvalidEvaluationCacheError
+from optimagic.optimization.evaluation_cache import (
+    EvaluationCache,
+    EvaluationCacheOptions,
+    pre_process_evaluation_cache,
+)
+from optimagic.typing import EvalTask
+
+
+def test_pre_process_evaluation_cache_trivial_case():
+    options = EvaluationCacheOptions(max_size=10)
+    assert pre_process_evaluation_cache(options) == options
+
+
+@pytest.mark.parametrize("value", [None, False])
+def test_pre_process_evaluation_cache_no_cache(value):
+    assert pre_process_evaluation_cache(value) is None
+
+
+def test_pre_process_evaluation_cache_true_case():
+    assert pre_process_evaluation_cache(True) == EvaluationCacheOptions()
+
+
+def test_pre_process_evaluation_cache_dict_case():
+    got = pre_process_evaluation_cache({"max_size": 5, "tolerance": 1e-8})
+    assert got == EvaluationCacheOptions(max_size=5, tolerance=1e-8)
+
+
+def test_pre_process_evaluation_cache_invalid_type():
+    with pytest.raises(InvalidEvaluationCacheError, match="Invalid evaluation cache"):
+        pre_process_evaluation_cache("invalid")
+
+
+@pytest.mark.parametrize("value", [0, -1, 1.5, True])
+def test_evaluation_cache_options_invalid_max_size(value):
+    with pytest.raises(InvalidEvaluationCacheError, match="Invalid max_size"):
+        EvaluationCacheOptions(max_size=value)
+
+
+@pytest.mark.parametrize("value", [-1e-8, np.inf, "a"])
+def test_evaluation_cache_options_invalid_tolerance(value):
+    with pytest.raises(InvalidEvaluationCacheError, match="Invalid tolerance"):
+        EvaluationCacheOptions(tolerance=value)
+
+
+def test_evaluation_cache_lru_eviction():
+    cache = EvaluationCache(EvaluationCacheOptions(max_size=2))
+    cache.store(np.array([1.0]), EvalTask.FUN, 1)
+    cache.store(np.array([2.0]), EvalTask.FUN, 2)
+    # the lookup makes [1.0] the most recently used entry
+    assert cache.lookup(np.array([1.0])) == {EvalTask.FUN: 1}
+    cache.store(np.array([3.0]), EvalTask.FUN, 3)
+
+    assert cache.lookup(np.array([2.0])) == {}
+    assert cache.lookup(np.array([1.0])) == {EvalTask.FUN: 1}
+    assert cache.info().size == 2
+
+
+def test_evaluation_cache_stores_several_tasks_per_point():
+    cache = EvaluationCache(EvaluationCacheOptions())
+    cache.store(np.array([1.0, 2.0]), EvalTask.FUN, 1)
+    cache.store(np.array([1.0, 2.0]), EvalTask.JAC, 2)
+    assert cache.lookup(np.array([1.0, 2.0])) == {EvalTask.FUN: 1, EvalTask.JAC: 2}
+
+
+def test_evaluation_cache_tolerance():
+    cache = EvaluationCache(EvaluationCacheOptions(tolerance=1e-6))
+    cache.store(np.array([1.0]), EvalTask.FUN, 1)
+    assert cache.lookup(np.array([1.0 + 1e-9])) == {EvalTask.FUN: 1}
+    assert cache.lookup(np.array([1.0 + 1e-5])) == {}
+
+
+def test_evaluation_cache_without_tolerance_distinguishes_close_points():
+    cache = EvaluationCache(EvaluationCacheOptions())
+    cache.store(np.array([1.0]), EvalTask.FUN, 1)
+    assert cache.lookup(np.array([1.0 + 1e-15])) == {}
+    assert cache.lookup(np.array([1])) == {EvalTask.FUN: 1}
+
+
+def test_evaluation_cache_info():
+    cache = EvaluationCache(EvaluationCacheOptions(max_size=3))
+    cache.record(hit=True)
+    cache.record(hit=False)
+    cache.record(hit=False)
+    cache.record(hit=False)
+    info = cache.info()
+    assert (info.hits, info.misses, info.max_size) == (1, 3, 3)
+    assert info.hit_rate == 0.25
+
+
+def test_minimize_with_evaluation_cache():
+    kwargs = {
+        "fun": lambda x: x @ x,
+        "params": np.arange(3.0),
+        "algorithm": "scipy_lbfgsb",
+    }
+    res_without_cache = om.minimize(**kwargs)
+    res = om.minimize(**kwargs, evaluation_cache={"max_size": 10})
+
+    assert res_without_cache.evaluation_cache_info is None
+    assert res.evaluation_cache_info.misses > 0
+    assert res.evaluation_cache_info.max_size == 10
+    np.testing.assert_array_almost_equal(res.params, res_without_cache.params)
+    assert res.history.fun == res_without_cache.history.fun
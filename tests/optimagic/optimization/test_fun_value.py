@@ -51,6 +51,29 @@ def test_values_for_likelihood_optimizers(value):
     aae(got, np.array([1.0, 4]))
 
 
+@pytest.mark.parametrize(
+    "value, solver_type, expected",
+    [
+        (ScalarFunctionValue(1 + 2j), AggregationLevel.SCALAR, 1 + 2j),
+        (
+            LeastSquaresFunctionValue(np.array([1 + 2j])),
+            AggregationLevel.SCALAR,
+            (1 + 2j) ** 2,
+        ),
+        (
+            LeastSquaresFunctionValue(np.array([1 + 2j])),
+            AggregationLevel.LIKELIHOOD,
+            np.array([(1 + 2j) ** 2]),
+        ),
+        (LikelihoodFunctionValue({"a": 1 + 2j}), AggregationLevel.SCALAR, 1 + 2j),
+    ],
+)
+def test_complex_values_are_kept(value, solver_type, expected):
+    got = value.internal_value(solver_type)
+    assert np.iscomplexobj(got)
+    aae(got, expected)
+
+
 @pytest.mark.parametrize("value", SCALAR_VALUES + LIKELIHOOD_VALUES)
 def test_invalid_values_for_least_squares_optimizers(value):
     with pytest.raises(InvalidFunctionError):
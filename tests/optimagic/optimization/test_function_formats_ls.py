@@ -234,3 +234,33 @@ def test_least_squares_minimize_with_invalid_fun_and_jac(fun_and_jac):
             algorithm="scipy_ls_lm",
             fun_and_jac=fun_and_jac,
         )
+
+
+# ======================================================================================
+# vectorized functions
+# ======================================================================================
+
+
+@mark.least_squares
+@mark.vectorized
+def vectorized_sos_ls(x):
+    return x
+
+
+@pytest.mark.parametrize("algorithm", ["pounders", "scipy_ls_lm"])
+def test_least_squares_minimize_with_vectorized_fun(algorithm):
+    res = minimize(
+        fun=vectorized_sos_ls,
+        params=np.array([1, 2, 3]),
+        algorithm=algorithm,
+    )
+    aaae(res.params, np.zeros(3))
+
+
+def test_vectorized_fun_with_pytree_params_raises_error():
+    with pytest.raises(InvalidFunctionError, match="Vectorized functions"):
+        minimize(
+            fun=vectorized_sos_ls,
+            params={"a": 1, "b": 2},
+            algorithm="pounders",
+        )
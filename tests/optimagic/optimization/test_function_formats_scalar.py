@@ -5,7 +5,7 @@ import pytest
 from numpy.testing import assert_array_almost_equal as aaae
 from numpy.typing import NDArray
 
-from optimagic import mark, maximize, minimize
+from optimagic import Bounds, MultistartOptions, mark, maximize, minimize
 from optimagic.exceptions import InvalidFunctionError
 from optimagic.optimization.fun_value import FunctionValue, ScalarFunctionValue
 
@@ -433,3 +433,30 @@ def test_minimize_with_invalid_fun_and_jac(fun_and_jac):
             algorithm="scipy_lbfgsb",
             fun_and_jac=fun_and_jac,
         )
+
+
+# ======================================================================================
+# vectorized functions
+# ======================================================================================
+
+
+def test_minimize_with_vectorized_fun_and_multistart():
+    calls = []
+
+    @mark.vectorized
+    def vectorized_sos(x):
+        calls.append(len(x))
+        return (x**2).sum(axis=1)
+
+    res = minimize(
+        fun=vectorized_sos,
+        params=np.array([1.0, 2, 3]),
+        algorithm="scipy_lbfgsb",
+        bounds=Bounds(lower=np.full(3, -5), upper=np.full(3, 5)),
+        multistart=MultistartOptions(n_samples=20, n_cores=1, seed=0),
+    )
+    aaae(res.params, np.zeros(3))
+    # the exploration sample is evaluated in one call
+    assert 20 in calls
+    # numerical derivatives are evaluated in one call per gradient
+    assert max(calls) > 1
@@ -1,3 +1,7 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -14,7 +18,7 @@ from optimagic.optimization.history import (
     _calculate_monotone_sequence,
     _get_batch_starts_and_stops,
     _get_flat_param_names,
-    _get_flat_params,
+    _get_flat_params_array,
     _is_1d_array,
     _task_to_categorical,
     _validate_args_are_all_none_or_lists_of_same_length,
@@ -100,6 +104,26 @@ def test_history_add_batch(history_entries):
     )
 
 
+def test_history_add_batch_from_several_threads(history_entries):
+    history = History(Direction.MINIMIZE)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(100):
+            executor.submit(history.add_batch, history_entries)
+
+    assert len(history.params) == len(history.task) == 300
+    assert history.batches == np.repeat(np.arange(100), 3).tolist()
+    for i in range(100):
+        assert history.params[3 * i : 3 * i + 3] == [e.params for e in history_entries]
+
+
+def test_history_can_be_pickled(history_entries):
+    history = History(Direction.MINIMIZE)
+    history.add_batch(history_entries)
+    unpickled = pickle.loads(pickle.dumps(history))
+    unpickled.add_entry(history_entries[0])
+    assert unpickled.batches == [0, 0, 0, 1]
+
+
 def test_history_from_data():
     data = {
         "params": [{"a": 1, "b": [2, 3]}, {"a": 4, "b": [5, 6]}, {"a": 7, "b": [8, 9]}],
@@ -130,6 +154,78 @@ def test_history_from_data():
     )
 
 
+def test_history_add_more_entries_than_initial_capacity():
+    history = History(Direction.MINIMIZE)
+    for i in range(100):
+        history.add_entry(
+            HistoryEntry(
+                params=np.array([i, -i]),
+                fun=None if i % 2 else float(i),
+                start_time=float(i),
+                stop_time=i + 0.5,
+                task=EvalTask.JAC if i % 2 else EvalTask.FUN,
+            )
+        )
+
+    assert history.batches == list(range(100))
+    assert history.fun[:4] == [0, None, 2, None]
+    assert history.task[:2] == [EvalTask.FUN, EvalTask.JAC]
+    aaae(history.stop_time, np.arange(100) + 0.5)
+    aaae(history.flat_params, np.column_stack([np.arange(100), -np.arange(100)]))
+    aaae(history.params[-1], np.array([99, -99]))
+
+
+def test_history_params_are_reconstructed_from_template():
+    params = pd.DataFrame(
+        {"value": [1.0, 2.0], "lower_bound": [0.0, -np.inf]}, index=["a", "b"]
+    )
+    history = History(Direction.MINIMIZE)
+    history.add_batch(
+        [
+            HistoryEntry(
+                params=params.assign(value=[k, k + 1.0]),
+                fun=k,
+                start_time=0.0,
+                stop_time=0.1,
+                task=EvalTask.FUN,
+            )
+            for k in range(3)
+        ]
+    )
+
+    got = history.params
+    assert len(got) == 3
+    assert_frame_equal(got[2], params.assign(value=[2.0, 3.0]))
+    assert history.flat_param_names == ["a", "b"]
+
+
+def test_history_from_data_with_missing_values():
+    history = History(
+        direction=Direction.MINIMIZE,
+        params=[np.arange(2), np.arange(2)],
+        fun=[1.0, None],
+        start_time=[None, None],
+        stop_time=[None, None],
+        batches=[None, None],
+        task=[None, None],
+    )
+
+    assert history.fun == [1.0, None]
+    assert history.batches == [None, None]
+    assert history.task == [None, None]
+    assert np.isnan(history.start_time).all()
+
+
+def test_history_with_params_of_different_structure_raises_error():
+    history = History(Direction.MINIMIZE)
+    entry = HistoryEntry(
+        params=np.arange(2), fun=1.0, start_time=0.0, stop_time=0.1, task=EvalTask.FUN
+    )
+    history.add_entry(entry)
+    with pytest.raises(ValueError, match="must have the same structure"):
+        history.add_entry(replace(entry, params=np.arange(3)))
+
+
 # ======================================================================================
 # Test functionality of History
 # ======================================================================================
@@ -541,12 +637,12 @@ def test_is_1d_array():
     assert _is_1d_array([0, 1]) is False
 
 
-def test_get_flat_params_pytree():
+def test_get_flat_params_array_pytree():
     params = [
         {"a": 1, "b": [0, 1], "c": np.arange(2)},
         {"a": 2, "b": [1, 2], "c": np.arange(2)},
     ]
-    got = _get_flat_params(params)
+    got = _get_flat_params_array(params, n_params=5)
     exp = [
         [1, 0, 1, 0, 1],
         [2, 1, 2, 0, 1],
@@ -554,9 +650,9 @@ def test_get_flat_params_pytree():
     assert_array_equal(got, exp)
 
 
-def test_get_flat_params_fast_path():
+def test_get_flat_params_array_fast_path():
     params = [np.arange(2)]
-    got = _get_flat_params(params)
+    got = _get_flat_params_array(params, n_params=2)
     exp = [[0, 1]]
     assert_array_equal(got, exp)
 
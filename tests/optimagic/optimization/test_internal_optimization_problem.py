@@ -2,13 +2,19 @@ from copy import copy
 
 import numpy as np
 import pytest
+import scipy.sparse as sp
 from numpy.testing import assert_array_almost_equal as aaae
 
 from optimagic import NumdiffOptions
 from optimagic.batch_evaluators import process_batch_evaluator
 from optimagic.config import CRITERION_PENALTY_CONSTANT, CRITERION_PENALTY_SLOPE
 from optimagic.exceptions import UserFunctionRuntimeError
+from optimagic.logging.logger import LogStore, SQLiteLogOptions
 from optimagic.optimization.error_penalty import get_error_penalty_function
+from optimagic.optimization.evaluation_cache import (
+    EvaluationCache,
+    EvaluationCacheOptions,
+)
 from optimagic.optimization.fun_value import (
     LeastSquaresFunctionValue,
     ScalarFunctionValue,
@@ -329,6 +335,51 @@ def test_batch_fun_and_jac(base_problem, n_cores):
     aaae(got_jac, expected_jac)
 
 
+@pytest.mark.parametrize("n_cores", [1, 2])
+def test_batch_fun_is_logged_by_parent_process(base_problem, n_cores, tmp_path):
+    logger = LogStore.from_options(SQLiteLogOptions(tmp_path / "log.db"))
+    problem = copy(base_problem)
+    problem._logger = logger
+
+    problem.batch_fun([np.array([1, 2, 3]), np.array([4, 5, 6])], n_cores=n_cores)
+
+    assert [row.scalar_fun for row in logger.iteration_store.select()] == [14, 77]
+
+
+def test_batch_evaluations_reuse_the_worker_function(base_problem):
+    funcs = []
+
+    def batch_evaluator(func, arguments, **kwargs):
+        funcs.append(func)
+        return [func(arg) for arg in arguments]
+
+    problem = copy(base_problem)
+    problem._batch_evaluator = batch_evaluator
+
+    problem.batch_fun([np.array([1, 2, 3])], n_cores=1)
+    problem.batch_fun([np.array([4, 5, 6])], n_cores=1)
+    problem.with_step_id(1).batch_fun([np.array([4, 5, 6])], n_cores=1)
+
+    assert funcs[0] is funcs[1]
+    assert funcs[2] is not funcs[0]
+    assert funcs[2].__self__._step_id == 1
+
+
+def test_with_log_collection(base_problem, tmp_path):
+    logger = LogStore.from_options(SQLiteLogOptions(tmp_path / "log.db"))
+    problem = copy(base_problem)
+    problem._logger = logger
+
+    collecting = problem.with_log_collection()
+    collecting.fun(np.array([1, 2, 3]))
+    collecting.batch_fun([np.array([4, 5, 6])], n_cores=1)
+
+    assert collecting.logger is None
+    assert [e.scalar_fun for e in collecting.collected_log_entries] == [14, 77]
+    assert problem.collected_log_entries is None
+    assert logger.iteration_store.select() == []
+
+
 # ======================================================================================
 # test sign flipping
 # ======================================================================================
@@ -706,3 +757,302 @@ def test_error_in_exploration_fun_maximize(error_max_problem):
     )
     expected = [-np.inf, -np.inf]
     assert np.allclose(got, expected)
+
+
+# ======================================================================================
+# Test evaluation cache
+# ======================================================================================
+
+
+@pytest.fixture
+def cached_problem(base_problem):
+    call_log = []
+
+    def fun(params):
+        call_log.append("fun")
+        return ScalarFunctionValue(params @ params)
+
+    def jac(params):
+        call_log.append("jac")
+        return 2 * params
+
+    base_problem._fun = fun
+    base_problem._jac = jac
+    base_problem._fun_and_jac = None
+    base_problem._evaluation_cache = EvaluationCache(EvaluationCacheOptions())
+    return base_problem, call_log
+
+
+def test_cache_serves_repeated_fun_evaluations(cached_problem):
+    problem, call_log = cached_problem
+    x = np.array([1.0, 2, 3])
+    assert problem.fun(x) == problem.fun(x) == 14
+    assert call_log == ["fun"]
+
+    info = problem.evaluation_cache.info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_cache_hits_are_recorded_in_history(cached_problem):
+    problem, _ = cached_problem
+    x = np.array([1.0, 2, 3])
+    problem.fun(x)
+    problem.fun(x)
+    assert problem.history.fun == [14, 14]
+    assert problem.history.task == [EvalTask.FUN, EvalTask.FUN]
+    assert problem.history.stop_time[1] >= problem.history.stop_time[0]
+
+
+def test_cache_combines_fun_and_jac_from_separate_calls(cached_problem):
+    problem, call_log = cached_problem
+    x = np.array([1.0, 2, 3])
+    problem.fun(x)
+    problem.jac(x)
+    got_fun, got_jac = problem.fun_and_jac(x)
+    assert call_log == ["fun", "jac"]
+    assert got_fun == 14
+    aaae(got_jac, 2 * x)
+    assert problem.history.task[-1] == EvalTask.FUN_AND_JAC
+
+
+def test_cache_reuses_fun_in_fun_and_jac(cached_problem):
+    problem, call_log = cached_problem
+    x = np.array([1.0, 2, 3])
+    problem.fun(x)
+    problem.fun_and_jac(x)
+    assert call_log == ["fun", "jac"]
+
+
+def test_cache_records_one_miss_per_fun_and_jac_evaluation(cached_problem):
+    problem, call_log = cached_problem
+    x = np.array([1.0, 2, 3])
+    problem.fun_and_jac(x)
+    problem.fun(x)
+    assert call_log == ["fun", "jac"]
+
+    info = problem.evaluation_cache.info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_cache_hits_with_tolerance_record_params_of_requested_x(cached_problem):
+    problem, call_log = cached_problem
+    problem._evaluation_cache = EvaluationCache(EvaluationCacheOptions(tolerance=0.1))
+    x = np.array([1.0, 2, 3])
+    problem.fun(x)
+    problem.fun(x + 0.01)
+
+    assert call_log == ["fun"]
+    assert problem.history.fun == [14, 14]
+    aaae(problem.history.params[1], x + 0.01)
+
+
+def test_cache_serves_fun_and_jac_from_numerical_jac(cached_problem):
+    problem, call_log = cached_problem
+    problem._jac = None
+    x = np.array([1.0, 2, 3])
+    problem.jac(x)
+    n_calls = len(call_log)
+    assert problem.fun(x) == 14
+    aaae(problem.fun_and_jac(x)[1], 2 * x)
+    assert len(call_log) == n_calls
+
+
+def test_cached_jac_cannot_be_modified_in_place(cached_problem):
+    problem, _ = cached_problem
+    x = np.array([1.0, 2, 3])
+    problem.jac(x)[0] = 100
+    aaae(problem.jac(x), 2 * x)
+
+
+def test_batch_fun_only_evaluates_cache_misses(cached_problem):
+    problem, call_log = cached_problem
+    x_list = [np.array([1.0, 2, 3]), np.array([4.0, 5, 6])]
+    problem.fun(x_list[0])
+    got = problem.batch_fun(x_list, n_cores=1)
+    assert got == [14, 77]
+    assert call_log == ["fun", "fun"]
+    assert problem.history.fun == [14, 14, 77]
+
+
+def test_cache_does_not_store_penalty_values(cached_problem):
+    problem, call_log = cached_problem
+
+    def fun(params):
+        call_log.append("fun")
+        raise ValueError()
+
+    problem._fun = fun
+    problem._error_handling = ErrorHandling.CONTINUE
+    problem._error_penalty_func = lambda x: (ScalarFunctionValue(100.0), x)
+    x = np.array([1.0, 2, 3])
+    with pytest.warns(UserWarning):
+        problem.fun(x)
+        problem.fun(x)
+    assert call_log == ["fun", "fun"]
+
+
+# ======================================================================================
+# Test vectorized fun
+# ======================================================================================
+
+
+@pytest.fixture
+def vectorized_problem(base_problem):
+    call_log = []
+
+    def vectorized_fun(params):
+        call_log.append(params.shape)
+        if (params < 0).any():
+            raise ValueError()
+        return [ScalarFunctionValue(p @ p) for p in params]
+
+    base_problem._fun = lambda params: vectorized_fun(params[np.newaxis])[0]
+    base_problem._vectorized_fun = vectorized_fun
+    base_problem._jac = None
+    base_problem._fun_and_jac = None
+    return base_problem, call_log
+
+
+def test_batch_fun_with_vectorized_fun(vectorized_problem):
+    problem, call_log = vectorized_problem
+    x_list = [np.array([1.0, 2, 3]), np.array([4.0, 5, 6]), np.array([0.0, 0, 1])]
+    got = problem.batch_fun(x_list, n_cores=1, batch_size=3)
+    assert got == [14, 77, 1]
+    assert call_log == [(3, 3)]
+    assert problem.history.fun == [14, 77, 1]
+    assert problem.history.batches == [0, 0, 0]
+    assert problem.history.start_time == sorted(problem.history.start_time)
+
+
+def test_exploration_fun_with_vectorized_fun(vectorized_problem):
+    problem, call_log = vectorized_problem
+    x_list = [np.array([1.0, 2, 3]), np.array([4.0, 5, 6])]
+    got = problem.exploration_fun(x_list, n_cores=1)
+    assert got == [14, 77]
+    assert call_log == [(2, 3)]
+    assert problem.history.task == [EvalTask.EXPLORATION, EvalTask.EXPLORATION]
+
+
+def test_numerical_jac_with_vectorized_fun(vectorized_problem):
+    problem, call_log = vectorized_problem
+    x = np.array([1.0, 2, 3])
+    aaae(problem.jac(x), 2 * x)
+    assert len(call_log) == 1
+
+
+def test_failed_vectorized_call_is_evaluated_point_by_point(vectorized_problem):
+    problem, call_log = vectorized_problem
+    problem._error_handling = ErrorHandling.CONTINUE
+    problem._error_penalty_func = lambda x: (ScalarFunctionValue(100.0), x)
+    x_list = [np.array([1.0, 2, 3]), np.array([-1.0, 0, 0])]
+    with pytest.warns(UserWarning):
+        got = problem.batch_fun(x_list, n_cores=1)
+    assert got == [14, 100]
+    assert call_log == [(2, 3), (1, 3), (1, 3)]
+    assert problem.history.fun == [14, 100]
+
+
+# ======================================================================================
+# Test sparse numerical Jacobians
+# ======================================================================================
+
+
+@pytest.fixture
+def sparse_problem(base_problem):
+    call_log = []
+
+    def fun(params):
+        call_log.append(params)
+        return LeastSquaresFunctionValue(value=params**2)
+
+    base_problem._fun = fun
+    base_problem._jac = None
+    base_problem._fun_and_jac = None
+    base_problem._solver_type = AggregationLevel.LEAST_SQUARES
+    return base_problem, call_log
+
+
+@pytest.mark.parametrize("jac_sparsity", [np.eye(5, dtype=bool), sp.eye(5)])
+def test_numerical_jac_with_sparsity_pattern(sparse_problem, jac_sparsity):
+    problem, call_log = sparse_problem
+    problem._jac_sparsity = jac_sparsity
+    x = np.arange(1, 6.0)
+    got = problem.jac(x)
+    assert isinstance(got, np.ndarray)
+    aaae(got, np.diag(2 * x))
+    # one positive and one negative step for the single color and f0
+    assert len(call_log) == 3
+
+
+def test_numerical_jac_with_detected_sparsity(sparse_problem):
+    problem, call_log = sparse_problem
+    problem._jac_sparsity = "detect"
+    x = np.arange(1, 6.0)
+
+    aaae(problem.jac(x), np.diag(2 * x))
+    # dense Jacobian at the probe point and sparse Jacobian at x
+    assert len(call_log) == 11 + 3
+    assert sp.issparse(problem._jac_sparsity)
+
+    call_log.clear()
+    _, got = problem.fun_and_jac(x + 1)
+    aaae(got, np.diag(2 * (x + 1)))
+    assert len(call_log) == 3
+
+
+def test_sparsity_is_detected_once_for_batch_jacobians(sparse_problem):
+    problem, call_log = sparse_problem
+    problem._jac_sparsity = "detect"
+    x_list = [np.arange(1, 6.0), np.arange(2, 7.0)]
+
+    problem.batch_jac(x_list, n_cores=1)
+    problem.batch_fun_and_jac([x + 1 for x in x_list], n_cores=1)
+
+    # dense Jacobian at the probe point and sparse Jacobians at each x
+    assert len(call_log) == 11 + 4 * 3
+    assert sp.issparse(problem._jac_sparsity)
+    worker_problem = problem._get_worker_function("_evaluate_jac").__self__
+    assert worker_problem._jac_sparsity is problem._jac_sparsity
+
+
+def test_pure_numerical_jac_does_not_store_detected_sparsity(sparse_problem):
+    problem, _ = sparse_problem
+    problem._jac_sparsity = "detect"
+    x = np.arange(1, 6.0)
+
+    (_, got), _, _ = problem._pure_evaluate_numerical_fun_and_jac(x)
+
+    aaae(got, np.diag(2 * x))
+    assert problem._jac_sparsity == "detect"
+
+
+def test_jac_sparsity_is_ignored_for_scalar_solvers(base_problem):
+    problem = InternalOptimizationProblem(
+        fun=base_problem._fun,
+        jac=None,
+        fun_and_jac=None,
+        converter=base_problem._converter,
+        solver_type=AggregationLevel.SCALAR,
+        direction=Direction.MINIMIZE,
+        bounds=base_problem._bounds,
+        numdiff_options=NumdiffOptions(jac_sparsity="detect"),
+        error_handling=ErrorHandling.RAISE,
+        error_penalty_func=None,
+        batch_evaluator=base_problem._batch_evaluator,
+        linear_constraints=None,
+        nonlinear_constraints=None,
+        logger=None,
+    )
+    aaae(problem.jac(np.array([1.0, 2, 3])), np.array([2.0, 4, 6]))
+    assert problem._jac_sparsity is None
+
+
+def test_numerical_jac_with_complex_step(sparse_problem):
+    problem, call_log = sparse_problem
+    problem._numdiff_options = NumdiffOptions(method="complex_step")
+    x = np.arange(1, 6.0)
+    fun, jac = problem.fun_and_jac(x)
+    aaae(fun, x**2)
+    aaae(jac, np.diag(2 * x), decimal=14)
+    # f0 and one complex step per parameter
+    assert len(call_log) == 6
@@ -9,6 +9,7 @@ from numpy.testing import assert_array_almost_equal as aaae
 from optimagic.optimization.algorithm import InternalOptimizeResult
 from optimagic.optimization.multistart import (
     _draw_exploration_sample,
+    _write_collected_logs,
     get_batched_optimization_sample,
     run_explorations,
     update_convergence_state,
@@ -174,3 +175,40 @@ def test_update_state_not_converged(current_state, starts, results):
     )
 
     assert not is_converged
+
+
+class _RecordingStore:
+    def __init__(self):
+        self.inserted = []
+        self.updates = {}
+
+    def insert_many(self, values):
+        self.inserted += values
+
+    def update(self, key, value):
+        self.updates[key] = value
+
+
+@dataclass
+class _RecordingLogger:
+    iteration_store: _RecordingStore
+    step_store: _RecordingStore
+
+    def flush(self):
+        pass
+
+
+def test_write_collected_logs_keeps_log_entries_of_failed_optimizations():
+    logger = _RecordingLogger(_RecordingStore(), _RecordingStore())
+    result = object()
+    batch_results = [(result, ["a", "b"]), ("traceback", ["c"]), "traceback"]
+
+    results = _write_collected_logs(batch_results, [1, 2, 3], logger)
+
+    assert results == [result, "traceback", "traceback"]
+    assert logger.iteration_store.inserted == ["a", "b", "c"]
+    assert logger.step_store.updates == {
+        1: {"status": "complete"},
+        2: {"status": "failed"},
+        3: {"status": "failed"},
+    }
@@ -3,10 +3,14 @@
 import numpy as np
 import pandas as pd
 import pytest
+from numpy.testing import assert_array_almost_equal as aaae
 
+from optimagic import mark
+from optimagic.constraints import FixedConstraint
 from optimagic.examples.criterion_functions import sos_scalar
 from optimagic.exceptions import InvalidFunctionError, InvalidNumdiffOptionsError
 from optimagic.optimization.optimize import maximize, minimize
+from optimagic.parameters.bounds import Bounds
 
 
 def test_sign_is_switched_back_after_maximization():
@@ -44,3 +48,44 @@ def test_with_invalid_numdiff_options():
             algorithm="scipy_lbfgsb",
             numdiff_options={"bla": 15},
         )
+
+
+@pytest.mark.parametrize("jac_sparsity", ["pattern", "detect"])
+def test_least_squares_optimization_with_jac_sparsity(jac_sparsity):
+    calls = []
+
+    @mark.least_squares
+    def fun(x):
+        calls.append(x)
+        residuals = x - np.arange(len(x))
+        residuals[1:] += 0.1 * x[:-1] ** 2
+        return residuals
+
+    if jac_sparsity == "pattern":
+        jac_sparsity = np.eye(20, dtype=bool) | np.eye(20, k=-1, dtype=bool)
+
+    expected = minimize(fun, params=np.zeros(20), algorithm="scipy_ls_trf")
+    n_calls_dense = len(calls)
+    calls.clear()
+
+    got = minimize(
+        fun,
+        params=np.zeros(20),
+        algorithm="scipy_ls_trf",
+        numdiff_options={"jac_sparsity": jac_sparsity},
+    )
+    aaae(got.params, expected.params)
+    assert len(calls) < n_calls_dense / 2
+
+
+def test_optimization_with_complex_step_derivatives():
+    got = minimize(
+        lambda p: (p["a"] ** 2).sum() + np.exp(p["b"]) - p["b"],
+        params={"a": np.ones(2), "b": 1.0},
+        algorithm="scipy_lbfgsb",
+        bounds=Bounds(lower={"a": np.array([0.5, -1.0]), "b": -1.0}),
+        constraints=FixedConstraint(selector=lambda p: p["a"][1]),
+        numdiff_options={"method": "complex_step"},
+    )
+    aaae(got.params["a"], np.array([0.5, 1.0]))
+    aaae(got.params["b"], 0.0)
@@ -18,7 +18,7 @@ from optimagic.examples.criterion_functions import (
     sos_derivatives,
     sos_ls,
 )
-from optimagic.logging.logger import SQLiteLogOptions
+from optimagic.logging.logger import SQLiteLogOptions, SQLiteLogReader
 from optimagic.logging.types import ExistenceStrategy
 from optimagic.optimization.optimize import minimize
 from optimagic.parameters.tree_registry import get_registry
@@ -71,3 +71,18 @@ def test_optimization_with_existing_exsting_database():
                 "logging.db", if_database_exists=ExistenceStrategy.RAISE
             ),
         )
+
+
+def test_parallel_optimization_with_threads_and_logging(tmp_path):
+    res = minimize(
+        sos_ls,
+        np.arange(3.0),
+        algorithm="neldermead_parallel",
+        algo_options={"batch_evaluator": "threading", "n_cores": 4},
+        logging=tmp_path / "logging.db",
+    )
+    aaae(res.params, np.zeros(3), decimal=4)
+
+    logged = SQLiteLogReader(tmp_path / "logging.db").read_history()
+    assert len(logged.fun) == len(logged.params) > 0
+    aaae(np.min(logged.fun), res.fun)
@@ -6,6 +6,7 @@ import pytest
 from numpy.testing import assert_array_almost_equal as aaae
 
 import optimagic as om
+from optimagic.batch_evaluators import PoolBatchEvaluator
 from optimagic.examples.criterion_functions import (
     sos_ls,
     sos_scalar,
@@ -143,6 +144,34 @@ def test_steps_are_logged_as_skipped_if_convergence(tmp_path, params):
     assert steps_table["status"].tolist() == expected_status
 
 
+def test_parallel_multistart_logs_all_local_optimizations(tmp_path, params):
+    options = om.MultistartOptions(
+        n_samples=10 * len(params),
+        stopping_maxopt=4,
+        convergence_max_discoveries=np.inf,
+        n_cores=2,
+    )
+    path = tmp_path / "logging.db"
+    res = minimize(
+        fun=sos_ls,
+        params=params,
+        algorithm="scipy_lbfgsb",
+        multistart=options,
+        logging=path,
+    )
+
+    reader = SQLiteLogReader(path)
+    steps_table = reader._step_store.to_df()
+    assert steps_table["status"].tolist() == ["complete"] * 5
+
+    iterations = reader._iteration_store.to_df()
+    n_local_evals = sum(
+        len(local_res.history.fun) for local_res in res.multistart_info.local_optima
+    )
+    assert len(iterations.query("step > 1")) == n_local_evals
+    assert set(iterations["step"]) == {1, 2, 3, 4, 5}
+
+
 def test_all_steps_occur_in_optimization_iterations_if_no_convergence(params):
     options = om.MultistartOptions(
         convergence_max_discoveries=np.inf,
@@ -310,3 +339,54 @@ def test_with_ackley_using_dict_options():
             "convergence_max_discoveries": 10,
         },
     )
+
+
+def test_multistart_cancels_pending_optimizations_after_convergence():
+    kwargs = {
+        "fun": sos_scalar,
+        "params": np.arange(3.0),
+        "algorithm": "scipy_lbfgsb",
+        "bounds": Bounds(soft_lower=np.full(3, -5.0), soft_upper=np.full(3, 10.0)),
+    }
+    multistart = {
+        "n_samples": 50,
+        "stopping_maxopt": 10,
+        "batch_size": 10,
+        "seed": 0,
+    }
+    res_blocking = minimize(**kwargs, multistart=om.MultistartOptions(**multistart))
+    res = minimize(
+        **kwargs,
+        multistart=om.MultistartOptions(
+            **multistart, batch_evaluator=PoolBatchEvaluator()
+        ),
+    )
+
+    assert len(res_blocking.multistart_info.local_optima) == 10
+    assert len(res.multistart_info.local_optima) < 10
+    aaae(res.params, res_blocking.params)
+
+
+def test_multistart_with_blocking_evaluator_keeps_order_of_local_optima():
+    kwargs = {
+        "fun": sos_scalar,
+        "params": np.arange(3.0),
+        "algorithm": "scipy_lbfgsb",
+        "bounds": Bounds(soft_lower=np.full(3, -5.0), soft_upper=np.full(3, 10.0)),
+    }
+    results = [
+        minimize(
+            **kwargs,
+            multistart=om.MultistartOptions(
+                n_samples=20, stopping_maxopt=6, batch_size=4, seed=0, n_cores=n_cores
+            ),
+        )
+        for n_cores in [1, 2, 2]
+    ]
+
+    expected = results[0].multistart_info.start_parameters
+    for res in results[1:]:
+        for got, exp in zip(
+            res.multistart_info.start_parameters, expected, strict=True
+        ):
+            aaae(got, exp)
@@ -165,6 +165,24 @@ def test_documentation_example(algorithm):
     )
 
 
+def test_constraint_evaluation_cache_info():
+    res = minimize(
+        fun=criterion,
+        params=np.ones(6),
+        algorithm="scipy_slsqp",
+        constraints=om.NonlinearConstraint(
+            func=np.prod,
+            selector=lambda x: x[:-1],
+            value=1.0,
+        ),
+    )
+    assert res.constraint_evaluation_cache_info.hits > 0
+    assert res.constraint_evaluation_cache_info.max_size == 1
+
+    res = minimize(fun=criterion, params=np.ones(6), algorithm="scipy_lbfgsb")
+    assert res.constraint_evaluation_cache_info is None
+
+
 # ======================================================================================
 # Test: selection + reparametrization constraint + nonlinear constraint
 # ======================================================================================
@@ -9,8 +9,11 @@ import pandas as pd
 import pytest
 import yaml
 from numpy.testing import assert_array_almost_equal as aaae
+from scipy.linalg import qr_multiply
 
 from optimagic.optimizers._pounders.pounders_auxiliary import (
+    _get_monomial_basis,
+    _QuadraticPartConditioning,
     add_geomtery_points_to_make_main_model_fully_linear,
     create_initial_residual_model,
     create_main_from_residual_model,
@@ -527,6 +530,41 @@ def test_get_interpolation_matrices_residual_model(
     assert np.allclose(n_modelpoints, expected["n_modelpoints"])
 
 
+def test_get_monomial_basis():
+    x = np.array([1.0, 2.0, 3.0])
+    expected = np.array([0.5, 2 / np.sqrt(2), 3 / np.sqrt(2), 2, 6 / np.sqrt(2), 4.5])
+
+    aaae(_get_monomial_basis(x), expected)
+
+
+@pytest.mark.parametrize("n_params", [1, 2, 3, 5])
+def test_quadratic_part_conditioning_matches_direct_svd(n_params):
+    rng = np.random.default_rng(n_params)
+    n_points = 2 * n_params + 1 + 3
+    n_poly_features = n_params * (n_params + 1) // 2
+
+    x = rng.normal(size=(n_points, n_params))
+    m_mat = np.column_stack([np.ones(n_points), x])
+    n_mat = np.vstack([_get_monomial_basis(xi) for xi in x])
+
+    conditioning = _QuadraticPartConditioning(
+        m_mat[: n_params + 1], n_max_rows=n_points - n_params - 1
+    )
+    for k in range(n_params + 1, n_points):
+        beta = conditioning.get_smallest_singular_value_with_candidate(
+            m_mat[: k + 1], n_mat[: k + 1]
+        )
+
+        m_mat_pad = np.zeros((k + 1, k + 1))
+        m_mat_pad[:, : n_params + 1] = m_mat[: k + 1]
+        n_z_mat, _ = qr_multiply(m_mat_pad, n_mat[: k + 1].T)
+        singular_values = np.linalg.svd(n_z_mat.T[n_params + 1 :], compute_uv=False)
+        expected = singular_values[min(k - n_params, n_poly_features) - 1]
+
+        aaae(beta, expected)
+        conditioning.add_candidate()
+
+
 def test_evaluate_residual_model(data_evaluate_residual_model):
     inputs, expected = data_evaluate_residual_model
     y_residuals = evaluate_residual_model(**inputs)
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 import pytest
+from numpy.testing import assert_array_almost_equal as aaae
 from numpy.testing import assert_array_equal
 from pandas.testing import assert_frame_equal
 from pybaum import tree_just_flatten
@@ -19,6 +20,7 @@ from optimagic.parameters.nonlinear_constraints import (
     _process_selector,
     _vector_to_list_of_scalar,
     equality_as_inequality_constraints,
+    get_constraint_evaluation_cache_info,
     process_nonlinear_constraints,
     vector_as_list_of_scalar_constraints,
 )
@@ -34,6 +36,9 @@ class Converter:
         registry = get_registry(extended=True)
         return np.array(tree_just_flatten(params, registry=registry))
 
+    def derivative_to_internal(self, derivative_eval, x, jac_is_flat=True):  # noqa: ARG002
+        return derivative_eval
+
 
 # ======================================================================================
 # _get_transformation_type
@@ -264,6 +269,92 @@ def test_process_nonlinear_constraints():
         assert "tol" in g
 
 
+def test_process_nonlinear_constraints_shares_evaluations_at_same_x():
+    n_evals = {"count": 0}
+
+    def constraint_func(x):
+        n_evals["count"] += 1
+        return x**2
+
+    nonlinear_constraints = [
+        {"type": "nonlinear", "func": constraint_func, "lower_bounds": 0.5},
+    ]
+
+    got = process_nonlinear_constraints(
+        nonlinear_constraints,
+        params=np.ones(3),
+        bounds=None,
+        converter=Converter(),
+        numdiff_options=NumdiffOptions(method="forward"),
+        skip_checks=True,
+    )
+    scalar_constraints = vector_as_list_of_scalar_constraints(got)
+    n_evals["count"] = 0
+
+    x = np.array([1.0, 2.0, 3.0])
+    for c in scalar_constraints:
+        c["fun"](x)
+    # the numerical jacobian reuses the constraint value at x
+    for i, c in enumerate(scalar_constraints):
+        aaae(c["jac"](x), 2 * x * np.eye(3)[i])
+
+    assert n_evals["count"] == 1 + 3
+    info = get_constraint_evaluation_cache_info(got)
+    assert info.hits == 2 + 1 + 2
+    assert info.misses == 2
+
+
+def test_numerical_jacobians_of_several_constraints_are_calculated_together():
+    n_evals = {"a": 0, "b": 0}
+
+    def constraint_a(x):
+        n_evals["a"] += 1
+        return x**2
+
+    def constraint_b(x):
+        n_evals["b"] += 1
+        return np.array([x[0] * x[1], x[0] + x[1]])
+
+    nonlinear_constraints = [
+        {
+            "type": "nonlinear",
+            "func": constraint_a,
+            "selector": lambda x: x[:2],
+            "lower_bounds": 0,
+        },
+        {
+            "type": "nonlinear",
+            "func": constraint_b,
+            "selector": lambda x: x[2:],
+            "lower_bounds": 0,
+        },
+    ]
+
+    got = process_nonlinear_constraints(
+        nonlinear_constraints,
+        params=np.ones(4),
+        bounds=None,
+        converter=Converter(),
+        numdiff_options=NumdiffOptions(method="forward"),
+        skip_checks=True,
+    )
+    n_evals["a"] = n_evals["b"] = 0
+
+    x = np.array([1.0, 2.0, 3.0, 4.0])
+    jac_a = got[0]["jac"](x)
+    jac_b = got[1]["jac"](x)
+
+    aaae(jac_a, [[2, 0, 0, 0], [0, 4, 0, 0]], decimal=4)
+    aaae(jac_b, [[0, 0, 4, 3], [0, 0, 1, 1]], decimal=4)
+    # the parameters of a and b are perturbed together
+    assert n_evals == {"a": 1 + 2, "b": 1 + 2}
+    assert got[1]["evaluation_cache"].info().hits == 1
+
+
+def test_get_constraint_evaluation_cache_info_without_constraints():
+    assert get_constraint_evaluation_cache_info([]) is None
+
+
 # ======================================================================================
 # vector_as_list_of_scalar_constraints
 # ======================================================================================
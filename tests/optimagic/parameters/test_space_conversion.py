@@ -3,11 +3,14 @@ import pytest
 from numpy.testing import assert_array_almost_equal as aaae
 
 from optimagic import first_derivative
+from optimagic.parameters.process_constraints import process_constraints
 from optimagic.parameters.space_conversion import (
     InternalParams,
     _multiply_from_left,
     _multiply_from_right,
+    get_reparametrize_from_internal,
     get_space_converter,
+    reparametrize_from_internal,
 )
 from optimagic.utilities import get_rng
 
@@ -310,3 +313,59 @@ def test_multiply_from_left_and_right(seed):
 
     aaae(calc_from_left, expected)
     aaae(calc_from_right, expected)
+
+
+def _get_test_case_many_transformations():
+    values = np.array(
+        [0.1, 0.2, 0.7, 0.3, 0.3, 0.4, 1, 0.1, 2, 0.2, 0.1, 3, 2, 1.5, 3, 0.2]
+        + [0.15, 0.33, 1, 0.2, 3, 0.5, 0.3, 2, 5, 5, 8]
+    )
+    n_params = len(values)
+    fp = InternalParams(
+        values=values,
+        lower_bounds=np.full(n_params, -np.inf),
+        upper_bounds=np.full(n_params, np.inf),
+        names=[str(i) for i in range(n_params)],
+    )
+
+    constraints = [
+        {"type": "probability", "index": [0, 1, 2]},
+        {"type": "probability", "index": [3, 4, 5]},
+        {"type": "covariance", "index": [6, 7, 8, 9, 10, 11]},
+        {"type": "sdcorr", "index": [12, 13, 14, 15, 16, 17]},
+        {"type": "covariance", "index": [18, 19, 20]},
+        {"type": "linear", "index": [21, 22], "weights": np.ones(2), "value": 0.8},
+        {"type": "equality", "index": [24, 25]},
+        {"type": "fixed", "index": [26], "value": 8},
+    ]
+    return constraints, fp
+
+
+@pytest.mark.parametrize("dtype", [float, complex])
+def test_reparametrize_from_internal_with_plan(dtype):
+    constraints, params = _get_test_case_many_transformations()
+    transformations, constr_info = process_constraints(
+        constraints=constraints,
+        params_vec=params.values,
+        lower_bounds=params.lower_bounds,
+        upper_bounds=params.upper_bounds,
+        param_names=params.names,
+    )
+    kwargs = {
+        "fixed_values": constr_info["internal_fixed_values"],
+        "pre_replacements": constr_info["pre_replacements"],
+        "transformations": transformations,
+        "post_replacements": constr_info["post_replacements"],
+    }
+    converter, internal = get_space_converter(
+        internal_params=params, internal_constraints=constraints
+    )
+    rng = get_rng(seed=0)
+    x = (internal.values + rng.uniform(0, 0.1, size=len(internal.values))).astype(dtype)
+
+    expected = reparametrize_from_internal(x, **kwargs)
+    calculated = get_reparametrize_from_internal(**kwargs)(x)
+
+    assert calculated.dtype == expected.dtype
+    aaae(calculated, expected, decimal=14)
+    aaae(converter.params_from_internal(internal.values), params.values)
@@ -1,10 +1,14 @@
+from collections import namedtuple
+
 import numpy as np
 import pandas as pd
 import pytest
 from numpy.testing import assert_array_equal as aae
+from pybaum import tree_equal, tree_flatten, tree_just_flatten, tree_unflatten
 
 from optimagic.parameters.bounds import Bounds
 from optimagic.parameters.tree_conversion import get_tree_converter
+from optimagic.parameters.tree_registry import get_registry
 from optimagic.typing import AggregationLevel
 
 
@@ -93,3 +97,65 @@ def test_tree_conversion_fast_path(solver_type):
     aae(converter.params_flatten(np.arange(3)), np.arange(3))
     aae(converter.params_unflatten(np.arange(3)), np.arange(3))
     aae(converter.derivative_flatten(derivative_eval), derivative_eval)
+
+
+_Point = namedtuple("_Point", ["x", "y"])
+
+UNFLATTEN_PARAMS = [
+    pd.DataFrame({"value": [3.0, 4.0], "lower_bound": [0.0, 0.0]}, index=["c", "d"]),
+    pd.DataFrame({"value": [3.0, 4.0], "name": ["c", "d"]}),
+    pd.Series([1.0, 2.0], index=["a", "b"], name="x"),
+    np.ones((2, 3)),
+    {"a": pd.DataFrame({"value": [1.0, 2.0]}), "b": [np.ones(2), 3.0]},
+    {"a": _Point(x=1.0, y=np.ones(2)), "b": 2.0},
+]
+
+
+@pytest.mark.parametrize("params", UNFLATTEN_PARAMS)
+@pytest.mark.parametrize("dtype", [float, int, complex])
+def test_params_unflatten_is_equivalent_to_tree_unflatten(params, dtype):
+    registry = get_registry(extended=True)
+    leaves, treedef = tree_flatten(params, registry=registry)
+    converter, _ = get_tree_converter(
+        params=params,
+        bounds=None,
+        func_eval=3.0,
+        solver_type=AggregationLevel.SCALAR,
+    )
+    x = np.arange(len(leaves)).astype(dtype) + 1
+
+    expected = tree_unflatten(treedef, list(x), registry=registry)
+    calculated = converter.params_unflatten(x)
+
+    expected_leaves = tree_just_flatten(expected)
+    calculated_leaves = tree_just_flatten(calculated)
+    assert tree_equal(calculated, expected)
+    for calc, exp in zip(calculated_leaves, expected_leaves, strict=True):
+        assert type(calc) is type(exp)
+        if isinstance(exp, pd.DataFrame):
+            pd.testing.assert_frame_equal(calc, exp)
+        elif isinstance(exp, pd.Series):
+            pd.testing.assert_series_equal(calc, exp)
+        elif isinstance(exp, np.ndarray):
+            assert calc.dtype == exp.dtype
+
+
+def test_params_unflatten_does_not_share_memory_with_x():
+    params = {
+        "a": pd.DataFrame({"value": [1.0, 2.0]}),
+        "b": pd.Series([1.0, 2.0]),
+        "c": np.ones(2),
+    }
+    converter, _ = get_tree_converter(
+        params=params,
+        bounds=None,
+        func_eval=3.0,
+        solver_type=AggregationLevel.SCALAR,
+    )
+    x = np.arange(6.0)
+    unflat = converter.params_unflatten(x)
+    x[:] = -1
+
+    aae(unflat["a"]["value"].to_numpy(), np.arange(2.0))
+    aae(unflat["b"].to_numpy(), np.arange(2.0, 4.0))
+    aae(unflat["c"], np.arange(4.0, 6.0))
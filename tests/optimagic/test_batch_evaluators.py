@@ -1,11 +1,22 @@
 import itertools
+import os
+import pickle
+import time
 import warnings
 
+import numpy as np
 import pytest
 
-from optimagic.batch_evaluators import process_batch_evaluator
+import optimagic.batch_evaluators as batch_evaluators_module
+from optimagic.batch_evaluators import (
+    PoolBatchEvaluator,
+    as_completed,
+    process_batch_evaluator,
+    submit_batch,
+    vectorized_batch_evaluate,
+)
 
-batch_evaluators = ["joblib"]
+batch_evaluators = ["joblib", "pool", "threading"]
 
 n_core_list = [1, 2]
 
@@ -24,10 +35,25 @@ def add_x_and_y(x, y):
     return x + y
 
 
+def get_pid(x):  # noqa: ARG001
+    return os.getpid()
+
+
+def sleep_and_return(x):
+    time.sleep(x)
+    return x
+
+
+def _get_batch_evaluator(batch_evaluator):
+    if batch_evaluator == "pool":
+        return PoolBatchEvaluator()
+    return process_batch_evaluator(batch_evaluator)
+
+
 @pytest.mark.slow()
 @pytest.mark.parametrize("batch_evaluator, n_cores", test_cases)
 def test_batch_evaluator_without_exceptions(batch_evaluator, n_cores):
-    batch_evaluator = process_batch_evaluator(batch_evaluator)
+    batch_evaluator = _get_batch_evaluator(batch_evaluator)
 
     calculated = batch_evaluator(
         func=double,
@@ -43,7 +69,7 @@ def test_batch_evaluator_without_exceptions(batch_evaluator, n_cores):
 @pytest.mark.slow()
 @pytest.mark.parametrize("batch_evaluator, n_cores", test_cases)
 def test_batch_evaluator_with_unhandled_exceptions(batch_evaluator, n_cores):
-    batch_evaluator = process_batch_evaluator(batch_evaluator)
+    batch_evaluator = _get_batch_evaluator(batch_evaluator)
     with pytest.raises(AssertionError):
         batch_evaluator(
             func=buggy_func,
@@ -56,7 +82,7 @@ def test_batch_evaluator_with_unhandled_exceptions(batch_evaluator, n_cores):
 @pytest.mark.slow()
 @pytest.mark.parametrize("batch_evaluator, n_cores", test_cases)
 def test_batch_evaluator_with_handled_exceptions(batch_evaluator, n_cores):
-    batch_evaluator = process_batch_evaluator(batch_evaluator)
+    batch_evaluator = _get_batch_evaluator(batch_evaluator)
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
 
@@ -74,7 +100,7 @@ def test_batch_evaluator_with_handled_exceptions(batch_evaluator, n_cores):
 @pytest.mark.slow()
 @pytest.mark.parametrize("batch_evaluator, n_cores", test_cases)
 def test_batch_evaluator_with_list_unpacking(batch_evaluator, n_cores):
-    batch_evaluator = process_batch_evaluator(batch_evaluator)
+    batch_evaluator = _get_batch_evaluator(batch_evaluator)
     calculated = batch_evaluator(
         func=add_x_and_y,
         arguments=[(1, 2), (3, 4)],
@@ -88,7 +114,7 @@ def test_batch_evaluator_with_list_unpacking(batch_evaluator, n_cores):
 @pytest.mark.slow()
 @pytest.mark.parametrize("batch_evaluator, n_cores", test_cases)
 def test_batch_evaluator_with_dict_unpacking(batch_evaluator, n_cores):
-    batch_evaluator = process_batch_evaluator(batch_evaluator)
+    batch_evaluator = _get_batch_evaluator(batch_evaluator)
     calculated = batch_evaluator(
         func=add_x_and_y,
         arguments=[{"x": 1, "y": 2}, {"x": 3, "y": 4}],
@@ -111,3 +137,214 @@ def test_get_batch_evaluator_invalid_type():
 
 def test_get_batch_evaluator_with_callable():
     assert callable(process_batch_evaluator(lambda x: x))
+
+
+@pytest.mark.slow()
+def test_pool_batch_evaluator_reuses_workers():
+    with PoolBatchEvaluator() as batch_evaluator:
+        first = batch_evaluator(func=get_pid, arguments=list(range(10)), n_cores=2)
+        second = batch_evaluator(func=get_pid, arguments=list(range(10)), n_cores=2)
+
+    assert os.getpid() not in first
+    assert set(second) <= set(first)
+
+
+@pytest.mark.slow()
+def test_pool_batch_evaluator_resends_func_to_new_workers():
+    with PoolBatchEvaluator() as batch_evaluator:
+        batch_evaluator(func=double, arguments=list(range(10)), n_cores=2)
+        # simulate workers that were restarted after the function was sent
+        batch_evaluator._executor.shutdown()
+        batch_evaluator._executor = None
+        batch_evaluator._n_workers = 0
+        calculated = batch_evaluator(func=double, arguments=list(range(10)), n_cores=2)
+
+    assert calculated == list(range(0, 20, 2))
+
+
+@pytest.mark.slow()
+def test_pool_batch_evaluator_can_be_pickled_after_use():
+    with PoolBatchEvaluator() as batch_evaluator:
+        batch_evaluator(func=double, arguments=list(range(4)), n_cores=2)
+        copied = pickle.loads(pickle.dumps(batch_evaluator))
+
+    assert copied(func=double, arguments=[1, 2], n_cores=1) == [2, 4]
+
+
+def test_pool_batch_evaluator_pickles_func_once(monkeypatch):
+    batch_evaluator = PoolBatchEvaluator()
+    dumped = []
+
+    def dumps(obj):
+        dumped.append(obj)
+        return b"payload"
+
+    monkeypatch.setattr(batch_evaluators_module.cloudpickle, "dumps", dumps)
+    first = batch_evaluator._get_payload(double, True, None)
+    second = batch_evaluator._get_payload(double, True, None)
+    batch_evaluator._get_payload(double, False, None)
+
+    assert first == second
+    assert len(dumped) == 2
+
+
+@pytest.mark.slow()
+def test_pool_batch_evaluator_without_loky(monkeypatch):
+    monkeypatch.setattr(batch_evaluators_module, "loky_is_available", False)
+    with PoolBatchEvaluator() as batch_evaluator:
+        calculated = batch_evaluator(func=double, arguments=list(range(4)), n_cores=2)
+        assert (
+            type(batch_evaluator._executor).__module__ == "concurrent.futures.process"
+        )
+
+    assert calculated == [0, 2, 4, 6]
+
+
+@pytest.mark.slow()
+@pytest.mark.parametrize("batch_evaluator, n_cores", test_cases)
+def test_submit_batch_and_as_completed(batch_evaluator, n_cores):
+    batch_evaluator = _get_batch_evaluator(batch_evaluator)
+    futures = submit_batch(
+        batch_evaluator, func=double, arguments=list(range(10)), n_cores=n_cores
+    )
+    calculated = sorted(future.result() for future in as_completed(futures))
+    assert calculated == list(range(0, 20, 2))
+
+
+@pytest.mark.slow()
+def test_submit_returns_before_evaluations_are_done():
+    with PoolBatchEvaluator() as batch_evaluator:
+        batch_evaluator(func=double, arguments=[1, 2], n_cores=2)
+        futures = batch_evaluator.submit(
+            func=sleep_and_return, arguments=[1.0, 0.0], n_cores=2
+        )
+        assert not futures[0].done()
+        first = next(as_completed(futures))
+        assert first is futures[1]
+        assert futures[0].result() == 1.0
+
+
+def test_as_completed_yields_done_futures_in_submission_order():
+    futures = submit_batch(
+        process_batch_evaluator("joblib"),
+        func=double,
+        arguments=list(range(50)),
+        n_cores=1,
+    )
+    calculated = [future.result() for future in as_completed(futures)]
+    assert calculated == list(range(0, 100, 2))
+
+
+def test_deferred_evaluations_can_be_cancelled():
+    call_log = []
+
+    def func(x):
+        call_log.append(x)
+        return x
+
+    futures = PoolBatchEvaluator().submit(func=func, arguments=[0, 1, 2], n_cores=1)
+    for future in as_completed(futures):
+        if future.result() == 0:
+            futures[2].cancel()
+
+    assert call_log == [0, 1]
+    assert futures[2].cancelled()
+
+
+@pytest.mark.slow()
+def test_submit_with_unhandled_exception():
+    with PoolBatchEvaluator() as batch_evaluator:
+        futures = batch_evaluator.submit(
+            func=buggy_func, arguments=[1], n_cores=2, error_handling="raise"
+        )
+        with pytest.raises(AssertionError):
+            futures[0].result()
+
+
+def vectorized_sum(x):
+    if (x < 0).any():
+        raise ValueError()
+    return x.sum(axis=1)
+
+
+@pytest.mark.parametrize("batch_evaluator, n_cores", test_cases)
+def test_vectorized_batch_evaluate(batch_evaluator, n_cores):
+    batch_evaluator = _get_batch_evaluator(batch_evaluator)
+    arguments = [np.full(2, i) for i in range(5)]
+    calculated = vectorized_batch_evaluate(
+        vectorized_sum,
+        arguments,
+        batch_evaluator=batch_evaluator,
+        n_cores=n_cores,
+    )
+    assert calculated == [0, 2, 4, 6, 8]
+
+
+def test_vectorized_batch_evaluate_isolates_failed_arguments():
+    arguments = [np.ones(2), -np.ones(2), np.zeros(2)]
+    with pytest.warns(UserWarning):
+        calculated = vectorized_batch_evaluate(
+            vectorized_sum,
+            arguments,
+            batch_evaluator=process_batch_evaluator("joblib"),
+            n_cores=1,
+            error_handling="continue",
+        )
+    assert calculated[0] == 2
+    assert isinstance(calculated[1], str)
+    assert calculated[2] == 0
+
+
+def test_vectorized_batch_evaluate_with_unhandled_exception():
+    with pytest.raises(ValueError):
+        vectorized_batch_evaluate(
+            vectorized_sum,
+            [np.ones(2), -np.ones(2)],
+            batch_evaluator=process_batch_evaluator("joblib"),
+            n_cores=1,
+            error_handling="raise",
+        )
+
+
+def vectorized_sum_with_missing_values(x):
+    return x.sum(axis=1)[:1]
+
+
+@pytest.mark.parametrize("n_cores", n_core_list)
+def test_vectorized_batch_evaluate_with_wrong_number_of_values(n_cores):
+    calculated = vectorized_batch_evaluate(
+        vectorized_sum_with_missing_values,
+        [np.ones(2), np.zeros(2), np.ones(2)],
+        batch_evaluator=process_batch_evaluator("joblib"),
+        n_cores=n_cores,
+        error_handling="continue",
+    )
+    # single entries are evaluated correctly, so only whole chunks are affected
+    assert calculated == [2, 0, 2]
+
+
+def test_vectorized_batch_evaluate_with_no_values_for_a_point():
+    def func(x):
+        return [] if (x < 0).any() else x.sum(axis=1)
+
+    with pytest.warns(UserWarning):
+        calculated = vectorized_batch_evaluate(
+            func,
+            [np.ones(2), -np.ones(2)],
+            batch_evaluator=process_batch_evaluator("joblib"),
+            n_cores=1,
+            error_handling="continue",
+        )
+    assert calculated[0] == 2
+    assert isinstance(calculated[1], str)
+
+
+def test_vectorized_batch_evaluate_with_wrong_number_of_values_and_raise():
+    with pytest.raises(ValueError, match="one function value per parameter"):
+        vectorized_batch_evaluate(
+            vectorized_sum_with_missing_values,
+            [np.ones(2), np.zeros(2)],
+            batch_evaluator=process_batch_evaluator("joblib"),
+            n_cores=1,
+            error_handling="raise",
+        )
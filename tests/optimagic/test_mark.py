@@ -49,6 +49,20 @@ def test_likelihood(func):
     assert got._problem_type == AggregationLevel.LIKELIHOOD
 
 
+@pytest.mark.parametrize("func", CALLABLES)
+def test_vectorized(func):
+    got = om.mark.vectorized(func)
+
+    assert got._vectorized
+
+
+def test_vectorized_preserves_problem_type():
+    got = om.mark.least_squares(om.mark.vectorized(f))
+
+    assert got._vectorized
+    assert got._problem_type == AggregationLevel.LEAST_SQUARES
+
+
 def test_mark_minimizer():
     @om.mark.minimizer(
         name="test",
@@ -2,9 +2,10 @@ import itertools
 
 import numpy as np
 import pytest
+from numpy.testing import assert_array_almost_equal as aaae
 
 import optimagic as om
-from optimagic.logging import SQLiteLogOptions
+from optimagic.logging import SQLiteLogOptions, SQLiteLogReader
 from optimagic.optimization.optimize import minimize
 from optimagic.parameters.bounds import Bounds
 from optimagic.visualization.history_plots import (
@@ -128,6 +129,31 @@ def test_criterion_plot_different_input_types():
     criterion_plot(results, show_exploration=True)
 
 
+def test_criterion_plot_and_params_plot_with_log_reader(tmp_path):
+    path = tmp_path / "test.db"
+    minimize(
+        fun=lambda x: x @ x,
+        params=np.arange(5),
+        algorithm="scipy_lbfgsb",
+        logging=path,
+    )
+    reader = SQLiteLogReader(path)
+
+    first = criterion_plot(reader)
+    second = criterion_plot(reader)
+    expected = criterion_plot(path)
+
+    aaae(first.data[0].y, expected.data[0].y)
+    aaae(second.data[0].y, expected.data[0].y)
+
+    got_params = params_plot(reader)
+    expected_params = params_plot(path)
+    for got_trace, expected_trace in zip(
+        got_params.data, expected_params.data, strict=True
+    ):
+        aaae(got_trace.y, expected_trace.y)
+
+
 def test_criterion_plot_wrong_inputs():
     with pytest.raises(ValueError):
         criterion_plot("bla", names=[1, 2])
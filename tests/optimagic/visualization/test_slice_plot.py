@@ -53,3 +53,23 @@ def test_slice_plot(fixed_inputs, func, kwargs):
         **fixed_inputs,
         **kwargs,
     )
+
+
+def test_slice_plot_with_vectorized_func():
+    calls = []
+
+    @mark.vectorized
+    def vectorized_sphere(params):
+        calls.append(len(params))
+        return (params**2).sum(axis=1)
+
+    slice_plot(
+        func=vectorized_sphere,
+        params=np.zeros(3),
+        bounds=Bounds(lower=np.full(3, -1), upper=np.full(3, 1)),
+        n_gridpoints=5,
+        n_cores=1,
+        return_dict=True,
+    )
+    # one call for the start params and one for all grid points
+    assert calls == [1, 12]